@@ -0,0 +1,100 @@
+"""
+Benchmark: requests/sec of ValrClient vs AsyncValrClient against a local mock server
+
+The mock server answers every request with a small JSON payload after a configurable
+delay, which stands in for network latency to the exchange.
+
+Usage (from the repository root, with the package and the ``async`` extra installed):
+    python benchmarks/bench_async_client.py --requests 2000 --concurrency 100 --latency 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from valr_api import AsyncValrClient, ValrClient
+
+PAYLOAD = json.dumps(
+    {
+        "currencyPair": "BTCZAR",
+        "askPrice": "1000000",
+        "bidPrice": "999999",
+        "lastTradedPrice": "999999",
+    }
+).encode("utf-8")
+
+
+def start_mock_server(latency: float) -> ThreadingHTTPServer:
+    """Start a keep-alive HTTP/1.1 server on a free local port"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(PAYLOAD)))
+            self.end_headers()
+            self.wfile.write(PAYLOAD)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_sync(base_url: str, total: int) -> float:
+    """Issue requests one after another with the blocking client"""
+    client = ValrClient(base_url=base_url)
+    started = time.perf_counter()
+    for _ in range(total):
+        client.market_data.get_market_summary("BTCZAR")
+    return total / (time.perf_counter() - started)
+
+
+async def bench_async(base_url: str, total: int, concurrency: int) -> float:
+    """Keep ``concurrency`` requests in flight on a single event loop"""
+    async with AsyncValrClient(base_url=base_url, pool_size=concurrency) as client:
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                await client.market_data.get_market_summary("BTCZAR")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.01, help="server delay in seconds")
+    args = parser.parse_args()
+
+    server = start_mock_server(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        sync_rps = bench_sync(base_url, min(args.requests, 500))
+        async_rps = asyncio.run(bench_async(base_url, args.requests, args.concurrency))
+    finally:
+        server.shutdown()
+
+    print(f"ValrClient       (sequential):          {sync_rps:10.1f} req/s")
+    print(f"AsyncValrClient  (concurrency={args.concurrency:<4}):     {async_rps:10.1f} req/s")
+    print(f"speed-up: {async_rps / sync_rps:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: response decoding on large orderbook and market-summary payloads
+
+Compares the previous decode path (bytes decoded to text, then parsed again from text)
+with single-pass parsing from raw bytes, using each available codec. Requests go through
+the in-memory mock backend, so the numbers reflect client-side cost only.
+
+Usage (from the repository root, with the package installed):
+    python benchmarks/bench_json.py --levels 20000 --pairs 1000
+"""
+
+import argparse
+import json
+import time
+
+from valr_api import ValrClient
+from valr_api.transport import HttpResponse, MockBackend
+from valr_api.utils.codec import JsonCodec, orjson, ujson
+
+
+def make_orderbook(levels: int) -> bytes:
+    """Build a full-depth orderbook payload"""
+
+    def side(start: float, step: float):
+        return [
+            {
+                "side": "sell" if step > 0 else "buy",
+                "quantity": f"{0.001 * (i % 50 + 1):.8f}",
+                "price": f"{start + step * i:.2f}",
+                "currencyPair": "BTCZAR",
+                "orderCount": i % 7 + 1,
+            }
+            for i in range(levels)
+        ]
+
+    book = {
+        "Asks": side(1000001.0, 1.0),
+        "Bids": side(1000000.0, -1.0),
+        "LastChange": "2024-01-01T00:00:00.000Z",
+    }
+    return json.dumps(book).encode("utf-8")
+
+
+def make_market_summary(pairs: int) -> bytes:
+    """Build an all-pairs market summary payload"""
+    summary = [
+        {
+            "currencyPair": f"PAIR{i}ZAR",
+            "askPrice": "10000.0",
+            "bidPrice": "9999.0",
+            "lastTradedPrice": "9999.5",
+            "previousClosePrice": "10100.0",
+            "baseVolume": "10.0",
+            "quoteVolume": "100000.0",
+            "highPrice": "10200.0",
+            "lowPrice": "9900.0",
+            "created": "2024-01-01T00:00:00.000Z",
+            "changeFromPrevious": "-0.01",
+        }
+        for i in range(pairs)
+    ]
+    return json.dumps(summary).encode("utf-8")
+
+
+def legacy_codec() -> JsonCodec:
+    """The previous behaviour: decode the body to text, then parse the text"""
+    return JsonCodec(JsonCodec.stdlib().dumps, lambda data: json.loads(data.decode("utf-8")))
+
+
+def bench(name: str, call, rounds: int) -> None:
+    """Time ``rounds`` calls and print the cost per call"""
+    call()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        call()
+    elapsed = time.perf_counter() - started
+    print(f"  {name:<28} {elapsed / rounds * 1e3:8.2f} ms/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--levels", type=int, default=20000, help="orderbook levels per side")
+    parser.add_argument("--pairs", type=int, default=1000, help="pairs in the market summary")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    orderbook = make_orderbook(args.levels)
+    summary = make_market_summary(args.pairs)
+    backend = MockBackend(
+        {
+            ("GET", "/v1/marketdata/BTCZAR/orderbook"): HttpResponse(200, orderbook),
+            ("GET", "/v1/marketdata/marketsummary"): HttpResponse(200, summary),
+        }
+    )
+    backend.requests = _Discard()
+
+    codecs = [("text + json (previous)", legacy_codec()), ("json", JsonCodec.stdlib())]
+    if ujson is not None:
+        codecs.append(("ujson", JsonCodec.ujson()))
+    if orjson is not None:
+        codecs.append(("orjson", JsonCodec.orjson()))
+
+    print(f"get_orderbook_full: {len(orderbook) / 1e6:.1f} MB")
+    for name, codec in codecs:
+        client = ValrClient(backend=backend, codec=codec)
+        bench(name, lambda: client.market_data.get_orderbook_full("BTCZAR"), args.rounds)
+
+    print(f"get_market_summary: {len(summary) / 1e6:.1f} MB")
+    for name, codec in codecs:
+        client = ValrClient(backend=backend, codec=codec)
+        bench(name, client.market_data.get_market_summary, args.rounds)
+
+
+class _Discard(list):
+    """Request log that keeps nothing, so memory stays flat during long runs"""
+
+    def append(self, item):
+        pass
+
+
+if __name__ == "__main__":
+    main()
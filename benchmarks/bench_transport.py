@@ -0,0 +1,58 @@
+"""
+Benchmark: per-request client overhead, measured through the in-memory mock backend
+
+No I/O takes place, so the figures are the cost the client itself adds to every request:
+building headers, signing, serializing, error mapping and parsing.
+
+Usage (from the repository root, with the package installed):
+    python benchmarks/bench_transport.py --requests 20000
+"""
+
+import argparse
+import time
+
+from valr_api import ValrClient
+from valr_api.transport import MockBackend
+
+ROUTES = {
+    ("GET", "/v1/public/status"): (200, {"status": "online"}),
+    ("GET", "/v1/account/balances"): (200, [{"currency": "BTC", "total": "0.1"}]),
+    ("POST", "/v1/wallet/crypto/BTC/withdraw"): (202, {"id": "1"}),
+}
+
+
+def bench(name: str, call, total: int) -> None:
+    """Time ``total`` calls and print the cost per call"""
+    started = time.perf_counter()
+    for _ in range(total):
+        call()
+    elapsed = time.perf_counter() - started
+    print(f"{name:<24} {elapsed / total * 1e6:8.2f} us/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    client = ValrClient(api_key="key", api_secret="secret", backend=MockBackend(ROUTES))
+    client.transport.backend.requests = _Discard()
+
+    bench("public GET", client.public.get_status, args.requests)
+    bench("signed GET", client.account.get_balances, args.requests)
+    bench(
+        "signed POST",
+        lambda: client.wallet.withdraw("BTC", "0.1", "address"),
+        args.requests,
+    )
+
+
+class _Discard(list):
+    """Request log that keeps nothing, so memory stays flat during long runs"""
+
+    def append(self, item):
+        pass
+
+
+if __name__ == "__main__":
+    main()
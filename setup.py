@@ -30,5 +30,11 @@ setup(
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8.0"],
+        "fast": ["orjson>=3.6.0"],
+        "http2": ["httpx[http2]>=0.24.0"],
+        "ws": ["websockets>=13.0"],
+    },
     python_requires=">=3.8",
 )
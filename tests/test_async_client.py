@@ -0,0 +1,120 @@
+"""
+Unit tests for VALR API asyncio client
+"""
+
+import asyncio
+import unittest
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.exceptions import (
+    ValrAuthenticationError,
+    ValrRateLimitError,
+    ValrServerError,
+)
+from valr_api.transport.aiohttp_backend import aiohttp
+
+if aiohttp is not None:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncValrClient(unittest.IsolatedAsyncioTestCase):
+    """Test VALR API asyncio client against a local server"""
+
+    async def asyncSetUp(self):
+        """Start a local server and create a client pointing at it"""
+        self.requests = []
+
+        async def handler(request):
+            self.requests.append(request)
+            if request.path == "/v1/public/status":
+                return web.json_response({"status": "online"})
+            if request.path == "/v1/account/balances":
+                if "X-VALR-SIGNATURE" not in request.headers:
+                    return web.Response(status=401, text="Unauthorized")
+                return web.json_response([{"currency": "BTC", "total": "0.1"}])
+            if request.path == "/v1/marketdata/BTCZAR/orderbook":
+                await asyncio.sleep(0.05)
+                return web.json_response({"Asks": [], "Bids": []})
+            if request.path == "/v1/wallet/crypto/BTC/withdraw":
+                return web.json_response(await request.json())
+            if request.path == "/v1/public/currencies":
+                return web.Response(status=429, text="Rate limit exceeded")
+            return web.Response(status=500, text="Server error")
+
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        base_url = str(self.server.make_url("")).rstrip("/")
+        self.client = AsyncValrClient(
+            api_key="test_api_key",
+            api_secret="test_api_secret",
+            base_url=base_url,
+            pool_size=10,
+        )
+
+    async def asyncTearDown(self):
+        """Close the client and stop the server"""
+        await self.client.close()
+        await self.server.close()
+
+    async def test_public_request(self):
+        """Test unauthenticated GET request"""
+        response = await self.client.public.get_status()
+
+        self.assertEqual(response, {"status": "online"})
+        self.assertNotIn("X-VALR-API-KEY", self.requests[0].headers)
+
+    async def test_authenticated_request(self):
+        """Test signed GET request"""
+        response = await self.client.account.get_balances(subaccount_id="42")
+
+        self.assertEqual(response, [{"currency": "BTC", "total": "0.1"}])
+        headers = self.requests[0].headers
+        self.assertEqual(headers["X-VALR-API-KEY"], "test_api_key")
+        self.assertIn("X-VALR-TIMESTAMP", headers)
+        self.assertEqual(headers["X-VALR-SUBACCOUNT-ID"], "42")
+
+    async def test_post_request(self):
+        """Test signed POST request with a JSON body"""
+        response = await self.client.wallet.withdraw("BTC", "0.1", "address")
+
+        self.assertEqual(response, {"amount": "0.1", "address": "address"})
+        self.assertEqual(self.requests[0].method, "POST")
+
+    async def test_concurrent_requests(self):
+        """Test that requests are kept in flight concurrently"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        results = await asyncio.gather(
+            *(self.client.market_data.get_orderbook("BTCZAR") for _ in range(20))
+        )
+
+        self.assertEqual(len(results), 20)
+        # 20 sequential requests would take at least a second
+        self.assertLess(loop.time() - started, 0.5)
+
+    async def test_error_mapping(self):
+        """Test that error responses map to the shared exception types"""
+        with self.assertRaises(ValrRateLimitError):
+            await self.client.public.get_currencies()
+
+        with self.assertRaises(ValrServerError):
+            await self.client.public.get_order_types()
+
+    async def test_missing_credentials(self):
+        """Test signed request without credentials"""
+        client = AsyncValrClient(base_url=self.client.base_url)
+
+        with self.assertRaises(ValrAuthenticationError):
+            await client.get("/v1/account/balances", auth_required=True)
+
+        await client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
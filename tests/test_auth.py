@@ -5,7 +5,9 @@ Unit tests for VALR API auth utilities
 import unittest
 from unittest.mock import patch
 
-from valr_api.utils.auth import generate_signature, get_timestamp
+from valr_api.utils.auth import Signer, generate_signature, get_timestamp
+
+SECRET = "2b286ac2291bfdc9fce6b7294d0efbcc5b18925"
 
 
 class TestAuthUtilities(unittest.TestCase):
@@ -38,6 +40,15 @@ class TestAuthUtilities(unittest.TestCase):
         # Ensure signatures are different
         self.assertNotEqual(signature, signature_with_body)
 
+        # Serialized bodies are signed as-is
+        body_bytes = b'{"orderId":"123456","amount":"0.1"}'
+        self.assertEqual(
+            generate_signature(api_secret, timestamp, "POST", "/v1/orders/limit", body_bytes),
+            generate_signature(
+                api_secret, timestamp, "POST", "/v1/orders/limit", body_bytes.decode("utf-8")
+            ),
+        )
+
     @patch("time.time")
     def test_get_timestamp(self, mock_time):
         """Test get_timestamp function"""
@@ -51,5 +62,52 @@ class TestAuthUtilities(unittest.TestCase):
         self.assertEqual(timestamp, 1643102132854)
 
 
+class TestSigner(unittest.TestCase):
+    """Test the reusable request signer"""
+
+    def test_matches_generate_signature(self):
+        """Test that the signer produces the same signatures as generate_signature"""
+        signer = Signer(SECRET)
+        cases = [
+            ("GET", "/v1/account/balances", None),
+            ("get", "/v1/account/balances", None),
+            ("POST", "/v1/orders/limit", {"pair": "BTCZAR", "price": "1"}),
+            ("POST", "/v1/orders/limit", '{"pair":"BTCZAR"}'),
+            ("POST", "/v1/orders/limit", b'{"pair":"BTCZAR"}'),
+            ("DELETE", "/v1/orders/order", b""),
+        ]
+        for verb, path, body in cases:
+            self.assertEqual(
+                signer.sign(1643102132854, verb, path, body),
+                generate_signature(SECRET, 1643102132854, verb, path, body),
+            )
+
+    def test_key_state_is_reused(self):
+        """Test that signing does not consume the precomputed key state"""
+        signer = Signer(SECRET, cache_size=0)
+        first = signer.sign(1, "GET", "/v1/account/balances")
+        self.assertEqual(signer.sign(1, "GET", "/v1/account/balances"), first)
+        self.assertEqual(
+            signer.sign(2, "GET", "/v1/account/balances"),
+            generate_signature(SECRET, 2, "GET", "/v1/account/balances"),
+        )
+
+    def test_cache(self):
+        """Test that signatures without a body are remembered, within the size bound"""
+        signer = Signer(SECRET, cache_size=2)
+        with patch.object(signer, "_sign", wraps=signer._sign) as sign:
+            signer.sign(1, "GET", "/v1/account/balances")
+            signer.sign(1, "GET", "/v1/account/balances")
+            self.assertEqual(sign.call_count, 1)
+
+            signer.sign(1, "POST", "/v1/orders/limit", b"{}")
+            signer.sign(1, "POST", "/v1/orders/limit", b"{}")
+            self.assertEqual(sign.call_count, 3)
+
+            for timestamp in range(2, 6):
+                signer.sign(timestamp, "GET", "/v1/account/balances")
+            self.assertLessEqual(len(signer._cache), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
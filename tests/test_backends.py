@@ -0,0 +1,155 @@
+"""
+Unit tests for VALR API HTTP backends, against a local HTTP server
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from valr_api.client import ValrClient
+from valr_api.exceptions import ValrConnectionError
+from valr_api.transport import (
+    AiohttpBackend,
+    AsyncHttpxBackend,
+    HttpxBackend,
+    PreparedRequest,
+    RequestsBackend,
+    Urllib3Backend,
+    socket_options,
+    split_timeout,
+)
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Answer every request with its method, raw path, body and signature header"""
+
+    protocol_version = "HTTP/1.1"
+
+    def handle_request(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        echo = {
+            "method": self.command,
+            "path": self.path,
+            "body": self.rfile.read(length).decode("utf-8"),
+            "signature": self.headers.get("X-VALR-SIGNATURE"),
+        }
+        content = json.dumps(echo).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_DELETE = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+def closed_port():
+    """A local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestBackends(unittest.TestCase):
+    """Test that every backend sends prepared requests unchanged"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def check_client(self, backend):
+        """Send signed requests through a client on the backend"""
+        client = ValrClient(
+            api_key="key", api_secret="secret", base_url=self.base_url, backend=backend
+        )
+        try:
+            echo = client.account.get_transaction_history(skip=0, limit=10)
+            self.assertEqual(echo["path"], "/v1/account/transactionhistory?limit=10&skip=0")
+            self.assertIsNotNone(echo["signature"])
+
+            echo = client.orders.cancel_order("BTCZAR", order_id="o-1")
+            self.assertEqual(echo["method"], "DELETE")
+            self.assertEqual(json.loads(echo["body"])["orderId"], "o-1")
+            # Pooled connections are reused after close
+            backend.close()
+            self.assertEqual(client.public.get_status()["path"], "/v1/public/status")
+        finally:
+            backend.close()
+
+    def test_requests_backend(self):
+        """Test the requests backend"""
+        self.check_client(RequestsBackend(pool_size=4))
+
+    def test_urllib3_backend(self):
+        """Test the urllib3 backend"""
+        self.check_client(Urllib3Backend(pool_size=4))
+
+    def test_httpx_backend(self):
+        """Test the httpx backend"""
+        self.check_client(HttpxBackend(pool_size=4))
+
+    def test_async_backends(self):
+        """Test the asynchronous backends"""
+        request = PreparedRequest(
+            "POST", self.base_url + "/v1/orders/limit?a=%2F", "/v1/orders/limit", body=b"{}"
+        )
+
+        async def run(backend):
+            try:
+                return await backend.send(request, (1.0, 5.0))
+            finally:
+                await backend.close()
+
+        for backend in (AsyncHttpxBackend(), AiohttpBackend()):
+            response = asyncio.run(run(backend))
+            echo = json.loads(response.content)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual((echo["method"], echo["body"]), ("POST", "{}"))
+            self.assertEqual(echo["path"], "/v1/orders/limit?a=%2F")
+
+    def test_client_session(self):
+        """Test that a client only exposes the session its backend sends through"""
+        backend = RequestsBackend()
+        self.assertIs(ValrClient(backend=backend).session, backend.session)
+        self.assertIsNone(ValrClient(backend=Urllib3Backend()).session)
+        self.assertIsNotNone(ValrClient().session)
+
+    def test_connection_errors(self):
+        """Test that failed connections raise ValrConnectionError"""
+        url = f"http://127.0.0.1:{closed_port()}/v1/public/status"
+        request = PreparedRequest("GET", url, "/v1/public/status")
+
+        for backend in (RequestsBackend(), Urllib3Backend(), HttpxBackend()):
+            with self.subTest(backend=type(backend).__name__):
+                with self.assertRaises(ValrConnectionError):
+                    backend.send(request, (0.5, 0.5))
+                backend.close()
+
+    def test_timeouts_and_socket_options(self):
+        """Test splitting timeouts and building socket options"""
+        self.assertEqual(split_timeout(3), (3, 3))
+        self.assertEqual(split_timeout((0.5, 10)), (0.5, 10))
+        self.assertEqual(
+            socket_options(tcp_nodelay=True, keepalive=False),
+            [
+                (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 0),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Unit tests for VALR API history backfill
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from valr_api.client import ValrClient
+from valr_api.exceptions import ValrApiError
+from valr_api.history import Backfill, BackfillCheckpoint
+from valr_api.models import Trade
+from valr_api.transport import HttpResponse, MockBackend
+from valr_api.utils.retry import RetryPolicy
+
+START = 1_600_000_000_000
+HOUR = 3_600_000
+
+
+def iso(ms):
+    """Format epoch milliseconds like VALR does"""
+    moment = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{ms % 1000:03d}Z"
+
+
+# A quiet day with a burst of 30 transactions in its fifth hour
+TIMES = [START + i * HOUR for i in range(24)] + [START + 4 * HOUR + i * 1000 for i in range(1, 31)]
+TRANSACTIONS = [{"id": f"tx{t}", "eventAt": iso(t)} for t in TIMES]
+
+
+class HistoryServer:
+    """Serve TRANSACTIONS filtered by time, with both bounds inclusive like the API"""
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            return HttpResponse(500, b'{"message": "down"}')
+        params = request.params
+        start, end = params["startTime"], params["endTime"]
+        matching = [tx for tx, t in zip(TRANSACTIONS, TIMES) if start <= t <= end]
+        matching.sort(key=lambda tx: tx["eventAt"], reverse=True)
+        page = matching[params["skip"] : params["skip"] + params["limit"]]
+        return HttpResponse(200, json.dumps(page).encode("utf-8"))
+
+
+def make_client(server):
+    """Create a client whose transaction history is served by server"""
+    backend = MockBackend({("GET", "/v1/account/transactionhistory"): server})
+    return ValrClient(
+        api_key="key", api_secret="secret", backend=backend, retry_policy=RetryPolicy.never()
+    )
+
+
+class TestBackfill(unittest.TestCase):
+    """Test the time-sliced backfill"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = os.path.join(self.directory.name, "transactions.journal")
+
+    def tearDown(self):
+        """Remove the journal"""
+        self.directory.cleanup()
+
+    def test_merged_in_time_order(self):
+        """Test that every transaction is returned once, oldest first"""
+        client = make_client(HistoryServer())
+        backfill = Backfill.transactions(
+            client, START, START + 24 * HOUR, window=6 * HOUR, limit=10
+        )
+
+        transactions = backfill.run()
+
+        self.assertEqual([tx["id"] for tx in transactions], [f"tx{t}" for t in sorted(TIMES)])
+        self.assertEqual(backfill.progress, 1.0)
+
+    def test_splits_full_windows(self):
+        """Test that a window overflowing a page is split until it fits"""
+        client = make_client(HistoryServer())
+        backfill = Backfill.transactions(
+            client, START, START + 24 * HOUR, window=6 * HOUR, limit=10, workers=1
+        )
+
+        self.assertEqual(len(backfill.run()), len(TIMES))
+        self.assertGreater(backfill.splits, 0)
+
+    def test_pages_unsplittable_windows(self):
+        """Test that a window at the minimum length is paged through"""
+        client = make_client(HistoryServer())
+        backfill = Backfill.transactions(
+            client, START, START + 24 * HOUR, window=6 * HOUR, min_window=6 * HOUR, limit=10
+        )
+
+        self.assertEqual(len(backfill.run()), len(TIMES))
+        self.assertEqual(backfill.splits, 0)
+
+    def test_resume_from_checkpoint(self):
+        """Test that a failed backfill resumes with only the missing windows"""
+        options = {"window": HOUR, "limit": 100, "workers": 1, "checkpoint": self.journal}
+        failing = HistoryServer(fail_after=10)
+        with self.assertRaises(ValrApiError):
+            Backfill.transactions(make_client(failing), START, START + 24 * HOUR, **options).run()
+
+        server = HistoryServer()
+        backfill = Backfill.transactions(make_client(server), START, START + 24 * HOUR, **options)
+        transactions = backfill.run()
+
+        self.assertEqual(len(transactions), len(TIMES))
+        self.assertEqual(server.calls, 14)
+
+    def test_truncated_journal_line(self):
+        """Test that a line cut short by a crash is discarded"""
+        checkpoint = BackfillCheckpoint(self.journal)
+        checkpoint.append((0, 10), [{"id": "a"}])
+        with open(self.journal, "a", encoding="utf-8") as file:
+            file.write('{"start": 10, "end"')
+
+        self.assertEqual(checkpoint.load(), [((0, 10), [{"id": "a"}])])
+        checkpoint.append((10, 20), [])
+        self.assertEqual(len(checkpoint.load()), 2)
+
+    def test_models_survive_checkpoint(self):
+        """Test that journaled trades are rebuilt as models"""
+        checkpoint = BackfillCheckpoint(self.journal)
+        trade = Trade({"id": "1", "price": "100.5", "tradedAt": iso(START)})
+        checkpoint.append((START, START + HOUR), [trade])
+
+        backfill = Backfill(
+            lambda *page: [], START, START + HOUR, checkpoint=checkpoint, model=Trade
+        )
+
+        self.assertEqual(backfill.run(), [trade])
+
+    def test_invalid_range(self):
+        """Test that an empty range is rejected"""
+        with self.assertRaises(ValueError):
+            Backfill(lambda *page: [], START, START)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Unit tests for VALR API response cache
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.models import CurrencyPair
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+from valr_api.utils.cache import ResponseCache, get_default_cache
+
+PAIRS = [{"symbol": "BTCZAR", "minBaseAmount": "0.0001", "active": True}]
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the response cache"""
+
+    def test_ttl_patterns(self):
+        """Test per-endpoint TTLs and uncached endpoints"""
+        cache = ResponseCache()
+
+        self.assertEqual(cache.ttl_for("/v1/public/pairs"), 3600.0)
+        self.assertEqual(cache.ttl_for("/v1/public/BTCZAR/orderTypes"), 3600.0)
+        self.assertEqual(cache.ttl_for("/v1/public/status"), 10.0)
+        self.assertIsNone(cache.ttl_for("/v1/marketdata/BTCZAR/orderbook"))
+
+    def test_expiry(self):
+        """Test that entries expire after their TTL"""
+        cache = ResponseCache(ttls={"/a": 0.01})
+        cache.set(("url", "/a"), "/a", b"1")
+
+        self.assertEqual(cache.get(("url", "/a")), b"1")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(("url", "/a")))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = ResponseCache(ttls={"*": 60}, maxsize=2)
+        cache.set(("url", "/a"), "/a", b"a")
+        cache.set(("url", "/b"), "/b", b"b")
+        cache.get(("url", "/a"))
+        cache.set(("url", "/c"), "/c", b"c")
+
+        self.assertIsNone(cache.get(("url", "/b")))
+        self.assertEqual(cache.get(("url", "/a")), b"a")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_invalidate(self):
+        """Test invalidation by pattern and in full"""
+        cache = ResponseCache()
+        cache.set(cache.key("url", "/v1/public/pairs"), "/v1/public/pairs", b"[]")
+        cache.set(cache.key("url", "/v1/public/currencies"), "/v1/public/currencies", b"[]")
+
+        self.assertEqual(cache.invalidate("/v1/public/pairs"), 1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.invalidate(), 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_shared_default(self):
+        """Test that the default cache is shared across the process"""
+        self.assertIs(get_default_cache(), get_default_cache())
+
+
+class TestClientCache(unittest.TestCase):
+    """Test response caching on the clients"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.backend = MockBackend(
+            {
+                ("GET", "/v1/public/pairs"): (200, PAIRS),
+                ("GET", "/v1/public/BTCZAR/orderTypes"): (200, [{"orderType": "LIMIT"}]),
+                ("GET", "/v1/marketdata/BTCZAR/orderbook"): (200, {"Asks": [], "Bids": []}),
+            }
+        )
+
+    def test_shared_between_clients(self):
+        """Test that clients sharing a cache share responses"""
+        cache = ResponseCache()
+        first = ValrClient(backend=self.backend, cache=cache)
+        second = ValrClient(backend=self.backend, cache=cache, models=True)
+
+        self.assertEqual(first.public.get_currency_pairs(), PAIRS)
+        pair = second.public.get_currency_pairs()[0]
+
+        self.assertIsInstance(pair, CurrencyPair)
+        self.assertEqual(len(self.backend.requests), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_callers_get_independent_copies(self):
+        """Test that modifying returned data does not change the cache"""
+        client = ValrClient(backend=self.backend, cache=ResponseCache())
+
+        client.public.get_currency_pairs().clear()
+
+        self.assertEqual(client.public.get_currency_pairs(), PAIRS)
+
+    def test_uncached_endpoints(self):
+        """Test that market data is never cached or counted"""
+        cache = ResponseCache()
+        client = ValrClient(backend=self.backend, cache=cache)
+
+        client.market_data.get_orderbook("BTCZAR")
+        client.market_data.get_orderbook("BTCZAR")
+
+        self.assertEqual(len(self.backend.requests), 2)
+        self.assertEqual(cache.stats()["misses"], 0)
+
+    def test_background_refresh(self):
+        """Test that an entry near expiry is refreshed in the background"""
+        refreshed = threading.Event()
+        payloads = [b'[{"orderType": "LIMIT"}]', b'[{"orderType": "MARKET"}]']
+
+        def respond(request):
+            if len(payloads) == 1:
+                refreshed.set()
+            return HttpResponse(200, payloads.pop(0) if len(payloads) > 1 else payloads[0])
+
+        backend = MockBackend({("GET", "/v1/public/BTCZAR/orderTypes"): respond})
+        cache = ResponseCache(ttls={"/v1/public/*/orderTypes": 0.05}, refresh_ahead=0.5)
+        client = ValrClient(backend=backend, cache=cache)
+
+        client.public.get_order_types("BTCZAR")
+        time.sleep(0.03)
+        # Served from the cache while the refresh runs
+        self.assertEqual(client.public.get_order_types("BTCZAR"), [{"orderType": "LIMIT"}])
+        self.assertTrue(refreshed.wait(1))
+        for _ in range(100):
+            if client.public.get_order_types("BTCZAR") == [{"orderType": "MARKET"}]:
+                break
+            time.sleep(0.005)
+
+        self.assertEqual(client.public.get_order_types("BTCZAR"), [{"orderType": "MARKET"}])
+        self.assertEqual(cache.stats()["refreshes"], 1)
+
+    def test_async_client(self):
+        """Test that the async client uses the same cache"""
+        cache = ResponseCache()
+        backend = AsyncMockBackend({("GET", "/v1/public/pairs"): (200, PAIRS)})
+        client = AsyncValrClient(backend=backend, cache=cache)
+
+        async def run():
+            await client.public.get_currency_pairs()
+            return await client.public.get_currency_pairs()
+
+        self.assertEqual(asyncio.run(run()), PAIRS)
+        self.assertEqual(len(backend.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
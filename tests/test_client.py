@@ -34,7 +34,9 @@ class TestValrClient(unittest.TestCase):
         # Set up mock response
         mock_response = MagicMock()
         mock_response.ok = True
+        mock_response.status_code = 200
         mock_response.text = json.dumps({"data": "test_data"})
+        mock_response.content = json.dumps({"data": "test_data"}).encode("utf-8")
         mock_response.json.return_value = {"data": "test_data"}
         mock_request.return_value = mock_response
 
@@ -49,7 +51,7 @@ class TestValrClient(unittest.TestCase):
         args, kwargs = mock_request.call_args
         self.assertEqual(kwargs["method"], "GET")
         self.assertEqual(kwargs["url"], "https://api.valr.com/v1/public/currencies")
-        self.assertEqual(kwargs["params"], None)
+        self.assertIsNone(kwargs.get("params"))
         self.assertEqual(kwargs["data"], None)
 
     @patch("valr_api.client.requests.Session.request")
@@ -58,7 +60,9 @@ class TestValrClient(unittest.TestCase):
         # Set up mock response
         mock_response = MagicMock()
         mock_response.ok = True
+        mock_response.status_code = 200
         mock_response.text = json.dumps({"data": "test_data"})
+        mock_response.content = json.dumps({"data": "test_data"}).encode("utf-8")
         mock_response.json.return_value = {"data": "test_data"}
         mock_request.return_value = mock_response
 
@@ -73,7 +77,7 @@ class TestValrClient(unittest.TestCase):
         args, kwargs = mock_request.call_args
         self.assertEqual(kwargs["method"], "GET")
         self.assertEqual(kwargs["url"], "https://api.valr.com/v1/account/balances")
-        self.assertEqual(kwargs["params"], None)
+        self.assertIsNone(kwargs.get("params"))
         self.assertEqual(kwargs["data"], None)
 
         # Check auth headers were included
@@ -0,0 +1,190 @@
+"""
+Unit tests for VALR API server clock estimation
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+from valr_api.utils.clock import ClockSync, server_time_ms
+
+SKEW = 5000
+
+
+def server_time(skew=SKEW, delay=0.0):
+    """Fetch function reporting a server clock ``skew`` ms ahead, after ``delay``"""
+
+    def fetch():
+        time.sleep(delay / 2)
+        moment = datetime.fromtimestamp(time.time() + skew / 1000, tz=timezone.utc)
+        time.sleep(delay / 2)
+        return {"epochTime": int(moment.timestamp()), "time": moment.isoformat()}
+
+    return fetch
+
+
+def _iso(ms):
+    """Format epoch milliseconds as an ISO timestamp"""
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat(timespec="microseconds")
+
+
+class TestClockSync(unittest.TestCase):
+    """Test the clock estimate"""
+
+    def test_server_time_ms(self):
+        """Test reading both fields of the server time response"""
+        self.assertEqual(server_time_ms({"time": "2024-01-01T00:00:00.250Z"}), 1704067200250)
+        self.assertEqual(server_time_ms({"epochTime": 1704067200}), 1704067200500)
+
+    def test_offset(self):
+        """Test that a sample corrects timestamps by the server offset"""
+        clock = ClockSync(server_time())
+        self.assertAlmostEqual(clock.timestamp(), time.time() * 1000, delta=50)
+
+        clock.sample()
+
+        self.assertAlmostEqual(clock.offset, SKEW, delta=50)
+        self.assertAlmostEqual(clock.timestamp(), time.time() * 1000 + SKEW, delta=50)
+
+    def test_lowest_rtt_sample_wins(self):
+        """Test that the fastest exchange is trusted over slower ones"""
+        clock = ClockSync()
+        clock.fetch = server_time(skew=SKEW)
+        clock.sample()
+        clock.fetch = server_time(skew=-SKEW, delay=0.05)
+        clock.sample()
+
+        self.assertAlmostEqual(clock.offset, SKEW, delta=50)
+        self.assertLess(clock.rtt, 50)
+
+    def test_wall_clock_step(self):
+        """Test that a wall-clock step after a sample does not move timestamps"""
+        clock = ClockSync(server_time())
+        clock.sample()
+        expected = time.time() * 1000 + SKEW
+
+        with mock.patch("valr_api.utils.clock.time.time", return_value=0.0):
+            self.assertAlmostEqual(clock.timestamp(), expected, delta=50)
+
+    def test_drift(self):
+        """Test that drift is the rate of the server clock against the monotonic clock"""
+        clock = ClockSync()
+        for second in range(4):
+            server = 1_000_000 + second * 1000.1
+            clock._record(second, second, {"time": _iso(server)}, second)
+
+        self.assertAlmostEqual(clock.drift, 100, delta=1)
+
+    def test_background_sampling(self):
+        """Test that the background thread samples and stops"""
+        clock = ClockSync(server_time(), interval=0.01)
+        clock.start()
+        time.sleep(0.05)
+        clock.stop()
+
+        stats = clock.stats()
+        self.assertGreater(stats["samples"], 1)
+        self.assertEqual(stats["failures"], 0)
+        self.assertAlmostEqual(stats["offset_ms"], SKEW, delta=50)
+
+    def test_malformed_samples(self):
+        """Test that malformed server times count as failures without ending sampling"""
+        responses = iter([{"epochTime": None}, {"time": "not a time"}, ["not", "an", "object"]])
+        good = server_time()
+
+        def fetch():
+            return next(responses, None) or good()
+
+        clock = ClockSync(fetch, interval=0.01)
+        clock.start()
+        deadline = time.monotonic() + 1
+        while clock.stats()["samples"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        clock.stop()
+
+        self.assertEqual(clock.failures, 3)
+        self.assertGreater(clock.stats()["samples"], 0)
+
+    def test_start_requires_fetch(self):
+        """Test that a clock without a fetch function cannot start"""
+        with self.assertRaises(ValueError):
+            ClockSync().start()
+
+
+class TestClientClock(unittest.TestCase):
+    """Test that signed requests use the clock"""
+
+    def routes(self):
+        """Routing table with a skewed server clock"""
+        fetch = server_time()
+        return {
+            ("GET", "/v1/public/time"): lambda request: HttpResponse(
+                200, ('{"time": "%s"}' % fetch()["time"]).encode("utf-8")
+            ),
+            ("GET", "/v1/account/balances"): (200, []),
+        }
+
+    def test_signed_timestamp(self):
+        """Test that the signature timestamp is corrected"""
+        backend = MockBackend(self.routes())
+        clock = ClockSync()
+        client = ValrClient(api_key="key", api_secret="secret", backend=backend, clock=clock)
+
+        clock.sample()
+        client.account.get_balances()
+
+        signed = int(backend.requests[-1].headers["X-VALR-TIMESTAMP"])
+        self.assertAlmostEqual(signed, time.time() * 1000 + SKEW, delta=100)
+
+    def test_samples_are_not_coalesced(self):
+        """Test that a sample sends its own request while an identical one is in flight"""
+        started, release = threading.Event(), threading.Event()
+        time_route = self.routes()[("GET", "/v1/public/time")]
+
+        def slow_time(request):
+            if not started.is_set():
+                started.set()
+                release.wait(5)
+            return time_route(request)
+
+        backend = MockBackend({("GET", "/v1/public/time"): slow_time})
+        clock = ClockSync()
+        client = ValrClient(backend=backend, clock=clock)
+        pending = threading.Thread(target=client.market_data.get_server_time)
+        pending.start()
+        started.wait(5)
+        try:
+            clock.sample()
+        finally:
+            release.set()
+            pending.join()
+
+        self.assertEqual(len(backend.requests), 2)
+        self.assertLess(clock.rtt, 1000)
+
+    def test_async_client(self):
+        """Test that the asyncio client binds and samples the clock"""
+        backend = AsyncMockBackend(self.routes())
+        clock = ClockSync(interval=60)
+        client = AsyncValrClient(api_key="key", api_secret="secret", backend=backend, clock=clock)
+
+        async def run():
+            clock.start_async()
+            await asyncio.sleep(0.01)
+            await client.account.get_balances()
+            clock.stop()
+
+        asyncio.run(run())
+
+        signed = int(backend.requests[-1].headers["X-VALR-TIMESTAMP"])
+        self.assertAlmostEqual(signed, time.time() * 1000 + SKEW, delta=100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for VALR API JSON codec
+"""
+
+import json
+import unittest
+from decimal import Decimal
+
+from valr_api.client import ValrClient
+from valr_api.transport import MockBackend
+from valr_api.utils.auth import generate_signature
+from valr_api.utils.codec import JsonCodec, orjson
+
+
+class TestJsonCodec(unittest.TestCase):
+    """Test VALR API JSON codec"""
+
+    def codecs(self):
+        """All codecs available in this environment"""
+        codecs = [JsonCodec.stdlib()]
+        if orjson is not None:
+            codecs.append(JsonCodec.orjson())
+        return codecs
+
+    def test_round_trip(self):
+        """Test that every codec serializes to bytes and parses bytes"""
+        payload = {"pair": "BTCZAR", "price": Decimal("1000.50"), "levels": [1, 2]}
+
+        for codec in self.codecs():
+            data = codec.dumps(payload)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(
+                codec.loads(data), {"pair": "BTCZAR", "price": "1000.50", "levels": [1, 2]}
+            )
+
+    def test_default_prefers_orjson(self):
+        """Test automatic codec selection"""
+        expected = "orjson" if orjson is not None else "json"
+        self.assertEqual(JsonCodec.default().name, expected)
+
+    def test_signed_bytes_are_sent_bytes(self):
+        """Test that the body is serialized once and signed exactly as sent"""
+        calls = []
+
+        def dumps(obj):
+            calls.append(obj)
+            return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+        backend = MockBackend({("POST", "/v1/wallet/crypto/BTC/withdraw"): (202, {"id": "1"})})
+        client = ValrClient(
+            api_key="test_api_key",
+            api_secret="test_api_secret",
+            backend=backend,
+            codec=JsonCodec(dumps, json.loads),
+        )
+
+        client.wallet.withdraw("BTC", "0.1", "address")
+
+        self.assertEqual(len(calls), 1)
+        request = backend.requests[0]
+        self.assertEqual(request.body, b'{"amount":"0.1","address":"address"}')
+        expected = generate_signature(
+            "test_api_secret",
+            int(request.headers["X-VALR-TIMESTAMP"]),
+            "POST",
+            "/v1/wallet/crypto/BTC/withdraw",
+            request.body,
+        )
+        self.assertEqual(request.headers["X-VALR-SIGNATURE"], expected)
+
+    def test_response_parsed_from_bytes(self):
+        """Test that responses are parsed from the raw body"""
+        seen = []
+
+        def loads(data):
+            seen.append(data)
+            return json.loads(data)
+
+        backend = MockBackend({("GET", "/v1/public/status"): (200, {"status": "online"})})
+        client = ValrClient(backend=backend, codec=JsonCodec(JsonCodec.stdlib().dumps, loads))
+
+        self.assertEqual(client.public.get_status(), {"status": "online"})
+        self.assertEqual(seen, [b'{"status": "online"}'])
+
+
+if __name__ == "__main__":
+    unittest.main()
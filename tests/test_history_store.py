@@ -0,0 +1,145 @@
+"""
+Unit tests for the VALR API local history store
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from valr_api.client import ValrClient
+from valr_api.history import ColumnTable, HistoryStore
+from valr_api.transport import HttpResponse, MockBackend
+
+
+def trade(number, second=None):
+    """Build a trade, by default one second after the previous number"""
+    second = number if second is None else second
+    return {
+        "id": f"t{number}",
+        "price": f"{1000 + number}",
+        "quantity": "0.1",
+        "tradedAt": f"2024-01-01T00:00:{second:02d}.000Z",
+    }
+
+
+class TradeServer:
+    """Serve a trade history newest first, in skip/limit pages"""
+
+    def __init__(self, trades):
+        self.trades = trades
+        self.requests = 0
+
+    def __call__(self, request):
+        self.requests += 1
+        newest_first = sorted(self.trades, key=lambda t: t["tradedAt"], reverse=True)
+        skip, limit = request.params["skip"], request.params["limit"]
+        body = {
+            "trades": newest_first[skip : skip + limit],
+            "isLastPage": skip + limit >= len(newest_first),
+        }
+        return HttpResponse(200, json.dumps(body).encode("utf-8"))
+
+
+class TestColumnTable(unittest.TestCase):
+    """Test the append-only column files"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "table")
+
+    def tearDown(self):
+        """Remove the table"""
+        self.directory.cleanup()
+
+    def test_append_and_read(self):
+        """Test that rows are read back from the memory-mapped columns"""
+        table = ColumnTable(self.path)
+        table.append([trade(1), trade(2)])
+        table.append([dict(trade(3), fee="0.01")])
+
+        prices = table.column("price")
+        fees = table.column("fee")
+
+        self.assertEqual(list(prices), ["1001", "1002", "1003"])
+        self.assertEqual(prices[-1], "1003")
+        self.assertEqual(fees[:], [None, None, "0.01"])
+        self.assertEqual(list(ColumnTable(self.path))[2]["fee"], "0.01")
+        prices.close()
+        fees.close()
+
+    def test_torn_append_is_truncated(self):
+        """Test that bytes beyond the committed rows are discarded on open"""
+        table = ColumnTable(self.path)
+        table.append([trade(1)])
+        for name in os.listdir(self.path):
+            if name.endswith((".dat", ".idx")):
+                with open(os.path.join(self.path, name), "ab") as file:
+                    file.write(b"garbage!")
+
+        table = ColumnTable(self.path)
+        table.append([trade(2)])
+
+        self.assertEqual([row["id"] for row in table], ["t1", "t2"])
+
+    def test_unknown_column(self):
+        """Test that reading a missing column raises KeyError"""
+        with self.assertRaises(KeyError):
+            ColumnTable(self.path).column("price")
+
+
+class TestHistoryStore(unittest.TestCase):
+    """Test incremental syncs"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = TradeServer([trade(i) for i in range(1, 8)])
+        backend = MockBackend({("GET", "/v1/account/BTCZAR/tradehistory"): self.server})
+        self.client = ValrClient(api_key="key", api_secret="secret", backend=backend)
+
+    def tearDown(self):
+        """Remove the store"""
+        self.directory.cleanup()
+
+    def test_sync_only_fetches_new_records(self):
+        """Test that a second sync stops at the high-water mark"""
+        store = HistoryStore(self.directory.name, self.client)
+        self.assertEqual(store.sync_trades("BTCZAR"), 7)
+
+        self.server.trades += [trade(8), trade(9)]
+        self.server.requests = 0
+        self.assertEqual(store.sync_trades("BTCZAR"), 2)
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(store.sync_trades("BTCZAR"), 0)
+
+        table = HistoryStore(self.directory.name).table("trades", "BTCZAR")
+        self.assertEqual([row["id"] for row in table], [f"t{i}" for i in range(1, 10)])
+
+    def test_records_sharing_the_mark_time(self):
+        """Test that a late record with the same time as the mark is still stored"""
+        store = HistoryStore(self.directory.name, self.client)
+        store.sync_trades("BTCZAR")
+
+        self.server.trades.append(trade(70, second=7))
+
+        self.assertEqual(store.sync_trades("BTCZAR"), 1)
+        self.assertEqual(store.table("trades", "BTCZAR").high_water_mark["ids"], ["t7", "t70"])
+
+    def test_tables_per_account(self):
+        """Test that subaccounts are stored separately"""
+        store = HistoryStore(self.directory.name, self.client)
+        store.sync_trades("BTCZAR", subaccount_id="42")
+
+        self.assertEqual(len(store.table("trades", "BTCZAR", "42")), 7)
+        self.assertEqual(len(store.table("trades", "BTCZAR")), 0)
+
+    def test_unknown_kind(self):
+        """Test that only known history kinds are accepted"""
+        with self.assertRaises(ValueError):
+            HistoryStore(self.directory.name).table("orders")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,279 @@
+"""
+Unit tests for VALR API balance ledger
+"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from decimal import Decimal
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.state import BalanceLedger
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+
+BALANCES = [
+    {"currency": "BTC", "available": "0.5", "reserved": "0.1", "total": "0.6"},
+    {"currency": "ZAR", "available": "1000", "reserved": "500", "total": "1500"},
+]
+
+
+def transaction(id_, at, kind, credit=None, debit=None, fee=None):
+    """Transaction history record; amounts are (currency, value) pairs"""
+    record = {
+        "id": id_,
+        "transactionType": {"type": kind, "description": kind},
+        "eventAt": f"2024-01-01T00:00:{at:02d}.000Z",
+    }
+    for prefix, amount in (("credit", credit), ("debit", debit), ("fee", fee)):
+        if amount is not None:
+            record[f"{prefix}Currency"], record[f"{prefix}Value"] = amount
+    return record
+
+
+class AccountServer:
+    """Serve balances and a newest-first transaction history, per subaccount header"""
+
+    def __init__(self):
+        self.balances = {"0": BALANCES, "7": [BALANCES[1]]}
+        self.transactions = {"0": [transaction("t1", 1, "FIAT_DEPOSIT", credit=("ZAR", "10"))]}
+
+    def get_balances(self, request):
+        subaccount_id = request.headers.get("X-VALR-SUBACCOUNT-ID", "0")
+        return HttpResponse(200, json.dumps(self.balances[subaccount_id]).encode("utf-8"))
+
+    def get_transactions(self, request):
+        records = self.transactions.get(request.headers.get("X-VALR-SUBACCOUNT-ID", "0"), [])
+        skip, limit = request.params["skip"], request.params["limit"]
+        return HttpResponse(200, json.dumps(records[skip : skip + limit]).encode("utf-8"))
+
+    def routes(self):
+        return {
+            ("GET", "/v1/account/balances"): self.get_balances,
+            ("GET", "/v1/account/transactionhistory"): self.get_transactions,
+        }
+
+
+class TestBalanceLedger(unittest.TestCase):
+    """Test the balance ledger"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.server = AccountServer()
+        self.backend = MockBackend(self.server.routes())
+        self.client = ValrClient(api_key="key", api_secret="secret", backend=self.backend)
+        self.ledger = BalanceLedger(self.client)
+        self.ledger.seed()
+
+    def add(self, *records):
+        """Add transactions to the server history, newest first"""
+        self.server.transactions["0"] = list(reversed(records)) + self.server.transactions["0"]
+
+    def test_seed(self):
+        """Test that seeding loads Decimal balances and reads need no request"""
+        requests = len(self.backend.requests)
+
+        self.assertEqual(
+            self.ledger.balance("BTC"),
+            {"available": Decimal("0.5"), "reserved": Decimal("0.1"), "total": Decimal("0.6")},
+        )
+        self.assertEqual(self.ledger.available("ZAR"), Decimal("1000"))
+        self.assertEqual(self.ledger.available("ETH"), 0)
+        self.assertEqual(set(self.ledger.snapshot()), {"BTC", "ZAR"})
+        self.assertEqual(len(self.backend.requests), requests)
+
+    def test_sync_transactions(self):
+        """Test that only transactions after the seed are applied, once"""
+        self.add(
+            transaction("t2", 2, "FIAT_DEPOSIT", credit=("ZAR", "100")),
+            transaction(
+                "t3",
+                3,
+                "LIMIT_BUY",
+                credit=("BTC", "0.001"),
+                debit=("ZAR", "400"),
+                fee=("BTC", "0.00001"),
+            ),
+        )
+
+        self.assertEqual(self.ledger.sync_transactions(), 2)
+        self.assertEqual(self.ledger.sync_transactions(), 0)
+
+        zar = self.ledger.balance("ZAR")
+        self.assertEqual(zar["total"], Decimal("1200"))
+        # The limit buy settled reserved funds
+        self.assertEqual(zar["reserved"], Decimal("100"))
+        self.assertEqual(zar["available"], Decimal("1100"))
+        self.assertEqual(self.ledger.balance("BTC")["total"], Decimal("0.60099"))
+
+    def test_stream_messages(self):
+        """Test that stream events are applied once, from their balance updates"""
+        record = transaction("t2", 2, "FIAT_DEPOSIT", credit=("ZAR", "100"))
+        update = {
+            "type": "BALANCE_UPDATE",
+            "data": {
+                "currency": {"symbol": "ZAR"},
+                "available": "1100",
+                "reserved": "500",
+                "total": "1600",
+            },
+        }
+
+        self.assertTrue(
+            self.ledger.apply_message({"type": "NEW_ACCOUNT_HISTORY_RECORD", "data": record})
+        )
+        self.ledger.apply_message(update)
+        self.assertFalse(
+            self.ledger.apply_message({"type": "NEW_ACCOUNT_HISTORY_RECORD", "data": record})
+        )
+        self.add(record)
+
+        self.assertEqual(self.ledger.sync_transactions(), 0)
+        self.assertEqual(self.ledger.balance("ZAR")["total"], Decimal("1600"))
+        self.assertEqual(self.ledger.available("ZAR"), Decimal("1100"))
+
+    def test_drift_check_marks_included_transactions(self):
+        """Test that transactions in adopted balances are not applied again"""
+        self.add(transaction("t2", 2, "FIAT_DEPOSIT", credit=("ZAR", "100")))
+        self.server.balances["0"] = [
+            BALANCES[0],
+            dict(BALANCES[1], available="1100", total="1600"),
+        ]
+
+        self.assertEqual(self.ledger.check_drift()[None]["ZAR"]["total"], Decimal("100"))
+        self.assertEqual(self.ledger.sync_transactions(), 0)
+        self.assertEqual(self.ledger.available("ZAR"), Decimal("1100"))
+        self.assertEqual(self.ledger.check_drift(), {})
+
+    def test_drift_check(self):
+        """Test that drift is reported and corrected"""
+        self.server.balances["0"] = [dict(BALANCES[0], available="0.4", total="0.5")]
+
+        drift = self.ledger.check_drift()
+
+        self.assertEqual(
+            drift, {None: {"BTC": {"available": Decimal("-0.1"), "total": Decimal("-0.1")}}}
+        )
+        self.assertEqual(self.ledger.balance("BTC")["total"], Decimal("0.5"))
+        self.assertEqual(self.ledger.check_drift(), {})
+        self.assertEqual((self.ledger.drift_checks, self.ledger.drifts), (2, 1))
+
+    def test_drift_check_keeps_newer_local_state(self):
+        """Test that a currency changed while balances were fetched is not overwritten"""
+        ledger = self.ledger
+        route = self.server.get_balances
+
+        def get_balances(request):
+            response = route(request)
+            ledger.apply_transaction(transaction("t9", 9, "FIAT_DEPOSIT", credit=("ZAR", "5")))
+            return response
+
+        self.backend.routes[("GET", "/v1/account/balances")] = get_balances
+        self.ledger.check_drift()
+
+        self.assertEqual(self.ledger.available("ZAR"), Decimal("1005"))
+
+    def test_subaccounts(self):
+        """Test that balances are kept per account"""
+        ledger = BalanceLedger(self.client, subaccount_ids=[None, "7"])
+        ledger.seed()
+
+        self.assertEqual(ledger.available("BTC", "7"), 0)
+        self.assertEqual(ledger.available("ZAR", "7"), Decimal("1000"))
+        self.assertEqual(ledger.available("BTC"), Decimal("0.5"))
+
+    def test_concurrent_reads(self):
+        """Test that snapshots stay consistent while transactions are applied"""
+        stop = threading.Event()
+        totals = set()
+
+        def reader():
+            while not stop.is_set():
+                snapshot = self.ledger.snapshot()
+                totals.add(snapshot["ZAR"]["total"] - snapshot["ZAR"]["available"])
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for i in range(200):
+            self.ledger.apply_transaction(
+                transaction(f"d{i}", 5, "FIAT_DEPOSIT", credit=("ZAR", "1"))
+            )
+        stop.set()
+        thread.join()
+
+        self.assertEqual(totals, {Decimal("500")})
+        self.assertEqual(self.ledger.available("ZAR"), Decimal("1200"))
+
+    def test_background_loop(self):
+        """Test that the background loop syncs transactions"""
+        ledger = BalanceLedger(self.client, interval=0.01)
+        ledger.seed()
+        self.add(transaction("t2", 2, "FIAT_DEPOSIT", credit=("ZAR", "100")))
+
+        ledger.start()
+        deadline = time.monotonic() + 1
+        while ledger.available("ZAR") != Decimal("1100") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        ledger.stop()
+
+        self.assertEqual(ledger.available("ZAR"), Decimal("1100"))
+        self.assertEqual(ledger.failures, 0)
+
+    def test_background_loop_survives_errors(self):
+        """Test that a malformed transaction does not end the background loop"""
+        ledger = BalanceLedger(self.client, interval=0.01)
+        ledger.seed()
+        self.add(transaction("t2", 2, "FIAT_DEPOSIT", credit=("ZAR", "not a number")))
+
+        with self.assertLogs("valr_api.state.ledger", "ERROR"):
+            ledger.start()
+            deadline = time.monotonic() + 1
+            while ledger.failures < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.server.transactions["0"][0] = transaction(
+                "t2", 2, "FIAT_DEPOSIT", credit=("ZAR", "100")
+            )
+            while ledger.available("ZAR") != Decimal("1100") and time.monotonic() < deadline:
+                time.sleep(0.01)
+            alive = ledger._thread.is_alive()
+            ledger.stop()
+
+        self.assertTrue(alive)
+        self.assertGreaterEqual(ledger.failures, 1)
+        self.assertEqual(ledger.available("ZAR"), Decimal("1100"))
+
+    def test_async_client(self):
+        """Test seeding and syncing on the asyncio client"""
+        server = AccountServer()
+        client = AsyncValrClient(
+            api_key="key", api_secret="secret", backend=AsyncMockBackend(server.routes())
+        )
+        ledger = BalanceLedger(client)
+
+        async def run():
+            await ledger.seed_async()
+            server.transactions["0"].insert(
+                0, transaction("t2", 2, "FIAT_DEPOSIT", credit=("ZAR", "100"))
+            )
+            applied = await ledger.sync_transactions_async()
+            drift = await ledger.check_drift_async()
+            server.transactions["0"].insert(
+                0, transaction("t3", 3, "FIAT_DEPOSIT", credit=("ZAR", "50"))
+            )
+            server.balances["0"] = [dict(BALANCES[1], available="1050", total="1550")]
+            await ledger.check_drift_async()
+            return applied, drift, await ledger.sync_transactions_async()
+
+        applied, drift, reapplied = asyncio.run(run())
+
+        self.assertEqual(applied, 1)
+        self.assertEqual(drift[None]["ZAR"]["total"], Decimal("-100"))
+        # t3 is already in the balances adopted by the drift check
+        self.assertEqual(reapplied, 0)
+        self.assertEqual(ledger.available("ZAR"), Decimal("1050"))
+
+
+if __name__ == "__main__":
+    unittest.main()
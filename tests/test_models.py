@@ -0,0 +1,145 @@
+"""
+Unit tests for VALR API response models
+"""
+
+import sys
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from valr_api.client import ValrClient
+from valr_api.models import Balance, CurrencyPair, MarketSummary, Trade, Withdrawal
+from valr_api.transport import MockBackend
+
+TRADE = {
+    "price": "9999.0",
+    "quantity": "0.001",
+    "currencyPair": "BTCZAR",
+    "tradedAt": "2019-06-28T10:01:09.465Z",
+    "side": "buy",
+    "orderId": "123456",
+    "sequenceId": 42,
+    "id": "abc",
+    "unknownField": "kept",
+}
+
+
+class TestModels(unittest.TestCase):
+    """Test VALR API response models"""
+
+    def test_lazy_conversion(self):
+        """Test that fields are converted on first access and cached"""
+        trade = Trade(TRADE)
+
+        # Nothing is converted before access
+        self.assertEqual(Trade.__dict__["_price"].__get__(trade), "9999.0")
+
+        self.assertEqual(trade.price, Decimal("9999.0"))
+        self.assertIsInstance(trade.price, Decimal)
+        self.assertIs(trade.price, trade.price)
+        self.assertEqual(
+            trade.traded_at, datetime(2019, 6, 28, 10, 1, 9, 465000, tzinfo=timezone.utc)
+        )
+        self.assertEqual(trade.sequence_id, 42)
+        self.assertEqual(trade.side, "buy")
+        self.assertIsNone(trade.fee)
+
+    def test_dict_access(self):
+        """Test read access by API key, including undeclared keys"""
+        trade = Trade(TRADE)
+
+        self.assertEqual(trade["quantity"], Decimal("0.001"))
+        self.assertEqual(trade["unknownField"], "kept")
+        self.assertEqual(trade.get("fee", "0"), "0")
+        with self.assertRaises(KeyError):
+            trade["missing"]
+        self.assertEqual(set(trade.keys()), set(TRADE))
+        self.assertEqual(trade.to_dict()["price"], Decimal("9999.0"))
+
+    def test_slots(self):
+        """Test that models do not carry a per-instance dict"""
+        trade = Trade(TRADE)
+
+        self.assertFalse(hasattr(trade, "__dict__"))
+        self.assertLess(sys.getsizeof(trade), sys.getsizeof(dict(TRADE)))
+
+    def test_build(self):
+        """Test wrapping of lists, objects and envelopes"""
+        self.assertIsInstance(Trade.build(TRADE), Trade)
+        self.assertIsInstance(Trade.build([TRADE])[0], Trade)
+
+        envelope = Trade.build({"trades": [TRADE], "isLastPage": True}, "trades")
+        self.assertTrue(envelope["isLastPage"])
+        self.assertIsInstance(envelope["trades"][0], Trade)
+
+    def test_numbers_from_json(self):
+        """Test that JSON numbers convert to exact decimals"""
+        balance = Balance({"currency": "BTC", "available": 0.1, "total": 1})
+
+        self.assertEqual(balance.available, Decimal("0.1"))
+        self.assertEqual(balance.total, Decimal("1"))
+
+
+class TestClientModels(unittest.TestCase):
+    """Test model support on the client"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.backend = MockBackend(
+            {
+                ("GET", "/v1/account/balances"): (200, [{"currency": "BTC", "total": "0.5"}]),
+                ("GET", "/v1/account/BTCZAR/tradehistory"): (200, [TRADE]),
+                ("GET", "/v1/marketdata/BTCZAR/marketsummary"): (
+                    200,
+                    {"currencyPair": "BTCZAR", "askPrice": "10000.0"},
+                ),
+                ("GET", "/v1/public/pairs"): (
+                    200,
+                    [{"symbol": "BTCZAR", "minBaseAmount": "0.0001", "active": True}],
+                ),
+                ("POST", "/v1/wallet/crypto/BTC/withdraw"): (202, {"id": "1", "amount": "0.1"}),
+            }
+        )
+
+    def make_client(self, models):
+        """Create a client with or without models"""
+        return ValrClient(
+            api_key="test_api_key",
+            api_secret="test_api_secret",
+            backend=self.backend,
+            models=models,
+        )
+
+    def test_models_disabled_by_default(self):
+        """Test that plain dicts are returned unless models are enabled"""
+        client = self.make_client(models=False)
+
+        self.assertEqual(client.account.get_balances(), [{"currency": "BTC", "total": "0.5"}])
+
+    def test_models_enabled(self):
+        """Test that endpoint methods return models when enabled"""
+        client = self.make_client(models=True)
+
+        balance = client.account.get_balances()[0]
+        self.assertIsInstance(balance, Balance)
+        self.assertEqual(balance.total, Decimal("0.5"))
+
+        trade = client.account.get_trade_history("BTCZAR")[0]
+        self.assertIsInstance(trade, Trade)
+
+        summary = client.market_data.get_market_summary("BTCZAR")
+        self.assertIsInstance(summary, MarketSummary)
+        self.assertEqual(summary.ask_price, Decimal("10000.0"))
+
+        pair = client.public.get_currency_pairs()[0]
+        self.assertIsInstance(pair, CurrencyPair)
+        self.assertEqual(pair.min_base_amount, Decimal("0.0001"))
+        self.assertTrue(pair.active)
+
+        withdrawal = client.wallet.withdraw("BTC", "0.1", "address")
+        self.assertIsInstance(withdrawal, Withdrawal)
+        self.assertEqual(withdrawal.amount, Decimal("0.1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Unit tests for VALR API open-order tracking
+"""
+
+import asyncio
+import json
+import time
+import unittest
+from decimal import Decimal
+
+from valr_api.api import OrderIdGenerator, batch_cancel_order, batch_limit_order
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.state import OrderTracker
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+
+
+def open_order(order_id, pair="BTCZAR", side="buy", remaining="0.002", price="1000000"):
+    """Open-orders entry"""
+    return {
+        "orderId": order_id,
+        "customerOrderId": None,
+        "currencyPair": pair,
+        "side": side,
+        "price": price,
+        "originalQuantity": "0.002",
+        "remainingQuantity": remaining,
+        "status": "Placed",
+        "type": "limit",
+    }
+
+
+class OrderServer:
+    """Accept placements with sequential order IDs and serve a settable open-orders list"""
+
+    def __init__(self):
+        self.next_id = 0
+        self.open_orders = []
+
+    def place(self, request):
+        self.next_id += 1
+        return HttpResponse(202, json.dumps({"id": f"order-{self.next_id}"}).encode("utf-8"))
+
+    def batch(self, request):
+        outcomes = []
+        for entry in json.loads(request.body)["requests"]:
+            if entry["type"] == "CANCEL_ORDER":
+                outcomes.append({"accepted": True})
+            else:
+                self.next_id += 1
+                outcomes.append({"accepted": True, "orderId": f"order-{self.next_id}"})
+        return HttpResponse(200, json.dumps({"outcomes": outcomes}).encode("utf-8"))
+
+    def routes(self):
+        return {
+            ("POST", "/v1/orders/limit"): self.place,
+            ("POST", "/v1/batch/orders"): self.batch,
+            ("DELETE", "/v1/orders/order"): HttpResponse(200),
+            ("GET", "/v1/orders/open"): lambda request: HttpResponse(
+                200, json.dumps(self.open_orders).encode("utf-8")
+            ),
+            ("GET", "/v1/account/BTCZAR/tradehistory"): (
+                200,
+                {"trades": [{"id": "t1", "orderId": "order-1", "quantity": "0.001"}]},
+            ),
+        }
+
+
+class TestOrderTracker(unittest.TestCase):
+    """Test the open-order tracker"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.server = OrderServer()
+        self.backend = MockBackend(self.server.routes())
+        client = ValrClient(api_key="key", api_secret="secret", backend=self.backend)
+        client.orders.order_ids = OrderIdGenerator("desk")
+        self.tracker = OrderTracker(client)
+
+    def test_placement_is_indexed(self):
+        """Test that placed orders are found by every index without a request"""
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "1000000")
+        self.tracker.place_limit_order("BTCZAR", "SELL", "0.001", "1100000")
+        requests = len(self.backend.requests)
+
+        order = self.tracker.get(customer_order_id="desk-1")
+        self.assertEqual(order.order_id, "order-1")
+        self.assertIs(self.tracker.get("order-1"), order)
+        self.assertEqual(self.tracker.orders("BTCZAR", "BUY"), [order])
+        self.assertEqual(len(self.tracker.orders("BTCZAR")), 2)
+        self.assertEqual(
+            self.tracker.exposure("BTCZAR", "BUY"),
+            {"orders": 1, "quantity": Decimal("0.002"), "notional": Decimal("2000")},
+        )
+        self.assertEqual(self.tracker.exposure("ETHZAR", "BUY")["quantity"], 0)
+        self.assertEqual(len(self.backend.requests), requests)
+
+    def test_fills(self):
+        """Test that fills reduce and then close orders, counting each trade once"""
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "1000000")
+        fill = {
+            "type": "NEW_ACCOUNT_TRADE",
+            "data": {"id": "t1", "orderId": "order-1", "quantity": "0.0015"},
+        }
+
+        self.assertTrue(self.tracker.apply_message(fill))
+        self.assertFalse(self.tracker.apply_message(fill))
+        self.assertEqual(self.tracker.get("order-1").remaining, Decimal("0.0005"))
+        self.assertEqual(self.tracker.get("order-1").status, "Partially Filled")
+
+        self.tracker.apply_fill({"id": "t2", "orderId": "order-1", "quantity": "0.0005"})
+        self.assertIsNone(self.tracker.get("order-1"))
+        self.assertEqual(self.tracker.orders(), [])
+
+    def test_sync_fills(self):
+        """Test applying fills from the trade history"""
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "1000000")
+        self.assertEqual(self.tracker.sync_fills("BTCZAR"), 1)
+        self.assertEqual(self.tracker.sync_fills("BTCZAR"), 0)
+        self.assertEqual(self.tracker.get("order-1").remaining, Decimal("0.001"))
+
+    def test_status_updates_and_cancels(self):
+        """Test status updates from the account stream and cancel acknowledgements"""
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "1000000")
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "990000")
+
+        self.tracker.apply_message(
+            {
+                "type": "ORDER_STATUS_UPDATE",
+                "data": {
+                    "orderId": "order-9",
+                    "orderStatusType": "Placed",
+                    "currencyPair": "ETHZAR",
+                    "orderSide": "sell",
+                    "originalPrice": "50000",
+                    "originalQuantity": "1",
+                    "remainingQuantity": "1",
+                },
+            }
+        )
+        self.assertEqual(self.tracker.exposure("ETHZAR", "SELL")["notional"], Decimal("50000"))
+
+        self.tracker.apply_status({"orderId": "order-9", "orderStatusType": "Cancelled"})
+        self.assertIsNone(self.tracker.get("order-9"))
+
+        self.tracker.cancel_order("BTCZAR", customer_order_id="desk-2")
+        self.assertIsNone(self.tracker.get("order-2"))
+        self.assertEqual(self.backend.requests[-1].method, "DELETE")
+        self.assertEqual([order.order_id for order in self.tracker.orders()], ["order-1"])
+
+    def test_batch(self):
+        """Test that accepted batch placements are tracked and cancellations applied"""
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "1000000")
+
+        self.tracker.place_batch_orders(
+            [
+                batch_limit_order("BTCZAR", "SELL", "0.001", "1100000"),
+                batch_cancel_order("BTCZAR", order_id="order-1"),
+            ]
+        )
+
+        self.assertEqual([order.order_id for order in self.tracker.orders()], ["order-2"])
+        self.assertEqual(self.tracker.get("order-2").customer_order_id, "desk-2")
+
+    def test_reconcile(self):
+        """Test that reconciling adopts unknown orders and drops closed ones"""
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "1000000")
+        self.server.open_orders = [open_order("order-7", side="sell", remaining="0.001")]
+        self.tracker.orders()[0].updated -= 10
+
+        self.tracker.reconcile()
+
+        self.assertIsNone(self.tracker.get("order-1"))
+        self.assertEqual(self.tracker.exposure("BTCZAR", "SELL")["quantity"], Decimal("0.001"))
+        self.assertEqual(self.tracker.reconciles, 1)
+
+    def test_reconcile_keeps_newer_local_state(self):
+        """Test that changes made while the open orders were fetched are kept"""
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "1000000")
+        self.tracker.place_limit_order("BTCZAR", "BUY", "0.002", "990000")
+        snapshot = [open_order("order-1"), open_order("order-2")]
+        tracker = self.tracker
+
+        def fetch(request):
+            # Fill and cancel arrive after the server took its snapshot
+            tracker.apply_fill({"id": "t1", "orderId": "order-1", "quantity": "0.001"})
+            tracker.apply_cancel("order-2")
+            return HttpResponse(200, json.dumps(snapshot).encode("utf-8"))
+
+        self.backend.routes[("GET", "/v1/orders/open")] = fetch
+        self.tracker.reconcile()
+
+        self.assertEqual(self.tracker.get("order-1").remaining, Decimal("0.001"))
+        self.assertIsNone(self.tracker.get("order-2"))
+
+    def test_background_loop_survives_errors(self):
+        """Test that a malformed open-orders response does not end background reconciliation"""
+        self.tracker.reconcile_interval = 0.01
+        self.server.open_orders = [{"status": "Placed"}]
+
+        with self.assertLogs("valr_api.state.orders", "ERROR"):
+            self.tracker.start()
+            deadline = time.monotonic() + 1
+            while self.tracker.failures < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.server.open_orders = [open_order("order-5")]
+            while self.tracker.get("order-5") is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            alive = self.tracker._thread.is_alive()
+            self.tracker.stop()
+
+        self.assertTrue(alive)
+        self.assertGreaterEqual(self.tracker.failures, 1)
+        self.assertIsNotNone(self.tracker.get("order-5"))
+
+    def test_async_client(self):
+        """Test placement and reconciliation on the asyncio client"""
+        server = OrderServer()
+        server.open_orders = [open_order("order-5")]
+        client = AsyncValrClient(
+            api_key="key", api_secret="secret", backend=AsyncMockBackend(server.routes())
+        )
+        tracker = OrderTracker(client, reconcile_interval=60)
+
+        async def run():
+            await tracker.aplace_limit_order("BTCZAR", "SELL", "0.001", "1100000")
+            tracker.start_async()
+            await asyncio.sleep(0.01)
+            tracker.stop()
+
+        asyncio.run(run())
+
+        self.assertEqual(tracker.reconciles, 1)
+        self.assertEqual(
+            sorted(order.order_id for order in tracker.orders("BTCZAR")), ["order-1", "order-5"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
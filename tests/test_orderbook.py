@@ -0,0 +1,117 @@
+"""
+Unit tests for VALR API array-backed orderbook
+"""
+
+import unittest
+from array import array
+
+from valr_api.client import ValrClient
+from valr_api.models import OrderBook
+from valr_api.models.orderbook import np
+from valr_api.transport import MockBackend
+
+ORDERBOOK = {
+    "Asks": [
+        {"side": "sell", "quantity": "1.0", "price": "101", "currencyPair": "BTCZAR"},
+        {"side": "sell", "quantity": "2.0", "price": "102", "currencyPair": "BTCZAR"},
+        {"side": "sell", "quantity": "3.0", "price": "103", "currencyPair": "BTCZAR"},
+    ],
+    "Bids": [
+        {"side": "buy", "quantity": "0.5", "price": "99", "currencyPair": "BTCZAR"},
+        {"side": "buy", "quantity": "1.5", "price": "98", "currencyPair": "BTCZAR"},
+    ],
+    "LastChange": 1000,
+}
+
+
+class OrderBookTests:
+    """Analytics checks shared by the array and NumPy storage"""
+
+    use_numpy = False
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.book = OrderBook.from_dict(ORDERBOOK, use_numpy=self.use_numpy)
+
+    def test_top_of_book(self):
+        """Test best bid/ask, spread and mid"""
+        self.assertEqual(self.book.currency_pair, "BTCZAR")
+        self.assertEqual(self.book.last_change, 1000)
+        self.assertEqual(self.book.best_bid, 99.0)
+        self.assertEqual(self.book.best_ask, 101.0)
+        self.assertEqual(self.book.spread, 2.0)
+        self.assertEqual(self.book.mid, 100.0)
+
+    def test_depth(self):
+        """Test total and cumulative depth"""
+        self.assertEqual(self.book.depth("BUY"), 6.0)
+        self.assertEqual(self.book.depth("BUY", levels=2), 3.0)
+        self.assertEqual(self.book.depth("SELL", levels=1), 0.5)
+        self.assertEqual(list(self.book.cumulative_depth("BUY")), [1.0, 3.0, 6.0])
+
+    def test_vwap_and_slippage(self):
+        """Test fill price estimates"""
+        self.assertEqual(self.book.vwap("BUY", 1.0), 101.0)
+        self.assertAlmostEqual(self.book.vwap("BUY", 2.0), 101.5)
+        self.assertAlmostEqual(self.book.vwap("SELL", 1.0), 98.5)
+        self.assertIsNone(self.book.vwap("BUY", 10.0))
+
+        self.assertAlmostEqual(self.book.slippage("BUY", 2.0), 0.5 / 101)
+        self.assertAlmostEqual(self.book.slippage("SELL", 1.0), 0.5 / 99)
+        self.assertEqual(self.book.slippage("BUY", 1.0), 0.0)
+
+    def test_invalid_arguments(self):
+        """Test argument validation"""
+        with self.assertRaises(ValueError):
+            self.book.vwap("HOLD", 1.0)
+        with self.assertRaises(ValueError):
+            self.book.vwap("BUY", 0)
+
+    def test_empty_book(self):
+        """Test an empty book"""
+        book = OrderBook.from_dict({"Asks": [], "Bids": []}, use_numpy=self.use_numpy)
+
+        self.assertIsNone(book.best_bid)
+        self.assertIsNone(book.mid)
+        self.assertEqual(book.depth("BUY"), 0.0)
+        self.assertIsNone(book.vwap("SELL", 1.0))
+
+
+class TestArrayOrderBook(OrderBookTests, unittest.TestCase):
+    """Test the array module storage"""
+
+    def test_storage(self):
+        """Test that levels are stored in contiguous double arrays"""
+        self.assertIsInstance(self.book.ask_prices, array)
+        self.assertEqual(self.book.ask_prices.typecode, "d")
+        self.assertEqual(list(self.book.to_levels("bids")), [(99.0, 0.5), (98.0, 1.5)])
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestNumpyOrderBook(OrderBookTests, unittest.TestCase):
+    """Test the NumPy storage"""
+
+    use_numpy = True
+
+    def test_storage(self):
+        """Test that levels are stored in float64 arrays"""
+        self.assertEqual(self.book.bid_quantities.dtype, np.float64)
+
+
+class TestClientOrderBook(unittest.TestCase):
+    """Test orderbook models on the client"""
+
+    def test_models_enabled(self):
+        """Test that get_orderbook returns an OrderBook when models are enabled"""
+        backend = MockBackend({("GET", "/v1/marketdata/BTCZAR/orderbook"): (200, ORDERBOOK)})
+
+        book = ValrClient(backend=backend, models=True).market_data.get_orderbook("BTCZAR")
+        self.assertIsInstance(book, OrderBook)
+        self.assertEqual(book.best_ask, 101.0)
+
+        raw = ValrClient(backend=backend).market_data.get_orderbook_full("BTCZAR")
+        self.assertEqual(raw, ORDERBOOK)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Unit tests for VALR API local orderbook engine
+"""
+
+import json
+import os
+import random
+import threading
+import unittest
+
+from valr_api.client import ValrClient
+from valr_api.exceptions import ValrSequenceGapError
+from valr_api.state import LocalOrderBook, OrderBookEngine
+from valr_api.transport import HttpResponse, MockBackend
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "orderbook_btczar.json")
+
+
+def load_fixture():
+    """Load the recorded BTCZAR orderbook snapshot and updates"""
+    with open(FIXTURE, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+class TestLocalOrderBook(unittest.TestCase):
+    """Test VALR API local orderbook"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.fixture = load_fixture()
+        self.book = LocalOrderBook("BTCZAR")
+        self.book.load_snapshot(self.fixture["snapshot"])
+
+    def test_snapshot_aggregates_levels(self):
+        """Test that orders at the same price are summed"""
+        self.assertEqual(self.book.best_bid, (999900.0, 0.8))
+        self.assertEqual(self.book.best_ask, (1000100.0, 0.5))
+        self.assertEqual(self.book.asks()[1], (1000200.0, 1.5))
+        self.assertEqual(len(self.book), 6)
+
+    def test_recorded_updates(self):
+        """Test replaying recorded updates, including a stale duplicate"""
+        applied = [self.book.apply(update) for update in self.fixture["updates"]]
+
+        self.assertEqual(applied, [True, False, True, True])
+        expected = self.fixture["expected"]
+        self.assertEqual(self.book.last_change, expected["LastChange"])
+        self.assertEqual(self.book.asks(), [tuple(level) for level in expected["Asks"]])
+        self.assertEqual(self.book.bids(), [tuple(level) for level in expected["Bids"]])
+
+    def test_gap_detection(self):
+        """Test that an update skipping a change raises"""
+        with self.assertRaises(ValrSequenceGapError):
+            self.book.apply(self.fixture["gap_update"])
+
+    def test_contiguous_sequences(self):
+        """Test gap detection for feeds with contiguous sequence numbers"""
+        book = LocalOrderBook("BTCZAR", contiguous=True)
+        book.load_snapshot({"Asks": [], "Bids": [], "LastChange": 10})
+
+        self.assertTrue(book.apply({"LastChange": 11, "Bids": [{"price": "1", "quantity": "1"}]}))
+        with self.assertRaises(ValrSequenceGapError):
+            book.apply({"LastChange": 13})
+
+    def test_snapshot_and_depth(self):
+        """Test conversion to an array-backed OrderBook"""
+        snapshot = self.book.snapshot(depth=2)
+
+        self.assertEqual(list(snapshot.bid_prices), [999900.0, 999800.0])
+        self.assertEqual(list(snapshot.ask_prices), [1000100.0, 1000200.0])
+        self.assertEqual(snapshot.last_change, 100)
+        self.assertEqual(snapshot.spread, 200.0)
+
+    def test_matches_reference_under_random_updates(self):
+        """Test ordering invariants against a naive reference implementation"""
+        rng = random.Random(7)
+        book = LocalOrderBook("BTCZAR")
+        reference = {"Bids": {}, "Asks": {}}
+
+        for change in range(1, 2000):
+            side = rng.choice(["Bids", "Asks"])
+            price = float(rng.randrange(100, 200))
+            quantity = rng.choice([0.0, 0.0, 1.0, 2.5])
+            book.apply({"LastChange": change, side: [{"price": price, "quantity": quantity}]})
+            if quantity:
+                reference[side][price] = quantity
+            else:
+                reference[side].pop(price, None)
+
+        self.assertEqual(book.bids(), sorted(reference["Bids"].items(), reverse=True))
+        self.assertEqual(book.asks(), sorted(reference["Asks"].items()))
+
+
+class TestOrderBookEngine(unittest.TestCase):
+    """Test VALR API orderbook engine"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.fixture = load_fixture()
+        self.snapshots = [self.fixture["snapshot"], self.fixture["resync_snapshot"]]
+        self.backend = MockBackend(
+            {("GET", "/v1/marketdata/BTCZAR/orderbook"): lambda request: self.next_snapshot()}
+        )
+        self.engine = OrderBookEngine(ValrClient(backend=self.backend))
+
+    def next_snapshot(self):
+        """Serve the recorded snapshots in order"""
+        return HttpResponse(200, json.dumps(self.snapshots.pop(0)).encode("utf-8"))
+
+    def test_seeds_from_snapshot(self):
+        """Test that a book is seeded from REST on first use"""
+        for update in self.fixture["updates"]:
+            self.engine.apply("BTCZAR", update)
+
+        self.assertEqual(self.engine.book("BTCZAR").last_change, 103)
+        self.assertEqual(len(self.backend.requests), 1)
+        self.assertEqual(self.engine.pairs(), ["BTCZAR"])
+
+    def test_models_client(self):
+        """Test seeding from a client that returns OrderBook models"""
+        engine = OrderBookEngine(ValrClient(backend=self.backend, models=True))
+
+        book = engine.book("BTCZAR")
+
+        self.assertEqual(book.best_bid, (999900.0, 0.8))
+        self.assertEqual(book.asks()[1], (1000200.0, 1.5))
+        self.assertEqual(book.last_change, self.fixture["snapshot"]["LastChange"])
+
+    def test_snapshots_fetched_concurrently(self):
+        """Test that a slow snapshot of one pair does not hold up another pair"""
+        release = threading.Event()
+        snapshot = self.fixture["snapshot"]
+
+        def source(pair):
+            if pair == "ETHZAR":
+                release.wait(5)
+            return snapshot
+
+        engine = OrderBookEngine(snapshot_source=source)
+        slow = threading.Thread(target=engine.book, args=("ETHZAR",))
+        slow.start()
+        try:
+            self.assertEqual(engine.book("BTCZAR").last_change, snapshot["LastChange"])
+            self.assertEqual(engine.pairs(), ["BTCZAR"])
+        finally:
+            release.set()
+            slow.join()
+        self.assertEqual(sorted(engine.pairs()), ["BTCZAR", "ETHZAR"])
+
+    def test_resync_on_gap(self):
+        """Test that a gap triggers a resync and the update is applied on top"""
+        self.engine.book("BTCZAR")
+
+        self.assertTrue(self.engine.apply("BTCZAR", self.fixture["gap_update"]))
+
+        book = self.engine.book("BTCZAR")
+        self.assertEqual(self.engine.resyncs, 1)
+        self.assertEqual(book.last_change, 106)
+        self.assertEqual(book.best_bid, (999990.0, 0.1))
+        self.assertEqual(book.best_ask, (1000300.0, 1.0))
+
+    def test_resync_unseeded_pair(self):
+        """Test that resyncing a pair without a book fetches a single snapshot"""
+        book = self.engine.resync("BTCZAR")
+
+        self.assertEqual(len(self.backend.requests), 1)
+        self.assertEqual(book.last_change, self.fixture["snapshot"]["LastChange"])
+        self.assertIs(self.engine.book("BTCZAR"), book)
+        self.assertEqual(self.engine.resyncs, 1)
+
+    def test_requires_snapshot_source(self):
+        """Test constructor validation"""
+        with self.assertRaises(ValueError):
+            OrderBookEngine()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+"""
+Unit tests for VALR API order endpoints
+"""
+
+import asyncio
+import json
+import threading
+import unittest
+
+from valr_api.api import (
+    OrderIdGenerator,
+    batch_cancel_order,
+    batch_limit_order,
+    batch_market_order,
+    batch_stop_limit_order,
+)
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.models import Order
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+from valr_api.utils.ratelimit import RateLimiter
+
+ORDER = {
+    "orderId": "order-1",
+    "customerOrderId": "desk-1",
+    "currencyPair": "BTCZAR",
+    "side": "buy",
+    "type": "limit",
+    "status": "Placed",
+    "price": "1000000",
+    "originalQuantity": "0.001",
+}
+
+
+def batch_outcomes(request):
+    """Accept every request of a batch, without echoing customer order IDs"""
+    entries = json.loads(request.body)["requests"]
+    outcomes = [{"accepted": True, "orderId": f"order-{i}"} for i in range(len(entries))]
+    return HttpResponse(200, json.dumps({"batchId": 7, "outcomes": outcomes}).encode("utf-8"))
+
+
+class TestOrderIdGenerator(unittest.TestCase):
+    """Test customer order ID generation"""
+
+    def test_unique_ids(self):
+        """Test that IDs from several threads and generators never collide"""
+        first, second = OrderIdGenerator(), OrderIdGenerator()
+        ids = []
+
+        def worker():
+            ids.extend(first() for _ in range(1000))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids.append(second())
+
+        self.assertEqual(len(set(ids)), 4001)
+        self.assertNotEqual(first.prefix, second.prefix)
+        self.assertTrue(all(len(id_) <= 50 for id_ in ids))
+
+    def test_prefix(self):
+        """Test fixed prefixes and their validation"""
+        self.assertEqual(OrderIdGenerator("desk-a")(), "desk-a-1")
+        with self.assertRaises(ValueError):
+            OrderIdGenerator("desk a")
+
+
+class TestOrdersAPI(unittest.TestCase):
+    """Test the order endpoints"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.backend = MockBackend(
+            {
+                ("POST", "/v1/orders/limit"): (202, {"id": "order-1"}),
+                ("POST", "/v1/orders/market"): (202, {"id": "order-2"}),
+                ("POST", "/v1/orders/stop/limit"): (202, {"id": "order-3"}),
+                ("POST", "/v1/batch/orders"): batch_outcomes,
+                ("DELETE", "/v1/orders/order"): HttpResponse(200),
+                ("DELETE", "/v1/orders"): (200, [{"orderId": "order-1"}]),
+                ("DELETE", "/v1/orders/BTCZAR"): (200, []),
+                ("GET", "/v1/orders/BTCZAR/orderid/order-1"): (200, ORDER),
+                ("GET", "/v1/orders/BTCZAR/customerorderid/desk-1"): (200, ORDER),
+                ("GET", "/v1/orders/open"): (200, [ORDER]),
+            }
+        )
+        self.client = ValrClient(api_key="key", api_secret="secret", backend=self.backend)
+        self.client.orders.order_ids = OrderIdGenerator("desk")
+
+    def body(self, index=-1):
+        """Decoded body of a recorded request"""
+        return json.loads(self.backend.requests[index].body)
+
+    def test_limit_order(self):
+        """Test that a limit order gets a generated customer order ID"""
+        response = self.client.orders.place_limit_order(
+            "BTCZAR", "buy", "0.001", 1000000, post_only=True, time_in_force="GTC"
+        )
+
+        self.assertEqual(response, {"id": "order-1", "customerOrderId": "desk-1"})
+        self.assertEqual(
+            self.body(),
+            {
+                "pair": "BTCZAR",
+                "side": "BUY",
+                "quantity": "0.001",
+                "price": "1000000",
+                "postOnly": True,
+                "timeInForce": "GTC",
+                "customerOrderId": "desk-1",
+            },
+        )
+        self.assertIn("X-VALR-SIGNATURE", self.backend.requests[0].headers)
+
+    def test_market_and_stop_limit_orders(self):
+        """Test market and stop-limit placements, with a given customer order ID"""
+        self.client.orders.place_market_order("BTCZAR", "SELL", quote_amount="100")
+        self.assertEqual(self.body()["quoteAmount"], "100")
+        self.assertNotIn("baseAmount", self.body())
+
+        response = self.client.orders.place_stop_limit_order(
+            "BTCZAR",
+            "SELL",
+            "0.001",
+            "900000",
+            stop_price="910000",
+            type="TAKE_PROFIT_LIMIT",
+            customer_order_id="mine",
+        )
+        self.assertEqual(response["customerOrderId"], "mine")
+        self.assertEqual(self.body()["stopPrice"], "910000")
+        self.assertEqual(self.body()["type"], "TAKE_PROFIT_LIMIT")
+
+        with self.assertRaises(ValueError):
+            self.client.orders.place_market_order("BTCZAR", "SELL")
+
+    def test_batch_orders(self):
+        """Test that a batch goes out as one request and outcomes get customer order IDs"""
+        requests = [
+            batch_limit_order("BTCZAR", "BUY", "0.001", "990000"),
+            batch_market_order("BTCZAR", "BUY", base_amount="0.001", customer_order_id="m"),
+            batch_stop_limit_order("BTCZAR", "SELL", "0.001", "900000", "910000"),
+            batch_cancel_order("BTCZAR", order_id="order-0"),
+        ]
+
+        response = self.client.orders.place_batch_orders(requests)
+
+        self.assertEqual(len(self.backend.requests), 1)
+        entries = self.body()["requests"]
+        self.assertEqual(
+            [entry["type"] for entry in entries],
+            ["PLACE_LIMIT", "PLACE_MARKET", "PLACE_STOP_LIMIT", "CANCEL_ORDER"],
+        )
+        self.assertEqual(
+            [outcome.get("customerOrderId") for outcome in response["outcomes"]],
+            ["desk-1", "m", "desk-2", None],
+        )
+        self.assertNotIn("customerOrderId", requests[0]["data"])
+
+    def test_batch_size(self):
+        """Test that empty and oversized batches are refused before sending"""
+        entry = batch_limit_order("BTCZAR", "BUY", "0.001", "990000")
+        for requests in ([], [entry] * 21):
+            with self.assertRaises(ValueError):
+                self.client.orders.place_batch_orders(requests)
+        self.assertEqual(self.backend.requests, [])
+
+    def test_cancel(self):
+        """Test cancelling one order and all orders"""
+        self.client.orders.cancel_order("BTCZAR", customer_order_id="desk-1")
+        self.assertEqual(self.body(), {"customerOrderId": "desk-1", "pair": "BTCZAR"})
+        self.assertEqual(self.backend.requests[-1].method, "DELETE")
+
+        self.assertEqual(self.client.orders.cancel_all_orders(), [{"orderId": "order-1"}])
+        self.client.orders.cancel_all_orders("BTCZAR")
+        self.assertEqual(self.backend.requests[-1].path, "/v1/orders/BTCZAR")
+
+        with self.assertRaises(ValueError):
+            self.client.orders.cancel_order("BTCZAR", order_id="a", customer_order_id="b")
+
+    def test_status(self):
+        """Test order status by either ID and open orders as models"""
+        self.client.models = True
+
+        by_id = self.client.orders.get_order_status("BTCZAR", order_id="order-1")
+        by_customer_id = self.client.orders.get_order_status("BTCZAR", customer_order_id="desk-1")
+        open_orders = self.client.orders.get_open_orders()
+
+        self.assertIsInstance(by_id, Order)
+        self.assertEqual(by_customer_id.order_id, "order-1")
+        self.assertEqual(open_orders[0].customer_order_id, "desk-1")
+
+    def test_rate_limit_group(self):
+        """Test that order endpoints draw from the orders budget"""
+        self.assertEqual(RateLimiter.group_for("/v1/orders/limit"), "orders")
+        self.assertEqual(RateLimiter.group_for("/v1/orders"), "orders")
+        self.assertEqual(RateLimiter.group_for("/v1/batch/orders"), "orders")
+
+    def test_async_client(self):
+        """Test placement and cancellation on the asyncio client"""
+        backend = AsyncMockBackend(self.backend.routes)
+        client = AsyncValrClient(api_key="key", api_secret="secret", backend=backend)
+
+        async def run():
+            order = await client.orders.aplace_limit_order("BTCZAR", "BUY", "0.001", "990000")
+            batch = await client.orders.aplace_batch_orders(
+                [batch_limit_order("BTCZAR", "BUY", "0.001", "980000")]
+            )
+            await client.orders.cancel_order("BTCZAR", order_id=order["id"])
+            return order, batch
+
+        order, batch = asyncio.run(run())
+
+        prefix = client.orders.order_ids.prefix
+        self.assertEqual(order["customerOrderId"], prefix + "-1")
+        self.assertEqual(batch["outcomes"][0]["customerOrderId"], prefix + "-2")
+        self.assertEqual(len(backend.requests), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Unit tests for VALR API paginated history iterators
+"""
+
+import asyncio
+import json
+import unittest
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+from valr_api.utils.pagination import AsyncPaginator, Paginator, split_page
+
+TRADES = [{"id": str(i), "price": "100", "quantity": "1"} for i in range(25)]
+
+
+def trade_pages(request):
+    """Serve TRADES in skip/limit pages with an isLastPage flag"""
+    skip, limit = request.params["skip"], request.params["limit"]
+    page = TRADES[skip : skip + limit]
+    body = {"trades": page, "isLastPage": skip + limit >= len(TRADES)}
+    return HttpResponse(200, json.dumps(body).encode("utf-8"))
+
+
+def transaction_pages(request):
+    """Serve TRADES as a plain list, ending with a short page"""
+    skip, limit = request.params["skip"], request.params["limit"]
+    return HttpResponse(200, json.dumps(TRADES[skip : skip + limit]).encode("utf-8"))
+
+
+def deposit_pages(request):
+    """Serve TRADES as deposits in skip/limit pages"""
+    skip, limit = request.params["skip"], request.params["limit"]
+    body = {"deposits": TRADES[skip : skip + limit], "isLastPage": skip + limit >= len(TRADES)}
+    return HttpResponse(200, json.dumps(body).encode("utf-8"))
+
+
+class TestSplitPage(unittest.TestCase):
+    """Test page splitting"""
+
+    def test_envelope(self):
+        """Test that the isLastPage flag ends the history"""
+        self.assertEqual(
+            split_page({"trades": [1, 2], "isLastPage": False}, "trades", 2), ([1, 2], False)
+        )
+        self.assertEqual(
+            split_page({"trades": [1, 2], "isLastPage": True}, "trades", 2), ([1, 2], True)
+        )
+
+    def test_short_page(self):
+        """Test that a page shorter than the limit ends the history"""
+        self.assertEqual(split_page([1], None, 2), ([1], True))
+        self.assertEqual(split_page({"trades": []}, "trades", 2), ([], True))
+
+
+class TestPaginator(unittest.TestCase):
+    """Test the synchronous iterators"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.backend = MockBackend(
+            {
+                ("GET", "/v1/account/BTCZAR/tradehistory"): trade_pages,
+                ("GET", "/v1/account/transactionhistory"): transaction_pages,
+            }
+        )
+        self.client = ValrClient(api_key="key", api_secret="secret", backend=self.backend)
+
+    def test_iterates_all_pages(self):
+        """Test that every record is yielded once, in order"""
+        trades = self.client.account.iter_trade_history("BTCZAR", limit=10)
+
+        self.assertEqual([trade["id"] for trade in trades], [t["id"] for t in TRADES])
+        self.assertEqual(trades.pages, 3)
+        self.assertEqual(trades.position, 25)
+        self.assertEqual([r.params["skip"] for r in self.backend.requests], [0, 10, 20])
+
+    def test_stops_on_short_page(self):
+        """Test that list endpoints stop after a short page"""
+        transactions = self.client.account.iter_transaction_history(limit=10, prefetch=False)
+
+        self.assertEqual(len(list(transactions)), 25)
+        self.assertEqual(len(self.backend.requests), 3)
+
+    def test_resume_from_position(self):
+        """Test that a saved position resumes where iteration stopped"""
+        trades = self.client.account.iter_trade_history("BTCZAR", limit=10)
+        seen = []
+        for trade in trades:
+            seen.append(trade["id"])
+            if len(seen) == 13:
+                break
+
+        resumed = self.client.account.iter_trade_history("BTCZAR", limit=10, skip=trades.position)
+        seen.extend(trade["id"] for trade in resumed)
+
+        self.assertEqual(seen, [t["id"] for t in TRADES])
+
+    def test_without_prefetch(self):
+        """Test that pages are requested lazily without prefetch"""
+        trades = iter(self.client.account.iter_trade_history("BTCZAR", limit=10, prefetch=False))
+        next(trades)
+
+        self.assertEqual(len(self.backend.requests), 1)
+
+    def test_invalid_limit(self):
+        """Test that the page size must be positive"""
+        with self.assertRaises(ValueError):
+            Paginator(lambda skip, limit: [], limit=0)
+
+
+class TestAsyncPaginator(unittest.TestCase):
+    """Test the asynchronous iterators"""
+
+    def test_async_client(self):
+        """Test that the async client pages through the history"""
+        backend = AsyncMockBackend({("GET", "/v1/wallet/crypto/deposit/history"): deposit_pages})
+        client = AsyncValrClient(api_key="key", api_secret="secret", backend=backend)
+
+        async def run():
+            deposits = client.wallet.aiter_deposit_history(limit=10)
+            self.assertIsInstance(deposits, AsyncPaginator)
+            return [deposit["id"] async for deposit in deposits], deposits.position
+
+        ids, position = asyncio.run(run())
+
+        self.assertEqual(ids, [t["id"] for t in TRADES])
+        self.assertEqual(position, 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
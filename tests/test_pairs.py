@@ -0,0 +1,149 @@
+"""
+Unit tests for VALR API currency-pair registry
+"""
+
+import unittest
+from decimal import ROUND_HALF_UP, Decimal
+
+from valr_api.client import ValrClient
+from valr_api.exceptions import ValrValidationError
+from valr_api.state import PairInfo, PairRegistry
+from valr_api.transport import MockBackend
+
+PAIRS = [
+    {
+        "symbol": "BTCZAR",
+        "baseCurrency": "BTC",
+        "quoteCurrency": "ZAR",
+        "active": True,
+        "minBaseAmount": "0.0001",
+        "maxBaseAmount": "2",
+        "minQuoteAmount": "10",
+        "maxQuoteAmount": "5000000",
+        "tickSize": "1",
+        "baseDecimalPlaces": "8",
+    },
+    {
+        "symbol": "ETHZAR",
+        "baseCurrency": "ETH",
+        "quoteCurrency": "ZAR",
+        "active": True,
+        "minBaseAmount": "0.001",
+        "maxBaseAmount": "100",
+        "minQuoteAmount": "10",
+        "maxQuoteAmount": "5000000",
+        "tickSize": "0.5",
+        "baseDecimalPlaces": "6",
+    },
+    {
+        "symbol": "BTCUSDC",
+        "baseCurrency": "BTC",
+        "quoteCurrency": "USDC",
+        "active": False,
+        "minBaseAmount": "0.0001",
+        "tickSize": "0.01",
+        "baseDecimalPlaces": "8",
+    },
+]
+
+ORDER_TYPES = [
+    {"currencyPair": "BTCZAR", "orderTypes": ["PLACE_LIMIT", "PLACE_MARKET", "PLACE_STOP_LIMIT"]},
+    {"currencyPair": "ETHZAR", "orderTypes": ["PLACE_LIMIT"]},
+]
+
+
+class TestPairRegistry(unittest.TestCase):
+    """Test VALR API currency-pair registry"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.registry = PairRegistry()
+        self.registry.load(PAIRS, ORDER_TYPES)
+
+    def test_indexes(self):
+        """Test lookups by symbol, base and quote currency"""
+        btczar = self.registry["BTCZAR"]
+
+        self.assertEqual(btczar.min_base_amount, Decimal("0.0001"))
+        self.assertEqual(btczar.step_size, Decimal("1E-8"))
+        self.assertEqual({p.symbol for p in self.registry.by_base("BTC")}, {"BTCZAR", "BTCUSDC"})
+        self.assertEqual({p.symbol for p in self.registry.by_quote("ZAR")}, {"BTCZAR", "ETHZAR"})
+        self.assertIn("ETHZAR", self.registry)
+        self.assertIsNone(self.registry.get("XRPZAR"))
+        with self.assertRaises(ValrValidationError):
+            self.registry["XRPZAR"]
+
+    def test_validate(self):
+        """Test that valid orders pass and every broken rule is reported"""
+        self.assertIs(self.registry.validate("BTCZAR", "0.001", "1000000"), self.registry["BTCZAR"])
+        self.registry.validate("BTCZAR", Decimal("0.5"), order_type="PLACE_MARKET")
+
+        cases = [
+            ("BTCZAR", "0.00001", "1000000", "LIMIT", "below the minimum"),
+            ("BTCZAR", "3", "1000000", "LIMIT", "above the maximum"),
+            ("BTCZAR", "0.000000001", "1000000", "LIMIT", "multiple of 1E-8"),
+            ("BTCZAR", "0.001", "1000000.5", "LIMIT", "multiple of 1"),
+            ("BTCZAR", "0.0001", "50000", "LIMIT", "total"),
+            ("ETHZAR", "1", None, "MARKET", "MARKET orders are not supported"),
+            ("BTCUSDC", "1", "100", "LIMIT", "not active"),
+        ]
+        for pair, quantity, price, order_type, message in cases:
+            with self.assertRaises(ValrValidationError) as context:
+                self.registry.validate(pair, quantity, price, order_type)
+            self.assertIn(message, str(context.exception))
+
+    def test_quantize(self):
+        """Test rounding to step and tick sizes"""
+        quantity, price = self.registry.quantize("ETHZAR", "1.23456789", "20000.74")
+
+        self.assertEqual(quantity, Decimal("1.234567"))
+        self.assertEqual(price, Decimal("20000.5"))
+        btczar = self.registry["BTCZAR"]
+        self.assertEqual(btczar.quantize_price("1000000.6"), Decimal("1000000"))
+        self.assertEqual(btczar.quantize_price("1000000.6", ROUND_HALF_UP), Decimal("1000001"))
+        self.assertEqual(self.registry["BTCUSDC"].quantize_price(0.129), Decimal("0.12"))
+
+    def test_quantize_unnormalised_ticks(self):
+        """Test ticks of 10 and 0.10, whose written exponent is not the quantum"""
+        for tick, expected in (("10", Decimal("1000000")), ("0.10", Decimal("1000005.3"))):
+            with self.subTest(tick=tick):
+                info = PairInfo(dict(PAIRS[0], tickSize=tick))
+                price = info.quantize_price("1000005.37")
+                self.assertEqual(price, expected)
+                self.assertEqual(info.problems("0.001", price), [])
+
+    def test_incremental_refresh(self):
+        """Test that only changed pairs are rebuilt and delisted pairs are dropped"""
+        btczar = self.registry["BTCZAR"]
+        updated = [dict(PAIRS[1], tickSize="1"), {"symbol": "XRPZAR", "baseCurrency": "XRP"}]
+
+        added, changed, removed = self.registry.load([PAIRS[0]] + updated, ORDER_TYPES)
+
+        self.assertEqual((added, changed, removed), (["XRPZAR"], ["ETHZAR"], ["BTCUSDC"]))
+        self.assertIs(self.registry["BTCZAR"], btczar)
+        self.assertEqual(self.registry["ETHZAR"].tick_size, Decimal("1"))
+        self.assertEqual([p.symbol for p in self.registry.by_base("BTC")], ["BTCZAR"])
+        self.assertEqual(self.registry.by_quote("USDC"), [])
+
+    def test_refresh_from_client(self):
+        """Test building the registry from the public endpoints"""
+        backend = MockBackend(
+            {
+                ("GET", "/v1/public/pairs"): (200, PAIRS),
+                ("GET", "/v1/public/orderTypes"): (
+                    200,
+                    [{"orderType": "LIMIT", "supportedCurrencyPairs": ["BTCZAR", "ETHZAR"]}],
+                ),
+            }
+        )
+        registry = PairRegistry(ValrClient(backend=backend, models=True), max_age=60)
+
+        self.assertTrue(registry.refresh_if_stale())
+        self.assertFalse(registry.refresh_if_stale())
+        self.assertEqual(len(registry), 3)
+        self.assertEqual(registry["BTCZAR"].order_types, frozenset({"LIMIT"}))
+        self.assertEqual(len(backend.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
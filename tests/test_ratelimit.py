@@ -0,0 +1,129 @@
+"""
+Unit tests for VALR API client-side rate limiting
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.transport import AsyncMockBackend, MockBackend
+from valr_api.utils.ratelimit import RateLimiter, TokenBucket, get_default_rate_limiter
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test the token bucket"""
+
+    def test_burst_then_queue(self):
+        """Test that a burst is free and later reservations queue up"""
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_refill(self):
+        """Test that tokens refill over time up to capacity"""
+        bucket = TokenBucket(rate=1000, capacity=1)
+        bucket.reserve()
+        time.sleep(0.01)
+
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_invalid_rate(self):
+        """Test rate validation"""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test the rate limiter"""
+
+    def test_groups(self):
+        """Test endpoint classification"""
+        self.assertEqual(RateLimiter.group_for("/v1/marketdata/BTCZAR/orderbook"), "public")
+        self.assertEqual(RateLimiter.group_for("/v1/public/status"), "public")
+        self.assertEqual(RateLimiter.group_for("/v1/account/balances"), "account")
+        self.assertEqual(RateLimiter.group_for("/v1/wallet/crypto/BTC/withdraw"), "wallet")
+        self.assertIsNone(RateLimiter.group_for("/v1/unknown"))
+
+    def test_group_budgets_are_independent(self):
+        """Test that exhausting one group does not delay another"""
+        limiter = RateLimiter(global_limit=None, groups={"public": (10, 1), "account": (10, 1)})
+
+        self.assertEqual(limiter.reserve("/v1/public/status"), 0.0)
+        self.assertGreater(limiter.reserve("/v1/public/status"), 0.0)
+        self.assertEqual(limiter.reserve("/v1/account/balances"), 0.0)
+
+    def test_global_budget(self):
+        """Test that the global bucket limits all groups together"""
+        limiter = RateLimiter(global_limit=(10, 1), groups={})
+
+        self.assertEqual(limiter.reserve("/v1/public/status"), 0.0)
+        self.assertGreater(limiter.reserve("/v1/account/balances"), 0.0)
+
+    def test_threads_never_exceed_rate(self):
+        """Test that concurrent threads are spaced out by the limiter"""
+        limiter = RateLimiter(global_limit=(200, 1), groups={})
+        sent = []
+        lock = threading.Lock()
+
+        def worker():
+            limiter.acquire("/v1/public/status")
+            with lock:
+                sent.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(max(sent) - min(sent), 9 / 200 * 0.9)
+        stats = limiter.stats()
+        self.assertEqual(stats["requests"], 10)
+        self.assertEqual(stats["delayed"], 9)
+        self.assertAlmostEqual(stats["max_wait"], 9 / 200, places=2)
+        self.assertIn("public", stats["groups"])
+
+    def test_shared_default(self):
+        """Test that the default limiter is shared across the process"""
+        self.assertIs(get_default_rate_limiter(), get_default_rate_limiter())
+
+
+class TestClientRateLimiting(unittest.TestCase):
+    """Test rate limiting on the clients"""
+
+    def test_sync_client(self):
+        """Test that requests made through the client are counted and delayed"""
+        limiter = RateLimiter(global_limit=None, groups={"public": (100, 1)})
+        backend = MockBackend({("GET", "/v1/public/status"): (200, {"status": "online"})})
+        first = ValrClient(backend=backend, rate_limiter=limiter)
+        second = ValrClient(backend=backend, rate_limiter=limiter)
+
+        first.public.get_status()
+        second.public.get_status()
+
+        self.assertEqual(limiter.stats()["requests"], 2)
+        self.assertEqual(limiter.stats()["delayed"], 1)
+
+    def test_async_client(self):
+        """Test that concurrent coroutines are delayed without blocking the loop"""
+        limiter = RateLimiter(global_limit=None, groups={"public": (100, 1)})
+        backend = AsyncMockBackend({("GET", "/v1/public/status"): (200, {"status": "online"})})
+        client = AsyncValrClient(backend=backend, rate_limiter=limiter, coalesce=False)
+
+        async def run():
+            return await asyncio.gather(*(client.public.get_status() for _ in range(3)))
+
+        started = time.monotonic()
+        self.assertEqual(len(asyncio.run(run())), 3)
+        self.assertGreaterEqual(time.monotonic() - started, 0.015)
+        self.assertEqual(limiter.stats()["delayed"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
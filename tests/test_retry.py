@@ -0,0 +1,169 @@
+"""
+Unit tests for VALR API retry policy
+"""
+
+import asyncio
+import time
+import unittest
+from email.utils import formatdate
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.exceptions import (
+    ValrConnectionError,
+    ValrRateLimitError,
+    ValrRequestError,
+    ValrServerError,
+)
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+from valr_api.utils.retry import RetryPolicy, parse_retry_after
+
+
+def flaky(*responses):
+    """Route answering with each response in turn, then with the last one forever"""
+    responses = list(responses)
+
+    def respond(request):
+        response = responses.pop(0) if len(responses) > 1 else responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return respond
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test the retry policy"""
+
+    def test_backoff_curve(self):
+        """Test exponential backoff capped at backoff_max, with and without jitter"""
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=3.0, jitter=False)
+
+        self.assertEqual([policy.backoff(n) for n in range(1, 6)], [0.5, 1.0, 2.0, 3.0, 3.0])
+        jittered = RetryPolicy(backoff_base=0.5, backoff_max=3.0)
+        for _ in range(100):
+            self.assertTrue(0 <= jittered.backoff(3) <= 2.0)
+
+    def test_parse_retry_after(self):
+        """Test delta-seconds and HTTP-date Retry-After values"""
+        self.assertEqual(parse_retry_after({"Retry-After": "2"}), 2.0)
+        self.assertEqual(parse_retry_after({"retry-after": "0.5"}), 0.5)
+        later = parse_retry_after({"Retry-After": formatdate(time.time() + 30, usegmt=True)})
+        self.assertTrue(25 < later <= 30)
+        self.assertIsNone(parse_retry_after({"Retry-After": "soon"}))
+        self.assertIsNone(parse_retry_after({}))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_retryable_errors(self):
+        """Test which errors are considered transient"""
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.is_retryable(ValrConnectionError("reset")))
+        self.assertTrue(policy.is_retryable(ValrServerError("down", status_code=503)))
+        self.assertTrue(policy.is_retryable(ValrRateLimitError("slow", status_code=429)))
+        self.assertFalse(policy.is_retryable(ValrRequestError("bad", status_code=400)))
+        self.assertFalse(policy.is_retryable(ValueError()))
+
+
+class TestClientRetries(unittest.TestCase):
+    """Test retries on the clients"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.failures = []
+        self.policy = RetryPolicy(
+            backoff_base=0.001,
+            hooks=[lambda request, attempt, error, delay: self.failures.append((attempt, delay))],
+        )
+
+    def make_client(self, routes, **kwargs):
+        """Create a client with the test policy"""
+        self.backend = MockBackend(routes)
+        return ValrClient(
+            api_key="test_api_key",
+            api_secret="test_api_secret",
+            backend=self.backend,
+            retry_policy=kwargs.pop("retry_policy", self.policy),
+            **kwargs,
+        )
+
+    def test_get_retries_until_success(self):
+        """Test that a GET survives transient failures"""
+        route = flaky(
+            ValrConnectionError("connection reset"),
+            HttpResponse(503, b"Service unavailable"),
+            HttpResponse(200, b'{"status": "online"}'),
+        )
+        client = self.make_client({("GET", "/v1/public/status"): route})
+
+        self.assertEqual(client.public.get_status(), {"status": "online"})
+        self.assertEqual([attempt for attempt, _ in self.failures], [1, 2])
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that the last error is raised once attempts run out"""
+        client = self.make_client({("GET", "/v1/public/status"): (500, "Server error")})
+
+        with self.assertRaises(ValrServerError):
+            client.public.get_status()
+        self.assertEqual(len(self.backend.requests), 3)
+        self.assertIsNone(self.failures[-1][1])
+
+    def test_client_errors_are_not_retried(self):
+        """Test that a 400 fails on the first attempt"""
+        client = self.make_client({("GET", "/v1/public/status"): (400, "Bad request")})
+
+        with self.assertRaises(ValrRequestError):
+            client.public.get_status()
+        self.assertEqual(len(self.backend.requests), 1)
+
+    def test_post_requires_opt_in(self):
+        """Test that withdrawals are not retried unless the call opts in"""
+        path = "/v1/wallet/crypto/BTC/withdraw"
+        client = self.make_client({("POST", path): (503, "Service unavailable")})
+
+        with self.assertRaises(ValrServerError):
+            client.wallet.withdraw("BTC", "0.1", "address")
+        self.assertEqual(len(self.backend.requests), 1)
+
+        with self.assertRaises(ValrServerError):
+            client.post(path, data={"amount": "0.1"}, retry=True)
+        self.assertEqual(len(self.backend.requests), 4)
+
+    def test_retry_after_and_fresh_signatures(self):
+        """Test that Retry-After is honoured and each attempt is signed afresh"""
+        route = flaky(
+            HttpResponse(429, b"Rate limit exceeded", {"Retry-After": "0.05"}),
+            HttpResponse(200, b"[]"),
+        )
+        client = self.make_client({("GET", "/v1/account/balances"): route})
+
+        started = time.monotonic()
+        client.account.get_balances()
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(self.failures, [(1, 0.05)])
+        first, second = self.backend.requests
+        self.assertIsNot(first.headers, second.headers)
+
+    def test_deadline(self):
+        """Test that no retry is scheduled past the total deadline"""
+        policy = RetryPolicy(max_attempts=10, deadline=0.01)
+        route = HttpResponse(503, b"Service unavailable", {"Retry-After": "1"})
+        client = self.make_client({("GET", "/v1/public/status"): route}, retry_policy=policy)
+
+        with self.assertRaises(ValrServerError):
+            client.public.get_status()
+        self.assertEqual(len(self.backend.requests), 1)
+
+    def test_async_client(self):
+        """Test that the async client shares the retry engine"""
+        route = flaky(HttpResponse(502, b"Bad gateway"), HttpResponse(200, b'{"ok": true}'))
+        backend = AsyncMockBackend({("GET", "/v1/public/status"): route})
+        client = AsyncValrClient(backend=backend, retry_policy=self.policy)
+
+        self.assertEqual(asyncio.run(client.public.get_status()), {"ok": True})
+        self.assertEqual(len(backend.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
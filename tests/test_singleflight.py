@@ -0,0 +1,250 @@
+"""
+Unit tests for VALR API request coalescing and bulk market data snapshots
+"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.exceptions import ValrServerError
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+from valr_api.utils.retry import RetryPolicy
+from valr_api.utils.singleflight import SingleFlight
+
+BOOK = {"Asks": [{"price": "101", "quantity": "1"}], "Bids": [], "LastChange": 1}
+SUMMARIES = [
+    {"currencyPair": "BTCZAR", "lastTradedPrice": "100"},
+    {"currencyPair": "ETHZAR", "lastTradedPrice": "10"},
+]
+
+
+def slow(payload, delay=0.05):
+    """Route answering after a delay, so that concurrent requests overlap"""
+
+    def respond(request):
+        time.sleep(delay)
+        return HttpResponse(200, json.dumps(payload).encode("utf-8"))
+
+    return respond
+
+
+class SlowAsyncMockBackend(AsyncMockBackend):
+    """Asynchronous mock backend that yields to the loop before answering"""
+
+    async def send(self, request, timeout):
+        await asyncio.sleep(0.01)
+        return self.respond(request)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test the coalescing primitive"""
+
+    def test_threads_share_one_call(self):
+        """Test that concurrent callers of a key share a single call"""
+        flight = SingleFlight()
+        calls = []
+        started = threading.Barrier(5)
+
+        def call():
+            calls.append(1)
+            time.sleep(0.05)
+            return "result"
+
+        def worker(results):
+            started.wait()
+            results.append(flight.do("key", call))
+
+        results = []
+        threads = [threading.Thread(target=worker, args=(results,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.shared, 4)
+
+    def test_errors_are_shared(self):
+        """Test that followers get the leader's exception"""
+        flight = SingleFlight()
+        entered = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def call():
+            entered.set()
+            release.wait(1)
+            raise ValueError("boom")
+
+        def worker():
+            try:
+                flight.do("key", call)
+            except ValueError as error:
+                errors.append(error)
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        entered.wait(1)
+        follower = threading.Thread(target=worker)
+        follower.start()
+        while flight.shared == 0:
+            time.sleep(0.001)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(len(errors), 2)
+        self.assertIs(errors[0], errors[1])
+
+    def test_calls_are_not_reused(self):
+        """Test that a finished call is not served to later callers"""
+        flight = SingleFlight()
+        values = iter(range(3))
+
+        self.assertEqual(flight.do("key", lambda: next(values)), 0)
+        self.assertEqual(flight.do("key", lambda: next(values)), 1)
+        self.assertEqual(flight.calls, 2)
+
+    def test_async_tasks_share_one_call(self):
+        """Test that concurrent tasks of a loop share a single call"""
+        flight = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(*(flight.do_async("key", call) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(run()), ["result"] * 5)
+        self.assertEqual(len(calls), 1)
+
+
+class TestClientCoalescing(unittest.TestCase):
+    """Test coalescing of identical requests on the clients"""
+
+    def test_concurrent_orderbook_requests(self):
+        """Test that ten threads asking for one book make one HTTP call"""
+        backend = MockBackend({("GET", "/v1/marketdata/BTCZAR/orderbook"): slow(BOOK)})
+        client = ValrClient(backend=backend)
+        barrier = threading.Barrier(10)
+        books = []
+
+        def worker():
+            barrier.wait()
+            books.append(client.market_data.get_orderbook("BTCZAR"))
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(backend.requests), 1)
+        self.assertEqual(books, [BOOK] * 10)
+        books[0]["Asks"].clear()
+        self.assertEqual(books[1], BOOK)
+
+    def test_failures_are_shared(self):
+        """Test that every coalesced caller sees the failure"""
+        backend = MockBackend(
+            {("GET", "/v1/public/status"): lambda request: time.sleep(0.05) or HttpResponse(503)}
+        )
+        client = ValrClient(backend=backend, retry_policy=RetryPolicy.never())
+        errors = []
+
+        def worker():
+            try:
+                client.public.get_status()
+            except ValrServerError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(len(backend.requests), 1)
+
+    def test_disabled(self):
+        """Test that coalescing can be turned off"""
+        backend = SlowAsyncMockBackend({("GET", "/v1/public/status"): (200, {"status": "online"})})
+        client = AsyncValrClient(backend=backend, coalesce=False)
+
+        async def run():
+            await asyncio.gather(*(client.public.get_status() for _ in range(3)))
+
+        asyncio.run(run())
+        self.assertEqual(len(backend.requests), 3)
+
+    def test_async_client(self):
+        """Test that concurrent tasks share one HTTP call"""
+        backend = SlowAsyncMockBackend({("GET", "/v1/public/status"): (200, {"status": "online"})})
+        client = AsyncValrClient(backend=backend)
+
+        async def run():
+            return await asyncio.gather(*(client.public.get_status() for _ in range(3)))
+
+        self.assertEqual(asyncio.run(run()), [{"status": "online"}] * 3)
+        self.assertEqual(len(backend.requests), 1)
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test bulk market data snapshots"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.routes = {
+            ("GET", "/v1/marketdata/BTCZAR/orderbook"): (200, BOOK),
+            ("GET", "/v1/marketdata/ETHZAR/orderbook"): (200, BOOK),
+            ("GET", "/v1/marketdata/XRPZAR/orderbook"): (200, BOOK),
+            ("GET", "/v1/marketdata/marketsummary"): (200, SUMMARIES),
+            ("GET", "/v1/marketdata/BTCZAR/marketsummary"): (200, SUMMARIES[0]),
+        }
+
+    def test_many_pairs(self):
+        """Test that market summaries of several pairs use the all-pairs endpoint"""
+        backend = MockBackend(self.routes)
+        client = ValrClient(backend=backend)
+
+        snapshot = client.market_data.get_snapshot(["BTCZAR", "ETHZAR", "XRPZAR", "BTCZAR"])
+
+        self.assertEqual(list(snapshot), ["BTCZAR", "ETHZAR", "XRPZAR"])
+        self.assertEqual(snapshot["ETHZAR"]["market_summary"], SUMMARIES[1])
+        self.assertEqual(snapshot["BTCZAR"]["orderbook"], BOOK)
+        self.assertIsNone(snapshot["XRPZAR"]["market_summary"])
+        paths = sorted(request.path for request in backend.requests)
+        self.assertEqual(paths.count("/v1/marketdata/marketsummary"), 1)
+        self.assertNotIn("/v1/marketdata/BTCZAR/marketsummary", paths)
+
+    def test_single_pair(self):
+        """Test that a single pair uses the per-pair summary"""
+        backend = MockBackend(self.routes)
+        client = ValrClient(backend=backend)
+
+        snapshot = client.market_data.get_snapshot(["BTCZAR"], orderbook=False)
+
+        self.assertEqual(snapshot, {"BTCZAR": {"market_summary": SUMMARIES[0]}})
+        self.assertEqual(backend.requests[0].path, "/v1/marketdata/BTCZAR/marketsummary")
+
+    def test_async_client(self):
+        """Test the asyncio snapshot"""
+        client = AsyncValrClient(backend=AsyncMockBackend(self.routes), models=True)
+
+        snapshot = asyncio.run(client.market_data.aget_snapshot(["BTCZAR", "ETHZAR"]))
+
+        self.assertEqual(snapshot["BTCZAR"]["market_summary"].last_traded_price, 100)
+        self.assertEqual(snapshot["ETHZAR"]["orderbook"].best_ask, 101.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for VALR API subaccount fan-out
+"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from decimal import Decimal
+
+from valr_api.api import FanOutResult
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.exceptions import ValrApiError
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+from valr_api.utils.retry import RetryPolicy
+
+SUBACCOUNTS = [{"id": str(i), "label": f"Desk {i}"} for i in range(1, 6)]
+
+
+class BalanceServer:
+    """Serve balances per subaccount header, failing for subaccount 3"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        subaccount_id = request.headers.get("X-VALR-SUBACCOUNT-ID", "0")
+        if subaccount_id == "3":
+            return HttpResponse(403, b'{"message": "Forbidden"}')
+        balances = [
+            {"currency": "BTC", "available": "0.5", "reserved": "0.1", "total": "0.6"},
+            {
+                "currency": "ZAR",
+                "available": subaccount_id,
+                "reserved": "0",
+                "total": subaccount_id,
+            },
+        ]
+        return HttpResponse(200, json.dumps(balances).encode("utf-8"))
+
+
+def routes(server):
+    """Routing table for the subaccount and balance endpoints"""
+    return {
+        ("GET", "/v1/account/subaccounts"): (200, SUBACCOUNTS),
+        ("GET", "/v1/account/balances"): server,
+    }
+
+
+class TestFanOut(unittest.TestCase):
+    """Test fan-out on the synchronous client"""
+
+    def make_client(self, server, **kwargs):
+        """Create a client backed by server"""
+        return ValrClient(
+            api_key="key",
+            api_secret="secret",
+            backend=MockBackend(routes(server)),
+            retry_policy=RetryPolicy.never(),
+            **kwargs,
+        )
+
+    def test_balances_sweep(self):
+        """Test that every subaccount is swept and errors are collected"""
+        client = self.make_client(BalanceServer())
+
+        sweep = client.subaccounts.get_balances()
+
+        self.assertEqual(list(sweep.results), [None, "1", "2", "4", "5"])
+        self.assertIsInstance(sweep.errors["3"], ValrApiError)
+        self.assertFalse(sweep.ok)
+        with self.assertRaises(ValrApiError):
+            sweep.raise_for_errors()
+
+    def test_total_balances(self):
+        """Test that balances add up per currency"""
+        client = self.make_client(BalanceServer(), models=True)
+
+        totals = client.subaccounts.get_balances(["1", "2", "4"]).total_balances()
+
+        self.assertEqual(totals["BTC"]["total"], Decimal("1.8"))
+        self.assertEqual(totals["ZAR"]["available"], Decimal("7"))
+
+    def test_bounded_parallelism(self):
+        """Test that no more than max_workers calls run at once"""
+        server = BalanceServer(delay=0.02)
+        client = self.make_client(server)
+
+        client.subaccounts.get_balances(max_workers=2)
+
+        self.assertEqual(server.peak, 2)
+
+    def test_custom_call(self):
+        """Test fanning out an arbitrary call over a subset"""
+        client = self.make_client(BalanceServer())
+        seen = []
+
+        result = client.subaccounts.fan_out(lambda subaccount_id: seen.append(subaccount_id), ["7"])
+
+        self.assertEqual(seen, ["7"])
+        self.assertTrue(result.ok)
+
+    def test_empty(self):
+        """Test fanning out over no subaccounts"""
+        result = self.make_client(BalanceServer()).subaccounts.fan_out(print, [])
+
+        self.assertIsInstance(result, FanOutResult)
+        self.assertEqual(result.results, {})
+
+
+class TestAsyncFanOut(unittest.TestCase):
+    """Test fan-out on the asyncio client"""
+
+    def test_balances_sweep(self):
+        """Test that the async sweep matches the synchronous one"""
+        backend = AsyncMockBackend(routes(BalanceServer()))
+        client = AsyncValrClient(
+            api_key="key", api_secret="secret", backend=backend, retry_policy=RetryPolicy.never()
+        )
+
+        sweep = asyncio.run(client.subaccounts.aget_balances(include_primary=False))
+
+        self.assertEqual(list(sweep.results), ["1", "2", "4", "5"])
+        self.assertEqual(list(sweep.errors), ["3"])
+        self.assertEqual(sweep.total_balances()["ZAR"]["total"], Decimal("12"))
+
+
+if __name__ == "__main__":
+    unittest.main()
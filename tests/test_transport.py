@@ -0,0 +1,179 @@
+"""
+Unit tests for VALR API transport layer
+"""
+
+import asyncio
+import json
+import unittest
+
+from valr_api.client import ValrClient
+from valr_api.exceptions import (
+    ValrApiError,
+    ValrAuthenticationError,
+    ValrRateLimitError,
+    ValrRequestError,
+    ValrServerError,
+)
+from valr_api.transport import (
+    AsyncMockBackend,
+    HttpResponse,
+    MockBackend,
+    Transport,
+    canonical_query,
+    raise_for_status,
+)
+from valr_api.utils.auth import generate_signature
+
+
+class TestTransport(unittest.TestCase):
+    """Test VALR API transport layer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.backend = MockBackend(
+            {
+                ("GET", "/v1/public/status"): (200, {"status": "online"}),
+                ("GET", "/v1/account/balances"): (200, [{"currency": "BTC"}]),
+                ("POST", "/v1/wallet/crypto/BTC/withdraw"): (202, {"id": "1"}),
+                ("GET", "/v1/public/time"): HttpResponse(200, b""),
+            }
+        )
+        self.client = ValrClient(
+            api_key="test_api_key",
+            api_secret="test_api_secret",
+            backend=self.backend,
+        )
+
+    def test_static_headers_are_reused(self):
+        """Test that unsigned requests share the precomputed headers"""
+        self.client.public.get_status()
+        self.client.public.get_status()
+
+        first, second = self.backend.requests
+        self.assertIs(first.headers, second.headers)
+        self.assertEqual(first.headers, {"Accept": "application/json"})
+
+    def test_signed_get_paths_are_unified(self):
+        """Test that get() and _get() produce identical signed requests"""
+        self.client.get("/v1/account/balances", auth_required=True, subaccount_id="42")
+        self.client.account.get_balances(subaccount_id="42")
+
+        for request in self.backend.requests:
+            self.assertEqual(request.method, "GET")
+            self.assertEqual(request.url, "https://api.valr.com/v1/account/balances")
+            self.assertEqual(request.headers["X-VALR-API-KEY"], "test_api_key")
+            self.assertEqual(request.headers["X-VALR-SUBACCOUNT-ID"], "42")
+            self.assertIn("X-VALR-SIGNATURE", request.headers)
+            self.assertIn("X-VALR-TIMESTAMP", request.headers)
+
+        # Signed headers must not leak into the shared static headers
+        self.assertNotIn("X-VALR-SIGNATURE", self.client.transport._signed_headers)
+
+    def test_canonical_query(self):
+        """Test that parameters always encode to the same query string"""
+        self.assertEqual(canonical_query(None), "")
+        self.assertEqual(canonical_query({"skip": None}), "")
+        self.assertEqual(
+            canonical_query({"skip": 0, "limit": 100, "currency": "BTC", "endTime": None}),
+            "currency=BTC&limit=100&skip=0",
+        )
+        self.assertEqual(
+            canonical_query({"types": "LIMIT_BUY,MARKET_BUY", "flag": True, "at": "a b"}),
+            "at=a%20b&flag=true&types=LIMIT_BUY%2CMARKET_BUY",
+        )
+
+    def test_signed_query_string(self):
+        """Test that the query string is signed and sent exactly as encoded"""
+        self.backend.routes[("GET", "/v1/account/transactionhistory")] = (200, [])
+        self.client.account.get_transaction_history(skip=10, limit=50, currency="BTC")
+
+        request = self.backend.requests[0]
+        target = "/v1/account/transactionhistory?currency=BTC&limit=50&skip=10"
+        self.assertEqual(request.url, "https://api.valr.com" + target)
+        self.assertEqual(request.path, "/v1/account/transactionhistory")
+        self.assertEqual(request.params, {"skip": 10, "limit": 50, "currency": "BTC"})
+        timestamp = int(request.headers["X-VALR-TIMESTAMP"])
+        self.assertEqual(
+            request.headers["X-VALR-SIGNATURE"],
+            generate_signature("test_api_secret", timestamp, "GET", target),
+        )
+
+    def test_signed_verb(self):
+        """Test that the request's own verb is signed"""
+        self.backend.routes[("DELETE", "/v1/account/balances")] = (200, {})
+        self.client.transport.request("DELETE", "/v1/account/balances", auth_required=True)
+
+        request = self.backend.requests[0]
+        timestamp = int(request.headers["X-VALR-TIMESTAMP"])
+        self.assertEqual(
+            request.headers["X-VALR-SIGNATURE"],
+            generate_signature("test_api_secret", timestamp, "DELETE", "/v1/account/balances"),
+        )
+
+    def test_post_body(self):
+        """Test that request bodies are serialized once with a JSON content type"""
+        response = self.client.wallet.withdraw("BTC", "0.1", "address")
+
+        self.assertEqual(response, {"id": "1"})
+        request = self.backend.requests[0]
+        self.assertEqual(json.loads(request.body), {"amount": "0.1", "address": "address"})
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+
+    def test_empty_response(self):
+        """Test that an empty body parses to an empty dict"""
+        self.assertEqual(self.client.market_data.get_server_time(), {})
+
+    def test_invalid_json_response(self):
+        """Test that a body that is not JSON raises ValrApiError"""
+        self.backend.routes[("GET", "/v1/public/status")] = HttpResponse(200, b"<html>")
+
+        with self.assertRaises(ValrApiError) as context:
+            self.client.public.get_status()
+
+        self.assertIn("Invalid JSON response", str(context.exception))
+        self.assertEqual(context.exception.response, "<html>")
+        self.assertIsInstance(context.exception.__cause__, ValueError)
+
+    def test_error_mapping_for_all_paths(self):
+        """Test that _get() errors map to the same exceptions as get()"""
+        self.backend.routes[("GET", "/v1/account/balances")] = (401, "Unauthorized")
+
+        with self.assertRaises(ValrAuthenticationError) as context:
+            self.client.account.get_balances()
+
+        self.assertEqual(context.exception.status_code, 401)
+        self.assertEqual(context.exception.response, "Unauthorized")
+
+    def test_missing_credentials(self):
+        """Test signed request without credentials"""
+        transport = Transport(MockBackend({}))
+
+        with self.assertRaises(ValrAuthenticationError):
+            transport.request("GET", "/v1/account/balances", auth_required=True)
+
+    def test_raise_for_status(self):
+        """Test status code to exception mapping"""
+        cases = [
+            (401, ValrAuthenticationError),
+            (429, ValrRateLimitError),
+            (404, ValrRequestError),
+            (503, ValrServerError),
+            (302, ValrApiError),
+        ]
+        for status_code, exception in cases:
+            with self.assertRaises(exception):
+                raise_for_status(status_code, "error")
+
+    def test_async_backend(self):
+        """Test that the async request path shares preparation and handling"""
+        backend = AsyncMockBackend({("GET", "/v1/public/status"): (200, {"status": "online"})})
+        transport = Transport(backend)
+
+        response = asyncio.run(transport.request_async("GET", "/v1/public/status"))
+
+        self.assertEqual(response, {"status": "online"})
+        self.assertEqual(backend.requests[0].url, "https://api.valr.com/v1/public/status")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for VALR API connection warm-up
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from valr_api.async_client import AsyncValrClient
+from valr_api.client import ValrClient
+from valr_api.transport import AsyncMockBackend, HttpResponse, MockBackend
+from valr_api.utils.cache import ResponseCache
+
+
+class TestConnectionWarmer(unittest.TestCase):
+    """Test connection warm-up and keep-alive"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.backend = MockBackend({("GET", "/v1/public/status"): self.status})
+        self.client = ValrClient(
+            api_key="key", api_secret="secret", backend=self.backend, cache=ResponseCache()
+        )
+
+    def status(self, request):
+        """Status route that records how many requests overlap"""
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        return HttpResponse(200, b'{"status": "online"}')
+
+    def test_warm_up(self):
+        """Test that warm-up sends concurrent unsigned requests past the cache"""
+        self.client.public.get_status()
+
+        self.assertEqual(self.client.warm_up(connections=3), 3)
+
+        requests = self.backend.requests[1:]
+        self.assertEqual(len(requests), 3)
+        self.assertEqual(self.peak, 3)
+        self.assertTrue(all("X-VALR-SIGNATURE" not in r.headers for r in requests))
+        self.assertEqual(self.client.warmer.warm_ups, 1)
+
+    def test_failures(self):
+        """Test that failed warm-ups are counted, not raised"""
+        self.backend.routes[("GET", "/v1/public/status")] = (503, {"message": "down"})
+
+        self.assertEqual(self.client.warm_up(connections=2), 0)
+        self.assertEqual(self.client.warmer.failures, 2)
+        # Warm-up requests are not retried
+        self.assertEqual(len(self.backend.requests), 2)
+
+    def test_keep_alive(self):
+        """Test that the keep-alive loop re-warms the connections until stopped"""
+        self.client.warmer.interval = 0.01
+
+        self.client.warm_up(connections=1, keep_alive=True)
+        deadline = time.monotonic() + 1
+        while self.client.warmer.warm_ups < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.client.warmer.stop()
+        sent = len(self.backend.requests)
+        time.sleep(0.05)
+
+        self.assertGreaterEqual(sent, 3)
+        self.assertEqual(len(self.backend.requests), sent)
+
+    def test_async_client(self):
+        """Test warm-up and keep-alive on the asyncio client"""
+        backend = AsyncMockBackend({("GET", "/v1/public/status"): (200, {"status": "online"})})
+        client = AsyncValrClient(backend=backend)
+        client.warmer.interval = 0.01
+
+        async def run():
+            warmed = await client.warm_up(connections=4, keep_alive=True)
+            await asyncio.sleep(0.05)
+            await client.close()
+            return warmed
+
+        self.assertEqual(asyncio.run(run()), 4)
+        self.assertGreater(client.warmer.warm_ups, 1)
+        self.assertIsNone(client.warmer._task)
+
+    def test_async_keep_alive_survives_errors(self):
+        """Test that a ping raising an unexpected error does not end the keep-alive task"""
+        pings = []
+
+        def status(request):
+            pings.append(request)
+            if len(pings) == 1:
+                raise ConnectionResetError("reset by peer")
+            return HttpResponse(200, b'{"status": "online"}')
+
+        client = AsyncValrClient(backend=AsyncMockBackend({("GET", "/v1/public/status"): status}))
+        client.warmer.interval = 0.01
+        client.warmer.connections = 1
+
+        async def run():
+            task = client.warmer.start_async()
+            deadline = time.monotonic() + 1
+            while client.warmer.warm_ups < 2 and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            alive = not task.done()
+            await client.close()
+            return alive
+
+        with self.assertLogs("valr_api.transport.warmup", "ERROR"):
+            self.assertTrue(asyncio.run(run()))
+        self.assertEqual(client.warmer.failures, 1)
+        self.assertGreaterEqual(client.warmer.warm_ups, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
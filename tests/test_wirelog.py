@@ -0,0 +1,83 @@
+"""
+Unit tests for VALR API wire logging
+"""
+
+import logging
+import unittest
+from unittest.mock import patch
+
+from valr_api.client import ValrClient
+from valr_api.transport import HttpResponse, MockBackend
+from valr_api.utils.retry import RetryPolicy
+from valr_api.utils.wirelog import WireLogger
+
+
+class TestWireLogger(unittest.TestCase):
+    """Test VALR API wire logging"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.logger = logging.getLogger("valr_api.tests.wire")
+        self.backend = MockBackend(
+            {
+                ("GET", "/v1/account/balances"): (200, [{"currency": "BTC"}] * 100),
+                ("GET", "/v1/public/status"): HttpResponse(200, b"{}"),
+                ("GET", "/v1/public/currencies"): (500, "Server error"),
+            }
+        )
+
+    def make_client(self, **kwargs):
+        """Create a client logging to the test logger"""
+        return ValrClient(
+            api_key="test_api_key",
+            api_secret="test_api_secret",
+            backend=self.backend,
+            wire_log=WireLogger(self.logger, **kwargs),
+            retry_policy=RetryPolicy.never(),
+        )
+
+    def test_disabled_costs_nothing(self):
+        """Test that nothing is formatted when DEBUG is off"""
+        self.logger.setLevel(logging.INFO)
+        client = self.make_client()
+
+        with patch.object(WireLogger, "log_exchange") as log_exchange:
+            client.public.get_status()
+
+        log_exchange.assert_not_called()
+        self.logger.setLevel(logging.NOTSET)
+
+    def test_redaction_and_truncation(self):
+        """Test that credentials are masked and bodies are truncated"""
+        client = self.make_client(max_body=20)
+
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            client.account.get_balances()
+
+        record = logs.records[0]
+        message = record.getMessage()
+        self.assertIn("GET https://api.valr.com/v1/account/balances", message)
+        self.assertIn('[{"currency": "BTC"}...', message)
+        self.assertIn("more)", message)
+        self.assertNotIn("test_api_key", message)
+
+        headers = record.valr["request_headers"]
+        self.assertEqual(headers["X-VALR-API-KEY"], "***")
+        self.assertEqual(headers["X-VALR-SIGNATURE"], "***")
+        self.assertEqual(record.valr["status_code"], 200)
+
+    def test_sampling_keeps_failures(self):
+        """Test that sampling drops successes but always logs failures"""
+        client = self.make_client(sample_rate=0.0)
+
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            client.public.get_status()
+            with self.assertRaises(Exception):
+                client.public.get_currencies()
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].valr["status_code"], 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+"""
+Unit tests for VALR API WebSocket streaming client
+"""
+
+import asyncio
+import json
+import unittest
+
+from valr_api.exceptions import ValrAuthenticationError, ValrStreamError
+from valr_api.utils.auth import generate_signature
+from valr_api.ws import DROP_NEWEST, DROP_OLDEST, ERROR, Subscription
+from valr_api.ws.client import websockets
+
+if websockets is not None:
+    from websockets.asyncio.server import serve
+    from websockets.datastructures import Headers
+    from websockets.http11 import Response
+
+    from valr_api.ws import ValrWebSocket
+
+SUMMARY = {
+    "type": "MARKET_SUMMARY_UPDATE",
+    "currencyPairSymbol": "BTCZAR",
+    "data": {"currencyPairSymbol": "BTCZAR", "lastTradedPrice": "1000000"},
+}
+
+
+class TestSubscription(unittest.IsolatedAsyncioTestCase):
+    """Test subscription queues and overflow policies"""
+
+    async def test_drop_oldest(self):
+        """Test that the oldest message makes room for a new one"""
+        subscription = Subscription("NEW_TRADE", maxsize=2, overflow=DROP_OLDEST)
+        for sequence in range(3):
+            subscription.put({"sequence": sequence})
+
+        self.assertEqual(subscription.dropped, 1)
+        self.assertEqual((await subscription.get())["sequence"], 1)
+        self.assertEqual((await subscription.get())["sequence"], 2)
+
+    async def test_drop_newest(self):
+        """Test that a message arriving at a full queue is discarded"""
+        subscription = Subscription("NEW_TRADE", maxsize=2, overflow=DROP_NEWEST)
+        for sequence in range(3):
+            subscription.put({"sequence": sequence})
+
+        self.assertEqual(subscription.dropped, 1)
+        self.assertEqual((await subscription.get())["sequence"], 0)
+
+    async def test_error(self):
+        """Test that overflowing fails the subscription"""
+        subscription = Subscription("NEW_TRADE", maxsize=1, overflow=ERROR)
+        subscription.put({"sequence": 0})
+        subscription.put({"sequence": 1})
+
+        with self.assertRaises(ValrStreamError):
+            await subscription.get()
+
+    async def test_iteration_ends_on_close(self):
+        """Test that iteration drains the queue and stops once closed"""
+        subscription = Subscription(None)
+        subscription.put({"sequence": 0})
+        subscription.close()
+
+        self.assertEqual([message async for message in subscription], [{"sequence": 0}])
+
+    def test_matches(self):
+        """Test event and pair filtering"""
+        subscription = Subscription("MARKET_SUMMARY_UPDATE", ["BTCZAR"])
+
+        self.assertTrue(subscription.matches("MARKET_SUMMARY_UPDATE", "BTCZAR"))
+        self.assertFalse(subscription.matches("MARKET_SUMMARY_UPDATE", "ETHZAR"))
+        self.assertFalse(subscription.matches("NEW_TRADE", "BTCZAR"))
+        self.assertTrue(Subscription(None).matches("NEW_TRADE", None))
+        with self.assertRaises(ValueError):
+            Subscription("NEW_TRADE", overflow="block")
+
+
+@unittest.skipIf(websockets is None, "websockets is not installed")
+class TestValrWebSocket(unittest.IsolatedAsyncioTestCase):
+    """Test VALR WebSocket client against a local stand-in server"""
+
+    async def asyncSetUp(self):
+        """Start a local WebSocket server"""
+        self.received = []
+        self.handshakes = []
+        self.connections = 0
+        self.drop_first = False
+        self.garbage = []
+
+        async def handler(connection):
+            self.connections += 1
+            if self.drop_first and self.connections == 1:
+                await connection.close()
+                return
+            async for raw in connection:
+                message = json.loads(raw)
+                self.received.append(message)
+                if message["type"] == "PING":
+                    await connection.send(json.dumps({"type": "PONG"}))
+                elif message["type"] == "SUBSCRIBE":
+                    for frame in self.garbage:
+                        await connection.send(frame)
+                    await connection.send(json.dumps(SUMMARY))
+                    await connection.send(json.dumps(dict(SUMMARY, currencyPairSymbol="ETHZAR")))
+
+        def process_request(connection, request):
+            self.handshakes.append(request)
+            if request.headers.get("X-VALR-API-KEY") == "bad_key":
+                return Response(401, "Unauthorized", Headers(), b"")
+            return None
+
+        self.server = await serve(handler, "127.0.0.1", 0, process_request=process_request)
+        port = self.server.sockets[0].getsockname()[1]
+        self.base_url = f"ws://127.0.0.1:{port}"
+
+    async def asyncTearDown(self):
+        """Stop the server"""
+        self.server.close()
+        await self.server.wait_closed()
+
+    def make_socket(self, **kwargs):
+        """Create a client pointing at the local server"""
+        kwargs.setdefault("api_key", "test_api_key")
+        kwargs.setdefault("api_secret", "test_api_secret")
+        return ValrWebSocket(ValrWebSocket.TRADE, base_url=self.base_url, **kwargs)
+
+    async def test_authenticated_handshake(self):
+        """Test that the handshake is signed over the feed path"""
+        async with self.make_socket() as ws:
+            await ws.wait_connected(timeout=5)
+
+        headers = self.handshakes[0].headers
+        self.assertEqual(headers["X-VALR-API-KEY"], "test_api_key")
+        expected = generate_signature(
+            "test_api_secret", int(headers["X-VALR-TIMESTAMP"]), "GET", "/ws/trade"
+        )
+        self.assertEqual(headers["X-VALR-SIGNATURE"], expected)
+
+    async def test_subscribe_and_iterate(self):
+        """Test that subscribed messages are routed by event and pair"""
+        async with self.make_socket() as ws:
+            await ws.wait_connected(timeout=5)
+            subscription = await ws.subscribe("MARKET_SUMMARY_UPDATE", ["BTCZAR"])
+
+            message = await asyncio.wait_for(subscription.__anext__(), 5)
+            self.assertEqual(message["data"]["lastTradedPrice"], "1000000")
+
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(subscription), 0)
+
+        self.assertEqual(
+            self.received[0],
+            {
+                "type": "SUBSCRIBE",
+                "subscriptions": [{"event": "MARKET_SUMMARY_UPDATE", "pairs": ["BTCZAR"]}],
+            },
+        )
+        self.assertTrue(subscription.closed)
+
+    async def test_callbacks(self):
+        """Test plain and coroutine callbacks"""
+        plain, coroutine = [], []
+
+        async def on_summary(message):
+            coroutine.append(message)
+
+        async with self.make_socket() as ws:
+            await ws.subscribe("MARKET_SUMMARY_UPDATE", callback=plain.append)
+            await ws.subscribe("MARKET_SUMMARY_UPDATE", ["ETHZAR"], callback=on_summary)
+            for _ in range(100):
+                if len(plain) == 2 and coroutine:
+                    break
+                await asyncio.sleep(0.01)
+
+        self.assertEqual([message["currencyPairSymbol"] for message in plain], ["BTCZAR", "ETHZAR"])
+        self.assertEqual([message["currencyPairSymbol"] for message in coroutine], ["ETHZAR"])
+
+    async def test_unsubscribe(self):
+        """Test that removing the last subscription of an event clears its pairs"""
+        async with self.make_socket() as ws:
+            await ws.wait_connected(timeout=5)
+            subscription = await ws.subscribe("NEW_TRADE", ["BTCZAR"])
+            await ws.unsubscribe(subscription)
+            await asyncio.sleep(0.05)
+
+        self.assertEqual(
+            self.received[-1],
+            {"type": "SUBSCRIBE", "subscriptions": [{"event": "NEW_TRADE", "pairs": []}]},
+        )
+
+    async def test_heartbeat(self):
+        """Test that pings are sent and pongs are not delivered"""
+        async with self.make_socket(heartbeat=0.02) as ws:
+            everything = await ws.subscribe()
+            await ws.wait_connected(timeout=5)
+            await asyncio.sleep(0.1)
+
+        self.assertIn({"type": "PING"}, self.received)
+        self.assertEqual(len(everything), 0)
+
+    async def test_reconnect_and_resubscribe(self):
+        """Test that a dropped connection is re-established with its subscriptions"""
+        self.drop_first = True
+        ws = self.make_socket(initial_backoff=0.01)
+        subscription = await ws.subscribe("MARKET_SUMMARY_UPDATE", ["BTCZAR"])
+        await ws.start()
+
+        message = await asyncio.wait_for(subscription.get(), 5)
+        await ws.close()
+
+        self.assertEqual(message["currencyPairSymbol"], "BTCZAR")
+        self.assertEqual(self.connections, 2)
+        self.assertEqual(ws.reconnects, 1)
+        self.assertEqual(self.received[0]["type"], "SUBSCRIBE")
+
+    async def test_malformed_frames_are_skipped(self):
+        """Test that undecodable and non-object frames do not end the stream"""
+        self.garbage = ["not json {", "[1, 2]", "null"]
+        async with self.make_socket() as ws:
+            subscription = await ws.subscribe("MARKET_SUMMARY_UPDATE", ["BTCZAR"])
+            await ws.wait_connected(timeout=5)
+
+            message = await asyncio.wait_for(subscription.get(), 5)
+            self.assertEqual(message["currencyPairSymbol"], "BTCZAR")
+            self.assertTrue(ws.connected)
+
+    async def test_unexpected_error_ends_subscriptions(self):
+        """Test that subscribers are released when the connection task fails"""
+        ws = self.make_socket()
+        subscription = await ws.subscribe("NEW_TRADE")
+
+        async def broken(events=None):
+            raise RuntimeError("boom")
+
+        ws._send_subscriptions = broken
+        await ws.start()
+
+        with self.assertRaises(ValrStreamError):
+            await asyncio.wait_for(subscription.get(), 5)
+        self.assertFalse(ws.connected)
+        await ws.close()
+
+    async def test_authentication_failure(self):
+        """Test that a rejected handshake fails subscriptions instead of retrying"""
+        ws = self.make_socket(api_key="bad_key")
+        subscription = await ws.subscribe("NEW_TRADE")
+        await ws.start()
+
+        with self.assertRaises(ValrAuthenticationError):
+            await asyncio.wait_for(subscription.get(), 5)
+        await ws.close()
+        self.assertEqual(ws.reconnects, 0)
+
+    async def test_gives_up_after_max_retries(self):
+        """Test that reconnecting stops after max_retries failed attempts"""
+        self.server.close()
+        await self.server.wait_closed()
+        ws = self.make_socket(initial_backoff=0.01, max_retries=2)
+        subscription = await ws.subscribe("NEW_TRADE")
+        await ws.start()
+
+        with self.assertRaises(ValrStreamError):
+            await asyncio.wait_for(subscription.get(), 5)
+        await ws.close()
+        self.assertEqual(ws.reconnects, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,7 @@ __version__ = "0.1.0"
 __author__ = "VALR API Python Client Contributors"
 __license__ = "MIT"
 
+from valr_api.async_client import AsyncValrClient
 from valr_api.client import ValrClient
 
-__all__ = ["ValrClient"]
+__all__ = ["AsyncValrClient", "ValrClient"]
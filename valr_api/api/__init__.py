@@ -4,7 +4,29 @@ VALR API endpoint modules
 
 from valr_api.api.account import AccountAPI
 from valr_api.api.market_data import MarketDataAPI
+from valr_api.api.orders import (
+    OrderIdGenerator,
+    OrdersAPI,
+    batch_cancel_order,
+    batch_limit_order,
+    batch_market_order,
+    batch_stop_limit_order,
+)
 from valr_api.api.public import PublicAPI
+from valr_api.api.subaccounts import FanOutResult, SubaccountsAPI
 from valr_api.api.wallet import WalletAPI
 
-__all__ = ["AccountAPI", "MarketDataAPI", "PublicAPI", "WalletAPI"]
+__all__ = [
+    "AccountAPI",
+    "FanOutResult",
+    "MarketDataAPI",
+    "OrderIdGenerator",
+    "OrdersAPI",
+    "PublicAPI",
+    "SubaccountsAPI",
+    "WalletAPI",
+    "batch_cancel_order",
+    "batch_limit_order",
+    "batch_market_order",
+    "batch_stop_limit_order",
+]
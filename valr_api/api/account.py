@@ -4,6 +4,9 @@ VALR Account API endpoints
 
 from typing import Any, Dict, List, Optional, cast
 
+from valr_api.models import Balance, Trade
+from valr_api.utils.pagination import AsyncPaginator, Paginator
+
 
 class AccountAPI:
     """
@@ -21,7 +24,7 @@ class AccountAPI:
             subaccount_id: Optional subaccount ID
 
         Returns:
-            List of account balances
+            List of account balances (``Balance`` models when the client uses models)
 
         Example:
             [
@@ -41,6 +44,7 @@ class AccountAPI:
                 endpoint=endpoint,
                 auth_type=self.client.SIGNED_AUTH,
                 subaccount_id=subaccount_id,
+                model=Balance,
             ),
         )
 
@@ -104,6 +108,8 @@ class AccountAPI:
         skip: int = 0,
         limit: int = 100,
         subaccount_id: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Get trade history for a specific currency pair
@@ -113,9 +119,12 @@ class AccountAPI:
             skip: Number of trades to skip (for pagination)
             limit: Maximum number of trades to return (default is 100, max is 100)
             subaccount_id: Optional subaccount ID
+            start_time: Start time in milliseconds (optional)
+            end_time: End time in milliseconds (optional)
 
         Returns:
-            Dictionary containing trade history and pagination info
+            Dictionary containing trade history and pagination info (trades are ``Trade``
+            models when the client uses models)
 
         Example:
             {
@@ -135,11 +144,17 @@ class AccountAPI:
             }
         """
         endpoint = f"/v1/account/{pair}/tradehistory"
-        params = {
+        params: Dict[str, Any] = {
             "skip": skip,
             "limit": limit,
         }
 
+        if start_time:
+            params["startTime"] = start_time
+
+        if end_time:
+            params["endTime"] = end_time
+
         return cast(
             Dict[str, Any],
             self.client._get(
@@ -147,9 +162,113 @@ class AccountAPI:
                 params=params,
                 auth_type=self.client.SIGNED_AUTH,
                 subaccount_id=subaccount_id,
+                model=Trade,
+                model_key="trades",
             ),
         )
 
+    def iter_transaction_history(
+        self,
+        transaction_types: Optional[List[str]] = None,
+        currency: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        subaccount_id: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ) -> Paginator:
+        """
+        Iterate the whole transaction history, one transaction at a time
+
+        Accepts the filters of :meth:`get_transaction_history`.
+
+        Args:
+            limit: Page size
+            skip: Position to start from, e.g. a saved ``position`` of an earlier iterator
+            prefetch: Whether to request the next page while the current one is consumed
+
+        Returns:
+            Iterator whose ``position`` can be saved to resume later
+        """
+
+        def fetch(skip: int, limit: int) -> Any:
+            return self.get_transaction_history(
+                skip, limit, transaction_types, currency, start_time, end_time, subaccount_id
+            )
+
+        return Paginator(fetch, limit=limit, skip=skip, prefetch=prefetch)
+
+    def aiter_transaction_history(
+        self,
+        transaction_types: Optional[List[str]] = None,
+        currency: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        subaccount_id: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ) -> AsyncPaginator:
+        """
+        Asynchronously iterate the whole transaction history (asyncio client)
+
+        Accepts the same arguments as :meth:`iter_transaction_history`.
+        """
+
+        def fetch(skip: int, limit: int) -> Any:
+            return self.get_transaction_history(
+                skip, limit, transaction_types, currency, start_time, end_time, subaccount_id
+            )
+
+        return AsyncPaginator(fetch, limit=limit, skip=skip, prefetch=prefetch)
+
+    def iter_trade_history(
+        self,
+        pair: str,
+        subaccount_id: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ) -> Paginator:
+        """
+        Iterate the whole trade history of a currency pair, one trade at a time
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            subaccount_id: Optional subaccount ID
+            limit: Page size (max is 100)
+            skip: Position to start from, e.g. a saved ``position`` of an earlier iterator
+            prefetch: Whether to request the next page while the current one is consumed
+
+        Returns:
+            Iterator whose ``position`` can be saved to resume later
+        """
+
+        def fetch(skip: int, limit: int) -> Any:
+            return self.get_trade_history(pair, skip, limit, subaccount_id)
+
+        return Paginator(fetch, "trades", limit=limit, skip=skip, prefetch=prefetch)
+
+    def aiter_trade_history(
+        self,
+        pair: str,
+        subaccount_id: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ) -> AsyncPaginator:
+        """
+        Asynchronously iterate the whole trade history of a pair (asyncio client)
+
+        Accepts the same arguments as :meth:`iter_trade_history`.
+        """
+
+        def fetch(skip: int, limit: int) -> Any:
+            return self.get_trade_history(pair, skip, limit, subaccount_id)
+
+        return AsyncPaginator(fetch, "trades", limit=limit, skip=skip, prefetch=prefetch)
+
     def get_subaccounts(self) -> List[Dict[str, Any]]:
         """
         Get all subaccounts
@@ -184,11 +303,17 @@ class AccountAPI:
             limit (int, optional): Number of trades to return. Defaults to 10.
 
         Returns:
-            list: List of trades.
+            list: List of trades (``Trade`` models when the client uses models).
         """
         endpoint = f"/v1/account/{currency_pair}/tradehistory"
         params = {"limit": limit}
         return cast(
             List[Dict[str, Any]],
-            self.client._get(endpoint=endpoint, params=params, auth_type=self.client.SIGNED_AUTH),
+            self.client._get(
+                endpoint=endpoint,
+                params=params,
+                auth_type=self.client.SIGNED_AUTH,
+                model=Trade,
+                model_key="trades",
+            ),
         )
@@ -2,7 +2,15 @@
 VALR Market Data API endpoints
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from valr_api.models import MarketSummary, OrderBook, Trade
+
+# (pair or None for all pairs, snapshot field, call)
+SnapshotCall = Tuple[Optional[str], str, Callable[[], Any]]
 
 
 class MarketDataAPI:
@@ -21,7 +29,8 @@ class MarketDataAPI:
             pair: Currency pair (e.g., BTCZAR)
 
         Returns:
-            Orderbook information
+            Orderbook information (an array-backed ``OrderBook`` when the client uses
+            models)
 
         Example:
             {
@@ -36,7 +45,7 @@ class MarketDataAPI:
                 "LastChange": 123456789
             }
         """
-        return self.client.get(f"/v1/marketdata/{pair}/orderbook")
+        return self.client.get(f"/v1/marketdata/{pair}/orderbook", model=OrderBook)
 
     def get_orderbook_summary(self, pair: str) -> List[Dict[str, Any]]:
         """
@@ -58,10 +67,13 @@ class MarketDataAPI:
             currency_pair (str): Currency pair to get orderbook for.
 
         Returns:
-            dict: Full orderbook.
+            dict: Full orderbook (an array-backed ``OrderBook`` when the client uses
+            models).
         """
         endpoint = f"/v1/marketdata/{currency_pair}/orderbook"
-        return self.client._get(endpoint=endpoint, auth_type=self.client.BASIC_AUTH)
+        return self.client._get(
+            endpoint=endpoint, auth_type=self.client.BASIC_AUTH, model=OrderBook
+        )
 
     def get_trade_history(self, currency_pair: str, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -72,11 +84,13 @@ class MarketDataAPI:
             limit (int, optional): Number of trades to return. Defaults to 100.
 
         Returns:
-            list: List of trades.
+            list: List of trades (``Trade`` models when the client uses models).
         """
         endpoint = f"/v1/marketdata/{currency_pair}/tradehistory"
         params = {"limit": limit}
-        return self.client._get(endpoint=endpoint, params=params, auth_type=self.client.BASIC_AUTH)
+        return self.client._get(
+            endpoint=endpoint, params=params, auth_type=self.client.BASIC_AUTH, model=Trade
+        )
 
     def get_market_summary(self, pair: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -86,7 +100,8 @@ class MarketDataAPI:
             pair: Optional currency pair to filter results
 
         Returns:
-            List of market summary objects
+            List of market summary objects (``MarketSummary`` models when the client uses
+            models). A single object is returned when ``pair`` is given.
 
         Example:
             [
@@ -107,8 +122,115 @@ class MarketDataAPI:
             ]
         """
         if pair:
-            return self.client.get(f"/v1/marketdata/{pair}/marketsummary")
-        return self.client.get("/v1/marketdata/marketsummary")
+            return self.client.get(f"/v1/marketdata/{pair}/marketsummary", model=MarketSummary)
+        return self.client.get("/v1/marketdata/marketsummary", model=MarketSummary)
+
+    def _snapshot_calls(
+        self,
+        pairs: List[str],
+        orderbook: bool,
+        orderbook_summary: bool,
+        market_summary: bool,
+    ) -> List[SnapshotCall]:
+        """
+        Requests needed for a snapshot of pairs
+        """
+        calls: List[SnapshotCall] = []
+        for pair in pairs:
+            if orderbook:
+                calls.append((pair, "orderbook", partial(self.get_orderbook, pair)))
+            if orderbook_summary:
+                calls.append((pair, "orderbook_summary", partial(self.get_orderbook_summary, pair)))
+        if market_summary:
+            # One all-pairs request is cheaper than a request per pair
+            if len(pairs) > 1:
+                calls.append((None, "market_summary", self.get_market_summary))
+            else:
+                calls.extend(
+                    (pair, "market_summary", partial(self.get_market_summary, pair))
+                    for pair in pairs
+                )
+        return calls
+
+    @staticmethod
+    def _snapshot(
+        pairs: List[str], calls: List[SnapshotCall], results: List[Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Arrange the results of the snapshot requests by pair
+        """
+        snapshot: Dict[str, Dict[str, Any]] = {pair: {} for pair in pairs}
+        for (pair, field, _), result in zip(calls, results):
+            if pair is not None:
+                snapshot[pair][field] = result
+                continue
+            by_pair = {summary["currencyPair"]: summary for summary in result}
+            for each in pairs:
+                snapshot[each][field] = by_pair.get(each)
+        return snapshot
+
+    def get_snapshot(
+        self,
+        pairs: Iterable[str],
+        orderbook: bool = True,
+        orderbook_summary: bool = False,
+        market_summary: bool = True,
+        max_workers: int = 8,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get market data for many currency pairs at once
+
+        Requests run concurrently on up to ``max_workers`` threads. Market summaries of
+        several pairs come from one all-pairs request rather than one request per pair.
+
+        Args:
+            pairs: Currency pairs (e.g., ["BTCZAR", "ETHZAR"])
+            orderbook: Include each pair's ``orderbook``
+            orderbook_summary: Include each pair's ``orderbook_summary``
+            market_summary: Include each pair's ``market_summary`` (None for a pair the
+                exchange does not list)
+            max_workers: Maximum number of requests in flight
+
+        Returns:
+            Requested data by pair, e.g.
+            ``{"BTCZAR": {"orderbook": {...}, "market_summary": {...}}, ...}``
+
+        Raises:
+            ValrApiError: If any request fails
+        """
+        pairs = list(dict.fromkeys(pairs))
+        calls = self._snapshot_calls(pairs, orderbook, orderbook_summary, market_summary)
+        if not calls:
+            return {pair: {} for pair in pairs}
+        with ThreadPoolExecutor(
+            min(max_workers, len(calls)), thread_name_prefix="valr-snapshot"
+        ) as executor:
+            results = list(executor.map(lambda call: call[2](), calls))
+        return self._snapshot(pairs, calls, results)
+
+    async def aget_snapshot(
+        self,
+        pairs: Iterable[str],
+        orderbook: bool = True,
+        orderbook_summary: bool = False,
+        market_summary: bool = True,
+        max_workers: int = 8,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get market data for many currency pairs at once (asyncio client)
+
+        Accepts the same arguments as :meth:`get_snapshot`.
+        """
+        pairs = list(dict.fromkeys(pairs))
+        calls = self._snapshot_calls(pairs, orderbook, orderbook_summary, market_summary)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run(call: SnapshotCall) -> Any:
+            async with semaphore:
+                return await call[2]()
+
+        results = await asyncio.gather(*(run(call) for call in calls))
+        return self._snapshot(pairs, calls, list(results))
 
     def get_server_time(self) -> Dict[str, Any]:
         """
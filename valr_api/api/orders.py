@@ -0,0 +1,547 @@
+"""
+VALR order placement and management endpoints
+"""
+
+import itertools
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from valr_api.models import Order
+
+Amount = Union[str, Decimal, int, float]
+
+# Maximum number of requests VALR accepts in one batch
+MAX_BATCH_SIZE = 20
+
+# Batch request types that place an order, and so carry a customer order ID
+PLACE_TYPES = ("PLACE_LIMIT", "PLACE_MARKET", "PLACE_STOP_LIMIT")
+
+
+class OrderIdGenerator:
+    """
+    Customer order IDs generated locally, without I/O or locking
+
+    IDs are a random prefix, drawn once per generator, followed by a counter, e.g.
+    ``3f9c2a71b0d4-1``, ``3f9c2a71b0d4-2``. They are unique within the process and, with
+    the random prefix, across restarts, and fit VALR's limit of 50 alphanumeric or dash
+    characters.
+
+    Args:
+        prefix: Fixed prefix instead of a random one (alphanumeric and dashes, at most 40
+            characters)
+    """
+
+    def __init__(self, prefix: Optional[str] = None):
+        if prefix is None:
+            prefix = uuid.uuid4().hex[:12]
+        elif len(prefix) > 40 or not prefix.replace("-", "").isalnum():
+            raise ValueError("prefix must be at most 40 alphanumeric or dash characters")
+        self.prefix = prefix
+        self._counter = itertools.count(1)
+
+    def __repr__(self) -> str:
+        return f"OrderIdGenerator(prefix={self.prefix!r})"
+
+    def __call__(self) -> str:
+        """
+        Next customer order ID
+        """
+        # next() on itertools.count is atomic under the GIL, so threads need no lock
+        return f"{self.prefix}-{next(self._counter)}"
+
+
+def _order_data(pair: str, side: str, customer_order_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Fields shared by all order types
+    """
+    data: Dict[str, Any] = {"pair": pair, "side": side.upper()}
+    if customer_order_id:
+        data["customerOrderId"] = customer_order_id
+    return data
+
+
+def batch_limit_order(
+    pair: str,
+    side: str,
+    quantity: Amount,
+    price: Amount,
+    post_only: bool = False,
+    time_in_force: Optional[str] = None,
+    customer_order_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Limit order entry for :meth:`OrdersAPI.place_batch_orders`
+
+    Takes the same arguments as :meth:`OrdersAPI.place_limit_order`.
+    """
+    data = _order_data(pair, side, customer_order_id)
+    data["quantity"] = str(quantity)
+    data["price"] = str(price)
+    data["postOnly"] = post_only
+    if time_in_force:
+        data["timeInForce"] = time_in_force
+    return {"type": "PLACE_LIMIT", "data": data}
+
+
+def batch_market_order(
+    pair: str,
+    side: str,
+    base_amount: Optional[Amount] = None,
+    quote_amount: Optional[Amount] = None,
+    customer_order_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Market order entry for :meth:`OrdersAPI.place_batch_orders`
+
+    Takes the same arguments as :meth:`OrdersAPI.place_market_order`.
+    """
+    if (base_amount is None) == (quote_amount is None):
+        raise ValueError("Give exactly one of base_amount and quote_amount")
+    data = _order_data(pair, side, customer_order_id)
+    if base_amount is not None:
+        data["baseAmount"] = str(base_amount)
+    else:
+        data["quoteAmount"] = str(quote_amount)
+    return {"type": "PLACE_MARKET", "data": data}
+
+
+def batch_stop_limit_order(
+    pair: str,
+    side: str,
+    quantity: Amount,
+    price: Amount,
+    stop_price: Amount,
+    type: str = "STOP_LOSS_LIMIT",
+    time_in_force: Optional[str] = None,
+    customer_order_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Stop-limit order entry for :meth:`OrdersAPI.place_batch_orders`
+
+    Takes the same arguments as :meth:`OrdersAPI.place_stop_limit_order`.
+    """
+    data = _order_data(pair, side, customer_order_id)
+    data["quantity"] = str(quantity)
+    data["price"] = str(price)
+    data["stopPrice"] = str(stop_price)
+    data["type"] = type
+    if time_in_force:
+        data["timeInForce"] = time_in_force
+    return {"type": "PLACE_STOP_LIMIT", "data": data}
+
+
+def batch_cancel_order(
+    pair: str, order_id: Optional[str] = None, customer_order_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Cancellation entry for :meth:`OrdersAPI.place_batch_orders`
+
+    Takes the same arguments as :meth:`OrdersAPI.cancel_order`.
+    """
+    return {"type": "CANCEL_ORDER", "data": _order_ref(pair, order_id, customer_order_id)}
+
+
+def _order_ref(
+    pair: str, order_id: Optional[str], customer_order_id: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Body identifying one order by exactly one of its IDs
+    """
+    if (order_id is None) == (customer_order_id is None):
+        raise ValueError("Give exactly one of order_id and customer_order_id")
+    if order_id is not None:
+        return {"orderId": order_id, "pair": pair}
+    return {"customerOrderId": customer_order_id, "pair": pair}
+
+
+def _tag(response: Any, customer_order_id: str) -> Any:
+    """
+    Add the customer order ID to a placement response that does not echo it
+    """
+    if isinstance(response, dict):
+        response.setdefault("customerOrderId", customer_order_id)
+    return response
+
+
+class OrdersAPI:
+    """
+    VALR order endpoints
+
+    Every placed order gets a customer order ID, generated on the client unless one is
+    given, and placement responses carry it as ``customerOrderId`` next to the
+    exchange's ``id``. Orders can then be correlated with later status calls and
+    WebSocket updates without looking them up.
+
+    Placement responses are post-processed, so the asyncio client uses the ``a``-prefixed
+    placement methods (``aplace_limit_order``, ...). The other methods work on both
+    clients.
+
+    Args:
+        client: Client the requests are made with
+        order_ids: Customer order ID generator. Defaults to a new
+            :class:`OrderIdGenerator`.
+    """
+
+    def __init__(self, client, order_ids: Optional[OrderIdGenerator] = None):
+        self.client = client
+        self.order_ids = order_ids if order_ids is not None else OrderIdGenerator()
+
+    def _with_id(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Batch entry with a customer order ID, generating one if it is missing
+        """
+        if entry["type"] in PLACE_TYPES and not entry["data"].get("customerOrderId"):
+            entry = {"type": entry["type"], "data": dict(entry["data"])}
+            entry["data"]["customerOrderId"] = self.order_ids()
+        return entry
+
+    def _batch_body(self, requests: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Body of a batch request
+        """
+        entries = [self._with_id(entry) for entry in requests]
+        if not entries:
+            raise ValueError("A batch needs at least one request")
+        if len(entries) > MAX_BATCH_SIZE:
+            raise ValueError(f"A batch holds at most {MAX_BATCH_SIZE} requests")
+        return {"requests": entries}
+
+    @staticmethod
+    def _tag_outcomes(response: Any, body: Dict[str, Any]) -> Any:
+        """
+        Add customer order IDs to the outcomes of a batch response, which are in
+        request order
+        """
+        outcomes = response.get("outcomes") if isinstance(response, dict) else None
+        if outcomes and len(outcomes) == len(body["requests"]):
+            for outcome, entry in zip(outcomes, body["requests"]):
+                customer_order_id = entry["data"].get("customerOrderId")
+                if customer_order_id and isinstance(outcome, dict):
+                    outcome.setdefault("customerOrderId", customer_order_id)
+        return response
+
+    def _place(self, endpoint: str, entry: Dict[str, Any], subaccount_id: Optional[str]) -> Any:
+        """
+        Post one order placement
+        """
+        entry = self._with_id(entry)
+        response = self.client.post(endpoint, entry["data"], subaccount_id=subaccount_id)
+        return _tag(response, entry["data"]["customerOrderId"])
+
+    async def _aplace(
+        self, endpoint: str, entry: Dict[str, Any], subaccount_id: Optional[str]
+    ) -> Any:
+        """
+        Post one order placement (asyncio client)
+        """
+        entry = self._with_id(entry)
+        response = await self.client.post(endpoint, entry["data"], subaccount_id=subaccount_id)
+        return _tag(response, entry["data"]["customerOrderId"])
+
+    def place_limit_order(
+        self,
+        pair: str,
+        side: str,
+        quantity: Amount,
+        price: Amount,
+        post_only: bool = False,
+        time_in_force: Optional[str] = None,
+        customer_order_id: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place a limit order
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            side: BUY or SELL
+            quantity: Base currency quantity
+            price: Limit price in the quote currency
+            post_only: Reject the order instead of letting it take liquidity
+            time_in_force: GTC (default), IOC or FOK
+            customer_order_id: Customer order ID (generated if omitted)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Order ID and customer order ID
+
+        Example:
+            {
+                "id": "558f5e0a-ffd1-46dd-8fae-763d93fa2f25",
+                "customerOrderId": "3f9c2a71b0d4-1"
+            }
+        """
+        entry = batch_limit_order(
+            pair, side, quantity, price, post_only, time_in_force, customer_order_id
+        )
+        return self._place("/v1/orders/limit", entry, subaccount_id)
+
+    async def aplace_limit_order(
+        self,
+        pair: str,
+        side: str,
+        quantity: Amount,
+        price: Amount,
+        post_only: bool = False,
+        time_in_force: Optional[str] = None,
+        customer_order_id: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place a limit order (asyncio client)
+
+        Accepts the same arguments as :meth:`place_limit_order`.
+        """
+        entry = batch_limit_order(
+            pair, side, quantity, price, post_only, time_in_force, customer_order_id
+        )
+        return await self._aplace("/v1/orders/limit", entry, subaccount_id)
+
+    def place_market_order(
+        self,
+        pair: str,
+        side: str,
+        base_amount: Optional[Amount] = None,
+        quote_amount: Optional[Amount] = None,
+        customer_order_id: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place a market order
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            side: BUY or SELL
+            base_amount: Amount to trade in the base currency
+            quote_amount: Amount to trade in the quote currency (instead of
+                ``base_amount``)
+            customer_order_id: Customer order ID (generated if omitted)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Order ID and customer order ID
+
+        Raises:
+            ValueError: If not exactly one of the amounts is given
+        """
+        entry = batch_market_order(pair, side, base_amount, quote_amount, customer_order_id)
+        return self._place("/v1/orders/market", entry, subaccount_id)
+
+    async def aplace_market_order(
+        self,
+        pair: str,
+        side: str,
+        base_amount: Optional[Amount] = None,
+        quote_amount: Optional[Amount] = None,
+        customer_order_id: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place a market order (asyncio client)
+
+        Accepts the same arguments as :meth:`place_market_order`.
+        """
+        entry = batch_market_order(pair, side, base_amount, quote_amount, customer_order_id)
+        return await self._aplace("/v1/orders/market", entry, subaccount_id)
+
+    def place_stop_limit_order(
+        self,
+        pair: str,
+        side: str,
+        quantity: Amount,
+        price: Amount,
+        stop_price: Amount,
+        type: str = "STOP_LOSS_LIMIT",
+        time_in_force: Optional[str] = None,
+        customer_order_id: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place a stop-limit order
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            side: BUY or SELL
+            quantity: Base currency quantity
+            price: Limit price of the order placed when the stop triggers
+            stop_price: Price at which the order triggers
+            type: STOP_LOSS_LIMIT or TAKE_PROFIT_LIMIT
+            time_in_force: GTC (default), IOC or FOK
+            customer_order_id: Customer order ID (generated if omitted)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Order ID and customer order ID
+        """
+        entry = batch_stop_limit_order(
+            pair, side, quantity, price, stop_price, type, time_in_force, customer_order_id
+        )
+        return self._place("/v1/orders/stop/limit", entry, subaccount_id)
+
+    async def aplace_stop_limit_order(
+        self,
+        pair: str,
+        side: str,
+        quantity: Amount,
+        price: Amount,
+        stop_price: Amount,
+        type: str = "STOP_LOSS_LIMIT",
+        time_in_force: Optional[str] = None,
+        customer_order_id: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place a stop-limit order (asyncio client)
+
+        Accepts the same arguments as :meth:`place_stop_limit_order`.
+        """
+        entry = batch_stop_limit_order(
+            pair, side, quantity, price, stop_price, type, time_in_force, customer_order_id
+        )
+        return await self._aplace("/v1/orders/stop/limit", entry, subaccount_id)
+
+    def place_batch_orders(
+        self, requests: Iterable[Dict[str, Any]], subaccount_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Place and cancel up to 20 orders in one signed request
+
+        Entries are built with :func:`batch_limit_order`, :func:`batch_market_order`,
+        :func:`batch_stop_limit_order` and :func:`batch_cancel_order`. Placements without
+        a customer order ID get a generated one. Each request succeeds or fails on its
+        own; its outcome is in ``outcomes``, in request order.
+
+        Args:
+            requests: Batch entries
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Batch ID and the outcome of each request
+
+        Raises:
+            ValueError: If the batch is empty or holds more than 20 requests
+
+        Example:
+            {
+                "batchId": 1419013,
+                "outcomes": [
+                    {
+                        "accepted": true,
+                        "orderId": "558f5e0a-ffd1-46dd-8fae-763d93fa2f25",
+                        "customerOrderId": "3f9c2a71b0d4-1"
+                    },
+                    ...
+                ]
+            }
+        """
+        body = self._batch_body(requests)
+        response = self.client.post("/v1/batch/orders", body, subaccount_id=subaccount_id)
+        return self._tag_outcomes(response, body)
+
+    async def aplace_batch_orders(
+        self, requests: Iterable[Dict[str, Any]], subaccount_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Place and cancel up to 20 orders in one signed request (asyncio client)
+
+        Accepts the same arguments as :meth:`place_batch_orders`.
+        """
+        body = self._batch_body(requests)
+        response = await self.client.post("/v1/batch/orders", body, subaccount_id=subaccount_id)
+        return self._tag_outcomes(response, body)
+
+    def cancel_order(
+        self,
+        pair: str,
+        order_id: Optional[str] = None,
+        customer_order_id: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Cancel an open order
+
+        Args:
+            pair: Currency pair of the order
+            order_id: Order ID
+            customer_order_id: Customer order ID (instead of ``order_id``)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Empty dict; the cancellation is confirmed asynchronously
+
+        Raises:
+            ValueError: If not exactly one of the IDs is given
+        """
+        return self.client.delete(
+            "/v1/orders/order",
+            data=_order_ref(pair, order_id, customer_order_id),
+            subaccount_id=subaccount_id,
+        )
+
+    def cancel_all_orders(
+        self, pair: Optional[str] = None, subaccount_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Cancel all open orders
+
+        Args:
+            pair: Only cancel orders of this currency pair (optional)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            The cancelled orders' IDs
+
+        Example:
+            [
+                {"orderId": "558f5e0a-ffd1-46dd-8fae-763d93fa2f25", "customerOrderId": null},
+                ...
+            ]
+        """
+        endpoint = f"/v1/orders/{pair}" if pair else "/v1/orders"
+        return self.client.delete(endpoint, subaccount_id=subaccount_id)
+
+    def get_order_status(
+        self,
+        pair: str,
+        order_id: Optional[str] = None,
+        customer_order_id: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get the status of an order
+
+        Args:
+            pair: Currency pair of the order
+            order_id: Order ID
+            customer_order_id: Customer order ID (instead of ``order_id``)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Order status (an ``Order`` model when the client uses models)
+
+        Raises:
+            ValueError: If not exactly one of the IDs is given
+        """
+        ref = _order_ref(pair, order_id, customer_order_id)
+        if order_id is not None:
+            endpoint = f"/v1/orders/{pair}/orderid/{order_id}"
+        else:
+            endpoint = f"/v1/orders/{pair}/customerorderid/{ref['customerOrderId']}"
+        return self.client.get(
+            endpoint, auth_required=True, subaccount_id=subaccount_id, model=Order
+        )
+
+    def get_open_orders(self, subaccount_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get all open orders
+
+        Args:
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Open orders (``Order`` models when the client uses models)
+        """
+        return self.client.get(
+            "/v1/orders/open", auth_required=True, subaccount_id=subaccount_id, model=Order
+        )
@@ -4,6 +4,8 @@ VALR Public API endpoints
 
 from typing import Any, Dict, List, Optional
 
+from valr_api.models import CurrencyPair
+
 
 class PublicAPI:
     """
@@ -38,7 +40,8 @@ class PublicAPI:
         Get all supported currency pairs
 
         Returns:
-            List of currency pair objects
+            List of currency pair objects (``CurrencyPair`` models when the client uses
+            models)
 
         Example:
             [
@@ -54,7 +57,7 @@ class PublicAPI:
                 ...
             ]
         """
-        return self.client.get("/v1/public/pairs")
+        return self.client.get("/v1/public/pairs", model=CurrencyPair)
 
     def get_order_types(self, pair: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,213 @@
+"""
+Fan-out of VALR API calls across subaccounts
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from valr_api.exceptions import ValrApiError
+from valr_api.models.base import to_decimal
+
+BALANCE_FIELDS = ("available", "reserved", "total")
+
+
+class FanOutResult:
+    """
+    Results of one call made for many subaccounts
+
+    Keys are subaccount IDs, with None standing for the primary account.
+
+    Args:
+        results: Result of each subaccount whose call succeeded
+        errors: Error of each subaccount whose call failed
+    """
+
+    def __init__(self, results: Dict[Optional[str], Any], errors: Dict[Optional[str], Exception]):
+        self.results = results
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        return f"FanOutResult(results={len(self.results)}, errors={len(self.errors)})"
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether every call succeeded
+        """
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """
+        Raise the first error, if any call failed
+
+        Raises:
+            ValrApiError: Error of the first failed subaccount
+        """
+        for error in self.errors.values():
+            raise error
+
+    def total_balances(self) -> Dict[str, Dict[str, Decimal]]:
+        """
+        Add up balance results per currency
+
+        Only meaningful for results of ``get_balances``. Failed subaccounts are left out,
+        so check :attr:`ok` before trusting the totals.
+
+        Returns:
+            ``{currency: {"available": ..., "reserved": ..., "total": ...}}``
+        """
+        totals: Dict[str, Dict[str, Decimal]] = {}
+        for balances in self.results.values():
+            for balance in balances:
+                sums = totals.setdefault(
+                    balance["currency"], {field: Decimal(0) for field in BALANCE_FIELDS}
+                )
+                for field in BALANCE_FIELDS:
+                    value = balance.get(field)
+                    if value is not None:
+                        sums[field] += value if isinstance(value, Decimal) else to_decimal(value)
+        return totals
+
+
+class SubaccountsAPI:
+    """
+    Run account calls across all (or some) subaccounts concurrently
+
+    The call is given a subaccount ID and makes one request for it, e.g.
+    ``lambda subaccount_id: client.wallet.get_deposit_history(subaccount_id=subaccount_id)``.
+    Calls run on at most ``max_workers`` threads (``fan_out``) or concurrent tasks
+    (``afan_out``, asyncio client), and go through the client's rate limiter. A failing
+    subaccount does not stop the others: its error is collected in the result.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def _ids(self, subaccounts: List[Dict[str, Any]], include_primary: bool) -> List[Optional[str]]:
+        """
+        IDs to call, from a ``get_subaccounts`` response
+        """
+        ids: List[Optional[str]] = [None] if include_primary else []
+        ids.extend(str(subaccount["id"]) for subaccount in subaccounts)
+        return ids
+
+    def fan_out(
+        self,
+        call: Callable[[Optional[str]], Any],
+        subaccount_ids: Optional[Iterable[Optional[str]]] = None,
+        max_workers: int = 8,
+        include_primary: bool = False,
+    ) -> FanOutResult:
+        """
+        Make a call for each subaccount on a thread pool
+
+        Args:
+            call: Function making the call for one subaccount ID
+            subaccount_ids: Subaccounts to call (None for all, from ``get_subaccounts``)
+            max_workers: Maximum number of calls in flight
+            include_primary: Also call for the primary account, keyed None, when
+                enumerating all subaccounts
+
+        Returns:
+            Results and errors per subaccount
+        """
+        if subaccount_ids is None:
+            subaccount_ids = self._ids(self.client.account.get_subaccounts(), include_primary)
+        ids = list(subaccount_ids)
+
+        def run(subaccount_id: Optional[str]) -> Tuple[Any, Optional[Exception]]:
+            try:
+                return call(subaccount_id), None
+            except ValrApiError as error:
+                return None, error
+
+        results: Dict[Optional[str], Any] = {}
+        errors: Dict[Optional[str], Exception] = {}
+        if ids:
+            with ThreadPoolExecutor(
+                min(max_workers, len(ids)), thread_name_prefix="valr-fanout"
+            ) as executor:
+                for subaccount_id, (result, error) in zip(ids, executor.map(run, ids)):
+                    if error is not None:
+                        errors[subaccount_id] = error
+                    else:
+                        results[subaccount_id] = result
+        return FanOutResult(results, errors)
+
+    async def afan_out(
+        self,
+        call: Callable[[Optional[str]], Awaitable[Any]],
+        subaccount_ids: Optional[Iterable[Optional[str]]] = None,
+        max_workers: int = 8,
+        include_primary: bool = False,
+    ) -> FanOutResult:
+        """
+        Make a call for each subaccount concurrently (asyncio client)
+
+        Accepts the same arguments as :meth:`fan_out`; ``call`` returns an awaitable.
+        """
+        if subaccount_ids is None:
+            subaccounts = await self.client.account.get_subaccounts()
+            subaccount_ids = self._ids(subaccounts, include_primary)
+        ids = list(subaccount_ids)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run(subaccount_id: Optional[str]) -> Tuple[Any, Optional[Exception]]:
+            async with semaphore:
+                try:
+                    return await call(subaccount_id), None
+                except ValrApiError as error:
+                    return None, error
+
+        results: Dict[Optional[str], Any] = {}
+        errors: Dict[Optional[str], Exception] = {}
+        outcomes = await asyncio.gather(*(run(subaccount_id) for subaccount_id in ids))
+        for subaccount_id, (result, error) in zip(ids, outcomes):
+            if error is not None:
+                errors[subaccount_id] = error
+            else:
+                results[subaccount_id] = result
+        return FanOutResult(results, errors)
+
+    def get_balances(
+        self,
+        subaccount_ids: Optional[Iterable[Optional[str]]] = None,
+        max_workers: int = 8,
+        include_primary: bool = True,
+    ) -> FanOutResult:
+        """
+        Get the balances of every subaccount
+
+        Args:
+            subaccount_ids: Subaccounts to sweep (None for all)
+            max_workers: Maximum number of requests in flight
+            include_primary: Also sweep the primary account when sweeping all
+
+        Returns:
+            Balances per subaccount; ``total_balances()`` adds them up per currency
+
+        Example:
+            sweep = client.subaccounts.get_balances()
+            firm = sweep.total_balances()
+            print(firm["BTC"]["total"], sweep.errors)
+        """
+        return self.fan_out(
+            self.client.account.get_balances, subaccount_ids, max_workers, include_primary
+        )
+
+    async def aget_balances(
+        self,
+        subaccount_ids: Optional[Iterable[Optional[str]]] = None,
+        max_workers: int = 8,
+        include_primary: bool = True,
+    ) -> FanOutResult:
+        """
+        Get the balances of every subaccount (asyncio client)
+
+        Accepts the same arguments as :meth:`get_balances`.
+        """
+        return await self.afan_out(
+            self.client.account.get_balances, subaccount_ids, max_workers, include_primary
+        )
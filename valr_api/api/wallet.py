@@ -4,6 +4,9 @@ VALR Wallet API endpoints
 
 from typing import Any, Dict, Optional
 
+from valr_api.models import Deposit, Withdrawal
+from valr_api.utils.pagination import AsyncPaginator, Paginator
+
 
 class WalletAPI:
     """
@@ -56,7 +59,8 @@ class WalletAPI:
             subaccount_id: Optional subaccount ID
 
         Returns:
-            Dictionary containing deposit history and pagination info
+            Dictionary containing deposit history and pagination info (deposits are
+            ``Deposit`` models when the client uses models)
 
         Example:
             {
@@ -90,8 +94,56 @@ class WalletAPI:
             params=params,
             auth_required=True,
             subaccount_id=subaccount_id,
+            model=Deposit,
+            model_key="deposits",
         )
 
+    def iter_deposit_history(
+        self,
+        currency: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ) -> Paginator:
+        """
+        Iterate the whole deposit history, one deposit at a time
+
+        Args:
+            currency: Filter by currency code (optional)
+            subaccount_id: Optional subaccount ID
+            limit: Page size
+            skip: Position to start from, e.g. a saved ``position`` of an earlier iterator
+            prefetch: Whether to request the next page while the current one is consumed
+
+        Returns:
+            Iterator whose ``position`` can be saved to resume later
+        """
+
+        def fetch(skip: int, limit: int) -> Any:
+            return self.get_deposit_history(currency, skip, limit, subaccount_id)
+
+        return Paginator(fetch, "deposits", limit=limit, skip=skip, prefetch=prefetch)
+
+    def aiter_deposit_history(
+        self,
+        currency: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ) -> AsyncPaginator:
+        """
+        Asynchronously iterate the whole deposit history (asyncio client)
+
+        Accepts the same arguments as :meth:`iter_deposit_history`.
+        """
+
+        def fetch(skip: int, limit: int) -> Any:
+            return self.get_deposit_history(currency, skip, limit, subaccount_id)
+
+        return AsyncPaginator(fetch, "deposits", limit=limit, skip=skip, prefetch=prefetch)
+
     def withdraw(
         self,
         currency: str,
@@ -113,7 +165,7 @@ class WalletAPI:
             subaccount_id: Optional subaccount ID
 
         Returns:
-            Withdrawal information
+            Withdrawal information (a ``Withdrawal`` model when the client uses models)
 
         Example:
             {
@@ -141,6 +193,7 @@ class WalletAPI:
             data=data,
             auth_required=True,
             subaccount_id=subaccount_id,
+            model=Withdrawal,
         )
 
     def get_withdrawal_history(
@@ -160,7 +213,8 @@ class WalletAPI:
             subaccount_id: Optional subaccount ID
 
         Returns:
-            Dictionary containing withdrawal history and pagination info
+            Dictionary containing withdrawal history and pagination info (withdrawals are
+            ``Withdrawal`` models when the client uses models)
 
         Example:
             {
@@ -195,4 +249,52 @@ class WalletAPI:
             params=params,
             auth_required=True,
             subaccount_id=subaccount_id,
+            model=Withdrawal,
+            model_key="withdrawals",
         )
+
+    def iter_withdrawal_history(
+        self,
+        currency: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ) -> Paginator:
+        """
+        Iterate the whole withdrawal history, one withdrawal at a time
+
+        Args:
+            currency: Filter by currency code (optional)
+            subaccount_id: Optional subaccount ID
+            limit: Page size
+            skip: Position to start from, e.g. a saved ``position`` of an earlier iterator
+            prefetch: Whether to request the next page while the current one is consumed
+
+        Returns:
+            Iterator whose ``position`` can be saved to resume later
+        """
+
+        def fetch(skip: int, limit: int) -> Any:
+            return self.get_withdrawal_history(currency, skip, limit, subaccount_id)
+
+        return Paginator(fetch, "withdrawals", limit=limit, skip=skip, prefetch=prefetch)
+
+    def aiter_withdrawal_history(
+        self,
+        currency: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ) -> AsyncPaginator:
+        """
+        Asynchronously iterate the whole withdrawal history (asyncio client)
+
+        Accepts the same arguments as :meth:`iter_withdrawal_history`.
+        """
+
+        def fetch(skip: int, limit: int) -> Any:
+            return self.get_withdrawal_history(currency, skip, limit, subaccount_id)
+
+        return AsyncPaginator(fetch, "withdrawals", limit=limit, skip=skip, prefetch=prefetch)
@@ -0,0 +1,371 @@
+"""
+VALR API asyncio client
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Union, cast
+
+from valr_api.api.account import AccountAPI
+from valr_api.api.market_data import MarketDataAPI
+from valr_api.api.orders import OrdersAPI
+from valr_api.api.public import PublicAPI
+from valr_api.api.subaccounts import SubaccountsAPI
+from valr_api.api.wallet import WalletAPI
+from valr_api.transport import AiohttpBackend, ConnectionWarmer, Timeout, Transport
+from valr_api.utils.cache import ResponseCache
+from valr_api.utils.clock import ClockSync
+from valr_api.utils.codec import JsonCodec
+from valr_api.utils.ratelimit import RateLimiter
+from valr_api.utils.retry import RetryPolicy
+from valr_api.utils.wirelog import WireLogger
+
+
+class AsyncValrClient:
+    """
+    VALR API asyncio client
+
+    Mirrors :class:`valr_api.client.ValrClient`, but every endpoint method returns an
+    awaitable. Requests share a bounded pool of keep-alive HTTP/1.1 connections, so a
+    single event loop can keep hundreds of requests in flight.
+
+    Requires the optional ``aiohttp`` dependency (``pip install valr-api[async]``).
+
+    Args:
+        api_key: VALR API key
+        api_secret: VALR API secret
+        base_url: VALR API base URL (defaults to https://api.valr.com)
+        timeout: Request timeout in seconds, or separate ``(connect, read)`` timeouts
+        pool_size: Maximum number of simultaneously open connections
+        keepalive_timeout: Seconds an idle pooled connection is kept open
+        backend: Asynchronous transport backend performing the HTTP I/O. Defaults to
+            an :class:`~valr_api.transport.AiohttpBackend` sized by the pool arguments;
+            :class:`~valr_api.transport.AsyncHttpxBackend` multiplexes requests over
+            HTTP/2 instead.
+        wire_log: Debug logger for request/response pairs, with body truncation,
+            sampling and credential redaction. Silent unless ``valr_api.wire`` is
+            enabled for DEBUG.
+        codec: JSON serializer/deserializer for request and response bodies. Defaults
+            to orjson when installed and the standard library ``json`` otherwise.
+        models: Return typed models (:mod:`valr_api.models`) instead of plain dicts.
+            Models keep fields in ``__slots__`` and convert prices, amounts and
+            timestamps to Decimal/datetime lazily, on first access.
+        rate_limiter: Client-side rate limiter that delays requests to stay within the
+            API limits. Pass :func:`~valr_api.utils.ratelimit.get_default_rate_limiter`
+            to share one budget between all clients in the process. Defaults to no
+            limiting.
+        retry_policy: When to retry failed requests, with exponential backoff and
+            ``Retry-After`` support. Defaults to retrying GETs up to three times on network
+            errors, 429 and 5xx responses; other methods are retried only when a call
+            passes ``retry=True``.
+        cache: Cache for public reference data (currencies, pairs, order types, status)
+            with per-endpoint TTLs. Pass :func:`~valr_api.utils.cache.get_default_cache`
+            to share cached responses between all clients in the process. Defaults to no
+            caching.
+        coalesce: Whether concurrent identical public GETs (e.g. ten threads asking for the
+            same order book at once) share a single HTTP call. Defaults to True.
+        clock: Server clock estimate (:class:`~valr_api.utils.clock.ClockSync`) that signed
+            requests are time-stamped with, so that a skewed host clock does not get them
+            rejected. It samples this client's ``/v1/public/time``; call ``clock.start_async()``
+            to keep it up to date in the background. Defaults to the local wall clock.
+
+    Example:
+        async with AsyncValrClient(api_key, api_secret) as client:
+            balances, summary = await asyncio.gather(
+                client.account.get_balances(),
+                client.market_data.get_market_summary(),
+            )
+    """
+
+    # Authentication types
+    BASIC_AUTH = "BASIC"
+    SIGNED_AUTH = "SIGNED"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        base_url: str = "https://api.valr.com",
+        timeout: Timeout = 30,
+        pool_size: int = 100,
+        keepalive_timeout: float = 30.0,
+        backend: Optional[Any] = None,
+        wire_log: Optional[WireLogger] = None,
+        codec: Optional[JsonCodec] = None,
+        models: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        clock: Optional[ClockSync] = None,
+    ):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.models = models
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.logger = logging.getLogger(__name__)
+        self.transport = Transport(
+            backend if backend is not None else AiohttpBackend(pool_size, keepalive_timeout),
+            api_key=api_key,
+            api_secret=api_secret,
+            base_url=self.base_url,
+            timeout=timeout,
+            wire_log=wire_log,
+            codec=codec,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            coalesce=coalesce,
+            clock=clock,
+        )
+        self.warmer = ConnectionWarmer(self.transport)
+
+        # Initialize API endpoints
+        self.public = PublicAPI(self)
+        self.market_data = MarketDataAPI(self)
+        if clock is not None and clock.fetch is None:
+            clock.fetch = self._server_time
+
+        # These endpoints require authentication
+        if api_key and api_secret:
+            self.account = AccountAPI(self)
+            self.wallet = WalletAPI(self)
+            self.orders = OrdersAPI(self)
+            self.subaccounts = SubaccountsAPI(self)
+
+    async def __aenter__(self) -> "AsyncValrClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def warm_up(self, connections: int = 4, keep_alive: bool = False) -> int:
+        """
+        Open pooled connections ahead of the first latency-sensitive request
+
+        Resolves the host and completes the TCP and TLS handshakes of ``connections``
+        connections with concurrent ``/v1/public/status`` requests.
+
+        Args:
+            connections: Number of connections to open, at most ``pool_size``
+            keep_alive: Also re-warm the connections every ``warmer.interval`` seconds in
+                a task of the running loop, until :meth:`close`
+
+        Returns:
+            Number of warm-up requests that succeeded
+        """
+        self.warmer.connections = connections
+        warmed = await self.warmer.warm_up_async()
+        if keep_alive:
+            self.warmer.start_async()
+        return warmed
+
+    async def close(self) -> None:
+        """
+        Close the transport backend and all of its pooled connections
+        """
+        self.warmer.stop()
+        await self.transport.backend.close()
+
+    async def _server_time(self) -> Dict[str, Any]:
+        """
+        Read the server time for a clock sample
+
+        Sent on its own, never joined to an identical request in flight or retried, so
+        that the sample's timestamps bracket exactly one round trip.
+        """
+        response = await self.transport.send_async("GET", "/v1/public/time", retry=False)
+        return cast(Dict[str, Any], self.transport.decode(response.content))
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        auth_required: bool = False,
+        subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Make request to VALR API
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint path
+            params: URL parameters
+            data: Request body for POST/PUT requests
+            auth_required: Whether authentication is required
+            subaccount_id: Optional subaccount ID for requests
+            model: Model class the response is wrapped in when the client uses models
+                (any class with a ``build(payload, key)`` classmethod)
+            model_key: Envelope key of the list to wrap, for responses such as
+                ``{"trades": [...]}``
+            retry: True to retry the request on transient failures even if its method
+                is not retried by default (e.g., a POST), False to never retry it
+
+        Returns:
+            Response from API as dictionary or list, or as models when the client was
+            created with ``models=True`` and a model was given
+
+        Raises:
+            ValrAuthenticationError: If authentication fails
+            ValrRequestError: If request is invalid
+            ValrRateLimitError: If rate limit is exceeded
+            ValrServerError: If server error occurs
+            ValrApiError: For any other API error
+        """
+        response = await self.transport.request_async(
+            method,
+            endpoint,
+            params=params,
+            data=data,
+            auth_required=auth_required,
+            subaccount_id=subaccount_id,
+            retry=retry,
+        )
+        if model is not None and self.models:
+            return model.build(response, model_key)
+        return response
+
+    async def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        auth_required: bool = False,
+        subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Make GET request to VALR API
+        """
+        return await self._request(
+            "GET",
+            endpoint,
+            params=params,
+            auth_required=auth_required,
+            subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
+        )
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Dict,
+        params: Optional[Dict] = None,
+        auth_required: bool = True,
+        subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Make POST request to VALR API
+        """
+        return await self._request(
+            "POST",
+            endpoint,
+            params=params,
+            data=data,
+            auth_required=auth_required,
+            subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
+        )
+
+    async def put(
+        self,
+        endpoint: str,
+        data: Dict,
+        params: Optional[Dict] = None,
+        auth_required: bool = True,
+        subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Make PUT request to VALR API
+        """
+        return await self._request(
+            "PUT",
+            endpoint,
+            params=params,
+            data=data,
+            auth_required=auth_required,
+            subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
+        )
+
+    async def delete(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        auth_required: bool = True,
+        subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Make DELETE request to VALR API
+        """
+        return await self._request(
+            "DELETE",
+            endpoint,
+            params=params,
+            data=data,
+            auth_required=auth_required,
+            subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
+        )
+
+    async def _get(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        auth_type: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Make a GET request to the API.
+
+        Args:
+            endpoint (str): API endpoint.
+            params (dict, optional): Query parameters. Defaults to None.
+            auth_type (str, optional): Authentication type. Defaults to None.
+            subaccount_id (str, optional): Subaccount ID. Defaults to None.
+            model (type, optional): Response model class. Defaults to None.
+            model_key (str, optional): Envelope key of the model list. Defaults to None.
+            retry (bool, optional): Retry override for this request. Defaults to None.
+
+        Returns:
+            Union[Dict, List]: Response data.
+        """
+        return await self._request(
+            "GET",
+            endpoint,
+            params=params,
+            auth_required=auth_type == self.SIGNED_AUTH,
+            subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
+        )
@@ -2,25 +2,24 @@
 VALR API client
 """
 
-import json
 import logging
-import time
 from typing import Any, Dict, List, Optional, Union, cast
 
 import requests
 
 from valr_api.api.account import AccountAPI
 from valr_api.api.market_data import MarketDataAPI
+from valr_api.api.orders import OrdersAPI
 from valr_api.api.public import PublicAPI
+from valr_api.api.subaccounts import SubaccountsAPI
 from valr_api.api.wallet import WalletAPI
-from valr_api.exceptions import (
-    ValrApiError,
-    ValrAuthenticationError,
-    ValrRateLimitError,
-    ValrRequestError,
-    ValrServerError,
-)
-from valr_api.utils.auth import generate_signature, get_timestamp
+from valr_api.transport import ConnectionWarmer, RequestsBackend, Timeout, Transport
+from valr_api.utils.cache import ResponseCache
+from valr_api.utils.clock import ClockSync
+from valr_api.utils.codec import JsonCodec
+from valr_api.utils.ratelimit import RateLimiter
+from valr_api.utils.retry import RetryPolicy
+from valr_api.utils.wirelog import WireLogger
 
 
 class ValrClient:
@@ -31,7 +30,39 @@ class ValrClient:
         api_key: VALR API key
         api_secret: VALR API secret
         base_url: VALR API base URL (defaults to https://api.valr.com)
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds, or separate ``(connect, read)`` timeouts
+        pool_size: Maximum number of keep-alive connections of the default backend
+        backend: Transport backend performing the HTTP I/O. Defaults to a
+            :class:`~valr_api.transport.RequestsBackend`, whose session is exposed as
+            ``session``. Use :class:`~valr_api.transport.Urllib3Backend` for the least
+            per-call overhead, or :class:`~valr_api.transport.HttpxBackend` to multiplex
+            requests from many threads over HTTP/2.
+        wire_log: Debug logger for request/response pairs, with body truncation,
+            sampling and credential redaction. Silent unless ``valr_api.wire`` is
+            enabled for DEBUG.
+        codec: JSON serializer/deserializer for request and response bodies. Defaults
+            to orjson when installed and the standard library ``json`` otherwise.
+        models: Return typed models (:mod:`valr_api.models`) instead of plain dicts.
+            Models keep fields in ``__slots__`` and convert prices, amounts and
+            timestamps to Decimal/datetime lazily, on first access.
+        rate_limiter: Client-side rate limiter that delays requests to stay within the
+            API limits. Pass :func:`~valr_api.utils.ratelimit.get_default_rate_limiter`
+            to share one budget between all clients in the process. Defaults to no
+            limiting.
+        retry_policy: When to retry failed requests, with exponential backoff and
+            ``Retry-After`` support. Defaults to retrying GETs up to three times on network
+            errors, 429 and 5xx responses; other methods are retried only when a call
+            passes ``retry=True``.
+        cache: Cache for public reference data (currencies, pairs, order types, status)
+            with per-endpoint TTLs. Pass :func:`~valr_api.utils.cache.get_default_cache`
+            to share cached responses between all clients in the process. Defaults to no
+            caching.
+        coalesce: Whether concurrent identical public GETs (e.g. ten threads asking for the
+            same order book at once) share a single HTTP call. Defaults to True.
+        clock: Server clock estimate (:class:`~valr_api.utils.clock.ClockSync`) that signed
+            requests are time-stamped with, so that a skewed host clock does not get them
+            rejected. It samples this client's ``/v1/public/time``; call ``clock.start()``
+            to keep it up to date in the background. Defaults to the local wall clock.
     """
 
     # Authentication types
@@ -43,23 +74,90 @@ class ValrClient:
         api_key: Optional[str] = None,
         api_secret: Optional[str] = None,
         base_url: str = "https://api.valr.com",
-        timeout: int = 30,
+        timeout: Timeout = 30,
+        pool_size: int = 10,
+        backend: Optional[Any] = None,
+        wire_log: Optional[WireLogger] = None,
+        codec: Optional[JsonCodec] = None,
+        models: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        clock: Optional[ClockSync] = None,
     ):
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self.session = requests.Session()
+        self.models = models
+        self.pool_size = pool_size
+        if backend is None:
+            backend = RequestsBackend(pool_size=pool_size)
+        # Only set when the backend sends through a requests session
+        self.session: Optional[requests.Session] = getattr(backend, "session", None)
         self.logger = logging.getLogger(__name__)
+        self.transport = Transport(
+            backend,
+            api_key=api_key,
+            api_secret=api_secret,
+            base_url=self.base_url,
+            timeout=timeout,
+            wire_log=wire_log,
+            codec=codec,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            coalesce=coalesce,
+            clock=clock,
+        )
+        self.warmer = ConnectionWarmer(self.transport)
 
         # Initialize API endpoints
         self.public = PublicAPI(self)
         self.market_data = MarketDataAPI(self)
+        if clock is not None and clock.fetch is None:
+            clock.fetch = self._server_time
 
         # These endpoints require authentication
         if api_key and api_secret:
             self.account = AccountAPI(self)
             self.wallet = WalletAPI(self)
+            self.orders = OrdersAPI(self)
+            self.subaccounts = SubaccountsAPI(self)
+
+    def warm_up(self, connections: int = 4, keep_alive: bool = False) -> int:
+        """
+        Open pooled connections ahead of the first latency-sensitive request
+
+        Resolves the host and completes the TCP and TLS handshakes of ``connections``
+        connections with concurrent ``/v1/public/status`` requests. The default backend
+        pools up to ``pool_size`` connections per host.
+
+        Args:
+            connections: Number of connections to open
+            keep_alive: Also re-warm the connections every ``warmer.interval`` seconds on a
+                daemon thread, so they do not close while idle. Stop it with
+                ``warmer.stop()``.
+
+        Returns:
+            Number of warm-up requests that succeeded
+        """
+        self.warmer.connections = connections
+        warmed = self.warmer.warm_up()
+        if keep_alive:
+            self.warmer.start()
+        return warmed
+
+    def _server_time(self) -> Dict[str, Any]:
+        """
+        Read the server time for a clock sample
+
+        Sent on its own, never joined to an identical request in flight or retried, so
+        that the sample's timestamps bracket exactly one round trip.
+        """
+        response = self.transport.send("GET", "/v1/public/time", retry=False)
+        return cast(Dict[str, Any], self.transport.decode(response.content))
 
     def _request(
         self,
@@ -69,6 +167,9 @@ class ValrClient:
         data: Optional[Dict] = None,
         auth_required: bool = False,
         subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
     ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Make request to VALR API
@@ -80,9 +181,16 @@ class ValrClient:
             data: Request body for POST/PUT requests
             auth_required: Whether authentication is required
             subaccount_id: Optional subaccount ID for requests
+            model: Model class the response is wrapped in when the client uses models
+                (any class with a ``build(payload, key)`` classmethod)
+            model_key: Envelope key of the list to wrap, for responses such as
+                ``{"trades": [...]}``
+            retry: True to retry the request on transient failures even if its method
+                is not retried by default (e.g., a POST), False to never retry it
 
         Returns:
-            Response from API as dictionary or list
+            Response from API as dictionary or list, or as models when the client was
+            created with ``models=True`` and a model was given
 
         Raises:
             ValrAuthenticationError: If authentication fails
@@ -91,96 +199,18 @@ class ValrClient:
             ValrServerError: If server error occurs
             ValrApiError: For any other API error
         """
-        url = f"{self.base_url}{endpoint}"
-
-        headers = {}
-
-        if auth_required:
-            if not self.api_key or not self.api_secret:
-                raise ValrAuthenticationError(
-                    "API key and secret are required for authenticated endpoints"
-                )
-
-            timestamp = get_timestamp()
-            signature = generate_signature(
-                self.api_secret,
-                timestamp,
-                method,
-                endpoint,
-                data,
-            )
-
-            headers.update(
-                {
-                    "X-VALR-API-KEY": self.api_key,
-                    "X-VALR-SIGNATURE": signature,
-                    "X-VALR-TIMESTAMP": str(timestamp),
-                }
-            )
-
-            if subaccount_id:
-                headers["X-VALR-SUBACCOUNT-ID"] = subaccount_id
-
-        if data is not None:
-            headers["Content-Type"] = "application/json"
-            data_str = json.dumps(data)
-        else:
-            data_str = None
-
-        try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                data=data_str,
-                timeout=self.timeout,
-            )
-
-            # Log request details in debug mode
-            self.logger.debug(f"Request: {method} {url} {params} {data}")
-            self.logger.debug(f"Response: {response.status_code} {response.text}")
-
-            # Handle error responses
-            if not response.ok:
-                if response.status_code == 401:
-                    raise ValrAuthenticationError(
-                        f"Authentication failed: {response.text}",
-                        status_code=response.status_code,
-                        response=response.text,
-                    )
-                elif response.status_code == 429:
-                    raise ValrRateLimitError(
-                        f"Rate limit exceeded: {response.text}",
-                        status_code=response.status_code,
-                        response=response.text,
-                    )
-                elif 400 <= response.status_code < 500:
-                    raise ValrRequestError(
-                        f"Request error: {response.text}",
-                        status_code=response.status_code,
-                        response=response.text,
-                    )
-                elif response.status_code >= 500:
-                    raise ValrServerError(
-                        f"Server error: {response.text}",
-                        status_code=response.status_code,
-                        response=response.text,
-                    )
-                else:
-                    raise ValrApiError(
-                        f"API error: {response.text}",
-                        status_code=response.status_code,
-                        response=response.text,
-                    )
-
-            # Return response data
-            if response.text:
-                return cast(Union[Dict[str, Any], List[Dict[str, Any]]], response.json())
-            return {}
-
-        except requests.RequestException as e:
-            raise ValrApiError(f"Request failed: {str(e)}")
+        response = self.transport.request(
+            method,
+            endpoint,
+            params=params,
+            data=data,
+            auth_required=auth_required,
+            subaccount_id=subaccount_id,
+            retry=retry,
+        )
+        if model is not None and self.models:
+            return model.build(response, model_key)
+        return response
 
     def get(
         self,
@@ -188,6 +218,9 @@ class ValrClient:
         params: Optional[Dict] = None,
         auth_required: bool = False,
         subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
     ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Make GET request to VALR API
@@ -198,6 +231,9 @@ class ValrClient:
             params=params,
             auth_required=auth_required,
             subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
         )
 
     def post(
@@ -207,6 +243,9 @@ class ValrClient:
         params: Optional[Dict] = None,
         auth_required: bool = True,
         subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
     ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Make POST request to VALR API
@@ -218,6 +257,9 @@ class ValrClient:
             data=data,
             auth_required=auth_required,
             subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
         )
 
     def put(
@@ -227,6 +269,9 @@ class ValrClient:
         params: Optional[Dict] = None,
         auth_required: bool = True,
         subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
     ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Make PUT request to VALR API
@@ -238,6 +283,9 @@ class ValrClient:
             data=data,
             auth_required=auth_required,
             subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
         )
 
     def delete(
@@ -247,6 +295,9 @@ class ValrClient:
         data: Optional[Dict] = None,
         auth_required: bool = True,
         subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
     ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Make DELETE request to VALR API
@@ -258,87 +309,20 @@ class ValrClient:
             data=data,
             auth_required=auth_required,
             subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
         )
 
-    def _handle_response(self, response) -> Dict[str, Any]:
-        """
-        Handle the response from the API.
-
-        Args:
-            response (requests.Response): Response from the API.
-
-        Returns:
-            dict: Response data.
-
-        Raises:
-            ValrRequestException: If the request fails.
-        """
-        if response.status_code == 200:
-            return cast(Dict[str, Any], response.json())
-
-        error_message = f"Request failed with status code {response.status_code}"
-
-        try:
-            error_data = response.json()
-            if "message" in error_data:
-                error_message = error_data["message"]
-        except ValueError:
-            pass
-
-        if response.status_code == 401:
-            raise ValrAuthenticationError(error_message)
-        elif response.status_code == 429:
-            raise ValrRateLimitError(error_message)
-        elif 400 <= response.status_code < 500:
-            raise ValrRequestError(error_message)
-        else:
-            raise ValrServerError(error_message)
-
-    def _get_headers(self, auth_type: str, endpoint: str, params=None, data=None) -> Dict[str, str]:
-        """
-        Get the headers for the request.
-
-        Args:
-            auth_type (str): Authentication type.
-            endpoint (str): API endpoint.
-            params (dict, optional): Query parameters. Defaults to None.
-            data (dict, optional): Request data. Defaults to None.
-
-        Returns:
-            dict: Headers for the request.
-        """
-        headers = {"Accept": "application/json", "Content-Type": "application/json"}
-
-        if (
-            auth_type == self.SIGNED_AUTH
-            and self.api_secret is not None
-            and self.api_key is not None
-        ):
-            timestamp = int(time.time() * 1000)
-            signature = generate_signature(
-                api_secret=self.api_secret,
-                timestamp=timestamp,
-                verb="GET",
-                path=endpoint,
-                body=data,
-            )
-
-            headers.update(
-                {
-                    "X-VALR-API-KEY": self.api_key,
-                    "X-VALR-SIGNATURE": signature,
-                    "X-VALR-TIMESTAMP": str(timestamp),
-                }
-            )
-
-        return headers
-
     def _get(
         self,
         endpoint: str,
         params: Optional[Dict] = None,
         auth_type: Optional[str] = None,
         subaccount_id: Optional[str] = None,
+        model: Optional[Any] = None,
+        model_key: Optional[str] = None,
+        retry: Optional[bool] = None,
     ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Make a GET request to the API.
@@ -348,23 +332,20 @@ class ValrClient:
             params (dict, optional): Query parameters. Defaults to None.
             auth_type (str, optional): Authentication type. Defaults to None.
             subaccount_id (str, optional): Subaccount ID. Defaults to None.
+            model (type, optional): Response model class. Defaults to None.
+            model_key (str, optional): Envelope key of the model list. Defaults to None.
+            retry (bool, optional): Retry override for this request. Defaults to None.
 
         Returns:
             Union[Dict, List]: Response data.
         """
-        if auth_type is None:
-            auth_type = self.BASIC_AUTH
-
-        headers = self._get_headers(auth_type, endpoint, params)
-
-        if subaccount_id:
-            headers["X-VALR-SUBACCOUNT-ID"] = subaccount_id
-
-        response = self.session.get(
-            f"{self.base_url}{endpoint}",
+        return self._request(
+            "GET",
+            endpoint,
             params=params,
-            headers=headers,
-            timeout=self.timeout,
+            auth_required=auth_type == self.SIGNED_AUTH,
+            subaccount_id=subaccount_id,
+            model=model,
+            model_key=model_key,
+            retry=retry,
         )
-
-        return cast(Union[Dict[str, Any], List[Dict[str, Any]]], self._handle_response(response))
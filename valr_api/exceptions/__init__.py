@@ -5,15 +5,23 @@ Exceptions for VALR API client
 from valr_api.exceptions.exceptions import (
     ValrApiError,
     ValrAuthenticationError,
+    ValrConnectionError,
     ValrRateLimitError,
     ValrRequestError,
+    ValrSequenceGapError,
     ValrServerError,
+    ValrStreamError,
+    ValrValidationError,
 )
 
 __all__ = [
     "ValrApiError",
     "ValrAuthenticationError",
+    "ValrConnectionError",
     "ValrRateLimitError",
     "ValrServerError",
     "ValrRequestError",
+    "ValrSequenceGapError",
+    "ValrStreamError",
+    "ValrValidationError",
 ]
@@ -6,10 +6,11 @@ Custom exceptions for VALR API client
 class ValrApiError(Exception):
     """Base exception for VALR API errors"""
 
-    def __init__(self, message=None, status_code=None, response=None):
+    def __init__(self, message=None, status_code=None, response=None, headers=None):
         self.message = message
         self.status_code = status_code
         self.response = response
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -35,3 +36,27 @@ class ValrRequestError(ValrApiError):
     """Exception raised for client request errors (4xx status codes)"""
 
     pass
+
+
+class ValrConnectionError(ValrApiError):
+    """Exception raised when a request fails before a response is received"""
+
+    pass
+
+
+class ValrSequenceGapError(ValrApiError):
+    """Exception raised when an incremental update does not follow the local state"""
+
+    pass
+
+
+class ValrStreamError(ValrApiError):
+    """Exception raised when a WebSocket stream or subscription fails"""
+
+    pass
+
+
+class ValrValidationError(ValrApiError):
+    """Exception raised when an order fails client-side validation"""
+
+    pass
@@ -0,0 +1,8 @@
+"""
+Bulk retrieval of VALR account history
+"""
+
+from valr_api.history.backfill import Backfill, BackfillCheckpoint
+from valr_api.history.store import Column, ColumnTable, HistoryStore
+
+__all__ = ["Backfill", "BackfillCheckpoint", "Column", "ColumnTable", "HistoryStore"]
@@ -0,0 +1,375 @@
+"""
+Parallel, resumable backfill of time-filtered VALR history endpoints
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from valr_api.history.records import json_default, record_time
+from valr_api.models import Trade
+from valr_api.models.base import Model
+from valr_api.utils.pagination import split_page
+
+# Fetches one page given (start_time, end_time, skip, limit), times in epoch milliseconds
+WindowFetcher = Callable[[int, int, int, int], Any]
+Window = Tuple[int, int]
+
+DAY = 86_400_000
+
+
+def _subtract(window: Window, done: List[Window]) -> List[Window]:
+    """
+    Parts of a window not covered by any of the done windows
+    """
+    remaining = []
+    start, end = window
+    for done_start, done_end in sorted(done):
+        if done_end <= start or done_start >= end:
+            continue
+        if done_start > start:
+            remaining.append((start, done_start))
+        start = max(start, done_end)
+        if start >= end:
+            break
+    if start < end:
+        remaining.append((start, end))
+    return remaining
+
+
+class BackfillCheckpoint:
+    """
+    Append-only journal of the windows a backfill has completed
+
+    Every completed window is appended as one JSON line holding its bounds and records, and
+    synced to disk before the backfill moves on. A line cut short by a crash is discarded
+    on load, so its window is simply fetched again.
+
+    Args:
+        path: Journal file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"BackfillCheckpoint({self.path!r})"
+
+    def load(self) -> List[Tuple[Window, List[Dict[str, Any]]]]:
+        """
+        Read the completed windows
+
+        Returns:
+            ``((start_time, end_time), records)`` for each completed window
+        """
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as file:
+            content = file.read()
+        complete = content[: content.rfind(b"\n") + 1]
+        if len(complete) != len(content):
+            with open(self.path, "wb") as file:
+                file.write(complete)
+        entries = []
+        for line in complete.splitlines():
+            entry = json.loads(line)
+            entries.append(((entry["start"], entry["end"]), entry["records"]))
+        return entries
+
+    def append(self, window: Window, records: List[Any]) -> None:
+        """
+        Record a completed window
+
+        Args:
+            window: ``(start_time, end_time)`` of the window
+            records: Records fetched for the window
+        """
+        entry = {
+            "start": window[0],
+            "end": window[1],
+            "records": [
+                record.to_dict() if isinstance(record, Model) else record for record in records
+            ],
+        }
+        line = json.dumps(entry, default=json_default, separators=(",", ":"))
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def clear(self) -> None:
+        """
+        Delete the journal
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Backfill:
+    """
+    Fetch a long time range of history concurrently, in windows
+
+    The range is cut into windows of ``window`` milliseconds that a pool of ``workers``
+    threads fetches concurrently. A window whose first page comes back full is split in
+    two, recursively, down to ``min_window``; a window that cannot be split further is
+    paged through with ``skip``. Requests go through the client, so its rate limiter and
+    retry policy apply. The records are merged, de-duplicated by ``id_key`` and sorted by
+    ``time_key``.
+
+    With a ``checkpoint``, each completed window is journaled. Running a backfill again
+    with the same journal only fetches the windows that are missing.
+
+    Args:
+        fetch: Function returning the page at ``(start_time, end_time, skip, limit)``
+        start_time: Start of the range, in epoch milliseconds
+        end_time: End of the range (exclusive), in epoch milliseconds
+        key: Envelope key of the records, or None for endpoints returning a list
+        window: Initial window length in milliseconds
+        min_window: Shortest window that is still split when it overflows a page
+        limit: Page size
+        workers: Number of concurrent requests
+        time_key: Key of the record timestamp
+        id_key: Key of the record ID
+        checkpoint: Journal path or :class:`BackfillCheckpoint`
+        model: Model class that journaled records are rebuilt as on resume
+        progress: Called with the fraction of the range done after each window
+
+    Example:
+        backfill = Backfill.transactions(
+            client, start_time, end_time, checkpoint="transactions.journal"
+        )
+        transactions = backfill.run()
+    """
+
+    def __init__(
+        self,
+        fetch: WindowFetcher,
+        start_time: int,
+        end_time: int,
+        key: Optional[str] = None,
+        window: int = DAY,
+        min_window: int = 1000,
+        limit: int = 100,
+        workers: int = 4,
+        time_key: str = "eventAt",
+        id_key: str = "id",
+        checkpoint: Union[str, BackfillCheckpoint, None] = None,
+        model: Optional[Type[Model]] = None,
+        progress: Optional[Callable[[float], None]] = None,
+    ):
+        if end_time <= start_time:
+            raise ValueError("end_time must be after start_time")
+        if window < 1 or min_window < 1 or limit < 1 or workers < 1:
+            raise ValueError("window, min_window, limit and workers must be at least 1")
+        self.fetch = fetch
+        self.start_time = start_time
+        self.end_time = end_time
+        self.key = key
+        self.window = window
+        self.min_window = min_window
+        self.limit = limit
+        self.workers = workers
+        self.time_key = time_key
+        self.id_key = id_key
+        if isinstance(checkpoint, str):
+            checkpoint = BackfillCheckpoint(checkpoint)
+        self.checkpoint = checkpoint
+        self.model = model
+        self.on_progress = progress
+        self.covered = 0
+        self.windows = 0
+        self.splits = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"Backfill(start_time={self.start_time}, end_time={self.end_time}, "
+            f"progress={self.progress:.0%})"
+        )
+
+    @classmethod
+    def transactions(
+        cls,
+        client: Any,
+        start_time: int,
+        end_time: int,
+        transaction_types: Optional[List[str]] = None,
+        currency: Optional[str] = None,
+        subaccount_id: Optional[str] = None,
+        **options: Any,
+    ) -> "Backfill":
+        """
+        Backfill the transaction history of a (synchronous) client
+
+        Args:
+            client: ValrClient
+            start_time: Start of the range, in epoch milliseconds
+            end_time: End of the range (exclusive), in epoch milliseconds
+            transaction_types: Types of transactions to return
+            currency: Currency to filter by
+            subaccount_id: Optional subaccount ID
+            **options: Other :class:`Backfill` arguments
+
+        Returns:
+            Backfill ready to run
+        """
+
+        def fetch(start: int, end: int, skip: int, limit: int) -> Any:
+            return client.account.get_transaction_history(
+                skip, limit, transaction_types, currency, start, end, subaccount_id
+            )
+
+        options.setdefault("time_key", "eventAt")
+        return cls(fetch, start_time, end_time, **options)
+
+    @classmethod
+    def trades(
+        cls,
+        client: Any,
+        pair: str,
+        start_time: int,
+        end_time: int,
+        subaccount_id: Optional[str] = None,
+        **options: Any,
+    ) -> "Backfill":
+        """
+        Backfill the trade history of a currency pair on a (synchronous) client
+
+        Args:
+            client: ValrClient
+            pair: Currency pair (e.g., BTCZAR)
+            start_time: Start of the range, in epoch milliseconds
+            end_time: End of the range (exclusive), in epoch milliseconds
+            subaccount_id: Optional subaccount ID
+            **options: Other :class:`Backfill` arguments
+
+        Returns:
+            Backfill ready to run
+        """
+
+        def fetch(start: int, end: int, skip: int, limit: int) -> Any:
+            return client.account.get_trade_history(
+                pair, skip, limit, subaccount_id, start_time=start, end_time=end
+            )
+
+        options.setdefault("time_key", "tradedAt")
+        options.setdefault("model", Trade if client.models else None)
+        return cls(fetch, start_time, end_time, key="trades", **options)
+
+    @property
+    def progress(self) -> float:
+        """
+        Fraction of the time range fetched so far
+        """
+        return self.covered / (self.end_time - self.start_time)
+
+    def run(self) -> List[Any]:
+        """
+        Fetch every window not yet journaled
+
+        Returns:
+            All records of the range, de-duplicated and in time order
+
+        Raises:
+            ValrApiError: If a request fails (completed windows stay journaled)
+        """
+        records: List[Any] = []
+        done: List[Window] = []
+        if self.checkpoint is not None:
+            for window, journaled in self.checkpoint.load():
+                done.append(window)
+                if self.model is not None:
+                    records.extend(self.model(record) for record in journaled)
+                else:
+                    records.extend(journaled)
+
+        pending: List[Window] = []
+        for start, end in _subtract((self.start_time, self.end_time), done):
+            pending.extend((s, min(s + self.window, end)) for s in range(start, end, self.window))
+        self.covered = (self.end_time - self.start_time) - sum(e - s for s, e in pending)
+
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="valr-backfill") as executor:
+            futures: Dict[Future, Window] = {
+                executor.submit(self._fetch_window, window): window for window in pending
+            }
+            failure: Optional[BaseException] = None
+            try:
+                while futures:
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        start, end = futures.pop(future)
+                        if future.cancelled():
+                            continue
+                        error = future.exception()
+                        if error is not None:
+                            # Keep journaling the windows already in flight, start no more
+                            if failure is None:
+                                failure = error
+                                for other in futures:
+                                    other.cancel()
+                            continue
+                        fetched = future.result()
+                        if fetched is None:
+                            if failure is None:
+                                self.splits += 1
+                                middle = start + (end - start) // 2
+                                for half in ((start, middle), (middle, end)):
+                                    futures[executor.submit(self._fetch_window, half)] = half
+                            continue
+                        self._complete((start, end), fetched, records)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            if failure is not None:
+                raise failure
+
+        return self._merge(records)
+
+    def _complete(self, window: Window, fetched: List[Any], records: List[Any]) -> None:
+        """
+        Journal a fetched window and account for it
+        """
+        if self.checkpoint is not None:
+            self.checkpoint.append(window, fetched)
+        records.extend(fetched)
+        self.windows += 1
+        self.covered += window[1] - window[0]
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+
+    def _page(self, start: int, end: int, skip: int) -> Tuple[List[Any], bool]:
+        """
+        Fetch one page of a window
+        """
+        with self._lock:
+            self.requests += 1
+        return split_page(self.fetch(start, end, skip, self.limit), self.key, self.limit)
+
+    def _fetch_window(self, window: Window) -> Optional[List[Any]]:
+        """
+        Fetch all records of a window, or None if the window should be split
+        """
+        start, end = window
+        records, is_last = self._page(start, end, 0)
+        if is_last:
+            return records
+        if end - start > self.min_window:
+            return None
+        while not is_last:
+            page, is_last = self._page(start, end, len(records))
+            records.extend(page)
+        return records
+
+    def _merge(self, records: List[Any]) -> List[Any]:
+        """
+        De-duplicate records by ID and sort them by time
+        """
+        unique: Dict[Any, Any] = {}
+        for index, record in enumerate(records):
+            record_id = record.get(self.id_key)
+            unique[record_id if record_id is not None else ("", index)] = record
+        return sorted(unique.values(), key=lambda record: record_time(record, self.time_key))
@@ -0,0 +1,39 @@
+"""
+Helpers for history records, whether plain dicts or models
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from valr_api.models.base import parse_datetime
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def json_default(value: Any) -> Any:
+    """
+    Serialize the converted values of models (``json.dumps`` ``default`` hook)
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def record_time(record: Any, key: str) -> datetime:
+    """
+    Timestamp of a record
+
+    Args:
+        record: Record dict or model
+        key: Key of the timestamp
+
+    Returns:
+        Timezone-aware datetime, or the epoch if the record has none
+    """
+    value = record.get(key)
+    if value is None:
+        return EPOCH
+    return value if isinstance(value, datetime) else parse_datetime(value)
@@ -0,0 +1,404 @@
+"""
+Incremental local store of account history in append-only columnar files
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from valr_api.history.records import json_default, record_time
+from valr_api.models.base import Model, parse_datetime
+from valr_api.utils.pagination import Paginator
+
+_OFFSET = struct.Struct("<Q")
+
+# (time key, id keys) of each kind of history, newest first from the API
+KINDS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "transactions": ("eventAt", ("id",)),
+    "trades": ("tradedAt", ("id",)),
+    "deposits": ("createdAt", ("id", "transactionHash")),
+    "withdrawals": ("createdAt", ("id", "uniqueId")),
+}
+
+
+def _record_id(record: Any, keys: Tuple[str, ...]) -> Optional[str]:
+    """
+    First ID found on a record
+    """
+    for key in keys:
+        value = record.get(key)
+        if value is not None:
+            return str(value)
+    return None
+
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    """
+    Memory-map a file read-only, or None if it is empty
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class Column(Sequence[Any]):
+    """
+    Read-only, memory-mapped view of one column of a :class:`ColumnTable`
+
+    Values are decoded on access, so slicing or scanning a column only touches the pages
+    of the file that are read.
+
+    Args:
+        data: Mapped value bytes
+        offsets: Mapped end offset of each value
+        rows: Number of rows
+    """
+
+    def __init__(self, data: Optional[mmap.mmap], offsets: Optional[mmap.mmap], rows: int):
+        self._data = data
+        self._offsets = offsets
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._rows))]
+        raw = self.raw(index)
+        return json.loads(raw) if raw else None
+
+    def raw(self, index: int) -> bytes:
+        """
+        Encoded value of a row (JSON, or empty for a missing value)
+
+        Args:
+            index: Row number
+
+        Returns:
+            Raw bytes of the value
+        """
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("column index out of range")
+        if self._offsets is None or self._data is None:
+            return b""
+        end = _OFFSET.unpack_from(self._offsets, index * _OFFSET.size)[0]
+        start = _OFFSET.unpack_from(self._offsets, (index - 1) * _OFFSET.size)[0] if index else 0
+        return self._data[start:end]
+
+    def close(self) -> None:
+        """
+        Unmap the files
+        """
+        for mapped in (self._data, self._offsets):
+            if mapped is not None:
+                mapped.close()
+        self._data = self._offsets = None
+
+
+class ColumnTable:
+    """
+    Append-only table stored as one pair of files per column
+
+    Each column has a ``.dat`` file holding its JSON-encoded values back to back and a
+    ``.idx`` file holding the end offset of every value as a little-endian uint64, so
+    any cell can be read straight from a memory map. ``meta.json`` holds the column
+    names, the committed row count and the high-water mark of the synced history. It is
+    replaced atomically after the column files are written, and rows beyond its count
+    (left by a crash mid-append) are truncated when the table is opened.
+
+    Args:
+        path: Directory of the table, created if missing
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        meta: Dict[str, Any] = {"rows": 0, "columns": [], "high_water_mark": None}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as file:
+                meta = json.load(file)
+        self.rows: int = meta["rows"]
+        self.columns: List[str] = meta["columns"]
+        self.high_water_mark: Optional[Dict[str, Any]] = meta["high_water_mark"]
+        self._sizes = [self._recover(index) for index in range(len(self.columns))]
+
+    def __repr__(self) -> str:
+        return f"ColumnTable({self.path!r}, rows={self.rows}, columns={len(self.columns)})"
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _file(self, index: int, suffix: str) -> str:
+        return os.path.join(self.path, f"c{index}.{suffix}")
+
+    def _recover(self, index: int) -> int:
+        """
+        Truncate a column to the committed rows and return the size of its values
+        """
+        with open(self._file(index, "idx"), "r+b") as offsets:
+            offsets.truncate(self.rows * _OFFSET.size)
+            size = 0
+            if self.rows:
+                offsets.seek((self.rows - 1) * _OFFSET.size)
+                size = _OFFSET.unpack(offsets.read(_OFFSET.size))[0]
+        with open(self._file(index, "dat"), "r+b") as data:
+            data.truncate(size)
+        return size
+
+    def append(
+        self, records: Sequence[Any], high_water_mark: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Append records as rows
+
+        Columns are added as new keys appear; earlier rows read as missing (None) in them.
+
+        Args:
+            records: Record dicts or models
+            high_water_mark: New high-water mark, committed with the rows
+        """
+        records = [record.to_dict() if isinstance(record, Model) else record for record in records]
+        columns = list(self.columns)
+        for record in records:
+            columns.extend(key for key in record if key not in columns)
+
+        sizes = list(self._sizes)
+        for index, name in enumerate(columns):
+            if index >= len(self.columns):
+                # New column: every earlier row is missing
+                with open(self._file(index, "dat"), "wb"):
+                    pass
+                with open(self._file(index, "idx"), "wb") as offsets:
+                    offsets.write(bytes(self.rows * _OFFSET.size))
+                sizes.append(0)
+            values = bytearray()
+            ends = bytearray()
+            for record in records:
+                value = record.get(name)
+                if value is not None:
+                    values += json.dumps(
+                        value, default=json_default, separators=(",", ":")
+                    ).encode()
+                ends += _OFFSET.pack(sizes[index] + len(values))
+            with open(self._file(index, "dat"), "ab") as data:
+                data.write(values)
+                os.fsync(data.fileno())
+            with open(self._file(index, "idx"), "ab") as offsets:
+                offsets.write(ends)
+                os.fsync(offsets.fileno())
+            sizes[index] += len(values)
+
+        meta: Dict[str, Any] = {
+            "rows": self.rows + len(records),
+            "columns": columns,
+            "high_water_mark": high_water_mark or self.high_water_mark,
+        }
+        temporary = os.path.join(self.path, "meta.json.tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, os.path.join(self.path, "meta.json"))
+
+        self.rows = meta["rows"]
+        self.columns = columns
+        self.high_water_mark = meta["high_water_mark"]
+        self._sizes = sizes
+
+    def column(self, name: str) -> Column:
+        """
+        Memory-map a column
+
+        Args:
+            name: Record key
+
+        Returns:
+            Column of the rows committed so far (close it when done)
+
+        Raises:
+            KeyError: If no record had the key
+        """
+        index = self.columns.index(name) if name in self.columns else None
+        if index is None:
+            raise KeyError(name)
+        return Column(_map(self._file(index, "dat")), _map(self._file(index, "idx")), self.rows)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the rows as dicts, oldest first
+        """
+        columns = [self.column(name) for name in self.columns]
+        try:
+            for row in range(self.rows):
+                record = {}
+                for name, column in zip(self.columns, columns):
+                    value = column[row]
+                    if value is not None:
+                        record[name] = value
+                yield record
+        finally:
+            for column in columns:
+                column.close()
+
+
+class HistoryStore:
+    """
+    Local copy of account history that only fetches what is new
+
+    Each kind of history of each account and currency (or pair) is kept in its own
+    :class:`ColumnTable` under ``root``, with a high-water mark: the time of the newest
+    stored record and the IDs stored at that time. A sync pages the history newest first
+    and stops at the mark, so after the first run it usually costs a single request.
+
+    Args:
+        root: Directory of the store
+        client: ValrClient used to sync (synchronous)
+
+    Example:
+        store = HistoryStore("history", client)
+        store.sync_trades("BTCZAR")
+        prices = store.table("trades", "BTCZAR").column("price")
+    """
+
+    def __init__(self, root: str, client: Any = None):
+        self.root = root
+        self.client = client
+        self._tables: Dict[str, ColumnTable] = {}
+
+    def __repr__(self) -> str:
+        return f"HistoryStore({self.root!r})"
+
+    def table(
+        self, kind: str, key: Optional[str] = None, subaccount_id: Optional[str] = None
+    ) -> ColumnTable:
+        """
+        Table of one kind of history
+
+        Args:
+            kind: ``transactions``, ``trades``, ``deposits`` or ``withdrawals``
+            key: Currency pair for trades; currency for the others (None for all)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            ColumnTable of the history
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown history kind: {kind}")
+        account = subaccount_id or "main"
+        parts = [re.sub(r"[^A-Za-z0-9_-]", "_", part) for part in (account, kind, key or "all")]
+        path = os.path.join(self.root, *parts)
+        if path not in self._tables:
+            self._tables[path] = ColumnTable(path)
+        return self._tables[path]
+
+    def sync_transactions(
+        self, currency: Optional[str] = None, subaccount_id: Optional[str] = None
+    ) -> int:
+        """
+        Fetch and store new transactions
+
+        Args:
+            currency: Currency to filter by (None for all)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Number of new records
+        """
+        pages = self.client.account.iter_transaction_history(
+            currency=currency, subaccount_id=subaccount_id, prefetch=False
+        )
+        return self._sync(
+            self.table("transactions", currency, subaccount_id), "transactions", pages
+        )
+
+    def sync_trades(self, pair: str, subaccount_id: Optional[str] = None) -> int:
+        """
+        Fetch and store new trades of a currency pair
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Number of new records
+        """
+        pages = self.client.account.iter_trade_history(
+            pair, subaccount_id=subaccount_id, prefetch=False
+        )
+        return self._sync(self.table("trades", pair, subaccount_id), "trades", pages)
+
+    def sync_deposits(
+        self, currency: Optional[str] = None, subaccount_id: Optional[str] = None
+    ) -> int:
+        """
+        Fetch and store new deposits
+
+        Args:
+            currency: Currency to filter by (None for all)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Number of new records
+        """
+        pages = self.client.wallet.iter_deposit_history(
+            currency, subaccount_id=subaccount_id, prefetch=False
+        )
+        return self._sync(self.table("deposits", currency, subaccount_id), "deposits", pages)
+
+    def sync_withdrawals(
+        self, currency: Optional[str] = None, subaccount_id: Optional[str] = None
+    ) -> int:
+        """
+        Fetch and store new withdrawals
+
+        Args:
+            currency: Currency to filter by (None for all)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            Number of new records
+        """
+        pages = self.client.wallet.iter_withdrawal_history(
+            currency, subaccount_id=subaccount_id, prefetch=False
+        )
+        return self._sync(self.table("withdrawals", currency, subaccount_id), "withdrawals", pages)
+
+    def _sync(self, table: ColumnTable, kind: str, pages: Paginator) -> int:
+        """
+        Append the records newer than the table's high-water mark
+        """
+        time_key, id_keys = KINDS[kind]
+        mark = table.high_water_mark
+        mark_time = parse_datetime(mark["time"]) if mark else None
+        seen = set(mark["ids"]) if mark else set()
+
+        new = []
+        for record in pages:
+            moment = record_time(record, time_key)
+            if mark_time is not None and moment <= mark_time:
+                if moment < mark_time:
+                    break
+                if _record_id(record, id_keys) in seen:
+                    continue
+            new.append((moment, record))
+        if not new:
+            return 0
+
+        # Oldest first, keeping the API order of records with the same time
+        new.reverse()
+        new.sort(key=lambda entry: entry[0])
+        newest = new[-1][0]
+        ids = {_record_id(record, id_keys) for moment, record in new if moment == newest}
+        if newest == mark_time:
+            ids |= seen
+        mark = {"time": newest.isoformat(), "ids": sorted(i for i in ids if i is not None)}
+        table.append([record for _, record in new], mark)
+        return len(new)
@@ -0,0 +1,27 @@
+"""
+Typed response models for VALR API client
+"""
+
+from valr_api.models.base import Model
+from valr_api.models.models import (
+    Balance,
+    CurrencyPair,
+    Deposit,
+    MarketSummary,
+    Order,
+    Trade,
+    Withdrawal,
+)
+from valr_api.models.orderbook import OrderBook
+
+__all__ = [
+    "Balance",
+    "CurrencyPair",
+    "Deposit",
+    "MarketSummary",
+    "Model",
+    "Order",
+    "OrderBook",
+    "Trade",
+    "Withdrawal",
+]
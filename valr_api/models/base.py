@@ -0,0 +1,270 @@
+"""
+Base classes for compact VALR API response models
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Type, TypeVar
+
+M = TypeVar("M", bound="Model")
+
+
+def to_decimal(value: Any) -> Decimal:
+    """
+    Convert an API number to Decimal
+
+    Args:
+        value: Number as a string (how VALR sends prices and amounts) or a JSON number
+
+    Returns:
+        Exact decimal value
+    """
+    if isinstance(value, str):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def parse_datetime(value: Any) -> datetime:
+    """
+    Parse a VALR timestamp
+
+    Args:
+        value: ISO 8601 string such as ``2019-06-28T10:01:09.465Z``, or epoch milliseconds
+
+    Returns:
+        Timezone-aware datetime in UTC
+    """
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        # Older Pythons only accept 3 or 6 fractional digits
+        head, dot, tail = value.partition(".")
+        if not dot:
+            raise
+        digits = len(tail) - len(tail.lstrip("0123456789"))
+        value = f"{head}.{tail[:digits][:6]:0<6}{tail[digits:]}"
+        parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class Field:
+    """
+    Lazily converted model field
+
+    The raw value from the response is stored in a slot on the instance. It is converted
+    on first access and the converted value replaces the raw one, so every field is parsed
+    at most once and never if it is not read.
+
+    Args:
+        key: Key of the field in the API response
+        type: Type the value is converted to, or None to keep the raw value
+        convert: Conversion function. Defaults to ``type``.
+    """
+
+    __slots__ = ("key", "type", "convert", "name", "member")
+
+    def __init__(
+        self,
+        key: str,
+        type: Optional[type] = None,
+        convert: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.key = key
+        self.type = type
+        self.convert: Any = convert if convert is not None else type
+        self.name = ""
+        self.member: Any = None
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        try:
+            value = self.member.__get__(obj)
+        except AttributeError:
+            return None
+        if self.type is not None and value is not None and type(value) is not self.type:
+            value = self.convert(value)
+            self.member.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.member.__set__(obj, value)
+
+
+class DecimalField(Field):
+    """Field converted to :class:`~decimal.Decimal`"""
+
+    __slots__ = ()
+
+    def __init__(self, key: str):
+        super().__init__(key, Decimal, to_decimal)
+
+
+class DateTimeField(Field):
+    """Field converted to a timezone-aware :class:`~datetime.datetime` in UTC"""
+
+    __slots__ = ()
+
+    def __init__(self, key: str):
+        super().__init__(key, datetime, parse_datetime)
+
+
+class IntField(Field):
+    """Field converted to ``int``"""
+
+    __slots__ = ()
+
+    def __init__(self, key: str):
+        super().__init__(key, int)
+
+
+class RawField(Field):
+    """Field returned exactly as received (strings, booleans, nested objects)"""
+
+    __slots__ = ()
+
+    def __init__(self, key: str):
+        super().__init__(key)
+
+
+class _ModelMeta(type):
+    """
+    Gives each model one slot per declared field and a key-to-field lookup table
+    """
+
+    def __new__(mcs, name: str, bases: Tuple[type, ...], namespace: Dict[str, Any]) -> Any:
+        fields = {attr: value for attr, value in namespace.items() if isinstance(value, Field)}
+        namespace["__slots__"] = tuple(namespace.get("__slots__", ())) + tuple(
+            f"_{attr}" for attr in fields
+        )
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        by_key: Dict[str, Field] = {}
+        for base in reversed(cls.__mro__[1:]):
+            by_key.update(getattr(base, "_fields", {}))
+        for attr, field in fields.items():
+            field.name = attr
+            field.member = cls.__dict__[f"_{attr}"]
+            by_key[field.key] = field
+        cls._fields = by_key  # type: ignore[attr-defined]
+        return cls
+
+
+class Model(metaclass=_ModelMeta):
+    """
+    Compact, read-mostly view of a VALR API object
+
+    Known fields live in ``__slots__`` and are converted lazily on first access. Keys the
+    model does not declare are kept in a side dict, so no data from the response is lost.
+    Models also support read access by API key (``trade["price"]``), which returns the
+    converted value.
+
+    Args:
+        data: Object from the API response
+    """
+
+    __slots__ = ("_extra",)
+
+    _fields: Dict[str, Field] = {}
+
+    def __init__(self, data: Dict[str, Any]):
+        fields = self._fields
+        extra = None
+        for key, value in data.items():
+            field = fields.get(key)
+            if field is not None:
+                field.member.__set__(self, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self._extra = extra
+
+    def __getitem__(self, key: str) -> Any:
+        field = self._fields.get(key)
+        if field is not None:
+            return field.__get__(self)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Read a value by API key
+
+        Args:
+            key: Key of the field in the API response
+            default: Value returned when the key is absent
+
+        Returns:
+            Converted field value, raw extra value or ``default``
+        """
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def keys(self) -> Iterator[str]:
+        """
+        Iterate over the API keys present on this object
+        """
+        for key, field in self._fields.items():
+            try:
+                field.member.__get__(self)
+            except AttributeError:
+                continue
+            yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a dict keyed by API key, with converted values
+
+        Returns:
+            Dictionary representation of the object
+        """
+        return {key: self[key] for key in self.keys()}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{field.name}={field.__get__(self)!r}"
+            for key, field in self._fields.items()
+            if field.__get__(self) is not None
+        )
+        return f"{type(self).__name__}({values})"
+
+    @classmethod
+    def build(cls: Type[M], payload: Any, key: Optional[str] = None) -> Any:
+        """
+        Wrap an API response in models
+
+        Args:
+            payload: Parsed response: an object, a list of objects, or an envelope dict
+                holding the list under ``key``
+            key: Envelope key of the list, for responses such as ``{"trades": [...]}``
+
+        Returns:
+            A model, a list of models, or a copy of the envelope with its list wrapped
+        """
+        if isinstance(payload, list):
+            return [cls(item) for item in payload]
+        if key is not None and isinstance(payload, dict) and key in payload:
+            envelope = dict(payload)
+            envelope[key] = cls.build(payload[key])
+            return envelope
+        return cls(payload)
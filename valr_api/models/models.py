@@ -0,0 +1,132 @@
+"""
+Typed VALR API response models
+"""
+
+from valr_api.models.base import DateTimeField, DecimalField, IntField, Model, RawField
+
+
+class Balance(Model):
+    """
+    Account balance for one currency
+    """
+
+    currency = RawField("currency")
+    available = DecimalField("available")
+    reserved = DecimalField("reserved")
+    total = DecimalField("total")
+    updated_at = DateTimeField("updatedAt")
+
+
+class Trade(Model):
+    """
+    Executed trade, from the account or the public market trade history
+    """
+
+    id = RawField("id")
+    order_id = RawField("orderId")
+    currency_pair = RawField("currencyPair")
+    price = DecimalField("price")
+    quantity = DecimalField("quantity")
+    quote_volume = DecimalField("quoteVolume")
+    side = RawField("side")
+    taker_side = RawField("takerSide")
+    fee = DecimalField("fee")
+    fee_currency = RawField("feeCurrency")
+    sequence_id = IntField("sequenceId")
+    traded_at = DateTimeField("tradedAt")
+
+
+class Order(Model):
+    """
+    Order and its execution status
+    """
+
+    order_id = RawField("orderId")
+    customer_order_id = RawField("customerOrderId")
+    currency_pair = RawField("currencyPair")
+    side = RawField("side")
+    type = RawField("type")
+    status = RawField("status")
+    price = DecimalField("price")
+    quantity = DecimalField("quantity")
+    stop_price = DecimalField("stopPrice")
+    original_price = DecimalField("originalPrice")
+    original_quantity = DecimalField("originalQuantity")
+    remaining_quantity = DecimalField("remainingQuantity")
+    average_price = DecimalField("averagePrice")
+    filled_percentage = DecimalField("filledPercentage")
+    total = DecimalField("total")
+    total_fee = DecimalField("totalFee")
+    fee_currency = RawField("feeCurrency")
+    time_in_force = RawField("timeInForce")
+    failed_reason = RawField("failedReason")
+    created_at = DateTimeField("createdAt")
+    updated_at = DateTimeField("updatedAt")
+
+
+class MarketSummary(Model):
+    """
+    24 hour market summary for a currency pair
+    """
+
+    currency_pair = RawField("currencyPair")
+    ask_price = DecimalField("askPrice")
+    bid_price = DecimalField("bidPrice")
+    last_traded_price = DecimalField("lastTradedPrice")
+    previous_close_price = DecimalField("previousClosePrice")
+    base_volume = DecimalField("baseVolume")
+    quote_volume = DecimalField("quoteVolume")
+    high_price = DecimalField("highPrice")
+    low_price = DecimalField("lowPrice")
+    high = DecimalField("high")
+    low = DecimalField("low")
+    change_from_previous = DecimalField("changeFromPrevious")
+    created = DateTimeField("created")
+
+
+class CurrencyPair(Model):
+    """
+    Tradable currency pair and its order limits
+    """
+
+    symbol = RawField("symbol")
+    base_currency = RawField("baseCurrency")
+    quote_currency = RawField("quoteCurrency")
+    short_name = RawField("shortName")
+    active = RawField("active")
+    min_base_amount = DecimalField("minBaseAmount")
+    max_base_amount = DecimalField("maxBaseAmount")
+    min_quote_amount = DecimalField("minQuoteAmount")
+    max_quote_amount = DecimalField("maxQuoteAmount")
+    tick_size = DecimalField("tickSize")
+    base_decimal_places = IntField("baseDecimalPlaces")
+
+
+class Deposit(Model):
+    """
+    Crypto deposit
+    """
+
+    currency = RawField("currency")
+    receive_address = RawField("receiveAddress")
+    transaction_hash = RawField("transactionHash")
+    amount = DecimalField("amount")
+    status = RawField("status")
+    confirmations = IntField("confirmations")
+    confirmed = RawField("confirmed")
+    created_at = DateTimeField("createdAt")
+
+
+class Withdrawal(Model):
+    """
+    Crypto withdrawal
+    """
+
+    id = RawField("id")
+    currency = RawField("currency")
+    address = RawField("address")
+    amount = DecimalField("amount")
+    fee = DecimalField("fee")
+    transaction_hash = RawField("transactionHash")
+    status = RawField("status")
+    created_at = DateTimeField("createdAt")
@@ -0,0 +1,256 @@
+"""
+Array-backed orderbook model
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+BUY = "BUY"
+SELL = "SELL"
+
+
+def _column(levels: Sequence[Dict[str, Any]], key: str, use_numpy: bool) -> Any:
+    """
+    Extract one numeric column from a list of orderbook levels
+    """
+    values = (float(level[key]) for level in levels)
+    if use_numpy:
+        return np.fromiter(values, dtype=np.float64, count=len(levels))
+    return array("d", values)
+
+
+class OrderBook:
+    """
+    Orderbook snapshot stored as contiguous price/quantity arrays
+
+    Bids are ordered best (highest) first and asks best (lowest) first, as VALR returns
+    them. Prices and quantities are held in ``array('d')`` buffers, or NumPy ``float64``
+    arrays when NumPy is installed, so a snapshot costs four buffers rather than one dict
+    per level. The analytics helpers work directly on the arrays; with NumPy they are
+    vectorized.
+
+    Args:
+        bid_prices: Bid prices, best first
+        bid_quantities: Bid quantities, aligned with ``bid_prices``
+        ask_prices: Ask prices, best first
+        ask_quantities: Ask quantities, aligned with ``ask_prices``
+        last_change: ``LastChange`` marker of the snapshot
+        currency_pair: Currency pair of the book
+    """
+
+    __slots__ = (
+        "bid_prices",
+        "bid_quantities",
+        "ask_prices",
+        "ask_quantities",
+        "last_change",
+        "currency_pair",
+    )
+
+    def __init__(
+        self,
+        bid_prices: Any,
+        bid_quantities: Any,
+        ask_prices: Any,
+        ask_quantities: Any,
+        last_change: Any = None,
+        currency_pair: Optional[str] = None,
+    ):
+        self.bid_prices = bid_prices
+        self.bid_quantities = bid_quantities
+        self.ask_prices = ask_prices
+        self.ask_quantities = ask_quantities
+        self.last_change = last_change
+        self.currency_pair = currency_pair
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        currency_pair: Optional[str] = None,
+        use_numpy: Optional[bool] = None,
+    ) -> "OrderBook":
+        """
+        Build an orderbook from a VALR orderbook response
+
+        Args:
+            data: Response of ``get_orderbook``/``get_orderbook_full``
+            currency_pair: Currency pair of the book, if not present in the levels
+            use_numpy: Store NumPy arrays. Defaults to True when NumPy is installed.
+
+        Returns:
+            Orderbook snapshot
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        bids = data.get("Bids") or []
+        asks = data.get("Asks") or []
+        if currency_pair is None:
+            for level in bids[:1] or asks[:1]:
+                currency_pair = level.get("currencyPair")
+        return cls(
+            _column(bids, "price", use_numpy),
+            _column(bids, "quantity", use_numpy),
+            _column(asks, "price", use_numpy),
+            _column(asks, "quantity", use_numpy),
+            last_change=data.get("LastChange"),
+            currency_pair=currency_pair,
+        )
+
+    @classmethod
+    def build(cls, payload: Dict[str, Any], key: Optional[str] = None) -> "OrderBook":
+        """
+        Wrap an orderbook response; used by clients created with ``models=True``
+        """
+        return cls.from_dict(payload)
+
+    def __repr__(self) -> str:
+        return (
+            f"OrderBook({self.currency_pair}, bids={len(self.bid_prices)}, "
+            f"asks={len(self.ask_prices)}, best_bid={self.best_bid}, best_ask={self.best_ask})"
+        )
+
+    def _side(self, side: str) -> Any:
+        """
+        Price and quantity arrays consumed by a taker order on ``side``
+        """
+        side = side.upper()
+        if side == BUY:
+            return self.ask_prices, self.ask_quantities
+        if side == SELL:
+            return self.bid_prices, self.bid_quantities
+        raise ValueError(f"side must be {BUY!r} or {SELL!r}, not {side!r}")
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        """Highest bid price, or None if there are no bids"""
+        return float(self.bid_prices[0]) if len(self.bid_prices) else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        """Lowest ask price, or None if there are no asks"""
+        return float(self.ask_prices[0]) if len(self.ask_prices) else None
+
+    @property
+    def spread(self) -> Optional[float]:
+        """Best ask minus best bid, or None if either side is empty"""
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    @property
+    def mid(self) -> Optional[float]:
+        """Midpoint between best bid and best ask, or None if either side is empty"""
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def depth(self, side: str, levels: Optional[int] = None) -> float:
+        """
+        Total quantity available to a taker
+
+        Args:
+            side: Taker side, ``"BUY"`` (consumes asks) or ``"SELL"`` (consumes bids)
+            levels: Number of price levels to include. Defaults to the whole side.
+
+        Returns:
+            Summed quantity of the first ``levels`` levels
+        """
+        quantities = self._side(side)[1][:levels]
+        if np is not None and isinstance(quantities, np.ndarray):
+            return float(quantities.sum())
+        return float(sum(quantities))
+
+    def cumulative_depth(self, side: str, levels: Optional[int] = None) -> Any:
+        """
+        Running total of quantity, level by level
+
+        Args:
+            side: Taker side, ``"BUY"`` (consumes asks) or ``"SELL"`` (consumes bids)
+            levels: Number of price levels to include. Defaults to the whole side.
+
+        Returns:
+            Array of cumulative quantities, the same kind of array as the book stores
+        """
+        quantities = self._side(side)[1][:levels]
+        if np is not None and isinstance(quantities, np.ndarray):
+            return np.cumsum(quantities)
+        running = 0.0
+        cumulative = array("d", bytes(8 * len(quantities)))
+        for index, quantity in enumerate(quantities):
+            running += quantity
+            cumulative[index] = running
+        return cumulative
+
+    def vwap(self, side: str, size: float) -> Optional[float]:
+        """
+        Volume-weighted average price of filling ``size`` against the book
+
+        Args:
+            side: Taker side, ``"BUY"`` (consumes asks) or ``"SELL"`` (consumes bids)
+            size: Base quantity to fill
+
+        Returns:
+            Average fill price, or None if the book cannot fill ``size``
+        """
+        if size <= 0:
+            raise ValueError("size must be positive")
+        prices, quantities = self._side(side)
+
+        if np is not None and isinstance(quantities, np.ndarray):
+            cumulative = np.cumsum(quantities)
+            index = int(np.searchsorted(cumulative, size))
+            if index >= len(cumulative):
+                return None
+            filled = float(cumulative[index - 1]) if index else 0.0
+            notional = float(np.dot(prices[:index], quantities[:index]))
+            return (notional + float(prices[index]) * (size - filled)) / size
+
+        remaining = size
+        notional = 0.0
+        for price, quantity in zip(prices, quantities):
+            if quantity >= remaining:
+                return (notional + price * remaining) / size
+            notional += price * quantity
+            remaining -= quantity
+        return None
+
+    def slippage(self, side: str, size: float) -> Optional[float]:
+        """
+        Relative cost of filling ``size`` compared to the best price
+
+        Args:
+            side: Taker side, ``"BUY"`` (consumes asks) or ``"SELL"`` (consumes bids)
+            size: Base quantity to fill
+
+        Returns:
+            Fractional slippage (0.001 is 10 basis points worse than the touch), or None if
+            the book cannot fill ``size``
+        """
+        average = self.vwap(side, size)
+        if average is None:
+            return None
+        best = float(self._side(side)[0][0])
+        if side.upper() == BUY:
+            return (average - best) / best
+        return (best - average) / best
+
+    def to_levels(self, side: str) -> Iterable[Any]:
+        """
+        Iterate ``(price, quantity)`` pairs of one side, best first
+
+        Args:
+            side: ``"bids"`` or ``"asks"``
+        """
+        if side.lower() == "bids":
+            return zip(self.bid_prices, self.bid_quantities)
+        if side.lower() == "asks":
+            return zip(self.ask_prices, self.ask_quantities)
+        raise ValueError(f"side must be 'bids' or 'asks', not {side!r}")
@@ -0,0 +1,18 @@
+"""
+In-process state maintained incrementally from VALR API data
+"""
+
+from valr_api.state.ledger import BalanceLedger
+from valr_api.state.orderbook import LocalOrderBook, OrderBookEngine
+from valr_api.state.orders import OrderTracker, TrackedOrder
+from valr_api.state.pairs import PairInfo, PairRegistry
+
+__all__ = [
+    "BalanceLedger",
+    "LocalOrderBook",
+    "OrderBookEngine",
+    "OrderTracker",
+    "PairInfo",
+    "PairRegistry",
+    "TrackedOrder",
+]
@@ -0,0 +1,559 @@
+"""
+In-process account balances, updated incrementally from transactions
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from valr_api.exceptions import ValrApiError
+from valr_api.history.records import record_time
+from valr_api.models.base import to_decimal
+
+logger = logging.getLogger(__name__)
+
+BALANCE_FIELDS = ("available", "reserved", "total")
+
+# Transaction types whose debits settle funds reserved earlier (by a resting order or a
+# pending withdrawal), and so are taken from the reserved balance first
+RESERVED_DEBIT_TYPES = frozenset(
+    {"LIMIT_BUY", "LIMIT_SELL", "BLOCKCHAIN_SEND", "FIAT_WITHDRAWAL", "SEND"}
+)
+
+# Number of applied transaction IDs remembered per account to skip duplicates
+SEEN_IDS = 10000
+
+ZERO = Decimal(0)
+
+
+def _decimal(value: Any) -> Decimal:
+    """
+    Convert an API amount to Decimal; a missing amount is zero
+    """
+    if value is None or value == "":
+        return ZERO
+    return value if isinstance(value, Decimal) else to_decimal(value)
+
+
+def _currency(data: Any) -> Optional[str]:
+    """
+    Currency code of a balance, which balance updates nest in a currency object
+    """
+    currency = data.get("currency")
+    if isinstance(currency, dict):
+        return currency.get("symbol") or currency.get("shortName")
+    return currency
+
+
+class _Balance:
+    """
+    Balance of one currency in one account
+    """
+
+    __slots__ = ("available", "reserved", "total", "updated")
+
+    def __init__(self, available: Decimal, reserved: Decimal, total: Decimal):
+        self.available = available
+        self.reserved = reserved
+        self.total = total
+        self.updated = time.monotonic()
+
+    def as_dict(self) -> Dict[str, Decimal]:
+        return {"available": self.available, "reserved": self.reserved, "total": self.total}
+
+
+class _Account:
+    """
+    Balances of one account and its transaction high-water mark
+    """
+
+    __slots__ = ("balances", "mark", "seen")
+
+    def __init__(self) -> None:
+        self.balances: Dict[str, _Balance] = {}
+        # Time of the newest applied transaction; older ones are already in the balances
+        self.mark: Optional[datetime] = None
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+
+    def remember(self, transaction_id: str) -> bool:
+        """
+        Record an applied transaction ID; False if it was applied before
+        """
+        if transaction_id in self.seen:
+            return False
+        self.seen[transaction_id] = None
+        if len(self.seen) > SEEN_IDS:
+            self.seen.popitem(last=False)
+        return True
+
+
+class BalanceLedger:
+    """
+    Live balances per currency and account, without a request per read
+
+    Balances are seeded from ``get_balances`` and then kept current, either from
+    transactions polled from the transaction history (:meth:`sync_transactions`) or from
+    the ``BALANCE_UPDATE`` messages of the account WebSocket stream
+    (:meth:`apply_message`). Amounts are ``Decimal``. Totals follow the transactions
+    exactly. Reservations are only reported by the balances endpoint and
+    ``BALANCE_UPDATE`` messages; in between, debits that settle an order fill or a
+    withdrawal are taken from the reserved amount first.
+
+    Whenever authoritative balances are adopted, the newest transactions are marked as
+    included in them, so that syncing does not apply them a second time.
+
+    :meth:`check_drift` compares the ledger with the authoritative balances, logs any
+    difference and adopts the authoritative values. The background loop (:meth:`start`)
+    syncs transactions every ``interval`` seconds and checks drift every
+    ``drift_interval`` seconds.
+
+    All methods are thread-safe; reads return copies.
+
+    Args:
+        client: Authenticated VALR client (``ValrClient`` or, with the ``_async`` methods,
+            ``AsyncValrClient``)
+        subaccount_ids: Accounts to keep balances for, None standing for the primary
+            account. Defaults to the primary account only.
+        interval: Seconds between transaction syncs in the background loop
+        drift_interval: Seconds between drift checks in the background loop
+        tolerance: Largest difference per amount that is not reported as drift
+
+    Example:
+        ledger = BalanceLedger(client)
+        ledger.seed()
+        ledger.start()
+        if ledger.available("ZAR") >= cost:
+            client.orders.place_limit_order(...)
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        subaccount_ids: Iterable[Optional[str]] = (None,),
+        interval: float = 5.0,
+        drift_interval: float = 300.0,
+        tolerance: Decimal = ZERO,
+    ):
+        self.client = client
+        self.subaccount_ids = list(subaccount_ids)
+        self.interval = interval
+        self.drift_interval = drift_interval
+        self.tolerance = tolerance
+        self.drift_checks = 0
+        self.drifts = 0
+        self.failures = 0
+        self._accounts: Dict[Optional[str], _Account] = {
+            subaccount_id: _Account() for subaccount_id in self.subaccount_ids
+        }
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopped = threading.Event()
+
+    def __repr__(self) -> str:
+        return f"BalanceLedger(accounts={len(self._accounts)})"
+
+    def _account(self, subaccount_id: Optional[str]) -> _Account:
+        account = self._accounts.get(subaccount_id)
+        if account is None:
+            account = self._accounts[subaccount_id] = _Account()
+        return account
+
+    def balance(self, currency: str, subaccount_id: Optional[str] = None) -> Dict[str, Decimal]:
+        """
+        Balance of one currency
+
+        Args:
+            currency: Currency code (e.g., BTC)
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            ``{"available": ..., "reserved": ..., "total": ...}``, zero for unknown
+            currencies
+        """
+        with self._lock:
+            balance = self._account(subaccount_id).balances.get(currency)
+            if balance is None:
+                return {field: ZERO for field in BALANCE_FIELDS}
+            return balance.as_dict()
+
+    def available(self, currency: str, subaccount_id: Optional[str] = None) -> Decimal:
+        """
+        Available amount of one currency
+        """
+        with self._lock:
+            balance = self._account(subaccount_id).balances.get(currency)
+            return balance.available if balance is not None else ZERO
+
+    def snapshot(self, subaccount_id: Optional[str] = None) -> Dict[str, Dict[str, Decimal]]:
+        """
+        Consistent copy of all balances of one account
+
+        Returns:
+            ``{currency: {"available": ..., "reserved": ..., "total": ...}}``
+        """
+        with self._lock:
+            balances = self._account(subaccount_id).balances
+            return {currency: balance.as_dict() for currency, balance in balances.items()}
+
+    def set_balances(
+        self,
+        balances: Iterable[Any],
+        subaccount_id: Optional[str] = None,
+        since: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Decimal]]:
+        """
+        Adopt authoritative balances
+
+        Args:
+            balances: ``get_balances`` response or ``BALANCE_UPDATE`` data
+            subaccount_id: Optional subaccount ID
+            since: Monotonic time the balances were requested at. Currencies changed
+                locally after it keep their local value. Defaults to adopting all.
+
+        Returns:
+            Per currency, the amounts that differed: authoritative minus ledger
+        """
+        differences: Dict[str, Dict[str, Decimal]] = {}
+        with self._lock:
+            account = self._account(subaccount_id)
+            for data in balances:
+                currency = _currency(data)
+                if currency is None:
+                    continue
+                new = _Balance(
+                    _decimal(data.get("available")),
+                    _decimal(data.get("reserved")),
+                    _decimal(data.get("total")),
+                )
+                old = account.balances.get(currency)
+                if old is not None and since is not None and old.updated > since:
+                    continue
+                old_values = old.as_dict() if old is not None else {}
+                changed = {
+                    field: value - old_values.get(field, ZERO)
+                    for field, value in new.as_dict().items()
+                    if abs(value - old_values.get(field, ZERO)) > self.tolerance
+                }
+                if changed:
+                    differences[currency] = changed
+                account.balances[currency] = new
+        return differences
+
+    def apply_transaction(self, transaction: Any, subaccount_id: Optional[str] = None) -> bool:
+        """
+        Apply the balance changes of one transaction
+
+        Args:
+            transaction: Transaction history record or ``NEW_ACCOUNT_HISTORY_RECORD`` data
+            subaccount_id: Optional subaccount ID
+
+        Returns:
+            True if the transaction was applied, False if it was applied before
+        """
+        kind = transaction.get("transactionType")
+        if isinstance(kind, dict):
+            kind = kind.get("type")
+        changes: List[Tuple[Optional[str], Decimal]] = [
+            (transaction.get("creditCurrency"), _decimal(transaction.get("creditValue"))),
+            (transaction.get("debitCurrency"), -_decimal(transaction.get("debitValue"))),
+            (transaction.get("feeCurrency"), -_decimal(transaction.get("feeValue"))),
+        ]
+        transaction_id = transaction.get("id")
+        with self._lock:
+            account = self._account(subaccount_id)
+            if transaction_id is not None and not account.remember(str(transaction_id)):
+                return False
+            moment = record_time(transaction, "eventAt")
+            if account.mark is None or moment > account.mark:
+                account.mark = moment
+            for currency, amount in changes:
+                if currency is None or not amount:
+                    continue
+                balance = account.balances.get(currency)
+                if balance is None:
+                    balance = account.balances[currency] = _Balance(ZERO, ZERO, ZERO)
+                balance.total += amount
+                if amount < 0 and kind in RESERVED_DEBIT_TYPES and balance.reserved > 0:
+                    settled = min(balance.reserved, -amount)
+                    balance.reserved -= settled
+                    balance.available += amount + settled
+                else:
+                    balance.available += amount
+                balance.updated = time.monotonic()
+        return True
+
+    def apply_message(self, message: Dict[str, Any], subaccount_id: Optional[str] = None) -> bool:
+        """
+        Apply an account WebSocket message
+
+        ``BALANCE_UPDATE`` messages set a currency's balance. The stream sends one for
+        every change, so ``NEW_ACCOUNT_HISTORY_RECORD`` messages only mark their
+        transaction as included, and a later :meth:`sync_transactions` skips it. Other
+        messages are ignored.
+
+        Args:
+            message: Account stream message
+            subaccount_id: Account the stream belongs to
+
+        Returns:
+            True if the message changed the ledger
+        """
+        kind = message.get("type")
+        data = message.get("data") or {}
+        if kind == "BALANCE_UPDATE":
+            self.set_balances([data], subaccount_id)
+            return True
+        if kind == "NEW_ACCOUNT_HISTORY_RECORD":
+            # The stream also sends the resulting balances as BALANCE_UPDATE messages
+            with self._lock:
+                return self._include(self._account(subaccount_id), [data]) > 0
+        return False
+
+    def _include(self, account: _Account, transactions: Iterable[Any]) -> int:
+        """
+        Mark transactions as included in the balances, without applying them
+
+        Returns:
+            Number of transactions that were not marked or applied before
+        """
+        included = 0
+        for transaction in transactions:
+            transaction_id = transaction.get("id")
+            if transaction_id is not None and not account.remember(str(transaction_id)):
+                continue
+            included += 1
+            moment = record_time(transaction, "eventAt")
+            if account.mark is None or moment > account.mark:
+                account.mark = moment
+        return included
+
+    def _seeded(self, subaccount_id: Optional[str], balances: Any, newest: Any) -> None:
+        """
+        Adopt seed balances, with the transactions up to ``newest`` counted as included
+        """
+        with self._lock:
+            account = self._account(subaccount_id)
+            account.balances.clear()
+            account.seen.clear()
+            account.mark = None
+            self._include(account, newest)
+            self.set_balances(balances, subaccount_id)
+
+    def seed(self) -> None:
+        """
+        Load the balances of every account, and mark the transactions they include
+
+        The newest transactions are read right after the balances; they and everything
+        before them count as included. A transaction landing between the two requests
+        is therefore missed until the next drift check.
+
+        Raises:
+            ValrApiError: If balances or transactions cannot be fetched
+        """
+        for subaccount_id in self.subaccount_ids:
+            balances = self.client.account.get_balances(subaccount_id)
+            newest = self.client.account.get_transaction_history(
+                limit=100, subaccount_id=subaccount_id
+            )
+            self._seeded(subaccount_id, balances, newest)
+
+    async def seed_async(self) -> None:
+        """
+        Load the balances of every account (asyncio client)
+        """
+        for subaccount_id in self.subaccount_ids:
+            balances = await self.client.account.get_balances(subaccount_id)
+            newest = await self.client.account.get_transaction_history(
+                limit=100, subaccount_id=subaccount_id
+            )
+            self._seeded(subaccount_id, balances, newest)
+
+    def _is_new(self, account: _Account, transaction: Any) -> Optional[bool]:
+        """
+        Whether a polled transaction is newer than the mark; None once older ones start
+        """
+        mark = account.mark
+        if mark is None:
+            return True
+        moment = record_time(transaction, "eventAt")
+        if moment < mark:
+            return None
+        return str(transaction.get("id")) not in account.seen
+
+    def _new_transactions(self, subaccount_id: Optional[str], transactions: List[Any]) -> int:
+        """
+        Apply polled transactions, oldest first
+        """
+        transactions.reverse()
+        return sum(self.apply_transaction(each, subaccount_id) for each in transactions)
+
+    def sync_transactions(self) -> int:
+        """
+        Apply the transactions of every account since the last sync
+
+        Returns:
+            Number of transactions applied
+        """
+        applied = 0
+        for subaccount_id in self.subaccount_ids:
+            account = self._account(subaccount_id)
+            new = []
+            pages = self.client.account.iter_transaction_history(
+                subaccount_id=subaccount_id, prefetch=False
+            )
+            for transaction in pages:
+                fresh = self._is_new(account, transaction)
+                if fresh is None:
+                    break
+                if fresh:
+                    new.append(transaction)
+            applied += self._new_transactions(subaccount_id, new)
+        return applied
+
+    async def sync_transactions_async(self) -> int:
+        """
+        Apply the transactions of every account since the last sync (asyncio client)
+        """
+        applied = 0
+        for subaccount_id in self.subaccount_ids:
+            account = self._account(subaccount_id)
+            new = []
+            pages = self.client.account.aiter_transaction_history(
+                subaccount_id=subaccount_id, prefetch=False
+            )
+            async for transaction in pages:
+                fresh = self._is_new(account, transaction)
+                if fresh is None:
+                    break
+                if fresh:
+                    new.append(transaction)
+            applied += self._new_transactions(subaccount_id, new)
+        return applied
+
+    def _drifted(
+        self, subaccount_id: Optional[str], balances: Any, newest: Any, started: float
+    ) -> Dict[str, Dict[str, Decimal]]:
+        """
+        Adopt authoritative balances, count ``newest`` as included and report the difference
+        """
+        with self._lock:
+            differences = self.set_balances(balances, subaccount_id, since=started)
+            self._include(self._account(subaccount_id), newest)
+        self.drift_checks += 1
+        if differences:
+            self.drifts += 1
+            logger.warning("Balance drift on account %s: %s", subaccount_id or "main", differences)
+        return differences
+
+    def check_drift(self) -> Dict[Optional[str], Dict[str, Dict[str, Decimal]]]:
+        """
+        Compare every account with its authoritative balances and adopt them
+
+        Currencies that change locally while the balances are fetched keep their local
+        value. As in :meth:`seed`, the newest transactions are read right after the
+        balances and count as included in them.
+
+        Returns:
+            Per account with drift, per currency, authoritative minus ledger amounts
+        """
+        drift = {}
+        for subaccount_id in self.subaccount_ids:
+            started = time.monotonic()
+            balances = self.client.account.get_balances(subaccount_id)
+            newest = self.client.account.get_transaction_history(
+                limit=100, subaccount_id=subaccount_id
+            )
+            differences = self._drifted(subaccount_id, balances, newest, started)
+            if differences:
+                drift[subaccount_id] = differences
+        return drift
+
+    async def check_drift_async(self) -> Dict[Optional[str], Dict[str, Dict[str, Decimal]]]:
+        """
+        Compare every account with its authoritative balances (asyncio client)
+        """
+        drift = {}
+        for subaccount_id in self.subaccount_ids:
+            started = time.monotonic()
+            balances = await self.client.account.get_balances(subaccount_id)
+            newest = await self.client.account.get_transaction_history(
+                limit=100, subaccount_id=subaccount_id
+            )
+            differences = self._drifted(subaccount_id, balances, newest, started)
+            if differences:
+                drift[subaccount_id] = differences
+        return drift
+
+    def start(self) -> None:
+        """
+        Sync transactions every ``interval`` and check drift every ``drift_interval``
+        seconds on a daemon thread
+        """
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+
+        def run() -> None:
+            checked = time.monotonic()
+            while not self._stopped.wait(self.interval):
+                try:
+                    self.sync_transactions()
+                    if time.monotonic() - checked >= self.drift_interval:
+                        checked = time.monotonic()
+                        self.check_drift()
+                except ValrApiError as error:
+                    self.failures += 1
+                    logger.warning("Balance ledger update failed: %s", error)
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Balance ledger update failed")
+
+        self._thread = threading.Thread(target=run, name="valr-balance-ledger", daemon=True)
+        self._thread.start()
+
+    def start_async(self) -> "asyncio.Task[None]":
+        """
+        Run the background loop of :meth:`start` in a task of the running loop
+
+        Returns:
+            The update task
+        """
+        if self._task is not None and not self._task.done():
+            return self._task
+
+        async def run() -> None:
+            checked = time.monotonic()
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    await self.sync_transactions_async()
+                    if time.monotonic() - checked >= self.drift_interval:
+                        checked = time.monotonic()
+                        await self.check_drift_async()
+                except ValrApiError as error:
+                    self.failures += 1
+                    logger.warning("Balance ledger update failed: %s", error)
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Balance ledger update failed")
+
+        self._task = asyncio.ensure_future(run())
+        return self._task
+
+    def stop(self) -> None:
+        """
+        Stop the background loop
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
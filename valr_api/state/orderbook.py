@@ -0,0 +1,358 @@
+"""
+Local orderbook maintenance from incremental updates
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from valr_api.exceptions import ValrSequenceGapError
+from valr_api.models.orderbook import OrderBook
+
+SnapshotSource = Callable[[str], Union[Dict[str, Any], OrderBook]]
+
+
+class _Side:
+    """
+    One side of a local orderbook
+
+    Quantities are kept in a dict keyed by price, and the prices in a list sorted so that
+    the best price is always last. Finding a level is a binary search and reading the best
+    level is O(1). Adding or removing a level is O(n) in the worst case, because the
+    levels better than it shift by one slot. Most changes are at or near the best price,
+    so they shift few entries, and removing the best level pops the end of the list
+    without shifting anything. Asks are stored under negated keys to keep the lowest ask
+    last.
+    """
+
+    __slots__ = ("sign", "keys", "quantities")
+
+    def __init__(self, sign: float):
+        self.sign = sign
+        self.keys: List[float] = []
+        self.quantities: Dict[float, float] = {}
+
+    def clear(self) -> None:
+        self.keys.clear()
+        self.quantities.clear()
+
+    def set(self, price: float, quantity: float) -> None:
+        """
+        Set the quantity at a price level; zero removes the level
+        """
+        quantities = self.quantities
+        key = price * self.sign
+        if quantity > 0:
+            if price not in quantities:
+                keys = self.keys
+                if not keys or key > keys[-1]:
+                    keys.append(key)
+                else:
+                    keys.insert(bisect_left(keys, key), key)
+            quantities[price] = quantity
+        elif price in quantities:
+            del quantities[price]
+            keys = self.keys
+            if keys[-1] == key:
+                keys.pop()
+            else:
+                del keys[bisect_left(keys, key)]
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self.keys:
+            return None
+        price = self.keys[-1] * self.sign
+        return price, self.quantities[price]
+
+    def levels(self, depth: Optional[int] = None) -> Iterable[Tuple[float, float]]:
+        """
+        Iterate ``(price, quantity)`` pairs, best first
+        """
+        keys = self.keys
+        stop = len(keys) - depth - 1 if depth is not None and depth < len(keys) else -1
+        quantities = self.quantities
+        sign = self.sign
+        for index in range(len(keys) - 1, stop, -1):
+            price = keys[index] * sign
+            yield price, quantities[price]
+
+
+class LocalOrderBook:
+    """
+    In-memory orderbook for one currency pair, maintained from incremental updates
+
+    Updates use the shape of VALR's orderbook responses: ``Bids``/``Asks`` lists of
+    ``{"price": ..., "quantity": ...}`` levels carrying the new absolute quantity at that
+    price (zero removes the level), and a ``LastChange`` sequence marker. Updates whose
+    ``LastChange`` is not newer than the book's are ignored as stale. A gap is detected
+    when an update names the ``PreviousChange`` it builds on and that differs from the
+    book's ``LastChange``, or, for feeds with contiguous sequence numbers, when
+    ``LastChange`` does not increase by exactly one.
+
+    All methods are thread-safe.
+
+    Args:
+        currency_pair: Currency pair of the book
+        contiguous: Whether ``LastChange`` values increase by exactly one per update
+    """
+
+    def __init__(self, currency_pair: str, contiguous: bool = False):
+        self.currency_pair = currency_pair
+        self.contiguous = contiguous
+        self.last_change: Any = None
+        self._bids = _Side(1.0)
+        self._asks = _Side(-1.0)
+        self._lock = threading.RLock()
+
+    def load_snapshot(self, data: Union[Dict[str, Any], OrderBook]) -> None:
+        """
+        Replace the book with a full snapshot
+
+        Args:
+            data: Orderbook response (``get_orderbook`` or ``get_orderbook_full``), as a
+                dict or as an :class:`~valr_api.models.OrderBook` from a client that uses
+                models. Multiple entries at the same price, as in the full orderbook, are
+                summed.
+        """
+        sides: Tuple[Iterable[Tuple[Any, Any]], Iterable[Tuple[Any, Any]]]
+        if isinstance(data, OrderBook):
+            sides = (
+                zip(data.bid_prices, data.bid_quantities),
+                zip(data.ask_prices, data.ask_quantities),
+            )
+            last_change = data.last_change
+        else:
+            sides = (
+                ((level["price"], level["quantity"]) for level in data.get("Bids") or ()),
+                ((level["price"], level["quantity"]) for level in data.get("Asks") or ()),
+            )
+            last_change = data.get("LastChange")
+
+        with self._lock:
+            for side, levels in zip((self._bids, self._asks), sides):
+                totals: Dict[float, float] = {}
+                for price, quantity in levels:
+                    price = float(price)
+                    totals[price] = totals.get(price, 0.0) + float(quantity)
+                side.clear()
+                side.quantities.update(totals)
+                side.keys.extend(sorted(price * side.sign for price in totals))
+            self.last_change = last_change
+
+    def apply(self, update: Dict[str, Any], check_sequence: bool = True) -> bool:
+        """
+        Apply an incremental update
+
+        Args:
+            update: Level changes with ``LastChange`` and, optionally, ``PreviousChange``
+            check_sequence: Whether to check the update for a sequence gap. Stale updates
+                are ignored either way.
+
+        Returns:
+            True if the update was applied, False if it was stale
+
+        Raises:
+            ValrSequenceGapError: If the update does not follow the book's ``LastChange``
+        """
+        with self._lock:
+            last_change = update.get("LastChange")
+            current = self.last_change
+            if current is not None and last_change is not None:
+                if last_change <= current:
+                    return False
+                previous = update.get("PreviousChange") if check_sequence else None
+                if previous is not None and previous != current:
+                    raise ValrSequenceGapError(
+                        f"{self.currency_pair}: update builds on {previous}, book is at {current}"
+                    )
+                contiguous = check_sequence and self.contiguous and previous is None
+                if contiguous and last_change != current + 1:
+                    raise ValrSequenceGapError(
+                        f"{self.currency_pair}: expected {current + 1}, received {last_change}"
+                    )
+
+            for level in update.get("Bids") or ():
+                self._bids.set(float(level["price"]), float(level["quantity"]))
+            for level in update.get("Asks") or ():
+                self._asks.set(float(level["price"]), float(level["quantity"]))
+            if last_change is not None:
+                self.last_change = last_change
+            return True
+
+    @property
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        """Best bid as ``(price, quantity)``, or None if there are no bids"""
+        with self._lock:
+            return self._bids.best()
+
+    @property
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        """Best ask as ``(price, quantity)``, or None if there are no asks"""
+        with self._lock:
+            return self._asks.best()
+
+    def bids(self, depth: Optional[int] = None) -> List[Tuple[float, float]]:
+        """
+        Bid levels as ``(price, quantity)`` pairs, best first
+
+        Args:
+            depth: Maximum number of levels. Defaults to all levels.
+        """
+        with self._lock:
+            return list(self._bids.levels(depth))
+
+    def asks(self, depth: Optional[int] = None) -> List[Tuple[float, float]]:
+        """
+        Ask levels as ``(price, quantity)`` pairs, best first
+
+        Args:
+            depth: Maximum number of levels. Defaults to all levels.
+        """
+        with self._lock:
+            return list(self._asks.levels(depth))
+
+    def snapshot(self, depth: Optional[int] = None) -> OrderBook:
+        """
+        Copy the book into an array-backed :class:`~valr_api.models.OrderBook`
+
+        Args:
+            depth: Maximum number of levels per side. Defaults to all levels.
+
+        Returns:
+            Immutable-by-convention snapshot that supports the orderbook analytics
+        """
+        with self._lock:
+            bid_prices, bid_quantities = array("d"), array("d")
+            for price, quantity in self._bids.levels(depth):
+                bid_prices.append(price)
+                bid_quantities.append(quantity)
+            ask_prices, ask_quantities = array("d"), array("d")
+            for price, quantity in self._asks.levels(depth):
+                ask_prices.append(price)
+                ask_quantities.append(quantity)
+            return OrderBook(
+                bid_prices,
+                bid_quantities,
+                ask_prices,
+                ask_quantities,
+                last_change=self.last_change,
+                currency_pair=self.currency_pair,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._bids.keys) + len(self._asks.keys)
+
+
+class OrderBookEngine:
+    """
+    Local orderbooks for many currency pairs, kept in sync from incremental updates
+
+    Books are created on first use and seeded from a REST snapshot. When an update
+    reveals a sequence gap, the book is resynchronised from a fresh snapshot; updates
+    that predate the snapshot are then discarded as stale.
+
+    Args:
+        client: VALR client whose ``market_data.get_orderbook_full`` provides snapshots.
+            Ignored when ``snapshot_source`` is given.
+        snapshot_source: Function returning the orderbook snapshot for a pair
+        contiguous: Whether ``LastChange`` values increase by exactly one per update
+
+    Example:
+        engine = OrderBookEngine(client)
+        for update in feed:
+            engine.apply("BTCZAR", update)
+        print(engine.book("BTCZAR").best_bid)
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        snapshot_source: Optional[SnapshotSource] = None,
+        contiguous: bool = False,
+    ):
+        if snapshot_source is None:
+            if client is None:
+                raise ValueError("either client or snapshot_source is required")
+            snapshot_source = client.market_data.get_orderbook_full
+        self.snapshot_source = snapshot_source
+        self.contiguous = contiguous
+        self.resyncs = 0
+        self._books: Dict[str, LocalOrderBook] = {}
+        self._lock = threading.Lock()
+
+    def book(self, currency_pair: str) -> LocalOrderBook:
+        """
+        Get the local book for a pair, seeding it from a snapshot on first use
+
+        Args:
+            currency_pair: Currency pair (e.g., BTCZAR)
+
+        Returns:
+            Local orderbook
+        """
+        book = self._books.get(currency_pair)
+        if book is None:
+            # Fetched without the lock, so that seeding one pair does not hold up others
+            book = self._seed(currency_pair, self.snapshot_source(currency_pair))
+        return book
+
+    def _seed(
+        self, currency_pair: str, snapshot: Union[Dict[str, Any], OrderBook]
+    ) -> LocalOrderBook:
+        """
+        Store a book seeded from a snapshot, unless another thread stored one first
+        """
+        with self._lock:
+            book = self._books.get(currency_pair)
+            if book is None:
+                book = LocalOrderBook(currency_pair, self.contiguous)
+                book.load_snapshot(snapshot)
+                self._books[currency_pair] = book
+        return book
+
+    def resync(self, currency_pair: str) -> LocalOrderBook:
+        """
+        Reload a pair's book from a fresh snapshot
+
+        Args:
+            currency_pair: Currency pair (e.g., BTCZAR)
+
+        Returns:
+            Local orderbook
+        """
+        snapshot = self.snapshot_source(currency_pair)
+        book = self._books.get(currency_pair)
+        if book is None:
+            book = self._seed(currency_pair, snapshot)
+        else:
+            book.load_snapshot(snapshot)
+        self.resyncs += 1
+        return book
+
+    def apply(self, currency_pair: str, update: Dict[str, Any]) -> bool:
+        """
+        Apply an incremental update, resynchronising on a sequence gap
+
+        Args:
+            currency_pair: Currency pair (e.g., BTCZAR)
+            update: Level changes with ``LastChange`` and, optionally, ``PreviousChange``
+
+        Returns:
+            True if the update changed the book, False if it was stale
+        """
+        book = self.book(currency_pair)
+        try:
+            return book.apply(update)
+        except ValrSequenceGapError:
+            self.resync(currency_pair)
+            # The snapshot supersedes everything up to its LastChange; a newer update is
+            # applied on top of it
+            return book.apply(update, check_sequence=False)
+
+    def pairs(self) -> List[str]:
+        """
+        Currency pairs with a local book
+        """
+        return list(self._books)
@@ -0,0 +1,632 @@
+"""
+Open-order tracking from placements, fills and cancellations
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from valr_api.api.orders import batch_limit_order
+from valr_api.exceptions import ValrApiError
+from valr_api.models.base import to_decimal
+
+logger = logging.getLogger(__name__)
+
+# Order statuses after which an order no longer rests on the book
+TERMINAL_STATUSES = frozenset({"FILLED", "CANCELLED", "FAILED", "EXPIRED"})
+
+SIDES = ("BUY", "SELL")
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    """
+    Convert an optional API number to Decimal
+    """
+    if value is None or value == "":
+        return None
+    return value if isinstance(value, Decimal) else to_decimal(value)
+
+
+def _first(data: Any, *keys: str) -> Any:
+    """
+    First present value among the keys of a dict or model
+    """
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+class TrackedOrder:
+    """
+    Live state of one open order
+
+    Args:
+        order_id: Exchange order ID
+        customer_order_id: Customer order ID, if the order has one
+        pair: Currency pair
+        side: BUY or SELL
+        price: Limit price, if the order has one
+        quantity: Original base quantity
+        remaining: Base quantity still open
+        status: Last known order status
+    """
+
+    __slots__ = (
+        "order_id",
+        "customer_order_id",
+        "pair",
+        "side",
+        "price",
+        "quantity",
+        "remaining",
+        "status",
+        "fills",
+        "updated",
+    )
+
+    def __init__(
+        self,
+        order_id: str,
+        customer_order_id: Optional[str],
+        pair: str,
+        side: str,
+        price: Optional[Decimal],
+        quantity: Decimal,
+        remaining: Optional[Decimal] = None,
+        status: str = "Placed",
+    ):
+        self.order_id = order_id
+        self.customer_order_id = customer_order_id
+        self.pair = pair
+        self.side = side.upper()
+        self.price = price
+        self.quantity = quantity
+        self.remaining = remaining if remaining is not None else quantity
+        self.status = status
+        # IDs of the trades already applied, so that a fill seen twice counts once
+        self.fills: Set[str] = set()
+        self.updated = time.monotonic()
+
+    def __repr__(self) -> str:
+        return (
+            f"TrackedOrder({self.order_id}, {self.pair} {self.side} "
+            f"{self.remaining}/{self.quantity} @ {self.price})"
+        )
+
+    @property
+    def notional(self) -> Decimal:
+        """
+        Quote value of the remaining quantity at the limit price
+        """
+        return self.remaining * self.price if self.price is not None else Decimal(0)
+
+    @classmethod
+    def from_status(cls, data: Any) -> "TrackedOrder":
+        """
+        Build from an open-orders, order-status or ``ORDER_STATUS_UPDATE`` object
+        """
+        quantity = _decimal(_first(data, "originalQuantity", "quantity")) or Decimal(0)
+        return cls(
+            str(data["orderId"]),
+            data.get("customerOrderId") or None,
+            _first(data, "currencyPair", "pair"),
+            _first(data, "side", "orderSide"),
+            _decimal(_first(data, "price", "originalPrice")),
+            quantity,
+            _decimal(data.get("remainingQuantity")),
+            _first(data, "status", "orderStatusType") or "Placed",
+        )
+
+
+class OrderTracker:
+    """
+    In-memory index of open orders, kept current without polling
+
+    Orders placed through the tracker are added as soon as the exchange accepts them, and
+    are updated incrementally from fills (``NEW_ACCOUNT_TRADE`` messages or trade history),
+    order status updates (``ORDER_STATUS_UPDATE``) and cancel acknowledgements. Live
+    orders are indexed by order ID, customer order ID and pair and side, so questions
+    such as the resting exposure on a pair are answered without a network call.
+
+    The open-orders endpoint is only consulted by :meth:`reconcile`, e.g. every
+    ``reconcile_interval`` seconds on a background thread (:meth:`start`). Reconciling
+    adds orders placed elsewhere and drops orders that closed unnoticed; orders that
+    changed locally while the request was in flight, or shortly before, keep their local
+    state.
+
+    All methods are thread-safe.
+
+    Args:
+        client: Authenticated VALR client (``ValrClient`` or, with the ``a``-prefixed and
+            ``_async`` methods, ``AsyncValrClient``)
+        reconcile_interval: Seconds between background reconciliations
+        grace: Seconds for which an order added or changed locally is kept even if the
+            open-orders endpoint does not list it yet
+        subaccount_id: Subaccount whose orders are tracked (None for the primary account)
+
+    Example:
+        tracker = OrderTracker(client)
+        tracker.reconcile()
+        tracker.place_limit_order("BTCZAR", "BUY", "0.001", "1000000")
+        tracker.start()
+        for message in account_stream:
+            tracker.apply_message(message)
+        print(tracker.exposure("BTCZAR", "BUY"))
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        reconcile_interval: float = 60.0,
+        grace: float = 5.0,
+        subaccount_id: Optional[str] = None,
+    ):
+        self.client = client
+        self.reconcile_interval = reconcile_interval
+        self.grace = grace
+        self.subaccount_id = subaccount_id
+        self.reconciles = 0
+        self.failures = 0
+        self._by_id: Dict[str, TrackedOrder] = {}
+        self._by_customer_id: Dict[str, TrackedOrder] = {}
+        self._by_pair_side: Dict[Tuple[str, str], Dict[str, TrackedOrder]] = {}
+        # Orders closed locally, by monotonic close time, so that a reconciliation that
+        # started before the close does not bring them back
+        self._closed: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopped = threading.Event()
+
+    def __repr__(self) -> str:
+        return f"OrderTracker(orders={len(self)})"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_id)
+
+    def _add(self, order: TrackedOrder) -> None:
+        self._remove(order.order_id, None)
+        self._by_id[order.order_id] = order
+        if order.customer_order_id:
+            self._by_customer_id[order.customer_order_id] = order
+        self._by_pair_side.setdefault((order.pair, order.side), {})[order.order_id] = order
+
+    def _remove(self, order_id: str, closed_at: Optional[float]) -> Optional[TrackedOrder]:
+        order = self._by_id.pop(order_id, None)
+        if order is None:
+            return None
+        if order.customer_order_id:
+            self._by_customer_id.pop(order.customer_order_id, None)
+        orders = self._by_pair_side.get((order.pair, order.side))
+        if orders is not None:
+            orders.pop(order_id, None)
+            if not orders:
+                del self._by_pair_side[(order.pair, order.side)]
+        if closed_at is not None:
+            self._closed[order_id] = closed_at
+        return order
+
+    def _lookup(self, order_id: Optional[str], customer_order_id: Optional[str]) -> Optional[str]:
+        """
+        Order ID of a tracked order, found by either of its IDs
+        """
+        if order_id is not None:
+            return str(order_id) if str(order_id) in self._by_id else None
+        if customer_order_id is not None:
+            order = self._by_customer_id.get(customer_order_id)
+            return order.order_id if order is not None else None
+        return None
+
+    def get(
+        self, order_id: Optional[str] = None, customer_order_id: Optional[str] = None
+    ) -> Optional[TrackedOrder]:
+        """
+        Look up an open order by order ID or customer order ID
+
+        Returns:
+            The tracked order, or None if it is not open
+        """
+        with self._lock:
+            key = self._lookup(order_id, customer_order_id)
+            return self._by_id[key] if key is not None else None
+
+    def orders(self, pair: Optional[str] = None, side: Optional[str] = None) -> List[TrackedOrder]:
+        """
+        Open orders, optionally of one pair and side
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            side: BUY or SELL
+        """
+        with self._lock:
+            if pair is None:
+                orders: Iterable[TrackedOrder] = self._by_id.values()
+                if side is not None:
+                    orders = (order for order in orders if order.side == side.upper())
+                return list(orders)
+            sides = (side.upper(),) if side is not None else SIDES
+            return [
+                order
+                for each in sides
+                for order in self._by_pair_side.get((pair, each), {}).values()
+            ]
+
+    def exposure(self, pair: str, side: str) -> Dict[str, Any]:
+        """
+        Resting exposure of the open orders on one side of a pair
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            side: BUY or SELL
+
+        Returns:
+            ``{"orders": ..., "quantity": ..., "notional": ...}``: the number of orders,
+            their remaining base quantity and its quote value at the limit prices
+        """
+        with self._lock:
+            orders = list(self._by_pair_side.get((pair, side.upper()), {}).values())
+        return {
+            "orders": len(orders),
+            "quantity": sum((order.remaining for order in orders), Decimal(0)),
+            "notional": sum((order.notional for order in orders), Decimal(0)),
+        }
+
+    def track(self, entry: Dict[str, Any], response: Any) -> Optional[TrackedOrder]:
+        """
+        Add an order placed with the order API
+
+        Args:
+            entry: Batch entry describing the placement (see
+                :func:`~valr_api.api.orders.batch_limit_order`)
+            response: Placement response, or the batch outcome of the entry
+
+        Returns:
+            The tracked order, or None if the placement was rejected
+        """
+        if response.get("accepted") is False:
+            return None
+        order_id = _first(response, "id", "orderId")
+        if order_id is None:
+            return None
+        data = entry["data"]
+        order = TrackedOrder(
+            str(order_id),
+            response.get("customerOrderId") or data.get("customerOrderId"),
+            data["pair"],
+            data["side"],
+            _decimal(data.get("price")),
+            _decimal(data.get("quantity")) or Decimal(0),
+        )
+        with self._lock:
+            self._add(order)
+        return order
+
+    def apply_fill(self, trade: Any) -> bool:
+        """
+        Reduce an open order by one of its trades
+
+        Args:
+            trade: Account trade, from ``get_trade_history`` or a ``NEW_ACCOUNT_TRADE``
+                message
+
+        Returns:
+            True if the trade changed a tracked order, False if it was unknown or
+            already applied
+        """
+        order_id = str(trade.get("orderId"))
+        trade_id = trade.get("id")
+        quantity = _decimal(trade.get("quantity")) or Decimal(0)
+        with self._lock:
+            order = self._by_id.get(order_id)
+            if order is None:
+                return False
+            if trade_id is not None:
+                if str(trade_id) in order.fills:
+                    return False
+                order.fills.add(str(trade_id))
+            order.remaining -= quantity
+            order.updated = time.monotonic()
+            if order.remaining <= 0:
+                order.status = "Filled"
+                self._remove(order_id, order.updated)
+            else:
+                order.status = "Partially Filled"
+            return True
+
+    def apply_status(self, status: Any) -> bool:
+        """
+        Apply an order status update
+
+        Terminal statuses (filled, cancelled, failed) remove the order. Other updates add
+        the order if it is not tracked yet, or refresh its remaining quantity.
+
+        Args:
+            status: ``ORDER_STATUS_UPDATE`` data, or a ``get_order_status`` response
+
+        Returns:
+            True if the update changed the tracker
+        """
+        state = _first(status, "status", "orderStatusType") or ""
+        if state.upper() in TERMINAL_STATUSES:
+            with self._lock:
+                return self._remove(str(status["orderId"]), time.monotonic()) is not None
+        update = TrackedOrder.from_status(status)
+        with self._lock:
+            order = self._by_id.get(update.order_id)
+            if order is None:
+                if update.order_id in self._closed:
+                    return False
+                self._add(update)
+                return True
+            if update.remaining < order.remaining:
+                order.remaining = update.remaining
+            order.status = update.status
+            order.updated = update.updated
+            return True
+
+    def apply_cancel(
+        self, order_id: Optional[str] = None, customer_order_id: Optional[str] = None
+    ) -> bool:
+        """
+        Remove an order whose cancellation was acknowledged
+
+        Returns:
+            True if the order was tracked
+        """
+        with self._lock:
+            key = self._lookup(order_id, customer_order_id)
+            return key is not None and self._remove(key, time.monotonic()) is not None
+
+    def apply_message(self, message: Dict[str, Any]) -> bool:
+        """
+        Apply an account WebSocket message
+
+        ``NEW_ACCOUNT_TRADE``, ``ORDER_STATUS_UPDATE`` and ``CANCEL_ORDER_WS_RESPONSE``
+        messages update the tracker; other messages are ignored.
+
+        Returns:
+            True if the message changed the tracker
+        """
+        kind = message.get("type")
+        data = message.get("data") or {}
+        if kind == "NEW_ACCOUNT_TRADE":
+            return self.apply_fill(data)
+        if kind == "ORDER_STATUS_UPDATE":
+            return self.apply_status(data)
+        if kind == "CANCEL_ORDER_WS_RESPONSE" and data.get("orderId"):
+            return self.apply_cancel(order_id=data["orderId"])
+        return False
+
+    def place_limit_order(self, pair: str, side: str, quantity: Any, price: Any, **kwargs: Any):
+        """
+        Place a limit order and track it
+
+        Accepts the arguments of :meth:`~valr_api.api.orders.OrdersAPI.place_limit_order`.
+
+        Returns:
+            The placement response
+        """
+        kwargs.setdefault("subaccount_id", self.subaccount_id)
+        response = self.client.orders.place_limit_order(pair, side, quantity, price, **kwargs)
+        self.track(self._limit_entry(pair, side, quantity, price, response), response)
+        return response
+
+    async def aplace_limit_order(
+        self, pair: str, side: str, quantity: Any, price: Any, **kwargs: Any
+    ):
+        """
+        Place a limit order and track it (asyncio client)
+
+        Accepts the same arguments as :meth:`place_limit_order`.
+        """
+        kwargs.setdefault("subaccount_id", self.subaccount_id)
+        response = await self.client.orders.aplace_limit_order(
+            pair, side, quantity, price, **kwargs
+        )
+        self.track(self._limit_entry(pair, side, quantity, price, response), response)
+        return response
+
+    @staticmethod
+    def _limit_entry(
+        pair: str, side: str, quantity: Any, price: Any, response: Any
+    ) -> Dict[str, Any]:
+        """
+        Batch entry describing a limit order placed with keyword arguments
+        """
+        return batch_limit_order(
+            pair, side, quantity, price, customer_order_id=response.get("customerOrderId")
+        )
+
+    def place_batch_orders(self, requests: Iterable[Dict[str, Any]]):
+        """
+        Place a batch of orders and track the accepted placements
+
+        Accepts the arguments of :meth:`~valr_api.api.orders.OrdersAPI.place_batch_orders`.
+        Accepted cancellations in the batch remove their orders.
+
+        Returns:
+            The batch response
+        """
+        requests = list(requests)
+        response = self.client.orders.place_batch_orders(requests, self.subaccount_id)
+        self._track_batch(requests, response)
+        return response
+
+    async def aplace_batch_orders(self, requests: Iterable[Dict[str, Any]]):
+        """
+        Place a batch of orders and track the accepted placements (asyncio client)
+        """
+        requests = list(requests)
+        response = await self.client.orders.aplace_batch_orders(requests, self.subaccount_id)
+        self._track_batch(requests, response)
+        return response
+
+    def _track_batch(self, requests: List[Dict[str, Any]], response: Any) -> None:
+        """
+        Apply the outcomes of a batch, which are in request order
+        """
+        outcomes = response.get("outcomes") or []
+        for entry, outcome in zip(requests, outcomes):
+            if entry["type"] == "CANCEL_ORDER":
+                if outcome.get("accepted"):
+                    data = entry["data"]
+                    self.apply_cancel(data.get("orderId"), data.get("customerOrderId"))
+            elif entry["type"] != "PLACE_MARKET":
+                self.track(entry, outcome)
+
+    def cancel_order(
+        self, pair: str, order_id: Optional[str] = None, customer_order_id: Optional[str] = None
+    ):
+        """
+        Cancel an order and stop tracking it once the cancellation is acknowledged
+
+        Accepts the arguments of :meth:`~valr_api.api.orders.OrdersAPI.cancel_order`.
+        """
+        response = self.client.orders.cancel_order(
+            pair, order_id, customer_order_id, self.subaccount_id
+        )
+        self.apply_cancel(order_id, customer_order_id)
+        return response
+
+    async def acancel_order(
+        self, pair: str, order_id: Optional[str] = None, customer_order_id: Optional[str] = None
+    ):
+        """
+        Cancel an order and stop tracking it (asyncio client)
+        """
+        response = await self.client.orders.cancel_order(
+            pair, order_id, customer_order_id, self.subaccount_id
+        )
+        self.apply_cancel(order_id, customer_order_id)
+        return response
+
+    def _reconcile(self, open_orders: Iterable[Any], started: float) -> None:
+        """
+        Replace the tracked state with the open orders fetched since ``started``
+        """
+        fetched = {order.order_id: order for order in map(TrackedOrder.from_status, open_orders)}
+        with self._lock:
+            for order_id, order in list(self._by_id.items()):
+                # Placements are acknowledged before they are listed as open, so
+                # recent ones are kept for a grace period
+                if order_id not in fetched and order.updated < started - self.grace:
+                    self._remove(order_id, None)
+            for order_id, order in fetched.items():
+                if order_id in self._closed:
+                    continue
+                local = self._by_id.get(order_id)
+                if local is None or local.updated < started:
+                    if local is not None:
+                        order.fills = local.fills
+                    self._add(order)
+            # Closures older than this fetch can no longer be undone by it
+            self._closed = {
+                order_id: closed_at
+                for order_id, closed_at in self._closed.items()
+                if closed_at >= started
+            }
+            self.reconciles += 1
+
+    def reconcile(self) -> None:
+        """
+        Bring the tracker in line with the open-orders endpoint
+
+        Raises:
+            ValrApiError: If the open orders cannot be fetched
+        """
+        started = time.monotonic()
+        self._reconcile(self.client.orders.get_open_orders(self.subaccount_id), started)
+
+    async def reconcile_async(self) -> None:
+        """
+        Bring the tracker in line with the open-orders endpoint (asyncio client)
+        """
+        started = time.monotonic()
+        self._reconcile(await self.client.orders.get_open_orders(self.subaccount_id), started)
+
+    def sync_fills(self, pair: str, limit: int = 100) -> int:
+        """
+        Apply the most recent trades of a pair from the trade history
+
+        For setups without an account stream: fills already applied are skipped.
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            limit: Number of recent trades to read
+
+        Returns:
+            Number of trades that changed a tracked order
+        """
+        history = self.client.account.get_trade_history(
+            pair, limit=limit, subaccount_id=self.subaccount_id
+        )
+        trades = history.get("trades", []) if isinstance(history, dict) else history
+        return sum(self.apply_fill(trade) for trade in trades)
+
+    def start(self) -> None:
+        """
+        Reconcile now and then every ``reconcile_interval`` seconds on a daemon thread
+        """
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+
+        def run() -> None:
+            while True:
+                try:
+                    self.reconcile()
+                except ValrApiError as error:
+                    self.failures += 1
+                    logger.warning("Open-order reconciliation failed: %s", error)
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Open-order reconciliation failed")
+                if self._stopped.wait(self.reconcile_interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="valr-order-tracker", daemon=True)
+        self._thread.start()
+
+    def start_async(self) -> "asyncio.Task[None]":
+        """
+        Reconcile now and then every ``reconcile_interval`` seconds in a task of the
+        running loop
+
+        Returns:
+            The reconciliation task
+        """
+        if self._task is not None and not self._task.done():
+            return self._task
+
+        async def run() -> None:
+            while True:
+                try:
+                    await self.reconcile_async()
+                except ValrApiError as error:
+                    self.failures += 1
+                    logger.warning("Open-order reconciliation failed: %s", error)
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Open-order reconciliation failed")
+                await asyncio.sleep(self.reconcile_interval)
+
+        self._task = asyncio.ensure_future(run())
+        return self._task
+
+    def stop(self) -> None:
+        """
+        Stop background reconciliation
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,397 @@
+"""
+Indexed registry of currency-pair metadata
+"""
+
+import threading
+import time
+from decimal import ROUND_DOWN, Decimal
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from valr_api.exceptions import ValrValidationError
+from valr_api.models.base import to_decimal
+
+Number = Union[Decimal, str, int, float]
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    """
+    Convert an optional API number to Decimal
+    """
+    if value is None or value == "":
+        return None
+    return value if isinstance(value, Decimal) else to_decimal(value)
+
+
+def _to_decimal(value: Number) -> Decimal:
+    """
+    Convert a caller-supplied number to Decimal without float artefacts
+    """
+    return value if isinstance(value, Decimal) else to_decimal(value)
+
+
+def _order_type(name: str) -> str:
+    """
+    Normalise an order type name: ``PLACE_LIMIT``, ``limit`` and ``LIMIT`` are all ``LIMIT``
+    """
+    name = name.upper()
+    return name[6:] if name.startswith("PLACE_") else name
+
+
+def _quantum(value: Decimal) -> Optional[Decimal]:
+    """
+    Exponent that ``Decimal.quantize`` rounds to a multiple of ``value`` with
+
+    Only sizes of 1, 0.1, 0.01, ... have one; larger powers of ten and other sizes return
+    None. The size is normalised first, so ``0.10`` quantizes to tenths.
+    """
+    normalized = value.normalize()
+    exponent = normalized.as_tuple().exponent
+    if normalized.as_tuple().digits == (1,) and isinstance(exponent, int) and exponent <= 0:
+        return normalized
+    return None
+
+
+class PairInfo:
+    """
+    Trading rules of one currency pair, with limits held as precomputed Decimals
+
+    Args:
+        data: Currency pair object from ``get_currency_pairs``
+        order_types: Order types supported on the pair (e.g., ``{"LIMIT", "MARKET"}``).
+            None means unknown, in which case order types are not validated.
+    """
+
+    __slots__ = (
+        "symbol",
+        "base_currency",
+        "quote_currency",
+        "active",
+        "min_base_amount",
+        "max_base_amount",
+        "min_quote_amount",
+        "max_quote_amount",
+        "tick_size",
+        "step_size",
+        "order_types",
+        "data",
+        "_tick_exponent",
+    )
+
+    def __init__(self, data: Dict[str, Any], order_types: Optional[Iterable[str]] = None):
+        self.data = data
+        self.symbol: str = data["symbol"]
+        self.base_currency: Optional[str] = data.get("baseCurrency")
+        self.quote_currency: Optional[str] = data.get("quoteCurrency")
+        self.active = bool(data.get("active", True))
+        self.min_base_amount = _decimal(data.get("minBaseAmount"))
+        self.max_base_amount = _decimal(data.get("maxBaseAmount"))
+        self.min_quote_amount = _decimal(data.get("minQuoteAmount"))
+        self.max_quote_amount = _decimal(data.get("maxQuoteAmount"))
+        self.tick_size = _decimal(data.get("tickSize"))
+        places = data.get("baseDecimalPlaces")
+        self.step_size = Decimal(1).scaleb(-int(places)) if places is not None else None
+        self.order_types: Optional[FrozenSet[str]] = (
+            frozenset(_order_type(name) for name in order_types)
+            if order_types is not None
+            else None
+        )
+        # Tick sizes of 1, 0.1, 0.01, ... (like every step size) quantize with a single
+        # Decimal.quantize call
+        tick = self.tick_size
+        self._tick_exponent = _quantum(tick) if tick else None
+
+    def __repr__(self) -> str:
+        return f"PairInfo({self.symbol}, tick={self.tick_size}, step={self.step_size})"
+
+    @staticmethod
+    def _quantize(
+        value: Decimal, size: Optional[Decimal], exponent: Optional[Decimal], rounding: str
+    ) -> Decimal:
+        if size is None or not size:
+            return value
+        if exponent is not None:
+            return value.quantize(exponent, rounding=rounding)
+        return (value / size).to_integral_value(rounding=rounding) * size
+
+    def quantize_price(self, price: Number, rounding: str = ROUND_DOWN) -> Decimal:
+        """
+        Round a price to the pair's tick size
+
+        Args:
+            price: Price
+            rounding: ``decimal`` rounding mode. Defaults to rounding towards zero.
+        """
+        return self._quantize(_to_decimal(price), self.tick_size, self._tick_exponent, rounding)
+
+    def quantize_quantity(self, quantity: Number, rounding: str = ROUND_DOWN) -> Decimal:
+        """
+        Round a base quantity to the pair's step size (its base decimal places)
+
+        Args:
+            quantity: Base quantity
+            rounding: ``decimal`` rounding mode. Defaults to rounding towards zero.
+        """
+        return self._quantize(_to_decimal(quantity), self.step_size, self.step_size, rounding)
+
+    def problems(
+        self, quantity: Number, price: Optional[Number] = None, order_type: str = "LIMIT"
+    ) -> List[str]:
+        """
+        Check an order against the pair's rules
+
+        Args:
+            quantity: Base quantity
+            price: Limit price, if the order has one
+            order_type: Order type (e.g., ``LIMIT``, ``MARKET``)
+
+        Returns:
+            Descriptions of every rule the order breaks; empty if the order is valid
+        """
+        problems = []
+        if not self.active:
+            problems.append(f"{self.symbol} is not active")
+        order_type = _order_type(order_type)
+        if self.order_types is not None and order_type not in self.order_types:
+            problems.append(f"{order_type} orders are not supported on {self.symbol}")
+
+        quantity = _to_decimal(quantity)
+        if quantity <= 0:
+            problems.append(f"quantity {quantity} must be positive")
+        if self.min_base_amount is not None and quantity < self.min_base_amount:
+            problems.append(f"quantity {quantity} is below the minimum {self.min_base_amount}")
+        if self.max_base_amount is not None and quantity > self.max_base_amount:
+            problems.append(f"quantity {quantity} is above the maximum {self.max_base_amount}")
+        if self.step_size is not None and quantity % self.step_size:
+            problems.append(f"quantity {quantity} is not a multiple of {self.step_size}")
+
+        if price is not None:
+            price = _to_decimal(price)
+            if price <= 0:
+                problems.append(f"price {price} must be positive")
+            if self.tick_size and price % self.tick_size:
+                problems.append(f"price {price} is not a multiple of {self.tick_size}")
+            total = quantity * price
+            if self.min_quote_amount is not None and total < self.min_quote_amount:
+                problems.append(f"total {total} is below the minimum {self.min_quote_amount}")
+            if self.max_quote_amount is not None and total > self.max_quote_amount:
+                problems.append(f"total {total} is above the maximum {self.max_quote_amount}")
+        return problems
+
+
+class PairRegistry:
+    """
+    Currency-pair metadata indexed by symbol, base currency and quote currency
+
+    The registry is built from ``get_currency_pairs`` and ``get_order_types``. Limits,
+    tick sizes and step sizes are converted to Decimal once, when a pair is loaded, so
+    lookups are dict accesses and validation does no parsing. :meth:`refresh` fetches
+    both endpoints again but only rebuilds pairs whose data changed, and drops delisted
+    pairs.
+
+    Lookups are safe while another thread refreshes the registry.
+
+    Args:
+        client: VALR client used to fetch pairs and order types
+        max_age: Seconds after which :meth:`refresh_if_stale` refreshes the registry
+
+    Example:
+        registry = PairRegistry(client)
+        registry.refresh()
+        registry.validate("BTCZAR", "0.0012", "1000001", "LIMIT")
+        price = registry["BTCZAR"].quantize_price("1000001.37")
+    """
+
+    def __init__(self, client: Any = None, max_age: float = 3600.0):
+        self.client = client
+        self.max_age = max_age
+        self.refreshed_at: Optional[float] = None
+        self._pairs: Dict[str, PairInfo] = {}
+        self._by_base: Dict[str, Dict[str, PairInfo]] = {}
+        self._by_quote: Dict[str, Dict[str, PairInfo]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._pairs
+
+    def __getitem__(self, symbol: str) -> PairInfo:
+        try:
+            return self._pairs[symbol]
+        except KeyError:
+            raise ValrValidationError(f"Unknown currency pair {symbol}") from None
+
+    def get(self, symbol: str) -> Optional[PairInfo]:
+        """
+        Pair by symbol, or None if unknown
+        """
+        return self._pairs.get(symbol)
+
+    def symbols(self) -> List[str]:
+        """
+        All known pair symbols
+        """
+        return list(self._pairs)
+
+    def by_base(self, currency: str) -> List[PairInfo]:
+        """
+        Pairs whose base currency is ``currency`` (e.g., every BTC pair)
+        """
+        return list(self._by_base.get(currency, {}).values())
+
+    def by_quote(self, currency: str) -> List[PairInfo]:
+        """
+        Pairs quoted in ``currency`` (e.g., every ZAR pair)
+        """
+        return list(self._by_quote.get(currency, {}).values())
+
+    def load(
+        self,
+        pairs: Iterable[Any],
+        order_types: Optional[Any] = None,
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Update the registry from API responses
+
+        Pairs whose data and order types are unchanged are kept as they are.
+
+        Args:
+            pairs: Response of ``get_currency_pairs`` (dicts or models)
+            order_types: Response of ``get_order_types``, in either of its shapes
+                (``[{"currencyPair": ..., "orderTypes": [...]}]`` or
+                ``[{"orderType": ..., "supportedCurrencyPairs": [...]}]``)
+
+        Returns:
+            Symbols added, changed and removed
+        """
+        types_by_pair = _order_types_by_pair(order_types) if order_types is not None else {}
+        added, changed = [], []
+        seen = set()
+
+        with self._lock:
+            for item in pairs:
+                data = item if isinstance(item, dict) else item.to_dict()
+                symbol = data["symbol"]
+                seen.add(symbol)
+                types = types_by_pair.get(symbol)
+                current = self._pairs.get(symbol)
+                if current is not None:
+                    if current.data == data and (types is None or current.order_types == types):
+                        continue
+                    if types is None:
+                        types = current.order_types
+                    # Replaced in place, so concurrent lookups never miss the pair
+                    self._unindex_currencies(current)
+                    changed.append(symbol)
+                else:
+                    added.append(symbol)
+                self._index(PairInfo(data, types))
+
+            removed = [symbol for symbol in self._pairs if symbol not in seen]
+            for symbol in removed:
+                self._unindex_currencies(self._pairs.pop(symbol))
+            self.refreshed_at = time.monotonic()
+        return added, changed, removed
+
+    def refresh(self) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Fetch pairs and order types and apply the changes
+
+        Returns:
+            Symbols added, changed and removed
+        """
+        if self.client is None:
+            raise ValueError("PairRegistry needs a client to refresh")
+        pairs = self.client.public.get_currency_pairs()
+        order_types = self.client.public.get_order_types()
+        return self.load(pairs, order_types)
+
+    def refresh_if_stale(self) -> bool:
+        """
+        Refresh if the registry is empty or older than ``max_age``
+
+        Returns:
+            True if the registry was refreshed
+        """
+        if self.refreshed_at is not None and time.monotonic() - self.refreshed_at < self.max_age:
+            return False
+        self.refresh()
+        return True
+
+    def validate(
+        self,
+        pair: str,
+        quantity: Number,
+        price: Optional[Number] = None,
+        order_type: str = "LIMIT",
+    ) -> PairInfo:
+        """
+        Check an order against its pair's rules
+
+        Args:
+            pair: Currency pair (e.g., BTCZAR)
+            quantity: Base quantity
+            price: Limit price, if the order has one
+            order_type: Order type (e.g., ``LIMIT``, ``MARKET``)
+
+        Returns:
+            The pair's rules
+
+        Raises:
+            ValrValidationError: If the pair is unknown or the order breaks a rule
+        """
+        info = self[pair]
+        problems = info.problems(quantity, price, order_type)
+        if problems:
+            raise ValrValidationError(f"Invalid {pair} order: " + "; ".join(problems))
+        return info
+
+    def quantize(
+        self, pair: str, quantity: Number, price: Optional[Number] = None
+    ) -> Tuple[Decimal, Optional[Decimal]]:
+        """
+        Round a quantity and price down to the pair's step and tick sizes
+
+        Returns:
+            ``(quantity, price)``; price is None when none was given
+        """
+        info = self[pair]
+        return (
+            info.quantize_quantity(quantity),
+            info.quantize_price(price) if price is not None else None,
+        )
+
+    def _index(self, info: PairInfo) -> None:
+        self._pairs[info.symbol] = info
+        if info.base_currency:
+            self._by_base.setdefault(info.base_currency, {})[info.symbol] = info
+        if info.quote_currency:
+            self._by_quote.setdefault(info.quote_currency, {})[info.symbol] = info
+
+    def _unindex_currencies(self, info: PairInfo) -> None:
+        for index, currency in (
+            (self._by_base, info.base_currency),
+            (self._by_quote, info.quote_currency),
+        ):
+            if currency and currency in index:
+                index[currency].pop(info.symbol, None)
+                if not index[currency]:
+                    del index[currency]
+
+
+def _order_types_by_pair(order_types: Any) -> Dict[str, FrozenSet[str]]:
+    """
+    Map each pair to its supported order types, from either response shape
+    """
+    by_pair: Dict[str, set] = {}
+    for entry in order_types:
+        if "currencyPair" in entry:
+            by_pair.setdefault(entry["currencyPair"], set()).update(
+                _order_type(name) for name in entry.get("orderTypes", ())
+            )
+        elif "orderType" in entry:
+            name = _order_type(entry["orderType"])
+            for symbol in entry.get("supportedCurrencyPairs", ()):
+                by_pair.setdefault(symbol, set()).add(name)
+    return {symbol: frozenset(names) for symbol, names in by_pair.items()}
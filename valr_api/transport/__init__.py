@@ -0,0 +1,39 @@
+"""
+Transport layer for VALR API clients
+"""
+
+from valr_api.transport.aiohttp_backend import AiohttpBackend
+from valr_api.transport.base import (
+    HttpResponse,
+    PreparedRequest,
+    Timeout,
+    Transport,
+    canonical_query,
+    raise_for_status,
+    socket_options,
+    split_timeout,
+)
+from valr_api.transport.httpx_backend import AsyncHttpxBackend, HttpxBackend
+from valr_api.transport.mock_backend import AsyncMockBackend, MockBackend
+from valr_api.transport.requests_backend import RequestsBackend
+from valr_api.transport.urllib3_backend import Urllib3Backend
+from valr_api.transport.warmup import ConnectionWarmer
+
+__all__ = [
+    "AiohttpBackend",
+    "AsyncHttpxBackend",
+    "AsyncMockBackend",
+    "ConnectionWarmer",
+    "HttpResponse",
+    "HttpxBackend",
+    "MockBackend",
+    "PreparedRequest",
+    "RequestsBackend",
+    "Timeout",
+    "Transport",
+    "Urllib3Backend",
+    "canonical_query",
+    "raise_for_status",
+    "socket_options",
+    "split_timeout",
+]
@@ -0,0 +1,95 @@
+"""
+Transport backend built on aiohttp
+"""
+
+import asyncio
+from typing import Optional
+
+from valr_api.exceptions import ValrConnectionError
+from valr_api.transport.base import HttpResponse, PreparedRequest, Timeout
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None  # type: ignore[assignment]
+    yarl = None  # type: ignore[assignment]
+
+
+class AiohttpBackend:
+    """
+    Asynchronous backend using a bounded pool of keep-alive aiohttp connections
+
+    Requires the optional ``aiohttp`` dependency (``pip install valr-api[async]``).
+
+    Args:
+        pool_size: Maximum number of simultaneously open connections
+        keepalive_timeout: Seconds an idle pooled connection is kept open
+    """
+
+    def __init__(self, pool_size: int = 100, keepalive_timeout: float = 30.0):
+        if aiohttp is None:
+            raise ImportError(
+                "AiohttpBackend requires aiohttp; install it with `pip install valr-api[async]`"
+            )
+
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.session: Optional["aiohttp.ClientSession"] = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """
+        Get the pooled HTTP session, creating it on first use
+
+        The session is created lazily because it must be bound to a running event loop.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def send(self, request: PreparedRequest, timeout: Timeout) -> HttpResponse:
+        """
+        Send a prepared request
+
+        Args:
+            request: Prepared request
+            timeout: Request timeout in seconds, or a ``(connect, read)`` pair
+
+        Returns:
+            Backend-independent response
+
+        Raises:
+            ValrConnectionError: If the request could not be completed
+        """
+        session = self._get_session()
+        if isinstance(timeout, tuple):
+            client_timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        else:
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+        try:
+            async with session.request(
+                request.method,
+                # Already encoded (and signed) by the transport; sent as is
+                yarl.URL(request.url, encoded=True),
+                headers=request.headers,
+                data=request.body,
+                timeout=client_timeout,
+            ) as response:
+                content = await response.read()
+                return HttpResponse(response.status, content, response.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise ValrConnectionError(f"Request failed: {str(e)}")
+
+    async def close(self) -> None:
+        """
+        Close the pooled HTTP session and all of its connections
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
@@ -0,0 +1,561 @@
+"""
+Transport layer shared by the VALR API clients
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
+from urllib.parse import quote, urlencode
+
+from valr_api.exceptions import (
+    ValrApiError,
+    ValrAuthenticationError,
+    ValrRateLimitError,
+    ValrRequestError,
+    ValrServerError,
+)
+from valr_api.utils.auth import Signer, get_timestamp
+from valr_api.utils.cache import CacheKey, ResponseCache
+from valr_api.utils.clock import ClockSync
+from valr_api.utils.codec import JsonCodec, get_default_codec
+from valr_api.utils.ratelimit import RateLimiter
+from valr_api.utils.retry import RetryPolicy
+from valr_api.utils.singleflight import SingleFlight
+from valr_api.utils.wirelog import WireLogger
+
+ResponseData = Union[Dict[str, Any], List[Dict[str, Any]]]
+# Seconds for the whole request, or separate (connect, read) seconds
+Timeout = Union[float, Tuple[float, float]]
+
+
+class PreparedRequest:
+    """
+    A fully built request, ready to be handed to a backend
+
+    Args:
+        method: HTTP method (GET, POST, PUT, DELETE)
+        url: Absolute request URL, including the encoded query string
+        path: API endpoint path
+        params: URL parameters, as given; they are already encoded into ``url``, so
+            backends must not encode them again
+        headers: Request headers. Backends must treat these as read-only, because
+            requests without authentication share a single precomputed header dict.
+        body: Serialized request body, exactly as signed
+    """
+
+    __slots__ = ("method", "url", "path", "params", "headers", "body")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        path: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        body: Optional[bytes] = None,
+    ):
+        self.method = method
+        self.url = url
+        self.path = path
+        self.params = params
+        self.headers = headers if headers is not None else {}
+        self.body = body
+
+    def __repr__(self) -> str:
+        return f"PreparedRequest({self.method} {self.url})"
+
+
+def canonical_query(params: Optional[Mapping[str, Any]]) -> str:
+    """
+    Encode URL parameters as a canonical query string
+
+    Parameters are sorted by name and parameters set to None are left out, so the same
+    parameters always encode to the same string. Booleans are written as ``true`` and
+    ``false``.
+
+    Args:
+        params: URL parameters
+
+    Returns:
+        Query string without the leading ``?`` (empty if there are no parameters)
+    """
+    if not params:
+        return ""
+    items = [
+        (name, ("true" if value else "false") if isinstance(value, bool) else value)
+        for name, value in sorted(params.items())
+        if value is not None
+    ]
+    return urlencode(items, quote_via=quote)
+
+
+def split_timeout(timeout: Timeout) -> Tuple[float, float]:
+    """
+    Split a request timeout into its connect and read parts
+
+    Args:
+        timeout: Seconds for both parts, or a ``(connect, read)`` pair
+
+    Returns:
+        ``(connect, read)`` seconds
+    """
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+def socket_options(tcp_nodelay: bool = True, keepalive: bool = True) -> List[Tuple[int, int, int]]:
+    """
+    Socket options for pooled API connections
+
+    Args:
+        tcp_nodelay: Disable Nagle's algorithm, so small requests are sent without delay
+        keepalive: Enable TCP keep-alive probes on idle pooled connections
+
+    Returns:
+        ``(level, option, value)`` triples, as taken by urllib3 and httpx
+    """
+    return [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, int(tcp_nodelay)),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(keepalive)),
+    ]
+
+
+class HttpResponse:
+    """
+    Backend-independent HTTP response
+
+    Args:
+        status_code: HTTP status code
+        content: Raw response body
+        headers: Response headers
+    """
+
+    __slots__ = ("status_code", "content", "headers")
+
+    def __init__(self, status_code: int, content: bytes = b"", headers: Optional[Mapping] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+
+    @property
+    def text(self) -> str:
+        """Response body decoded as UTF-8, computed on access"""
+        return self.content.decode("utf-8", "replace")
+
+    @property
+    def ok(self) -> bool:
+        """Whether the status code indicates success"""
+        return self.status_code < 400
+
+
+def raise_for_status(status_code: int, text: str, headers: Optional[Mapping] = None) -> None:
+    """
+    Raise the exception matching an unsuccessful VALR API response
+
+    Args:
+        status_code: HTTP status code of the response
+        text: Response body
+        headers: Response headers, kept on the exception (e.g., for ``Retry-After``)
+
+    Raises:
+        ValrAuthenticationError: If authentication fails (401)
+        ValrRateLimitError: If rate limit is exceeded (429)
+        ValrRequestError: If request is invalid (4xx)
+        ValrServerError: If server error occurs (5xx)
+        ValrApiError: For any other API error
+    """
+    if status_code == 401:
+        raise ValrAuthenticationError(
+            f"Authentication failed: {text}",
+            status_code=status_code,
+            response=text,
+            headers=headers,
+        )
+    elif status_code == 429:
+        raise ValrRateLimitError(
+            f"Rate limit exceeded: {text}",
+            status_code=status_code,
+            response=text,
+            headers=headers,
+        )
+    elif 400 <= status_code < 500:
+        raise ValrRequestError(
+            f"Request error: {text}",
+            status_code=status_code,
+            response=text,
+            headers=headers,
+        )
+    elif status_code >= 500:
+        raise ValrServerError(
+            f"Server error: {text}",
+            status_code=status_code,
+            response=text,
+            headers=headers,
+        )
+    else:
+        raise ValrApiError(
+            f"API error: {text}",
+            status_code=status_code,
+            response=text,
+            headers=headers,
+        )
+
+
+class Transport:
+    """
+    Single request path for the VALR API clients
+
+    The transport builds requests (URL, headers, signature and body), hands them to a
+    pluggable backend that performs the I/O, and turns the backend's response into
+    parsed data or a VALR exception. Headers that do not change between requests are
+    computed once, when the transport is created.
+
+    Backends implement ``send(request, timeout) -> HttpResponse``, either as a regular
+    method (used by :meth:`request`) or as a coroutine (used by :meth:`request_async`).
+
+    Args:
+        backend: Backend that performs the HTTP I/O
+        api_key: VALR API key
+        api_secret: VALR API secret
+        base_url: VALR API base URL
+        timeout: Request timeout in seconds, or a ``(connect, read)`` pair
+        wire_log: Debug logger for request/response pairs. Defaults to a
+            :class:`~valr_api.utils.wirelog.WireLogger` on the ``valr_api.wire`` logger.
+        codec: JSON serializer/deserializer. Defaults to orjson when installed and the
+            standard library otherwise.
+        rate_limiter: Client-side rate limiter that delays requests before they are
+            built and signed. Defaults to no limiting.
+        retry_policy: When to retry failed requests. Defaults to a
+            :class:`~valr_api.utils.retry.RetryPolicy` that retries GETs on network errors,
+            429 and 5xx responses.
+        cache: Cache for responses of public reference data endpoints. Defaults to no
+            caching.
+        coalesce: Whether concurrent identical public GETs share one HTTP call
+        clock: Server clock estimate that signed requests are time-stamped with.
+            Defaults to the local wall clock.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        base_url: str = "https://api.valr.com",
+        timeout: Timeout = 30,
+        wire_log: Optional[WireLogger] = None,
+        codec: Optional[JsonCodec] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        clock: Optional[ClockSync] = None,
+    ):
+        self.backend = backend
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.signer = Signer(api_secret) if api_secret else None
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.wire_log = wire_log if wire_log is not None else WireLogger()
+        self.codec = codec if codec is not None else get_default_codec()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.clock = clock
+        # Background refresh tasks, referenced until they finish
+        self._refreshes: "Set[asyncio.Future[None]]" = set()
+
+        # Static headers, shared by every request of the matching kind
+        self._headers = {"Accept": "application/json"}
+        self._body_headers = {**self._headers, "Content-Type": "application/json"}
+        if api_key:
+            self._signed_headers = {**self._headers, "X-VALR-API-KEY": api_key}
+            self._signed_body_headers = {**self._body_headers, "X-VALR-API-KEY": api_key}
+
+    def prepare(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        auth_required: bool = False,
+        subaccount_id: Optional[str] = None,
+    ) -> PreparedRequest:
+        """
+        Build a request for the VALR API
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint path
+            params: URL parameters
+            data: Request body for POST/PUT requests
+            auth_required: Whether authentication is required
+            subaccount_id: Optional subaccount ID for requests
+
+        Returns:
+            Prepared request
+
+        Raises:
+            ValrAuthenticationError: If authentication is required but no credentials
+                were configured
+        """
+        body = self.codec.dumps(data) if data is not None else None
+        # The query is encoded once; the same bytes are signed and sent
+        query = canonical_query(params)
+        target = endpoint + "?" + query if query else endpoint
+
+        if auth_required:
+            if not self.api_key or self.signer is None:
+                raise ValrAuthenticationError(
+                    "API key and secret are required for authenticated endpoints"
+                )
+
+            timestamp = self.clock.timestamp() if self.clock is not None else get_timestamp()
+            signature = self.signer.sign(timestamp, method, target, body)
+
+            headers = dict(self._signed_body_headers if body is not None else self._signed_headers)
+            headers["X-VALR-SIGNATURE"] = signature
+            headers["X-VALR-TIMESTAMP"] = str(timestamp)
+
+            if subaccount_id:
+                headers["X-VALR-SUBACCOUNT-ID"] = subaccount_id
+        else:
+            headers = self._body_headers if body is not None else self._headers
+
+        return PreparedRequest(method, self.base_url + target, endpoint, params, headers, body)
+
+    def check(self, request: PreparedRequest, response: HttpResponse) -> None:
+        """
+        Log an exchange and raise if the response is unsuccessful
+
+        Args:
+            request: The request that produced the response
+            response: Backend response
+
+        Raises:
+            ValrApiError: Or one of its subclasses for unsuccessful responses
+        """
+        if self.wire_log.enabled():
+            self.wire_log.log_exchange(request, response)
+
+        if not response.ok:
+            raise_for_status(response.status_code, response.text, response.headers)
+
+    def decode(self, content: bytes) -> ResponseData:
+        """
+        Parse a response body; an empty body parses to an empty dict
+
+        Raises:
+            ValrApiError: If the body is not valid JSON
+        """
+        if not content:
+            return {}
+        try:
+            return self.codec.loads(content)
+        except ValueError as e:
+            raise ValrApiError(
+                f"Invalid JSON response: {e}", response=content.decode("utf-8", "replace")
+            ) from e
+
+    def handle(self, request: PreparedRequest, response: HttpResponse) -> ResponseData:
+        """
+        Turn a backend response into parsed data
+
+        Args:
+            request: The request that produced the response
+            response: Backend response
+
+        Returns:
+            Response from API as dictionary or list
+
+        Raises:
+            ValrApiError: Or one of its subclasses for unsuccessful responses
+        """
+        self.check(request, response)
+        return self.decode(response.content)
+
+    def _cache_key(self, method: str, endpoint: str, kwargs: Dict[str, Any]) -> Optional[CacheKey]:
+        """
+        Cache key of a request, or None if the request is not cacheable
+        """
+        cache = self.cache
+        if cache is None or method != "GET" or kwargs.get("auth_required"):
+            return None
+        if cache.ttl_for(endpoint) is None:
+            return None
+        return cache.key(self.base_url, endpoint, kwargs.get("params"))
+
+    def _flight_key(self, method: str, endpoint: str, kwargs: Dict[str, Any]) -> Optional[CacheKey]:
+        """
+        Key under which identical requests are coalesced, or None if they are not
+        """
+        if self.single_flight is None or method != "GET" or kwargs.get("auth_required"):
+            return None
+        return ResponseCache.key(self.base_url, endpoint, kwargs.get("params"))
+
+    def fetch(
+        self, method: str, endpoint: str, retry: Optional[bool] = None, **kwargs: Any
+    ) -> bytes:
+        """
+        Send a request and return the response body, joining an identical public GET
+        already in flight instead of sending it again
+
+        Accepts the same arguments as :meth:`request`.
+        """
+        key = self._flight_key(method, endpoint, kwargs)
+        if key is None:
+            return self.send(method, endpoint, retry, **kwargs).content
+        assert self.single_flight is not None
+        return self.single_flight.do(
+            key, lambda: self.send(method, endpoint, retry, **kwargs).content
+        )
+
+    async def fetch_async(
+        self, method: str, endpoint: str, retry: Optional[bool] = None, **kwargs: Any
+    ) -> bytes:
+        """
+        Asynchronous variant of :meth:`fetch`
+        """
+        key = self._flight_key(method, endpoint, kwargs)
+
+        async def call() -> bytes:
+            response = await self.send_async(method, endpoint, retry, **kwargs)
+            return response.content
+
+        if key is None:
+            return await call()
+        assert self.single_flight is not None
+        return await self.single_flight.do_async(key, call)
+
+    def request(
+        self, method: str, endpoint: str, retry: Optional[bool] = None, **kwargs: Any
+    ) -> ResponseData:
+        """
+        Make a request through a synchronous backend
+
+        Failed attempts are retried according to the retry policy. Every attempt is
+        rate limited and signed afresh. Public reference data is served from the response
+        cache, when the transport has one, and concurrent identical public GETs share a
+        single HTTP call.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint path
+            retry: True to retry this request even if its method is not retried by
+                default, False to never retry it
+            **kwargs: Other arguments of :meth:`prepare`
+        """
+        key = self._cache_key(method, endpoint, kwargs)
+        if key is None:
+            return self.decode(self.fetch(method, endpoint, retry, **kwargs))
+
+        assert self.cache is not None
+        cache = self.cache
+
+        def refresh() -> None:
+            def run() -> None:
+                try:
+                    cache.set(key, endpoint, self.send(method, endpoint, retry, **kwargs).content)
+                except ValrApiError:
+                    cache.release(key)
+
+            threading.Thread(target=run, name="valr-cache-refresh", daemon=True).start()
+
+        content = cache.get(key, refresh)
+        if content is None:
+            content = self.fetch(method, endpoint, retry, **kwargs)
+            cache.set(key, endpoint, content)
+        return self.decode(content)
+
+    async def request_async(
+        self, method: str, endpoint: str, retry: Optional[bool] = None, **kwargs: Any
+    ) -> ResponseData:
+        """
+        Make a request through an asynchronous backend
+
+        Accepts the same arguments as :meth:`request`.
+        """
+        key = self._cache_key(method, endpoint, kwargs)
+        if key is None:
+            return self.decode(await self.fetch_async(method, endpoint, retry, **kwargs))
+
+        assert self.cache is not None
+        cache = self.cache
+
+        async def run() -> None:
+            try:
+                response = await self.send_async(method, endpoint, retry, **kwargs)
+                cache.set(key, endpoint, response.content)
+            except ValrApiError:
+                cache.release(key)
+
+        def refresh() -> None:
+            task = asyncio.ensure_future(run())
+            self._refreshes.add(task)
+            task.add_done_callback(self._refreshes.discard)
+
+        content = cache.get(key, refresh)
+        if content is None:
+            content = await self.fetch_async(method, endpoint, retry, **kwargs)
+            cache.set(key, endpoint, content)
+        return self.decode(content)
+
+    def send(
+        self, method: str, endpoint: str, retry: Optional[bool] = None, **kwargs: Any
+    ) -> HttpResponse:
+        """
+        Send a request through a synchronous backend, with rate limiting and retries
+
+        Accepts the same arguments as :meth:`request`.
+
+        Returns:
+            Successful backend response
+
+        Raises:
+            ValrApiError: Or one of its subclasses once the request is given up
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+            request = self.prepare(method, endpoint, **kwargs)
+            try:
+                response = self.backend.send(request, self.timeout)
+                self.check(request, response)
+                return response
+            except ValrApiError as error:
+                delay = self.retry_policy.next_delay(request, attempt, error, started, retry)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    async def send_async(
+        self, method: str, endpoint: str, retry: Optional[bool] = None, **kwargs: Any
+    ) -> HttpResponse:
+        """
+        Send a request through an asynchronous backend, with rate limiting and retries
+
+        Accepts the same arguments as :meth:`request`.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint)
+            request = self.prepare(method, endpoint, **kwargs)
+            try:
+                response = await self.backend.send(request, self.timeout)
+                self.check(request, response)
+                return response
+            except ValrApiError as error:
+                delay = self.retry_policy.next_delay(request, attempt, error, started, retry)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
@@ -0,0 +1,184 @@
+"""
+Transport backends built on httpx, with HTTP/2 support
+"""
+
+from typing import Optional
+
+from valr_api.exceptions import ValrConnectionError
+from valr_api.transport.base import (
+    HttpResponse,
+    PreparedRequest,
+    Timeout,
+    socket_options,
+    split_timeout,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore[assignment]
+
+
+def _timeout(timeout: Timeout) -> "httpx.Timeout":
+    """
+    Convert a transport timeout to an httpx timeout
+    """
+    connect, read = split_timeout(timeout)
+    return httpx.Timeout(read, connect=connect)
+
+
+class HttpxBackend:
+    """
+    Synchronous backend using a pooled httpx client
+
+    With HTTP/2, concurrent requests from many threads are multiplexed over a single
+    connection instead of each holding a connection of its own. Requires the optional
+    ``httpx`` dependency (``pip install valr-api[http2]``).
+
+    Args:
+        http2: Negotiate HTTP/2 when the server supports it
+        pool_size: Maximum number of simultaneously open connections
+        keepalive_timeout: Seconds an idle pooled connection is kept open
+        tcp_nodelay: Disable Nagle's algorithm on pooled connections
+        keepalive: Enable TCP keep-alive probes on idle pooled connections
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        pool_size: int = 100,
+        keepalive_timeout: float = 30.0,
+        tcp_nodelay: bool = True,
+        keepalive: bool = True,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "HttpxBackend requires httpx; install it with `pip install valr-api[http2]`"
+            )
+
+        self.http2 = http2
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.socket_options = socket_options(tcp_nodelay, keepalive)
+        self.client: Optional["httpx.Client"] = None
+
+    def _limits(self) -> "httpx.Limits":
+        """
+        Connection pool limits
+        """
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=self.keepalive_timeout,
+        )
+
+    def _get_client(self) -> "httpx.Client":
+        """
+        Get the pooled HTTP client, creating it on first use and after close
+        """
+        if self.client is None or self.client.is_closed:
+            transport = httpx.HTTPTransport(
+                http2=self.http2, limits=self._limits(), socket_options=self.socket_options
+            )
+            self.client = httpx.Client(transport=transport)
+        return self.client
+
+    def send(self, request: PreparedRequest, timeout: Timeout) -> HttpResponse:
+        """
+        Send a prepared request
+
+        Args:
+            request: Prepared request
+            timeout: Request timeout in seconds, or a ``(connect, read)`` pair
+
+        Returns:
+            Backend-independent response
+
+        Raises:
+            ValrConnectionError: If the request could not be completed
+        """
+        try:
+            response = self._get_client().request(
+                request.method,
+                request.url,
+                headers=request.headers,
+                content=request.body,
+                timeout=_timeout(timeout),
+            )
+        except httpx.HTTPError as e:
+            raise ValrConnectionError(f"Request failed: {str(e)}")
+
+        return HttpResponse(response.status_code, response.content, response.headers)
+
+    def close(self) -> None:
+        """
+        Close the pooled HTTP client and all of its connections
+        """
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+
+
+class AsyncHttpxBackend(HttpxBackend):
+    """
+    Asynchronous variant of :class:`HttpxBackend`, for the asyncio client
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        pool_size: int = 100,
+        keepalive_timeout: float = 30.0,
+        tcp_nodelay: bool = True,
+        keepalive: bool = True,
+    ):
+        super().__init__(http2, pool_size, keepalive_timeout, tcp_nodelay, keepalive)
+        self.async_client: Optional["httpx.AsyncClient"] = None
+
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """
+        Get the pooled HTTP client, creating it on first use and after close
+        """
+        if self.async_client is None or self.async_client.is_closed:
+            transport = httpx.AsyncHTTPTransport(
+                http2=self.http2, limits=self._limits(), socket_options=self.socket_options
+            )
+            self.async_client = httpx.AsyncClient(transport=transport)
+        return self.async_client
+
+    async def send(  # type: ignore[override]
+        self, request: PreparedRequest, timeout: Timeout
+    ) -> HttpResponse:
+        """
+        Send a prepared request
+
+        Args:
+            request: Prepared request
+            timeout: Request timeout in seconds, or a ``(connect, read)`` pair
+
+        Returns:
+            Backend-independent response
+
+        Raises:
+            ValrConnectionError: If the request could not be completed
+        """
+        try:
+            response = await self._get_async_client().request(
+                request.method,
+                request.url,
+                headers=request.headers,
+                content=request.body,
+                timeout=_timeout(timeout),
+            )
+        except httpx.HTTPError as e:
+            raise ValrConnectionError(f"Request failed: {str(e)}")
+
+        return HttpResponse(response.status_code, response.content, response.headers)
+
+    async def close(self) -> None:  # type: ignore[override]
+        """
+        Close the pooled HTTP client and all of its connections
+        """
+        if self.async_client is not None:
+            await self.async_client.aclose()
+        self.async_client = None
@@ -0,0 +1,90 @@
+"""
+In-memory transport backends for tests and benchmarks
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from valr_api.transport.base import HttpResponse, PreparedRequest, Timeout
+
+MockRoute = Union[HttpResponse, Tuple[int, Any], Callable[[PreparedRequest], HttpResponse]]
+
+
+class MockBackend:
+    """
+    Synchronous backend that answers requests from a routing table without any I/O
+
+    Routes map ``(method, path)`` to either an ``HttpResponse``, a ``(status_code, payload)``
+    tuple whose payload is JSON encoded unless it already is ``str`` or ``bytes``, or a
+    callable that receives the prepared request and returns an ``HttpResponse``. Unknown
+    routes answer with 404. Every request sent is recorded in ``requests``.
+
+    Args:
+        routes: Routing table
+
+    Example:
+        backend = MockBackend({("GET", "/v1/public/status"): (200, {"status": "online"})})
+        client = ValrClient(backend=backend)
+    """
+
+    def __init__(self, routes: Dict[Tuple[str, str], MockRoute]):
+        self.routes = routes
+        self.requests: List[PreparedRequest] = []
+
+    def respond(self, request: PreparedRequest) -> HttpResponse:
+        """
+        Look up the response for a request
+
+        Args:
+            request: Prepared request
+
+        Returns:
+            Response configured for the request's route
+        """
+        self.requests.append(request)
+
+        route = self.routes.get((request.method, request.path))
+        if route is None:
+            message = f"No route for {request.method} {request.path}"
+            return HttpResponse(404, message.encode("utf-8"))
+        if isinstance(route, HttpResponse):
+            return route
+        if callable(route):
+            return route(request)
+
+        status_code, payload = route
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        elif not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode("utf-8")
+        return HttpResponse(status_code, payload)
+
+    def send(self, request: PreparedRequest, timeout: Timeout) -> HttpResponse:
+        """
+        Answer a prepared request
+        """
+        return self.respond(request)
+
+    def close(self) -> None:
+        """
+        Nothing to release
+        """
+
+
+class AsyncMockBackend(MockBackend):
+    """
+    Asynchronous variant of :class:`MockBackend`
+    """
+
+    async def send(  # type: ignore[override]
+        self, request: PreparedRequest, timeout: Timeout
+    ) -> HttpResponse:
+        """
+        Answer a prepared request
+        """
+        return self.respond(request)
+
+    async def close(self) -> None:  # type: ignore[override]
+        """
+        Nothing to release
+        """
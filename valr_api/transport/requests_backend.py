@@ -0,0 +1,90 @@
+"""
+Transport backend built on requests
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from valr_api.exceptions import ValrConnectionError
+from valr_api.transport.base import (
+    HttpResponse,
+    PreparedRequest,
+    Timeout,
+    socket_options,
+)
+
+
+class _SocketOptionsAdapter(HTTPAdapter):
+    """
+    HTTP adapter whose pooled connections are opened with the given socket options
+    """
+
+    def __init__(self, options: List[Tuple[int, int, int]], pool_size: int):
+        self.socket_options = options
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class RequestsBackend:
+    """
+    Synchronous backend using a pooled ``requests.Session``
+
+    Args:
+        session: Session to send requests with. A new one is created if omitted; only
+            a new session is configured by the pool and socket arguments.
+        pool_size: Maximum number of keep-alive connections kept per host
+        tcp_nodelay: Disable Nagle's algorithm on pooled connections
+        keepalive: Enable TCP keep-alive probes on idle pooled connections
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_size: int = 10,
+        tcp_nodelay: bool = True,
+        keepalive: bool = True,
+    ):
+        if session is None:
+            session = requests.Session()
+            adapter = _SocketOptionsAdapter(socket_options(tcp_nodelay, keepalive), pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def send(self, request: PreparedRequest, timeout: Timeout) -> HttpResponse:
+        """
+        Send a prepared request
+
+        Args:
+            request: Prepared request
+            timeout: Request timeout in seconds, or a ``(connect, read)`` pair
+
+        Returns:
+            Backend-independent response
+
+        Raises:
+            ValrConnectionError: If the request could not be completed
+        """
+        try:
+            response = self.session.request(
+                method=request.method,
+                url=request.url,
+                headers=request.headers,
+                data=request.body,
+                timeout=timeout,
+            )
+        except requests.RequestException as e:
+            raise ValrConnectionError(f"Request failed: {str(e)}")
+
+        return HttpResponse(response.status_code, response.content, response.headers)
+
+    def close(self) -> None:
+        """
+        Close the session and its pooled connections
+        """
+        self.session.close()
@@ -0,0 +1,73 @@
+"""
+Transport backend built directly on a urllib3 connection pool
+"""
+
+import urllib3
+
+from valr_api.exceptions import ValrConnectionError
+from valr_api.transport.base import (
+    HttpResponse,
+    PreparedRequest,
+    Timeout,
+    socket_options,
+    split_timeout,
+)
+
+
+class Urllib3Backend:
+    """
+    Synchronous backend sending requests straight to a urllib3 pool manager
+
+    Skips the session, hook and adapter layers of requests, which is the cheapest
+    per-call path to a pooled keep-alive connection. urllib3 is always installed with
+    requests. Redirects and urllib3's own retries are disabled; retrying is left to the
+    transport's retry policy.
+
+    Args:
+        pool_size: Maximum number of keep-alive connections kept per host
+        tcp_nodelay: Disable Nagle's algorithm on pooled connections
+        keepalive: Enable TCP keep-alive probes on idle pooled connections
+    """
+
+    def __init__(self, pool_size: int = 10, tcp_nodelay: bool = True, keepalive: bool = True):
+        self.pool_size = pool_size
+        self.pool = urllib3.PoolManager(
+            maxsize=pool_size,
+            retries=False,
+            socket_options=socket_options(tcp_nodelay, keepalive),
+        )
+
+    def send(self, request: PreparedRequest, timeout: Timeout) -> HttpResponse:
+        """
+        Send a prepared request
+
+        Args:
+            request: Prepared request
+            timeout: Request timeout in seconds, or a ``(connect, read)`` pair
+
+        Returns:
+            Backend-independent response
+
+        Raises:
+            ValrConnectionError: If the request could not be completed
+        """
+        connect, read = split_timeout(timeout)
+        try:
+            response = self.pool.urlopen(
+                request.method,
+                request.url,
+                body=request.body,
+                headers=dict(request.headers),
+                redirect=False,
+                timeout=urllib3.Timeout(connect=connect, read=read),
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise ValrConnectionError(f"Request failed: {str(e)}")
+
+        return HttpResponse(response.status, response.data, response.headers)
+
+    def close(self) -> None:
+        """
+        Close all pooled connections
+        """
+        self.pool.clear()
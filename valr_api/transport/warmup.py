@@ -0,0 +1,160 @@
+"""
+Connection pre-warming and keep-alive for the VALR API transport
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from valr_api.exceptions import ValrApiError
+from valr_api.transport.base import Transport
+
+logger = logging.getLogger(__name__)
+
+# Cheapest public endpoint: unauthenticated, tiny response
+WARM_UP_ENDPOINT = "/v1/public/status"
+
+
+class ConnectionWarmer:
+    """
+    Open pooled connections ahead of time and keep them from going idle
+
+    A warm-up sends ``connections`` concurrent requests to ``/v1/public/status``, so the
+    backend resolves the host and completes that many TCP and TLS handshakes before the
+    first real request. The connections then stay in the backend's keep-alive pool,
+    and the next requests reuse them without a handshake. The background loop repeats the
+    warm-up every ``interval`` seconds, before the server or the pool closes idle
+    connections.
+
+    Warm-up requests bypass the response cache and request coalescing, but not the rate
+    limiter. Failures are counted in ``failures`` and never end the background loop.
+    The backend's pool must hold at least ``connections`` connections, or the extra ones
+    are closed again.
+
+    Args:
+        transport: Transport whose backend's connections are warmed
+        connections: Number of connections to open
+        interval: Seconds between background warm-ups
+    """
+
+    def __init__(self, transport: Transport, connections: int = 4, interval: float = 20.0):
+        self.transport = transport
+        self.connections = connections
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopped = threading.Event()
+        self.warm_ups = 0
+        self.failures = 0
+
+    def __repr__(self) -> str:
+        return f"ConnectionWarmer(connections={self.connections}, warm_ups={self.warm_ups})"
+
+    def _ping(self) -> bool:
+        """
+        Send one warm-up request through a synchronous backend
+        """
+        try:
+            self.transport.send("GET", WARM_UP_ENDPOINT, retry=False)
+        except ValrApiError as error:
+            logger.warning("Connection warm-up failed: %s", error)
+            return False
+        return True
+
+    async def _ping_async(self) -> bool:
+        """
+        Send one warm-up request through an asynchronous backend
+        """
+        try:
+            await self.transport.send_async("GET", WARM_UP_ENDPOINT, retry=False)
+        except ValrApiError as error:
+            logger.warning("Connection warm-up failed: %s", error)
+            return False
+        return True
+
+    def _count(self, results: List[bool]) -> int:
+        """
+        Record the outcome of a warm-up and return the number of successful requests
+        """
+        succeeded = sum(results)
+        self.warm_ups += 1
+        self.failures += len(results) - succeeded
+        return succeeded
+
+    def warm_up(self) -> int:
+        """
+        Open ``connections`` pooled connections with concurrent requests
+
+        Returns:
+            Number of warm-up requests that succeeded
+        """
+        if self.connections == 1:
+            return self._count([self._ping()])
+        with ThreadPoolExecutor(self.connections, thread_name_prefix="valr-warm-up") as pool:
+            results = [pool.submit(self._ping) for _ in range(self.connections)]
+        return self._count([result.result() for result in results])
+
+    async def warm_up_async(self) -> int:
+        """
+        Open ``connections`` pooled connections with concurrent requests
+
+        Returns:
+            Number of warm-up requests that succeeded
+        """
+        results = await asyncio.gather(*(self._ping_async() for _ in range(self.connections)))
+        return self._count(results)
+
+    def start(self) -> None:
+        """
+        Warm up the connections every ``interval`` seconds on a daemon thread
+        """
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+
+        def run() -> None:
+            while not self._stopped.wait(self.interval):
+                try:
+                    self.warm_up()
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Connection keep-alive failed")
+
+        self._thread = threading.Thread(target=run, name="valr-keep-alive", daemon=True)
+        self._thread.start()
+
+    def start_async(self) -> "asyncio.Task[None]":
+        """
+        Warm up the connections every ``interval`` seconds in a task of the running loop
+
+        Returns:
+            The keep-alive task
+        """
+        if self._task is not None and not self._task.done():
+            return self._task
+
+        async def run() -> None:
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    await self.warm_up_async()
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Connection keep-alive failed")
+
+        self._task = asyncio.ensure_future(run())
+        return self._task
+
+    def stop(self) -> None:
+        """
+        Stop the background keep-alive
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -2,6 +2,30 @@
 Utility functions for VALR API client
 """
 
-from valr_api.utils.auth import generate_signature, get_timestamp
+from valr_api.utils.auth import Signer, generate_signature, get_timestamp
+from valr_api.utils.cache import ResponseCache, get_default_cache
+from valr_api.utils.clock import ClockSync
+from valr_api.utils.codec import JsonCodec
+from valr_api.utils.pagination import AsyncPaginator, Paginator
+from valr_api.utils.ratelimit import RateLimiter, TokenBucket, get_default_rate_limiter
+from valr_api.utils.retry import RetryPolicy
+from valr_api.utils.singleflight import SingleFlight
+from valr_api.utils.wirelog import WireLogger
 
-__all__ = ["generate_signature", "get_timestamp"]
+__all__ = [
+    "AsyncPaginator",
+    "ClockSync",
+    "JsonCodec",
+    "Paginator",
+    "RateLimiter",
+    "ResponseCache",
+    "RetryPolicy",
+    "Signer",
+    "SingleFlight",
+    "TokenBucket",
+    "WireLogger",
+    "generate_signature",
+    "get_default_cache",
+    "get_default_rate_limiter",
+    "get_timestamp",
+]
@@ -7,7 +7,7 @@ import hashlib
 import hmac
 import json
 import time
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
 
 
 def generate_signature(
@@ -15,7 +15,7 @@ def generate_signature(
     timestamp: int,
     verb: str,
     path: str,
-    body: Optional[Union[Dict, str]] = None,
+    body: Optional[Union[Dict, str, bytes]] = None,
 ) -> str:
     """
     Generate a signature for the VALR API request
@@ -25,20 +25,25 @@ def generate_signature(
         timestamp: Unix timestamp in milliseconds
         verb: HTTP method (GET, POST, PUT, DELETE)
         path: API endpoint path
-        body: Request body for POST/PUT requests
+        body: Request body for POST/PUT requests. Serialized bytes or text are signed
+            as-is and must be exactly what is sent; a dict is serialized with ``json.dumps``.
 
     Returns:
         Base64 encoded signature
     """
-    # Create the payload string
-    payload = str(timestamp) + verb.upper() + path
+    # Create the payload
+    message = (str(timestamp) + verb.upper() + path).encode("utf-8")
 
     # Add the request body if it exists
     if body:
-        payload += json.dumps(body)
+        if isinstance(body, dict):
+            message += json.dumps(body).encode("utf-8")
+        elif isinstance(body, str):
+            message += body.encode("utf-8")
+        else:
+            message += body
 
     # Create the signature
-    message = payload.encode("utf-8")
     secret = api_secret.encode("utf-8")
     signature = hmac.new(secret, message, hashlib.sha512)
 
@@ -54,3 +59,80 @@ def get_timestamp() -> int:
         Current timestamp in milliseconds
     """
     return int(time.time() * 1000)
+
+
+class Signer:
+    """
+    HMAC-SHA512 request signer bound to one API secret
+
+    The keyed HMAC state (the secret hashed into the inner and outer pads) is computed
+    once; each signature copies that state and feeds it the timestamp, verb, path and
+    body as separate byte strings, without building a payload string. Signatures of
+    requests without a body are also remembered, because several requests signed
+    within the same millisecond for the same path share one signature. The memo only
+    holds recent timestamps and is dropped whenever it fills up.
+
+    Produces the same signatures as :func:`generate_signature`.
+
+    Args:
+        api_secret: VALR API secret key
+        cache_size: Maximum number of remembered signatures (0 disables the memo)
+
+    Example:
+        signer = Signer(api_secret)
+        signature = signer.sign(get_timestamp(), "GET", "/v1/account/balances")
+    """
+
+    def __init__(self, api_secret: str, cache_size: int = 256):
+        self._mac = hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha512)
+        self._cache: Dict[Tuple[int, str, str], str] = {}
+        self.cache_size = cache_size
+
+    def __repr__(self) -> str:
+        return "Signer(<secret>)"
+
+    def sign(
+        self,
+        timestamp: int,
+        verb: str,
+        path: str,
+        body: Optional[Union[Dict, str, bytes]] = None,
+    ) -> str:
+        """
+        Sign a request
+
+        Args:
+            timestamp: Unix timestamp in milliseconds
+            verb: HTTP method (GET, POST, PUT, DELETE)
+            path: API endpoint path
+            body: Request body, as for :func:`generate_signature`
+
+        Returns:
+            Base64 encoded signature
+        """
+        if not body and self.cache_size:
+            key = (timestamp, verb, path)
+            signature = self._cache.get(key)
+            if signature is None:
+                signature = self._sign(timestamp, verb, path, None)
+                if len(self._cache) >= self.cache_size:
+                    self._cache.clear()
+                self._cache[key] = signature
+            return signature
+        return self._sign(timestamp, verb, path, body)
+
+    def _sign(
+        self, timestamp: int, verb: str, path: str, body: Optional[Union[Dict, str, bytes]]
+    ) -> str:
+        mac = self._mac.copy()
+        mac.update(b"%d" % timestamp)
+        mac.update(verb.upper().encode("ascii"))
+        mac.update(path.encode("utf-8"))
+        if body:
+            if isinstance(body, bytes):
+                mac.update(body)
+            elif isinstance(body, str):
+                mac.update(body.encode("utf-8"))
+            else:
+                mac.update(json.dumps(body).encode("utf-8"))
+        return base64.b64encode(mac.digest()).decode("ascii")
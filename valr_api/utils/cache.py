@@ -0,0 +1,243 @@
+"""
+Response cache for slow-changing VALR API reference data
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CacheKey = Tuple[Any, ...]
+
+# Seconds to keep responses of public endpoints whose data rarely changes
+DEFAULT_TTLS: Dict[str, float] = {
+    "/v1/public/currencies": 3600.0,
+    "/v1/public/pairs": 3600.0,
+    "/v1/public/orderTypes": 3600.0,
+    "/v1/public/*/orderTypes": 3600.0,
+    "/v1/public/status": 10.0,
+}
+
+
+class _Entry:
+    """
+    Cached response body with its expiry
+    """
+
+    __slots__ = ("content", "stored", "expires", "refreshing")
+
+    def __init__(self, content: bytes, stored: float, expires: float):
+        self.content = content
+        self.stored = stored
+        self.expires = expires
+        self.refreshing = False
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL cache of raw response bodies with LRU eviction
+
+    Only endpoints matching a pattern in ``ttls`` are cached, each for its own time to
+    live. Bodies are stored as the raw bytes received and parsed again on every hit, so
+    callers can never modify a cached response through the data they were returned.
+
+    With ``refresh_ahead`` set, a hit on an entry that has used up that fraction of its
+    TTL still returns the cached body, but also starts one refresh in the background, so
+    frequently used entries are renewed before they expire instead of costing a caller a
+    round-trip.
+
+    Share one instance between clients, for example the process-wide instance from
+    :func:`get_default_cache`, to share cached responses across all of them.
+
+    Args:
+        ttls: Seconds to live by endpoint path pattern (``fnmatch`` syntax). Defaults to
+            ``DEFAULT_TTLS``.
+        maxsize: Maximum number of cached responses; the least recently used entry is
+            evicted first
+        refresh_ahead: Fraction of the TTL after which a hit triggers a background
+            refresh (e.g., 0.8), or None to only refresh on expiry
+
+    Example:
+        cache = get_default_cache()
+        client = ValrClient(cache=cache)
+        client.public.get_currency_pairs()
+        client.public.get_currency_pairs()  # served from the cache
+        print(cache.stats())
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        maxsize: int = 256,
+        refresh_ahead: Optional[float] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if refresh_ahead is not None and not 0 < refresh_ahead < 1:
+            raise ValueError("refresh_ahead must be between 0 and 1")
+
+        self.ttls = dict(ttls if ttls is not None else DEFAULT_TTLS)
+        self.maxsize = maxsize
+        self.refresh_ahead = refresh_ahead
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._ttl_by_path: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(size={len(self._entries)}, maxsize={self.maxsize})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, path: str) -> Optional[float]:
+        """
+        Time to live of an endpoint path, or None if it is not cached
+        """
+        try:
+            return self._ttl_by_path[path]
+        except KeyError:
+            pass
+        ttl = self.ttls.get(path)
+        if ttl is None:
+            for pattern, pattern_ttl in self.ttls.items():
+                if fnmatchcase(path, pattern):
+                    ttl = pattern_ttl
+                    break
+        # Paths are few (one per endpoint and pair), so the resolution is memoised
+        self._ttl_by_path[path] = ttl
+        return ttl
+
+    @staticmethod
+    def key(base_url: str, path: str, params: Optional[Dict] = None) -> CacheKey:
+        """
+        Cache key of a GET request
+        """
+        if not params:
+            return (base_url, path)
+        return (base_url, path, tuple(sorted((k, str(v)) for k, v in params.items())))
+
+    def get(self, key: CacheKey, refresh: Optional[Callable[[], None]] = None) -> Optional[bytes]:
+        """
+        Look up a cached body
+
+        Args:
+            key: Cache key from :meth:`key`
+            refresh: Function starting a background refresh of this entry; called, at
+                most once at a time, when the entry is due for refresh-ahead
+
+        Returns:
+            Cached body, or None on a miss
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            due = (
+                refresh is not None
+                and self.refresh_ahead is not None
+                and not entry.refreshing
+                and now - entry.stored >= (entry.expires - entry.stored) * self.refresh_ahead
+            )
+            if due:
+                entry.refreshing = True
+                self.refreshes += 1
+            content = entry.content
+
+        if due:
+            assert refresh is not None
+            refresh()
+        return content
+
+    def set(self, key: CacheKey, path: str, content: bytes) -> None:
+        """
+        Store a body if its endpoint is cached
+
+        Args:
+            key: Cache key from :meth:`key`
+            path: Endpoint path, which selects the TTL
+            content: Raw response body
+        """
+        ttl = self.ttl_for(path)
+        if ttl is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = _Entry(content, now, now + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def release(self, key: CacheKey) -> None:
+        """
+        Allow another refresh of an entry whose background refresh failed
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def invalidate(self, pattern: Optional[str] = None) -> int:
+        """
+        Drop cached responses
+
+        Args:
+            pattern: Endpoint path pattern (``fnmatch`` syntax) to drop, e.g.
+                ``/v1/public/pairs``. Defaults to dropping everything.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            if pattern is None:
+                count = len(self._entries)
+                self._entries.clear()
+                return count
+            keys = [key for key in self._entries if fnmatchcase(key[1], pattern)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters
+
+        Returns:
+            ``hits``, ``misses``, ``evictions``, background ``refreshes`` started, and the
+            current ``size``
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "refreshes": self.refreshes,
+                "size": len(self._entries),
+            }
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> ResponseCache:
+    """
+    Process-wide response cache with the default TTLs, created on first use
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = ResponseCache()
+    return _default_cache
@@ -0,0 +1,272 @@
+"""
+Server clock estimation for signed request timestamps
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from valr_api.exceptions import ValrApiError
+from valr_api.models.base import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+# Failures of a single sample: the request failed, or its body was not a server time
+SAMPLE_ERRORS = (ValrApiError, AttributeError, KeyError, TypeError, ValueError)
+
+
+class _Sample:
+    """
+    One exchange with the server clock
+    """
+
+    __slots__ = ("monotonic", "server", "offset", "rtt")
+
+    def __init__(self, monotonic: float, server: float, offset: float, rtt: float):
+        self.monotonic = monotonic
+        self.server = server
+        self.offset = offset
+        self.rtt = rtt
+
+
+def server_time_ms(response: Dict[str, Any]) -> float:
+    """
+    Server time of a ``/v1/public/time`` response, in epoch milliseconds
+
+    ``time`` carries milliseconds and is preferred. ``epochTime`` only has whole seconds,
+    so it is read as the middle of its second.
+    """
+    text = response.get("time")
+    if text:
+        value = parse_datetime(text).timestamp() * 1000
+        return value if "." in text else value + 500
+    return float(response["epochTime"]) * 1000 + 500
+
+
+class ClockSync:
+    """
+    Estimate the server clock and time-stamp signed requests with it
+
+    Each sample reads the server time and measures the round-trip time on the monotonic
+    clock. As in NTP, the server time is taken to be read halfway through the
+    round-trip, and the sample with the lowest round-trip time in the window is trusted
+    most. Between samples, time is advanced on the monotonic clock, corrected by the
+    drift measured across samples. This way a wall-clock step on the host does not
+    affect signed timestamps.
+
+    Until the first sample, :meth:`timestamp` falls back to the local wall clock.
+
+    Args:
+        fetch: Function returning a ``/v1/public/time`` response, e.g.
+            ``client.market_data.get_server_time``. Clients created with this clock
+            bind it for you.
+        interval: Seconds between background samples
+        window: Number of recent samples kept for the estimate
+
+    Example:
+        clock = ClockSync()
+        client = ValrClient(api_key, api_secret, clock=clock)
+        clock.start()
+        print(clock.stats())
+    """
+
+    def __init__(
+        self,
+        fetch: Optional[Callable[[], Any]] = None,
+        interval: float = 300.0,
+        window: int = 8,
+    ):
+        self.fetch = fetch
+        self.interval = interval
+        self._samples: Deque[_Sample] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._best: Optional[_Sample] = None
+        self._drift = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopped = threading.Event()
+        self.failures = 0
+
+    def __repr__(self) -> str:
+        return f"ClockSync(offset={self.offset:.1f}ms, samples={len(self._samples)})"
+
+    @property
+    def offset(self) -> float:
+        """
+        Server clock minus local wall clock in milliseconds, from the best sample
+        """
+        best = self._best
+        return best.offset if best is not None else 0.0
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """
+        Round-trip time of the best sample in milliseconds
+        """
+        best = self._best
+        return best.rtt if best is not None else None
+
+    @property
+    def drift(self) -> float:
+        """
+        Rate of the server clock relative to the local monotonic clock, in ppm
+        """
+        return self._drift * 1e6
+
+    def timestamp(self) -> int:
+        """
+        Current server time estimate
+
+        Returns:
+            Epoch milliseconds to sign requests with
+        """
+        best = self._best
+        if best is None:
+            return int(time.time() * 1000)
+        elapsed = (time.monotonic() - best.monotonic) * 1000
+        return int(best.server + elapsed * (1 + self._drift))
+
+    def _record(self, started: float, wall: float, response: Any, finished: float) -> None:
+        """
+        Add a sample taken between ``started`` and ``finished`` (monotonic seconds)
+        """
+        server = server_time_ms(response)
+        rtt = (finished - started) * 1000
+        midpoint = (started + finished) / 2
+        # Wall clock at the midpoint, read once to keep wall-clock steps out of the RTT
+        offset = server - (wall + (midpoint - started)) * 1000
+        sample = _Sample(midpoint, server, offset, rtt)
+        with self._lock:
+            self._samples.append(sample)
+            self._best = min(self._samples, key=lambda each: each.rtt)
+            self._drift = self._estimate_drift()
+
+    def _estimate_drift(self) -> float:
+        """
+        Least-squares slope of server time against monotonic time, minus one
+        """
+        samples = self._samples
+        if len(samples) < 2:
+            return 0.0
+        xs = [sample.monotonic * 1000 for sample in samples]
+        ys = [sample.server for sample in samples]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        spread = sum((x - mean_x) ** 2 for x in xs)
+        if spread == 0:
+            return 0.0
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+        return slope - 1
+
+    def sample(self) -> None:
+        """
+        Take a sample with a synchronous ``fetch``
+
+        Raises:
+            ValrApiError: If the server time cannot be read
+        """
+        if self.fetch is None:
+            raise ValueError("ClockSync has no fetch function")
+        started = time.monotonic()
+        wall = time.time()
+        response = self.fetch()
+        self._record(started, wall, response, time.monotonic())
+
+    async def sample_async(self) -> None:
+        """
+        Take a sample with an asynchronous ``fetch``
+        """
+        if self.fetch is None:
+            raise ValueError("ClockSync has no fetch function")
+        started = time.monotonic()
+        wall = time.time()
+        response = await self.fetch()
+        self._record(started, wall, response, time.monotonic())
+
+    def start(self) -> None:
+        """
+        Sample now and then every ``interval`` seconds on a daemon thread
+
+        Raises:
+            ValueError: If the clock has no fetch function
+        """
+        if self.fetch is None:
+            raise ValueError("ClockSync has no fetch function")
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+
+        def run() -> None:
+            while True:
+                try:
+                    self.sample()
+                except SAMPLE_ERRORS as error:
+                    self.failures += 1
+                    logger.warning("Server time sample failed: %s", error)
+                if self._stopped.wait(self.interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="valr-clock-sync", daemon=True)
+        self._thread.start()
+
+    def start_async(self) -> "asyncio.Task[None]":
+        """
+        Sample now and then every ``interval`` seconds in a task of the running loop
+
+        Returns:
+            The sampling task
+
+        Raises:
+            ValueError: If the clock has no fetch function
+        """
+        if self.fetch is None:
+            raise ValueError("ClockSync has no fetch function")
+        if self._task is not None and not self._task.done():
+            return self._task
+
+        async def run() -> None:
+            while True:
+                try:
+                    await self.sample_async()
+                except SAMPLE_ERRORS as error:
+                    self.failures += 1
+                    logger.warning("Server time sample failed: %s", error)
+                await asyncio.sleep(self.interval)
+
+        self._task = asyncio.ensure_future(run())
+        return self._task
+
+    def stop(self) -> None:
+        """
+        Stop background sampling
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Clock metrics
+
+        Returns:
+            ``offset_ms``, ``rtt_ms`` and ``drift_ppm`` of the estimate, the number of
+            ``samples`` in the window, the ``age_s`` of the newest sample and the number
+            of ``failures``
+        """
+        with self._lock:
+            newest = self._samples[-1] if self._samples else None
+            return {
+                "offset_ms": self.offset,
+                "rtt_ms": self.rtt,
+                "drift_ppm": self.drift,
+                "samples": len(self._samples),
+                "age_s": time.monotonic() - newest.monotonic if newest is not None else None,
+                "failures": self.failures,
+            }
@@ -0,0 +1,124 @@
+"""
+JSON serialization for VALR API requests and responses
+"""
+
+import json
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ujson  # type: ignore[import-untyped, import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+
+def _default(obj: Any) -> Any:
+    """
+    Serialize values the JSON encoders do not handle natively
+
+    Decimals are sent as strings, which is how VALR represents prices and amounts.
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """
+    Serializer/deserializer pair used by the transport
+
+    Bodies are serialized to bytes exactly once; the same bytes are signed and sent.
+    Responses are parsed straight from the raw response bytes, without decoding them to
+    text first.
+
+    Args:
+        dumps: Function serializing an object to bytes
+        loads: Function parsing bytes into an object
+        name: Name of the codec, for diagnostics
+    """
+
+    def __init__(
+        self,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+        name: str = "custom",
+    ):
+        self.dumps = dumps
+        self.loads = loads
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name})"
+
+    @classmethod
+    def stdlib(cls) -> "JsonCodec":
+        """
+        Codec built on the standard library ``json`` module
+        """
+
+        def dumps(obj: Any) -> bytes:
+            return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+        return cls(dumps, json.loads, "json")
+
+    @classmethod
+    def orjson(cls) -> "JsonCodec":
+        """
+        Codec built on ``orjson``
+
+        Raises:
+            ImportError: If orjson is not installed
+        """
+        if orjson is None:
+            raise ImportError("orjson is not installed; install it with `pip install orjson`")
+
+        def dumps(obj: Any) -> bytes:
+            return orjson.dumps(obj, default=_default)
+
+        return cls(dumps, orjson.loads, "orjson")
+
+    @classmethod
+    def ujson(cls) -> "JsonCodec":
+        """
+        Codec built on ``ujson``
+
+        Raises:
+            ImportError: If ujson is not installed
+        """
+        if ujson is None:
+            raise ImportError("ujson is not installed; install it with `pip install ujson`")
+
+        def dumps(obj: Any) -> bytes:
+            return ujson.dumps(obj, default=_default).encode("utf-8")
+
+        return cls(dumps, ujson.loads, "ujson")
+
+    @classmethod
+    def default(cls) -> "JsonCodec":
+        """
+        The fastest available codec: orjson if installed, otherwise the standard library
+        """
+        if orjson is not None:
+            return cls.orjson()
+        return cls.stdlib()
+
+
+_default_codec: Optional[JsonCodec] = None
+
+
+def get_default_codec() -> JsonCodec:
+    """
+    Get the process-wide default codec, selecting it on first use
+
+    Returns:
+        Shared :class:`JsonCodec` instance
+    """
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = JsonCodec.default()
+    return _default_codec
@@ -0,0 +1,186 @@
+"""
+Iterators over paginated (skip/limit) VALR API endpoints
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+# Fetches one page given (skip, limit)
+PageFetcher = Callable[[int, int], Any]
+
+
+def split_page(response: Any, key: Optional[str], limit: int) -> Tuple[List[Any], bool]:
+    """
+    Extract the records of a page and whether it is the last one
+
+    Args:
+        response: Page response, either a list of records or an envelope such as
+            ``{"trades": [...], "isLastPage": false}``
+        key: Envelope key of the records
+        limit: Requested page size; a shorter page is the last one
+
+    Returns:
+        ``(records, is_last)``
+    """
+    if isinstance(response, list) or key is None:
+        records = list(response or ())
+        return records, len(records) < limit
+    records = list(response.get(key) or ())
+    return records, bool(response.get("isLastPage")) or len(records) < limit
+
+
+class Paginator:
+    """
+    Iterate the records of a skip/limit endpoint one at a time
+
+    Pages are requested as needed and released once consumed, so memory stays bounded
+    by the page size whatever the length of the history. Iteration stops on a page
+    flagged ``isLastPage``, or on a page shorter than ``limit``. With ``prefetch``, the
+    next page is requested on a background thread while the current one is consumed.
+
+    ``position`` is the ``skip`` of the next record to be yielded. Persist it and pass it
+    back as ``skip`` to resume an interrupted pull exactly where it stopped (as long as
+    the history has not shifted in between).
+
+    Args:
+        fetch: Function returning the page at ``(skip, limit)``
+        key: Envelope key of the records, or None for endpoints returning a list
+        limit: Page size
+        skip: Position to start from
+        prefetch: Whether to request the next page while the current one is consumed
+
+    Example:
+        pages = client.account.iter_trade_history("BTCZAR")
+        for trade in pages:
+            process(trade)
+            checkpoint.save(pages.position)
+    """
+
+    def __init__(
+        self,
+        fetch: PageFetcher,
+        key: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.fetch = fetch
+        self.key = key
+        self.limit = limit
+        self.position = skip
+        self.prefetch = prefetch
+        self.pages = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __repr__(self) -> str:
+        return f"Paginator(key={self.key}, limit={self.limit}, position={self.position})"
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._records()
+
+    def _records(self) -> Iterator[Any]:
+        skip = self.position
+        pending: Optional[Future] = None
+        try:
+            while True:
+                response = pending.result() if pending is not None else self.fetch(skip, self.limit)
+                pending = None
+                self.pages += 1
+                records, is_last = split_page(response, self.key, self.limit)
+                skip += len(records)
+                if not is_last and self.prefetch:
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(1, thread_name_prefix="valr-page")
+                    pending = self._executor.submit(self.fetch, skip, self.limit)
+                for record in records:
+                    self.position += 1
+                    yield record
+                if is_last:
+                    return
+        finally:
+            if pending is not None:
+                pending.cancel()
+            self.close()
+
+    def close(self) -> None:
+        """
+        Stop the prefetch thread
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class AsyncPaginator:
+    """
+    Asynchronously iterate the records of a skip/limit endpoint one at a time
+
+    The ``async for`` counterpart of :class:`Paginator`, for the asyncio client. With
+    ``prefetch``, the next page is requested in a task while the current one is consumed.
+
+    Args:
+        fetch: Function returning an awaitable of the page at ``(skip, limit)``
+        key: Envelope key of the records, or None for endpoints returning a list
+        limit: Page size
+        skip: Position to start from
+        prefetch: Whether to request the next page while the current one is consumed
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int, int], Awaitable[Any]],
+        key: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        prefetch: bool = True,
+    ):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.fetch = fetch
+        self.key = key
+        self.limit = limit
+        self.position = skip
+        self.prefetch = prefetch
+        self.pages = 0
+
+    def __repr__(self) -> str:
+        return f"AsyncPaginator(key={self.key}, limit={self.limit}, position={self.position})"
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._records()
+
+    async def _records(self) -> AsyncIterator[Any]:
+        skip = self.position
+        pending: Optional["asyncio.Future[Any]"] = None
+        try:
+            while True:
+                if pending is not None:
+                    response = await pending
+                else:
+                    response = await self.fetch(skip, self.limit)
+                pending = None
+                self.pages += 1
+                records, is_last = split_page(response, self.key, self.limit)
+                skip += len(records)
+                if not is_last and self.prefetch:
+                    pending = asyncio.ensure_future(self.fetch(skip, self.limit))
+                for record in records:
+                    self.position += 1
+                    yield record
+                if is_last:
+                    return
+        finally:
+            if pending is not None:
+                pending.cancel()
@@ -0,0 +1,209 @@
+"""
+Client-side rate limiting for VALR API requests
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Default budgets as (requests per second, burst size)
+DEFAULT_GLOBAL_LIMIT = (30.0, 30.0)
+DEFAULT_GROUP_LIMITS: Dict[str, Tuple[float, float]] = {
+    "public": (10.0, 10.0),
+    "account": (20.0, 20.0),
+    "wallet": (5.0, 5.0),
+    "orders": (20.0, 20.0),
+}
+
+# Endpoint path prefixes and the group whose budget they draw from
+GROUP_PREFIXES = (
+    ("/v1/public/", "public"),
+    ("/v1/marketdata/", "public"),
+    ("/v1/account/", "account"),
+    ("/v1/wallet/", "wallet"),
+    ("/v1/orders", "orders"),
+    ("/v1/batch/", "orders"),
+)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate`` tokens per second
+
+    Callers reserve tokens instead of polling for them: a reservation always succeeds and
+    returns how long the caller must wait before using it. The balance may go negative, so
+    concurrent callers are queued behind each other in arrival order, and nobody holds a
+    lock while waiting. This makes one bucket usable from threads and event loops alike.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum number of tokens, i.e. the largest burst. Defaults to ``rate``.
+    """
+
+    __slots__ = ("rate", "capacity", "_tokens", "_updated", "_lock")
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.rate}, capacity={self.capacity})"
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take ``tokens`` from the bucket
+
+        Returns:
+            Seconds to wait before the tokens may be used (0.0 if they are available now)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Delays requests so that they stay within a global and a per-group budget
+
+    Every request draws one token from the global bucket and one from the bucket of its
+    endpoint group (``public`` for public and market data endpoints, ``account``,
+    ``wallet`` and ``orders`` for the signed endpoints). A request waits for whichever
+    bucket is further behind. Requests to endpoints outside the known groups only draw
+    from the global bucket.
+
+    The limiter is thread-safe and asyncio-safe. Share one instance between clients, for
+    example the process-wide instance from :func:`get_default_rate_limiter`, to enforce
+    one budget across all of them.
+
+    Args:
+        global_limit: ``(requests per second, burst)`` for all requests, or None for no
+            global limit
+        groups: ``(requests per second, burst)`` by group name. Defaults to
+            ``DEFAULT_GROUP_LIMITS``.
+
+    Example:
+        limiter = RateLimiter(groups={"public": (5, 10), "account": (20, 20)})
+        client = ValrClient(api_key, api_secret, rate_limiter=limiter)
+        ...
+        print(limiter.stats()["wait_time"])
+    """
+
+    def __init__(
+        self,
+        global_limit: Optional[Tuple[float, float]] = DEFAULT_GLOBAL_LIMIT,
+        groups: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
+        self.global_bucket = TokenBucket(*global_limit) if global_limit is not None else None
+        if groups is None:
+            groups = DEFAULT_GROUP_LIMITS
+        self.buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in groups.items()}
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.group_wait_time: Dict[str, float] = {}
+
+    def __repr__(self) -> str:
+        return f"RateLimiter(global={self.global_bucket}, groups={sorted(self.buckets)})"
+
+    @staticmethod
+    def group_for(path: str) -> Optional[str]:
+        """
+        Endpoint group of an API path, or None if it belongs to no group
+        """
+        for prefix, group in GROUP_PREFIXES:
+            if path.startswith(prefix):
+                return group
+        return None
+
+    def reserve(self, path: str) -> float:
+        """
+        Reserve capacity for one request to ``path``
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        group = self.group_for(path)
+        delay = self.global_bucket.reserve() if self.global_bucket is not None else 0.0
+        bucket = self.buckets.get(group) if group is not None else None
+        if bucket is not None:
+            delay = max(delay, bucket.reserve())
+
+        with self._stats_lock:
+            self.requests += 1
+            if delay > 0:
+                self.delayed += 1
+                self.wait_time += delay
+                self.max_wait = max(self.max_wait, delay)
+                key = group or "global"
+                self.group_wait_time[key] = self.group_wait_time.get(key, 0.0) + delay
+        return delay
+
+    def acquire(self, path: str) -> float:
+        """
+        Block the calling thread until a request to ``path`` may be sent
+
+        Returns:
+            Seconds waited
+        """
+        delay = self.reserve(path)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, path: str) -> float:
+        """
+        Wait, without blocking the event loop, until a request to ``path`` may be sent
+
+        Returns:
+            Seconds waited
+        """
+        delay = self.reserve(path)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Counters of requests and time spent waiting
+
+        Returns:
+            ``requests`` seen, requests ``delayed``, total ``wait_time`` and ``max_wait`` in
+            seconds, and ``groups`` mapping each group to its total wait time
+        """
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "delayed": self.delayed,
+                "wait_time": self.wait_time,
+                "max_wait": self.max_wait,
+                "groups": dict(self.group_wait_time),
+            }
+
+
+_default_rate_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """
+    Process-wide rate limiter with the default budgets, created on first use
+    """
+    global _default_rate_limiter
+    if _default_rate_limiter is None:
+        with _default_lock:
+            if _default_rate_limiter is None:
+                _default_rate_limiter = RateLimiter()
+    return _default_rate_limiter
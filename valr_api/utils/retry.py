@@ -0,0 +1,176 @@
+"""
+Retry policy for VALR API requests
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterable, Mapping, Optional, Tuple, Type
+
+from valr_api.exceptions import ValrApiError, ValrConnectionError
+
+# Called with (request, attempt, error, delay) after every failed attempt; delay is None
+# when the request will not be retried
+RetryHook = Callable[[Any, int, Exception, Optional[float]], None]
+
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET",)
+
+
+def parse_retry_after(headers: Optional[Mapping]) -> Optional[float]:
+    """
+    Seconds to wait according to a ``Retry-After`` header
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Delay in seconds, or None if the header is missing or malformed
+    """
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if value is None:
+        value = headers.get("retry-after")
+    if isinstance(value, (int, float)):
+        return max(0.0, float(value))
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request
+
+    A request is retried when it failed with one of ``retry_exceptions`` (network errors
+    and timeouts by default) or with one of ``retry_statuses``, its method is in
+    ``methods`` or the call opted in explicitly, and neither ``max_attempts`` nor the total
+    ``deadline`` has been reached. Only idempotent GETs are retried by default; POSTs such
+    as withdrawals are retried only when the call passes ``retry=True`` or the policy lists
+    their method.
+
+    The wait before attempt ``n + 1`` is the server's ``Retry-After`` when present, and
+    otherwise ``min(backoff_max, backoff_base * 2 ** (n - 1))``, randomised with full
+    jitter so that many clients do not retry in lockstep.
+
+    Args:
+        max_attempts: Maximum number of attempts, including the first
+        backoff_base: Delay in seconds before the first retry, before jitter
+        backoff_max: Maximum delay in seconds, before jitter
+        jitter: Whether to randomise delays between zero and the computed backoff
+        deadline: Maximum total seconds spent on a request, including waits. Defaults to
+            no deadline.
+        retry_statuses: HTTP status codes that are retried
+        retry_exceptions: Exception classes that are retried regardless of status
+        methods: HTTP methods retried without an explicit opt-in
+        respect_retry_after: Whether to wait as long as the ``Retry-After`` header asks
+        hooks: Functions called with ``(request, attempt, error, delay)`` after every failed
+            attempt; ``delay`` is None when the request is given up
+
+    Example:
+        failures = collections.Counter()
+        policy = RetryPolicy(
+            max_attempts=5,
+            deadline=10,
+            hooks=[lambda request, attempt, error, delay: failures.update([request.path])],
+        )
+        client = ValrClient(api_key, api_secret, retry_policy=policy)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8.0,
+        jitter: bool = True,
+        deadline: Optional[float] = None,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        retry_exceptions: Tuple[Type[Exception], ...] = (ValrConnectionError,),
+        methods: Iterable[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+        hooks: Optional[Iterable[RetryHook]] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+        self.methods = frozenset(method.upper() for method in methods)
+        self.respect_retry_after = respect_retry_after
+        self.hooks = list(hooks) if hooks is not None else []
+
+    @classmethod
+    def never(cls) -> "RetryPolicy":
+        """
+        Policy that never retries
+        """
+        return cls(max_attempts=1)
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryPolicy(max_attempts={self.max_attempts}, methods={sorted(self.methods)}, "
+            f"deadline={self.deadline})"
+        )
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Whether an error is transient and worth retrying
+        """
+        if isinstance(error, self.retry_exceptions):
+            return True
+        return isinstance(error, ValrApiError) and error.status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before retrying after failed attempt number ``attempt``, ignoring Retry-After
+        """
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def next_delay(
+        self,
+        request: Any,
+        attempt: int,
+        error: Exception,
+        started: float,
+        retry: Optional[bool] = None,
+    ) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt and run the hooks
+
+        Args:
+            request: The request that failed
+            attempt: Number of the attempt that failed, starting at 1
+            error: The error it failed with
+            started: ``time.monotonic()`` when the first attempt started
+            retry: Per-call override; True opts in, False opts out, None follows ``methods``
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        delay = None
+        allowed = retry if retry is not None else request.method in self.methods
+        if allowed and attempt < self.max_attempts and self.is_retryable(error):
+            retry_after = None
+            if self.respect_retry_after and isinstance(error, ValrApiError):
+                retry_after = parse_retry_after(error.headers)
+            delay = retry_after if retry_after is not None else self.backoff(attempt)
+            if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+                delay = None
+
+        for hook in self.hooks:
+            hook(request, attempt, error, delay)
+        return delay
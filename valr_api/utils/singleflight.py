@@ -0,0 +1,117 @@
+"""
+Coalescing of identical in-flight requests
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """
+    Call in flight, awaited by the callers that joined it
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Run a call once for all callers asking for the same key at the same time
+
+    The first caller of a key runs the call; callers arriving while it is in flight wait
+    for it and get its result, or its exception, instead of running the call again. Once
+    the call finishes, the next caller of the key starts a new one, so results are never
+    reused beyond the moment they were in flight.
+
+    ``do`` coalesces threads and ``do_async`` coalesces tasks of one event loop.
+
+    Example:
+        flight = SingleFlight()
+        book = flight.do(("orderbook", "BTCZAR"), lambda: fetch_orderbook("BTCZAR"))
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Tuple[int, Hashable], "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def __repr__(self) -> str:
+        return f"SingleFlight(calls={self.calls}, shared={self.shared})"
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """
+        Run a call, or join the identical call already in flight
+
+        Args:
+            key: Identity of the call
+            call: Function making the call
+
+        Returns:
+            Result of the call
+        """
+        with self._lock:
+            flight = self._calls.get(key)
+            if flight is None:
+                flight = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = call()
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            flight.done.set()
+
+    async def do_async(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call, or join the identical call already in flight (asyncio)
+
+        Accepts the same arguments as :meth:`do`; ``call`` returns an awaitable.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        future = self._futures.get(loop_key)
+        if future is not None:
+            self.shared += 1
+            # Shielded so that a cancelled follower does not cancel the call
+            return await asyncio.shield(future)
+
+        future = self._futures[loop_key] = loop.create_future()
+        self.calls += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Retrieved here, so a call nobody joined does not log "never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._futures[loop_key]
@@ -0,0 +1,124 @@
+"""
+Wire-level debug logging for VALR API requests
+"""
+
+import logging
+import random
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+#: Headers whose values never reach the log
+REDACTED_HEADERS = ("X-VALR-API-KEY", "X-VALR-SIGNATURE")
+
+
+class _Truncated:
+    """
+    Deferred, truncated rendering of a request or response body
+
+    Formatting happens in ``__str__``, so a handler that never emits the record never pays
+    for slicing or decoding the body.
+    """
+
+    __slots__ = ("body", "limit")
+
+    def __init__(self, body: Any, limit: int):
+        self.body = body
+        self.limit = limit
+
+    def __str__(self) -> str:
+        body = self.body
+        if body is None:
+            return ""
+        size = len(body)
+        text = body[: self.limit]
+        if isinstance(text, (bytes, bytearray, memoryview)):
+            text = bytes(text).decode("utf-8", "replace")
+        if size > self.limit:
+            return f"{text}...({size - self.limit} more)"
+        return text
+
+
+class WireLogger:
+    """
+    Structured, lazily evaluated logging of request/response pairs
+
+    Nothing is formatted unless the logger is enabled for DEBUG, in which case a sampled
+    subset of exchanges is logged. Failed responses are always logged when enabled.
+    Bodies are truncated and credential headers are redacted. Each record carries a
+    ``valr`` attribute with the structured fields (method, url, status, sizes, headers).
+
+    Args:
+        logger: Logger to write to. Defaults to the ``valr_api.wire`` logger.
+        max_body: Maximum number of body bytes rendered per message
+        sample_rate: Fraction of successful exchanges to log, between 0 and 1
+        redact_headers: Header names whose values are replaced with ``***``
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        max_body: int = 2048,
+        sample_rate: float = 1.0,
+        redact_headers: Iterable[str] = REDACTED_HEADERS,
+    ):
+        self.logger = logger if logger is not None else logging.getLogger("valr_api.wire")
+        self.max_body = max_body
+        self.sample_rate = sample_rate
+        self.redact_headers = frozenset(name.lower() for name in redact_headers)
+
+    def enabled(self) -> bool:
+        """
+        Whether wire logging would emit anything at all
+
+        The check is a single cached level lookup; call sites guard on it so a disabled
+        logger costs nothing beyond this call.
+        """
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def redact(self, headers: Mapping[str, str]) -> Dict[str, str]:
+        """
+        Copy headers with credential values masked
+
+        Args:
+            headers: Request or response headers
+
+        Returns:
+            Headers safe to write to a log
+        """
+        return {
+            name: "***" if name.lower() in self.redact_headers else value
+            for name, value in headers.items()
+        }
+
+    def log_exchange(self, request: Any, response: Any) -> None:
+        """
+        Log a request and its response, subject to sampling
+
+        Args:
+            request: Prepared request
+            response: Backend response
+        """
+        if response.status_code < 400 and self.sample_rate < 1.0:
+            if random.random() >= self.sample_rate:
+                return
+
+        body = response.content
+        self.logger.debug(
+            "%s %s params=%s body=%s -> %s %s",
+            request.method,
+            request.url,
+            request.params,
+            _Truncated(request.body, self.max_body),
+            response.status_code,
+            _Truncated(body, self.max_body),
+            extra={
+                "valr": {
+                    "method": request.method,
+                    "url": request.url,
+                    "params": request.params,
+                    "status_code": response.status_code,
+                    "request_headers": self.redact(request.headers),
+                    "request_bytes": len(request.body) if request.body else 0,
+                    "response_bytes": len(body) if body else 0,
+                }
+            },
+        )
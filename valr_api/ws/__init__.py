@@ -0,0 +1,8 @@
+"""
+Streaming client for VALR WebSocket feeds
+"""
+
+from valr_api.ws.client import ValrWebSocket
+from valr_api.ws.subscription import DROP_NEWEST, DROP_OLDEST, ERROR, Subscription
+
+__all__ = ["DROP_NEWEST", "DROP_OLDEST", "ERROR", "Subscription", "ValrWebSocket"]
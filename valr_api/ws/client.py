@@ -0,0 +1,421 @@
+"""
+VALR WebSocket streaming client
+"""
+
+import asyncio
+import inspect
+import logging
+import random
+from typing import Any, Dict, List, Optional
+
+from valr_api.exceptions import ValrAuthenticationError, ValrStreamError
+from valr_api.utils.auth import generate_signature, get_timestamp
+from valr_api.utils.clock import ClockSync
+from valr_api.utils.codec import JsonCodec, get_default_codec
+from valr_api.ws.subscription import DROP_OLDEST, Callback, Subscription
+
+try:
+    import websockets
+    from websockets.asyncio.client import connect
+except ImportError:  # pragma: no cover - optional dependency
+    websockets = None  # type: ignore[assignment]
+
+PING = '{"type":"PING"}'
+
+
+class ValrWebSocket:
+    """
+    Streaming connection to one of VALR's WebSocket feeds
+
+    The trade feed (``/ws/trade``) streams market data for the events and pairs that are
+    subscribed to; the account feed (``/ws/account``) streams every account event once
+    connected, and subscriptions only select which of them to receive. Both feeds are
+    authenticated with the API key and a signature over the feed path.
+
+    The connection runs in a background task. It sends a ``PING`` every ``heartbeat``
+    seconds and reconnects, with exponential backoff and jitter, when the server closes
+    the connection or stops answering. Subscriptions are re-sent after every reconnect.
+
+    Requires the optional ``websockets`` dependency (``pip install valr-api[ws]``).
+
+    Args:
+        path: Feed path, :attr:`TRADE` or :attr:`ACCOUNT`
+        api_key: VALR API key
+        api_secret: VALR API secret
+        base_url: VALR WebSocket base URL (defaults to wss://api.valr.com)
+        heartbeat: Seconds between pings; the connection is considered dead after two
+            intervals without any message
+        reconnect: Whether to reconnect when the connection is lost
+        initial_backoff: Upper bound of the first reconnect delay in seconds
+        max_backoff: Upper bound of any reconnect delay in seconds
+        max_retries: Consecutive failed connection attempts before giving up. Defaults
+            to retrying forever.
+        open_timeout: Seconds allowed for the opening handshake
+        queue_size: Default queue size of new subscriptions
+        overflow: Default overflow policy of new subscriptions
+        codec: JSON serializer/deserializer for messages
+        clock: Server clock estimate the handshake is time-stamped with (e.g. the
+            :class:`~valr_api.utils.clock.ClockSync` of a client). Defaults to the local
+            wall clock.
+
+    Example:
+        async with ValrWebSocket(ValrWebSocket.TRADE, api_key, api_secret) as ws:
+            summaries = await ws.subscribe("MARKET_SUMMARY_UPDATE", ["BTCZAR"])
+            async for message in summaries:
+                print(message["data"]["lastTradedPrice"])
+    """
+
+    TRADE = "/ws/trade"
+    ACCOUNT = "/ws/account"
+
+    def __init__(
+        self,
+        path: str = TRADE,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        base_url: str = "wss://api.valr.com",
+        heartbeat: float = 30.0,
+        reconnect: bool = True,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        max_retries: Optional[int] = None,
+        open_timeout: float = 10.0,
+        queue_size: int = 1000,
+        overflow: str = DROP_OLDEST,
+        codec: Optional[JsonCodec] = None,
+        clock: Optional[ClockSync] = None,
+    ):
+        if websockets is None:
+            raise ImportError(
+                "ValrWebSocket requires websockets; install it with `pip install valr-api[ws]`"
+            )
+
+        self.path = path
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.url = base_url.rstrip("/") + path
+        self.heartbeat = heartbeat
+        self.reconnect = reconnect
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self.open_timeout = open_timeout
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.codec = codec if codec is not None else get_default_codec()
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self.reconnects = 0
+        self.messages = 0
+        self.subscriptions: List[Subscription] = []
+        self._connection: Any = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._connected: Optional[asyncio.Event] = None
+        self._closing = False
+        self._last_message = 0.0
+
+    async def __aenter__(self) -> "ValrWebSocket":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @property
+    def connected(self) -> bool:
+        """Whether the connection is currently open"""
+        return self._connected is not None and self._connected.is_set()
+
+    async def start(self) -> None:
+        """
+        Start the background connection task
+        """
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._connected = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until the connection is open and subscriptions have been sent
+
+        Args:
+            timeout: Seconds to wait. Defaults to waiting indefinitely.
+
+        Raises:
+            asyncio.TimeoutError: If the connection did not open in time
+        """
+        if self._connected is None:
+            await self.start()
+        assert self._connected is not None
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    async def close(self) -> None:
+        """
+        Close the connection and end all subscriptions
+        """
+        self._closing = True
+        if self._connection is not None:
+            await self._connection.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._finish()
+
+    async def subscribe(
+        self,
+        event: Optional[str] = None,
+        pairs: Optional[List[str]] = None,
+        callback: Optional[Callback] = None,
+        maxsize: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ) -> Subscription:
+        """
+        Subscribe to an event type
+
+        On the trade feed this subscribes the connection to ``event`` for ``pairs``. On
+        the account feed it only filters the events the server already sends.
+
+        Args:
+            event: Event type (e.g., ``AGGREGATED_ORDERBOOK_UPDATE``, ``BALANCE_UPDATE``), or
+                None for every message
+            pairs: Currency pairs to receive. Defaults to all pairs.
+            callback: Function (or coroutine function) called with each message instead of
+                queueing it
+            maxsize: Queue size. Defaults to the connection's ``queue_size``.
+            overflow: Overflow policy. Defaults to the connection's ``overflow``.
+
+        Returns:
+            Subscription, iterable with ``async for`` when no callback is given
+        """
+        subscription = Subscription(
+            event,
+            pairs,
+            callback=callback,
+            maxsize=maxsize if maxsize is not None else self.queue_size,
+            overflow=overflow if overflow is not None else self.overflow,
+        )
+        self.subscriptions.append(subscription)
+        if event is not None:
+            await self._send_subscriptions([event])
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Remove a subscription and end its iteration
+
+        Args:
+            subscription: Subscription returned by :meth:`subscribe`
+        """
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+        subscription.close()
+        if subscription.event is not None:
+            await self._send_subscriptions([subscription.event])
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """
+        Send a message on the open connection
+
+        Raises:
+            ValrStreamError: If the connection is not open
+        """
+        if self._connection is None:
+            raise ValrStreamError("WebSocket is not connected")
+        await self._connection.send(self.codec.dumps(message).decode("utf-8"))
+
+    def _headers(self) -> Dict[str, str]:
+        """
+        Authentication headers for the opening handshake
+        """
+        if not self.api_key or not self.api_secret:
+            return {}
+        timestamp = self.clock.timestamp() if self.clock is not None else get_timestamp()
+        return {
+            "X-VALR-API-KEY": self.api_key,
+            "X-VALR-SIGNATURE": generate_signature(self.api_secret, timestamp, "GET", self.path),
+            "X-VALR-TIMESTAMP": str(timestamp),
+        }
+
+    def _subscription_message(self, events: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        ``SUBSCRIBE`` message for the given events, or all subscribed events
+
+        An event whose subscriptions were all removed is sent with an empty pair list,
+        which unsubscribes it.
+        """
+        pairs: Dict[str, Optional[set]] = {event: set() for event in events or ()}
+        for subscription in self.subscriptions:
+            event = subscription.event
+            if event is None or (events is not None and event not in events):
+                continue
+            current = pairs.get(event, set())
+            if subscription.pairs is None or current is None:
+                pairs[event] = None
+            else:
+                pairs[event] = current | subscription.pairs
+
+        subscriptions = []
+        for event, event_pairs in pairs.items():
+            entry: Dict[str, Any] = {"event": event}
+            if event_pairs is not None:
+                entry["pairs"] = sorted(event_pairs)
+            subscriptions.append(entry)
+        return {"type": "SUBSCRIBE", "subscriptions": subscriptions}
+
+    async def _send_subscriptions(self, events: Optional[List[str]] = None) -> None:
+        """
+        Send the current subscriptions for ``events`` on the trade feed, if connected
+        """
+        if self.path != self.TRADE or self._connection is None:
+            return
+        message = self._subscription_message(events)
+        if message["subscriptions"]:
+            await self.send(message)
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Reconnect delay for the given attempt: exponential with full jitter
+        """
+        return random.uniform(0, min(self.max_backoff, self.initial_backoff * 2**attempt))
+
+    async def _run(self) -> None:
+        """
+        Connect, read and reconnect until closed; subscriptions end when this returns
+        """
+        error: Optional[Exception] = None
+        try:
+            error = await self._connect_loop()
+        except Exception as e:
+            self.logger.exception("WebSocket %s failed", self.url)
+            error = ValrStreamError(f"{self.url}: {e}")
+        finally:
+            if self._connected is not None:
+                self._connected.clear()
+            self._finish(error)
+
+    async def _connect_loop(self) -> Optional[Exception]:
+        """
+        Connect, read and reconnect until closed
+
+        Returns:
+            The error to fail subscriptions with, or None when the stream ended normally
+        """
+        assert self._connected is not None
+        loop = asyncio.get_running_loop()
+        attempt = 0
+
+        while not self._closing:
+            try:
+                async with connect(
+                    self.url,
+                    additional_headers=self._headers(),
+                    open_timeout=self.open_timeout,
+                    ping_interval=None,
+                ) as connection:
+                    self._connection = connection
+                    self._last_message = loop.time()
+                    attempt = 0
+                    await self._send_subscriptions()
+                    self._connected.set()
+                    heartbeat = asyncio.ensure_future(self._heartbeat(connection))
+                    try:
+                        while True:
+                            # Text frames are read undecoded and parsed straight from bytes
+                            raw = await connection.recv(decode=False)
+                            self._last_message = loop.time()
+                            await self._receive(raw)
+                    finally:
+                        heartbeat.cancel()
+                        self._connected.clear()
+                        self._connection = None
+            except websockets.exceptions.InvalidStatus as e:
+                status = e.response.status_code
+                if status in (401, 403):
+                    return ValrAuthenticationError(f"{self.url}: {status}", status)
+                self.logger.warning("WebSocket %s rejected with %s", self.url, status)
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                self.logger.warning("WebSocket %s disconnected: %s", self.url, e)
+
+            if self._closing or not self.reconnect:
+                return None
+            if self.max_retries is not None and attempt >= self.max_retries:
+                return ValrStreamError(f"{self.url}: gave up after {attempt} retries")
+            delay = self._backoff(attempt)
+            attempt += 1
+            self.reconnects += 1
+            self.logger.info("Reconnecting to %s in %.2fs", self.url, delay)
+            await asyncio.sleep(delay)
+        return None
+
+    async def _receive(self, raw: bytes) -> None:
+        """
+        Decode and dispatch one frame; a malformed frame is logged and skipped
+        """
+        try:
+            message = self.codec.loads(raw)
+        except ValueError as e:
+            self.logger.warning("Skipping malformed WebSocket frame from %s: %s", self.url, e)
+            return
+        if not isinstance(message, dict):
+            self.logger.warning("Skipping non-object WebSocket frame from %s", self.url)
+            return
+        try:
+            await self._dispatch(message)
+        except Exception:
+            self.logger.exception("Skipping WebSocket frame from %s", self.url)
+
+    async def _heartbeat(self, connection: Any) -> None:
+        """
+        Ping periodically and drop the connection when the server goes silent
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            if loop.time() - self._last_message > 2 * self.heartbeat:
+                self.logger.warning("WebSocket %s heartbeat timed out", self.url)
+                await connection.close(1011, "heartbeat timeout")
+                return
+            await connection.send(PING)
+
+    async def _dispatch(self, message: Dict[str, Any]) -> None:
+        """
+        Deliver a decoded message to every matching subscription
+        """
+        event = message.get("type")
+        if event == "PONG":
+            return
+        self.messages += 1
+        pair = message.get("currencyPairSymbol")
+        if pair is None:
+            data = message.get("data")
+            if isinstance(data, dict):
+                pair = data.get("currencyPairSymbol") or data.get("currencyPair")
+
+        for subscription in self.subscriptions:
+            if not subscription.matches(event, pair):
+                continue
+            if subscription.callback is None:
+                subscription.put(message)
+                continue
+            try:
+                result = subscription.callback(message)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                self.logger.exception("WebSocket callback for %s failed", event)
+
+    def _finish(self, error: Optional[Exception] = None) -> None:
+        """
+        End every subscription, failing them with ``error`` if given
+        """
+        for subscription in self.subscriptions:
+            if error is not None:
+                subscription.fail(error)
+            else:
+                subscription.close()
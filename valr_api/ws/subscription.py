@@ -0,0 +1,156 @@
+"""
+Subscriptions to VALR WebSocket events
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, Optional
+
+from valr_api.exceptions import ValrStreamError
+
+# Overflow policies for a full subscription queue
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+ERROR = "error"
+
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, ERROR)
+
+Callback = Callable[[Dict[str, Any]], Any]
+
+
+class Subscription:
+    """
+    Messages of one event type, optionally restricted to some currency pairs
+
+    Without a callback, messages are buffered in a bounded queue and consumed with
+    ``async for`` or :meth:`get`. When the queue is full, the overflow policy decides what
+    happens to the next message: ``"drop_oldest"`` discards the oldest queued message,
+    ``"drop_newest"`` discards the incoming one, and ``"error"`` fails the subscription so
+    that the consumer's next read raises :class:`~valr_api.exceptions.ValrStreamError`.
+    Dropped messages are counted in ``dropped``.
+
+    With a callback, every message is passed to it as it arrives and nothing is queued.
+    The callback may be a plain function or a coroutine function.
+
+    Args:
+        event: Event type (e.g., ``MARKET_SUMMARY_UPDATE``), or None for every message
+        pairs: Currency pairs to receive. Defaults to all pairs.
+        callback: Function called with each message instead of queueing it
+        maxsize: Maximum number of queued messages
+        overflow: Policy applied when the queue is full
+    """
+
+    def __init__(
+        self,
+        event: Optional[str],
+        pairs: Optional[Iterable[str]] = None,
+        callback: Optional[Callback] = None,
+        maxsize: int = 1000,
+        overflow: str = DROP_OLDEST,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, not {overflow!r}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.event = event
+        self.pairs: Optional[FrozenSet[str]] = frozenset(pairs) if pairs is not None else None
+        self.callback = callback
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.closed = False
+        self._messages: Deque[Dict[str, Any]] = deque()
+        self._error: Optional[Exception] = None
+        self._ready = asyncio.Event()
+
+    def __repr__(self) -> str:
+        pairs = sorted(self.pairs) if self.pairs is not None else "all"
+        return f"Subscription({self.event}, pairs={pairs}, queued={len(self._messages)})"
+
+    def matches(self, event: Optional[str], pair: Optional[str]) -> bool:
+        """
+        Whether a message with this event type and currency pair belongs here
+        """
+        if self.event is not None and event != self.event:
+            return False
+        return self.pairs is None or pair in self.pairs
+
+    def put(self, message: Dict[str, Any]) -> None:
+        """
+        Queue a message, applying the overflow policy when the queue is full
+        """
+        if self.closed:
+            return
+        messages = self._messages
+        if len(messages) >= self.maxsize:
+            if self.overflow == DROP_NEWEST:
+                self.dropped += 1
+                return
+            if self.overflow == DROP_OLDEST:
+                messages.popleft()
+                self.dropped += 1
+            else:
+                self.dropped += 1
+                self.fail(ValrStreamError(f"{self!r} overflowed"))
+                return
+        messages.append(message)
+        self._ready.set()
+
+    def fail(self, error: Exception) -> None:
+        """
+        Close the subscription; the consumer's next read raises ``error``
+        """
+        self._error = error
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the subscription; queued messages can still be read
+        """
+        self.closed = True
+        self._ready.set()
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Wait for the next message
+
+        Returns:
+            Decoded message
+
+        Raises:
+            ValrStreamError: If the subscription overflowed or is closed and drained
+        """
+        while True:
+            if self._error is not None:
+                raise self._error
+            if self._messages:
+                return self._messages.popleft()
+            if self.closed:
+                raise ValrStreamError(f"{self!r} is closed")
+            self._ready.clear()
+            await self._ready.wait()
+
+    def get_nowait(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the next queued message, or None if the queue is empty
+        """
+        if self._error is not None:
+            raise self._error
+        return self._messages.popleft() if self._messages else None
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self.closed and self._error is None and not self._messages:
+            raise StopAsyncIteration
+        try:
+            return await self.get()
+        except ValrStreamError:
+            if self._error is None:
+                raise StopAsyncIteration
+            raise